@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark for edit pattern analysis.
+Compares the previous difflib-based implementation with the word-level
+Myers diff engine on large edited threads.
+"""
+import difflib
+import os
+import random
+import re
+import sys
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.edit_diff import analyze_edit
+
+STOPWORDS = ["the", "a", "of", "and", "to", "in", "is", "that", "for", "it", "on", "with"]
+
+
+def build_vocabulary(size: int, rng: random.Random):
+    """Build pseudo-words with a Zipf-like frequency, like real prose."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 11))) for _ in range(size)]
+    weights = [1.0 / (rank + 1) for rank in range(size)]
+    return STOPWORDS + words, [20.0] * len(STOPWORDS) + weights
+
+
+def build_thread(tweets: int, rng: random.Random) -> str:
+    """Build a synthetic thread with the given number of tweets."""
+    vocabulary, weights = build_vocabulary(5000, rng)
+    segments = []
+    for _ in range(tweets):
+        sentences = []
+        for _ in range(rng.randint(2, 4)):
+            words = rng.choices(vocabulary, weights, k=rng.randint(8, 16))
+            sentences.append(" ".join(words).capitalize() + ".")
+        segments.append(" ".join(sentences))
+    return "\n\n------\n\n".join(segments)
+
+
+def edit_thread(thread: str, edits: int, rng: random.Random) -> str:
+    """Apply a number of small word-level edits, the way a user would."""
+    words = thread.split(" ")
+    for _ in range(edits):
+        position = rng.randrange(len(words))
+        action = rng.random()
+        if action < 0.4:
+            words[position] = f"edited{rng.randint(0, 999)}"
+        elif action < 0.7:
+            words.insert(position, f"**added{rng.randint(0, 999)}**")
+        else:
+            del words[position]
+    return " ".join(words)
+
+
+def legacy_analysis(original: str, edited: str):
+    """The previous implementation: a discarded unified diff plus regex set differences."""
+    diff = list(difflib.unified_diff(
+        original.splitlines(keepends=True),
+        edited.splitlines(keepends=True),
+        fromfile='original',
+        tofile='edited',
+        n=3
+    ))
+    if not diff:
+        return None
+
+    orig_words_set = set(re.findall(r'\b\w+\b', original.lower()))
+    edited_words_set = set(re.findall(r'\b\w+\b', edited.lower()))
+    return {
+        'word_diff': len(edited.split()) - len(original.split()),
+        'added_bold': '**' in edited and '**' not in original,
+        'paragraph_structure_changed': original.count('\n') != edited.count('\n'),
+        'added_vocabulary': edited_words_set - orig_words_set,
+        'removed_vocabulary': orig_words_set - edited_words_set,
+    }
+
+
+def time_call(func, *args, repeat: int = 5) -> float:
+    """Return the best wall time of several runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Run the edit pattern benchmark."""
+    rng = random.Random(42)
+
+    print("=" * 78)
+    print("Edit Pattern Analysis Benchmark")
+    print("=" * 78)
+    print(f"{'Case':<36}{'Words':>8}{'difflib (ms)':>15}{'myers (ms)':>13}{'Speedup':>9}")
+
+    # (name, tweets, edits, layout): layout False keeps separators, True joins
+    # everything into one paragraph, None puts every sentence on its own line
+    cases = [
+        ("Single post (one paragraph), 5 edits", 8, 5, True),
+        ("Single post (one paragraph), 20 edits", 8, 20, True),
+        ("25-tweet thread, 10 edits", 25, 10, False),
+        ("25-tweet thread, 50 edits", 25, 50, False),
+        ("250-tweet thread, 50 edits", 250, 50, False),
+        ("250-tweet post (one paragraph), 50 edits", 250, 50, True),
+        ("1000-tweet post (one paragraph), 200 edits", 1000, 200, True),
+        ("1000-tweet post (line per sentence), 400 edits", 1000, 400, None),
+        ("3000-tweet post (line per sentence), 1000 edits", 3000, 1000, None),
+    ]
+
+    for name, tweets, edits, layout in cases:
+        original = build_thread(tweets, rng)
+        if layout is True:
+            original = original.replace("\n\n------\n\n", " ")
+        elif layout is None:
+            original = original.replace("\n\n------\n\n", "\n").replace(". ", ".\n")
+        edited = edit_thread(original, edits, rng)
+
+        legacy = legacy_analysis(original, edited)
+        current = analyze_edit(original, edited)
+        consistent = (
+            legacy['word_diff'] == current['word_diff']
+            and legacy['added_vocabulary'] == set(current['added_vocabulary'])
+            and legacy['removed_vocabulary'] == set(current['removed_vocabulary'])
+        )
+
+        legacy_ms = time_call(legacy_analysis, original, edited)
+        current_ms = time_call(analyze_edit, original, edited)
+        speedup = legacy_ms / current_ms if current_ms else float("inf")
+        marker = "" if consistent else "  [MISMATCH]"
+        print(f"{name:<36.36}{len(original.split()):>8}{legacy_ms:>15.2f}{current_ms:>13.2f}{speedup:>8.1f}x{marker}")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for concurrent memory writers.
+Starts several processes that record feedback into one memory database at
+the same time, then verifies that no write failed and every counter is exact.
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.config
+from src.memory_manager import MemoryManager
+
+CONTENT_TYPES = ["twitter_thread", "article_summary", "detailed_post"]
+ACTIONS = ["accept", "reject", "edit"]
+
+ORIGINAL = "Short **bold** opening.\n\nA second paragraph with a few words in it."
+EDITED = ("Short **bold** opening that now says considerably more than before.\n\n"
+          "A second paragraph with several additional specific words in it.")
+
+
+def planned_feedback(worker: int, index: int):
+    """Get the (content_type, action) of one record; deterministic so totals can be checked."""
+    return CONTENT_TYPES[(worker + index) % len(CONTENT_TYPES)], ACTIONS[index % len(ACTIONS)]
+
+
+def writer(db_path: str, worker: int, records: int, wal: bool, barrier, failures):
+    """Record feedback as fast as possible from one process."""
+    src.config.MEMORY_WAL_ENABLED = wal
+    manager = MemoryManager(db_path=db_path)
+    manager.max_records = sys.maxsize
+    barrier.wait()
+
+    failed = 0
+    for index in range(records):
+        content_type, action = planned_feedback(worker, index)
+        metadata = None
+        if action == "edit":
+            metadata = {"edited_content": EDITED}
+        elif action == "reject":
+            metadata = {"revision_reason": "Too long"}
+        content = ORIGINAL if action == "edit" else f"Worker {worker} item {index}. {ORIGINAL}"
+        if not manager.record_feedback(content_type, content, action, generation_time=1.0, metadata=metadata):
+            failed += 1
+    failures.put(failed)
+
+
+def verify(db_path: str, processes: int, records: int):
+    """Compare the database with the totals implied by the plan; returns a list of problems."""
+    expected = {content_type: {action: 0 for action in ACTIONS} for content_type in CONTENT_TYPES}
+    for worker in range(processes):
+        for index in range(records):
+            content_type, action = planned_feedback(worker, index)
+            expected[content_type][action] += 1
+
+    problems = []
+    with sqlite3.connect(db_path) as conn:
+        total = processes * records
+        for table in ("feedback_history", "quality_metrics"):
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if count != total:
+                problems.append(f"{table}: {count} rows, expected {total}")
+
+        for content_type, actions in expected.items():
+            row = conn.execute('''
+                SELECT COUNT(*), SUM(total_generated), SUM(total_accepted), SUM(total_rejected), SUM(total_edited)
+                FROM generation_stats WHERE content_type = ?
+            ''', (content_type,)).fetchone()
+            wanted = (1, sum(actions.values()), actions["accept"], actions["reject"], actions["edit"])
+            if row != wanted:
+                problems.append(f"generation_stats {content_type}: (rows, generated, accepted, rejected, edited) "
+                                f"= {row}, expected {wanted}")
+
+            frequency = conn.execute('''
+                SELECT frequency FROM edit_patterns WHERE content_type = ? AND edit_type = 'length_increase'
+            ''', (content_type,)).fetchone()
+            if (frequency[0] if frequency else 0) != actions["edit"]:
+                problems.append(f"edit_patterns {content_type}: frequency {frequency}, expected {actions['edit']}")
+    return problems
+
+
+def main():
+    """Run the concurrent writer benchmark."""
+    parser = argparse.ArgumentParser(description="Concurrent MemoryManager writer stress test")
+    parser.add_argument("--processes", type=int, default=8, help="Number of writer processes")
+    parser.add_argument("--records", type=int, default=200, help="Feedback records per process")
+    parser.add_argument("--no-wal", action="store_true", help="Use the rollback journal instead of WAL")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    wal = not args.no_wal
+    try:
+        src.config.MEMORY_WAL_ENABLED = wal
+        manager = MemoryManager(db_path=db_path)
+
+        barrier = multiprocessing.Barrier(args.processes + 1)
+        failures = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=writer, args=(db_path, worker, args.records, wal, barrier, failures))
+            for worker in range(args.processes)
+        ]
+        for process in workers:
+            process.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        failed = sum(failures.get() for _ in workers)
+        total = args.processes * args.records
+        problems = verify(db_path, args.processes, args.records)
+        if failed:
+            problems.insert(0, f"{failed} record_feedback calls failed")
+
+        print("=" * 78)
+        print("Concurrent Memory Writers Benchmark")
+        print("=" * 78)
+        print(f"Journal mode:   {'WAL' if wal else 'rollback (DELETE)'}")
+        print(f"Writers:        {args.processes} processes x {args.records} records = {total}")
+        print(f"Elapsed:        {elapsed:.2f}s ({total / elapsed:.0f} records/s)")
+        print(f"Result:         {'all counts exact' if not problems else 'MISMATCH'}")
+        for problem in problems:
+            print(f"   - {problem}")
+        print("=" * 78)
+        manager.close()
+        return 0 if not problems else 1
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(db_path + suffix)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
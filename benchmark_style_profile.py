@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark for style profiles.
+Compares the prompt size of thread, summary and detailed post prompts built
+with the raw writing samples and instructions against prompts built with the
+distilled style profile. With --live, profiles are built with the model if
+needed and one generation per content type is timed both ways.
+
+Tokens are counted with tiktoken when its encoding is available, otherwise
+with the 4 characters per token estimate.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.config import OPENAI_MODEL, SAMPLES_DIR, STYLE_PROFILE_MAX_WORDS
+from src.document_loader import DocumentProcessor
+from src.style_profile import StyleProfiler
+from src.twitter_generator import TwitterThreadGenerator
+from src.article_summary import ArticleSummaryGenerator
+from src.detailed_post import DetailedPostGenerator
+
+DEFAULT_ARTICLE = os.path.join("data", "input", "Bittensor-article.docx")
+ARGUMENT = "The article's central argument"
+
+
+def token_counter():
+    """Get a function counting tokens, and the name of the method it uses."""
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(OPENAI_MODEL)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), f"tiktoken {encoding.name}"
+    except Exception:
+        # Not installed, or the encoding could not be downloaded
+        return (lambda text: len(text) // 4), "estimate (4 chars/token)"
+
+
+def build_prompts(generators, article: str):
+    """Format the generation prompt of each content type with the generators' current style guidance."""
+    thread, summary, post = generators
+    instructions, samples = thread.load_style_guidance()
+    yield "Social media thread", thread.thread_prompt_template.format(
+        article_text=article, style_instructions=instructions, sample_threads=samples)
+    instructions, samples = summary.load_style_guidance(max_samples=2)
+    yield "Article summary", summary.summary_prompt.format(
+        content=article, style_instructions=instructions, sample_posts=samples)
+    instructions, samples = post.load_style_guidance()
+    yield "Detailed post", post.detailed_post_prompt.format(
+        argument=ARGUMENT, context=article, style_instructions=instructions, sample_posts=samples,
+        additional_context_instructions="No additional context is available for this post.")
+
+
+def generate_all(generators, article: str):
+    """Generate one piece of each content type, returning the wall time of each in seconds."""
+    thread, summary, post = generators
+    calls = [
+        lambda: thread.generate_thread(article),
+        lambda: summary.generate_summary(article),
+        lambda: post.generate_post_for_argument(ARGUMENT, article),
+    ]
+    timings = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+class EstimatedProfiler:
+    """Stands in for profiles that are not built yet with a placeholder of the maximum profile size."""
+
+    def __init__(self, profiler: StyleProfiler):
+        self.profiler = profiler
+        self.estimated = False
+
+    def get_profile(self, kind: str, instructions: str, samples_dir: str, build: bool = True):
+        profile = self.profiler.get_profile(kind, instructions, samples_dir, build=False)
+        if profile is None:
+            self.estimated = True
+            profile = " ".join(["word"] * STYLE_PROFILE_MAX_WORDS)
+        return profile
+
+
+def main():
+    """Run the style profile benchmark."""
+    parser = argparse.ArgumentParser(description="Compare prompts with raw samples and with style profiles.")
+    parser.add_argument("--article", default=DEFAULT_ARTICLE, help="article to build the prompts for")
+    parser.add_argument("--live", action="store_true",
+                        help="build missing profiles and time real generations (calls the model)")
+    args = parser.parse_args()
+
+    article = DocumentProcessor().process_document(args.article)["content"]
+    count_tokens, method = token_counter()
+
+    profiler = StyleProfiler()
+    profile_source = profiler if args.live else EstimatedProfiler(profiler)
+    raw = (TwitterThreadGenerator(samples_dir=SAMPLES_DIR), ArticleSummaryGenerator(samples_dir=SAMPLES_DIR),
+           DetailedPostGenerator(samples_dir=SAMPLES_DIR))
+    profiled = tuple(type(generator)(samples_dir=SAMPLES_DIR, style_profiler=profile_source) for generator in raw)
+
+    # Raw samples are picked at random; a fixed seed keeps runs comparable
+    random.seed(42)
+    raw_prompts = list(build_prompts(raw, article))
+    profiled_prompts = list(build_prompts(profiled, article))
+
+    print("=" * 78)
+    print("Style Profile Benchmark")
+    print("=" * 78)
+    print(f"Article: {args.article} ({count_tokens(article)} tokens), counting with {method}")
+    print(f"{'Prompt':<24}{'Raw samples':>14}{'Profile':>12}{'Saved':>10}{'Saved %':>10}")
+    for (name, raw_prompt), (_, profiled_prompt) in zip(raw_prompts, profiled_prompts):
+        raw_tokens, profiled_tokens = count_tokens(raw_prompt), count_tokens(profiled_prompt)
+        saved = raw_tokens - profiled_tokens
+        print(f"{name:<24}{raw_tokens:>14}{profiled_tokens:>12}{saved:>10}{100 * saved / raw_tokens:>9.1f}%")
+    if not args.live and profile_source.estimated:
+        print(f"\nProfiles not built yet were counted at the {STYLE_PROFILE_MAX_WORDS}-word limit "
+              "(run with --live to build them).")
+
+    if args.live:
+        print(f"\n{'Generation':<24}{'Raw (s)':>14}{'Profile (s)':>12}")
+        names = [name for name, _ in raw_prompts]
+        for name, raw_time, profiled_time in zip(names, generate_all(raw, article), generate_all(profiled, article)):
+            print(f"{name:<24}{raw_time:>14.1f}{profiled_time:>12.1f}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
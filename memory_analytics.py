@@ -3,26 +3,29 @@
 Memory Analytics Dashboard for ContentAgent.
 Shows learning insights, patterns, and recommendations.
 """
+import argparse
 import os
 import sys
 import json
+import time
 from datetime import datetime
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from src.config import EXPORT_DIR
+from src.memory_export import MemoryExporter, FORMAT_PARQUET, FORMAT_NPZ
 from src.memory_manager import MemoryManager
+from src.quality_trends import QualityTrends, TREND_METRICS
 
-def display_analytics():
-    """Display comprehensive memory analytics."""
+def display_analytics(snapshot):
+    """Display comprehensive memory analytics from a dashboard snapshot."""
     print("=" * 80)
     print("ContentAgent Memory Analytics Dashboard")
     print("=" * 80)
     
-    memory_manager = MemoryManager()
-    
     # Database overview
-    db_info = memory_manager.get_database_info()
+    db_info = snapshot.get('database', {})
     print(f"\n[DATABASE] Overview:")
     print(f"   Total feedback records: {db_info.get('total_feedback_records', 0)}")
     print(f"   Content types tracked: {db_info.get('content_types_tracked', 0)}")
@@ -34,7 +37,7 @@ def display_analytics():
     
     # Generation statistics
     print(f"\n[STATS] Generation Statistics:")
-    all_stats = memory_manager.get_generation_stats()
+    all_stats = snapshot['generation_stats']
     if all_stats:
         for stat in all_stats:
             print(f"   {stat['content_type'].replace('_', ' ').title()}:")
@@ -50,14 +53,14 @@ def display_analytics():
     content_types = ['twitter_thread', 'article_summary', 'detailed_post']
     
     for content_type in content_types:
-        stats = memory_manager.get_generation_stats(content_type)
-        if not stats:
+        analysis = snapshot['content_types'].get(content_type)
+        if not analysis or not analysis['generation_stats']:
             continue
             
         print(f"\n[ANALYSIS] {content_type.replace('_', ' ').title()}:")
         
         # Quality analysis
-        quality = memory_manager.get_quality_analysis(content_type)
+        quality = analysis['quality_analysis']
         if quality:
             print(f"   Quality Metrics:")
             for action, metrics in quality.items():
@@ -69,29 +72,29 @@ def display_analytics():
                     print(f"       • Samples: {metrics['sample_count']}")
         
         # Edit patterns
-        patterns = memory_manager.get_edit_patterns(content_type)
+        patterns = analysis['edit_patterns']
         if patterns:
             print(f"   Edit Patterns:")
             for pattern in patterns[:3]:  # Top 3
                 print(f"     • {pattern['edit_type']}: {pattern['description']} ({pattern['frequency']}x)")
         
         # User preferences
-        preferences = memory_manager.get_user_preferences(content_type)
+        preferences = analysis['user_preferences']
         if preferences:
             print(f"   Learned Preferences:")
             for pref_type, pref_data in preferences.items():
                 if pref_data['confidence'] >= 0.5:
-                    print(f"     • {pref_type}: {pref_data['value']} (confidence: {pref_data['confidence']:.0%})")
+                    value = f"{pref_data['mean']} ± {pref_data['std']}" if 'mean' in pref_data else pref_data['value']
+                    print(f"     • {pref_type}: {value} (confidence: {pref_data['confidence']:.0%})")
         
         # Learning insights
-        insights = memory_manager.get_learning_insights(content_type)
-        if insights.get('recommendations'):
+        if analysis['recommendations']:
             print(f"   [RECOMMENDATIONS]:")
-            for rec in insights['recommendations'][:3]:  # Top 3
+            for rec in analysis['recommendations'][:3]:  # Top 3
                 print(f"     • {rec}")
         
         # Prompt enhancements preview
-        enhancements = memory_manager.get_prompt_enhancements(content_type)
+        enhancements = analysis['prompt_enhancements']
         if enhancements:
             print(f"   [ENHANCEMENTS] Prompt Enhancements Active:")
             enhancement_lines = enhancements.split('\n')
@@ -102,12 +105,11 @@ def display_analytics():
     print(f"\n[UPDATED] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80)
 
-def display_recent_feedback():
-    """Display recent feedback for review."""
+def display_recent_feedback(snapshot):
+    """Display recent feedback for review from a dashboard snapshot."""
     print("\n[RECENT FEEDBACK] Last 10 items:")
     
-    memory_manager = MemoryManager()
-    recent = memory_manager.get_recent_feedback(limit=10)
+    recent = snapshot['recent_feedback']
     
     if not recent:
         print("   No feedback recorded yet.")
@@ -119,11 +121,122 @@ def display_recent_feedback():
         print(f"   [{timestamp}] {feedback['content_type']} - {feedback['user_action']}")
         print(f"     \"{content_preview}\"")
 
+def display_search_results(query, content_type=None, user_action=None, limit=20):
+    """Display feedback matching a full-text search."""
+    memory_manager = MemoryManager()
+    
+    start = time.perf_counter()
+    results = memory_manager.search_feedback(query, content_type=content_type,
+                                             user_action=user_action, limit=limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"\n[SEARCH] \"{query}\": {len(results)} result(s) in {elapsed_ms:.1f} ms")
+    
+    if not results:
+        print("   No matching feedback found.")
+        return
+    
+    for result in results:
+        timestamp = datetime.fromisoformat(result['timestamp']).strftime('%m/%d %H:%M')
+        snippet = " ".join(result['snippet'].split())
+        print(f"   #{result['id']} [{timestamp}] {result['content_type']} - {result['user_action']} (score {result['score']:.2f})")
+        print(f"     \"{snippet}\"")
+
+def run_export(output_dir, export_format=None, full=False, chunk_size=None):
+    """Export memory tables to columnar files."""
+    memory_manager = MemoryManager()
+    options = {"chunk_size": chunk_size} if chunk_size else {}
+    exporter = MemoryExporter(memory_manager.db_path, output_dir, export_format, **options)
+    
+    start = time.perf_counter()
+    results = exporter.export(incremental=not full)
+    elapsed = time.perf_counter() - start
+    
+    print(f"\n[EXPORT] {'Full' if full else 'Incremental'} {exporter.export_format} export to {output_dir} in {elapsed:.2f}s")
+    for table, result in results.items():
+        location = os.path.relpath(result['path'], output_dir) if result['path'] else "nothing new"
+        print(f"   {table}: {result['rows']} rows ({location})")
+
+def display_trends(content_type=None, metric="readability", weeks=8, window_days=7):
+    """Display weekly acceptance and quality trends."""
+    memory_manager = MemoryManager()
+    
+    start = time.perf_counter()
+    trends = QualityTrends.load(memory_manager.db_path, content_type)
+    weekly = trends.weekly(metric)
+    rolling_metric = trends.rolling_mean(metric, window_days)
+    rolling_acceptance = trends.rolling_mean("acceptance", window_days)
+    slope = trends.acceptance_slope(weeks)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    scope = content_type or "all content types"
+    print(f"\n[TRENDS] {metric.title()} and acceptance for {scope}: {len(trends)} record(s) in {elapsed_ms:.1f} ms")
+    
+    if not len(trends):
+        print("   No quality metrics recorded yet.")
+        return
+    
+    print(f"   {'Week of':<12}{'Samples':>8}{'Accept':>9}{'Mean':>9}{'P25':>9}{'P50':>9}{'P75':>9}")
+    for i in range(max(0, len(weekly['samples']) - weeks), len(weekly['samples'])):
+        p25, p50, p75 = weekly['percentiles'][i]
+        print(f"   {str(weekly['week_start'][i]):<12}{weekly['samples'][i]:>8}"
+              f"{weekly['acceptance_rate'][i]:>9.1%}{weekly['mean'][i]:>9.1f}{p25:>9.1f}{p50:>9.1f}{p75:>9.1f}")
+    
+    print(f"\n   Last {window_days:g} days: acceptance {rolling_acceptance[-1]:.1%}, "
+          f"{metric} {rolling_metric[-1]:.1f}")
+    if slope is not None:
+        direction = "rising" if slope > 0 else "falling" if slope < 0 else "flat"
+        print(f"   Acceptance drift over the last {min(weeks, len(weekly['samples']))} weeks: "
+              f"{slope * 100:+.1f} points per week ({direction})")
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="ContentAgent memory analytics")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    subparsers.add_parser("dashboard", help="Show the analytics dashboard (default)")
+    
+    search_parser = subparsers.add_parser("search", help="Search feedback history")
+    search_parser.add_argument("query", nargs="+", help="Words to search for; end a word with * to match a prefix")
+    search_parser.add_argument("--type", dest="content_type", help="Only search this content type")
+    search_parser.add_argument("--action", dest="user_action", choices=["accept", "reject", "edit"],
+                               help="Only search feedback with this action")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum number of results")
+    
+    trends_parser = subparsers.add_parser("trends", help="Show weekly acceptance and quality trends")
+    trends_parser.add_argument("--type", dest="content_type", help="Only analyze this content type")
+    trends_parser.add_argument("--metric", default="readability", choices=list(TREND_METRICS),
+                               help="Quality metric to summarize (default: readability)")
+    trends_parser.add_argument("--weeks", type=int, default=8, help="Number of recent weeks to show")
+    trends_parser.add_argument("--window", type=float, default=7, help="Rolling window in days")
+    
+    export_parser = subparsers.add_parser("export", help="Export memory tables to Parquet or NumPy files")
+    export_parser.add_argument("--output", default=EXPORT_DIR, help=f"Export directory (default: {EXPORT_DIR})")
+    export_parser.add_argument("--format", dest="export_format", choices=[FORMAT_PARQUET, FORMAT_NPZ],
+                               help="File format (default: parquet if pyarrow is installed, else npz)")
+    export_parser.add_argument("--full", action="store_true",
+                               help="Export all rows and reset the watermarks instead of only new rows")
+    export_parser.add_argument("--chunk-size", type=int, help="Rows read and written per batch")
+    
+    return parser.parse_args()
+
 def main():
     """Main analytics display."""
+    args = parse_args()
     try:
-        display_analytics()
-        display_recent_feedback()
+        if args.command == "search":
+            display_search_results(" ".join(args.query), args.content_type, args.user_action, args.limit)
+            return
+        if args.command == "trends":
+            display_trends(args.content_type, args.metric, args.weeks, args.window)
+            return
+        if args.command == "export":
+            run_export(args.output, args.export_format, args.full, args.chunk_size)
+            return
+        
+        snapshot = MemoryManager().get_dashboard_snapshot()
+        display_analytics(snapshot)
+        display_recent_feedback(snapshot)
         
         print(f"\n[TIP] The more you use ContentAgent and provide feedback,")
         print(f"   the smarter it becomes at matching your preferences!")
@@ -7,11 +7,11 @@ import os
 import sys
 
 # Import config first to ensure environment is set up
-from src.config import INPUT_DIR
+from src.config import INPUT_DIR, VALID_EXTENSIONS
 
 # Create a sample article if none exist
 md_files = os.listdir(INPUT_DIR)
-if not any(f.endswith('.md') or f.endswith('.docx') for f in md_files):
+if not any(os.path.splitext(f)[1].lower() in VALID_EXTENSIONS for f in md_files):
     print("Creating sample article in input directory...")
     with open(os.path.join(INPUT_DIR, "sample_article.md"), "w", encoding="utf-8") as f:
         f.write("# Sample Article\n\nThis is a sample article created by ContentAgent.")
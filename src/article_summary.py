@@ -9,12 +9,13 @@ import logging
 import os
 import glob
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-from src.config import OPENAI_MODEL, OUTPUT_DIR, get_api_key
+from src.config import OUTPUT_DIR
+from src.llm_resilience import create_chat_model, invoke_with_resilience
+from src.style_profile import PROFILE_INSTRUCTIONS
 from colorama import Fore, Style
 
 logger = logging.getLogger(__name__)
@@ -22,25 +23,25 @@ logger = logging.getLogger(__name__)
 class ArticleSummaryGenerator:
     """Generates factual, objective summaries of articles."""
     
-    def __init__(self, samples_dir: str = "data/samples", memory_manager=None):
+    def __init__(self, samples_dir: str = "data/samples", memory_manager=None, style_profiler=None):
         """
         Initialize the article summary generator.
         
         Args:
             samples_dir: Directory containing writing samples and instructions
+            style_profiler: Optional StyleProfiler whose profile replaces the raw samples and instructions
         """
         # Set samples directories
         self.samples_dir = samples_dir
         self.post_samples_dir = os.path.join(samples_dir, "sample_posts")
         self.memory_manager = memory_manager
+        self.style_profiler = style_profiler
         
         # Create sample directories if they don't exist
         os.makedirs(self.post_samples_dir, exist_ok=True)
         
         # Initialize the LLM (OpenAI)
-        self.model = ChatOpenAI(
-            model=OPENAI_MODEL,
-            openai_api_key=get_api_key("OPENAI_API_KEY"),
+        self.model = create_chat_model(
             temperature=0.7  # Increased for more creative, less generic output
         )
         
@@ -164,6 +165,26 @@ REVISED POST:
             
         return formatted_samples
     
+    def load_style_guidance(self, max_samples: int = 1) -> Tuple[str, str]:
+        """
+        Load the writing instructions and samples for a summary prompt.
+        
+        With a style profiler, the distilled style profile is used in place of
+        the raw samples and instructions.
+        
+        Args:
+            max_samples: Maximum number of raw samples to include
+            
+        Returns:
+            Tuple of (style instructions, sample posts)
+        """
+        style_instructions = self.load_writing_instructions()
+        if self.style_profiler:
+            profile = self.style_profiler.get_profile("post", style_instructions, self.post_samples_dir)
+            if profile:
+                return PROFILE_INSTRUCTIONS, profile
+        return style_instructions, self.load_post_samples(max_samples)
+    
     def generate_summary(self, content: str, custom_instructions: str = "") -> str:
         """
         Generate a factual, objective summary of the article.
@@ -178,8 +199,7 @@ REVISED POST:
         logger.info("Generating article summary")
         
         # Load writing instructions and samples
-        style_instructions = self.load_writing_instructions()
-        sample_posts = self.load_post_samples(max_samples=2)
+        style_instructions, sample_posts = self.load_style_guidance(max_samples=2)
         
         # Add any custom instructions
         if custom_instructions:
@@ -192,11 +212,11 @@ REVISED POST:
                 style_instructions = f"{style_instructions}{memory_enhancements}"
         
         try:
-            result = self.summary_chain.invoke({
+            result = invoke_with_resilience(self.summary_chain, {
                 "content": content,
                 "style_instructions": style_instructions,
                 "sample_posts": sample_posts
-            })
+            }, stage="article_summary")
             return result.content
         except Exception as e:
             logger.error(f"Error generating article summary: {e}")
@@ -218,8 +238,7 @@ REVISED POST:
         logger.info("Revising article summary based on feedback")
         
         # Load writing instructions and samples
-        style_instructions = self.load_writing_instructions()
-        sample_posts = self.load_post_samples()
+        style_instructions, sample_posts = self.load_style_guidance()
         
         # Add any custom instructions
         if custom_instructions:
@@ -232,13 +251,13 @@ REVISED POST:
                 style_instructions = f"{style_instructions}{memory_enhancements}"
         
         try:
-            result = self.revision_chain.invoke({
+            result = invoke_with_resilience(self.revision_chain, {
                 "original_summary": original_summary,
                 "content": content,
                 "feedback": feedback,
                 "style_instructions": style_instructions,
                 "sample_posts": sample_posts
-            })
+            }, stage="article_summary_revision")
             return result.content
         except Exception as e:
             logger.error(f"Error revising article summary: {e}")
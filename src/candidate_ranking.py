@@ -0,0 +1,190 @@
+"""
+Candidate Ranking for ContentAgent.
+
+This module generates several candidates for a piece of content in parallel
+and ranks them locally with what the memory system has learned about the
+user: the length and readability of content they accepted (learned
+preferences, or the quality metrics of accepted content when no preference
+is confident yet), their formatting preferences, and the directions of
+their past revision requests. The best candidate is shown first and the
+others are kept for the user to switch to, instead of asking for a revision.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from src.memory_manager import FORMATTING_PREFERENCES
+from src.text_metrics import text_metrics
+
+logger = logging.getLogger(__name__)
+
+# Distances from the preferred length and readability are measured in units
+# of at least this share of the target length and this many readability points
+LENGTH_MIN_SPREAD = 0.2
+READABILITY_MIN_SPREAD = 10.0
+
+# Distances beyond this many units count as this many, so one outlier metric cannot dominate
+MAX_DISTANCE = 3.0
+
+# Confidence given to targets taken from the quality metrics of accepted content
+QUALITY_TARGET_CONFIDENCE = 0.5
+
+FORMATTING_WEIGHT = 0.5
+
+# Revision directions, with the metric they are about and the direction the user wants it to move
+REVISION_DIRECTIONS = {
+    'avoid_long_content': ('words', -1.0),
+    'avoid_short_content': ('words', 1.0),
+    'avoid_technical': ('readability', 1.0),
+    'avoid_simple': ('readability', -1.0),
+}
+
+
+def generate_candidates(generate_fn: Callable[[], str], count: int) -> List[str]:
+    """
+    Generate several candidates concurrently.
+
+    Args:
+        generate_fn: Function generating one candidate
+        count: Number of candidates to generate
+
+    Returns:
+        The candidates that were generated, in submission order
+
+    Raises:
+        The error of the first failed call, if every call failed
+    """
+    if count <= 1:
+        return [generate_fn()]
+
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="candidate") as executor:
+        futures = [executor.submit(generate_fn) for _ in range(count)]
+
+    candidates, errors = [], []
+    for future in futures:
+        try:
+            candidate = future.result()
+        except Exception as e:
+            logger.error(f"Candidate generation failed: {e}")
+            errors.append(e)
+            continue
+        if candidate and candidate not in candidates:
+            candidates.append(candidate)
+    if not candidates:
+        raise errors[0] if errors else ValueError("No candidates were generated")
+    return candidates
+
+
+class CandidateRanker:
+    """Ranks candidates for a piece of content by the user's learned preferences."""
+
+    def __init__(self, memory_manager=None):
+        """
+        Initialize the ranker.
+
+        Args:
+            memory_manager: MemoryManager providing learned preferences and quality metrics
+        """
+        self.memory_manager = memory_manager
+
+    def _targets(self, content_type: str) -> Tuple[Dict[str, Any], Dict[str, Tuple[float, float, float]]]:
+        """
+        Load the user's preferences and preferred metric values for a content type.
+
+        Returns:
+            Tuple of (all preferences, mapping of metric to (target, spread, confidence))
+        """
+        preferences = self.memory_manager.get_user_preferences(content_type, min_confidence=0.0)
+        accepted = self.memory_manager.get_quality_analysis(content_type).get('accept', {})
+
+        targets = {}
+        for metric, preference_type, quality_key in (('words', 'preferred_length', 'avg_length'),
+                                                     ('readability', 'preferred_readability', 'avg_readability')):
+            preference = preferences.get(preference_type)
+            if preference and preference.get('mean') is not None:
+                targets[metric] = (preference['mean'], preference.get('std', 0.0), preference['confidence'])
+            elif accepted.get(quality_key):
+                targets[metric] = (accepted[quality_key], 0.0, QUALITY_TARGET_CONFIDENCE)
+        return preferences, targets
+
+    def score_candidates(self, content_type: str, candidates: List[str]) -> List[float]:
+        """
+        Score candidates by how well they match the user's preferences.
+
+        Args:
+            content_type: Type of the content
+            candidates: Candidate texts
+
+        Returns:
+            Score of each candidate, higher is better (all 0 without preference data)
+        """
+        if not self.memory_manager or len(candidates) < 2:
+            return [0.0] * len(candidates)
+
+        preferences, targets = self._targets(content_type)
+        metrics = [text_metrics.analyze(candidate) for candidate in candidates]
+        scores = np.zeros(len(candidates))
+
+        # Distance from the preferred length and readability, weighted by confidence
+        for metric, (target, spread, confidence) in targets.items():
+            minimum_spread = target * LENGTH_MIN_SPREAD if metric == 'words' else READABILITY_MIN_SPREAD
+            scale = max(spread, minimum_spread, 1.0)
+            values = np.array([candidate_metrics[metric] for candidate_metrics in metrics], dtype=float)
+            scores -= confidence * np.minimum(np.abs(values - target) / scale, MAX_DISTANCE)
+
+        # Formatting the user tends to use (confidence above 0.5) or avoid (below 0.5)
+        for preference_type, detect in FORMATTING_PREFERENCES.items():
+            preference = preferences.get(preference_type)
+            if preference:
+                lean = (preference['confidence'] - 0.5) * 2
+                scores += FORMATTING_WEIGHT * lean * np.array([1.0 if detect(text) else -1.0 for text in candidates])
+
+        # Directions the user often asks revisions for favour candidates further along them
+        for direction, (metric, sign) in REVISION_DIRECTIONS.items():
+            preference = preferences.get(direction)
+            if not preference or preference['confidence'] <= 0.5:
+                continue
+            values = np.array([candidate_metrics[metric] for candidate_metrics in metrics], dtype=float)
+            spread = values.std()
+            if spread > 0:
+                lean = (preference['confidence'] - 0.5) * 2
+                scores += lean * sign * np.clip((values - values.mean()) / spread, -MAX_DISTANCE, MAX_DISTANCE)
+
+        return scores.tolist()
+
+    def rank(self, content_type: str, candidates: List[str]) -> List[str]:
+        """
+        Order candidates from best to worst match of the user's preferences.
+
+        Candidates with equal scores keep their order.
+
+        Args:
+            content_type: Type of the content
+            candidates: Candidate texts
+
+        Returns:
+            The candidates, best first
+        """
+        scores = self.score_candidates(content_type, candidates)
+        order = sorted(range(len(candidates)), key=lambda index: -scores[index])
+        if len(candidates) > 1:
+            logger.info(f"Ranked {len(candidates)} {content_type} candidates, scores: "
+                        f"{', '.join(f'{scores[index]:.2f}' for index in order)}")
+        return [candidates[index] for index in order]
+
+    def generate(self, content_type: str, generate_fn: Callable[[], str], count: int) -> List[str]:
+        """
+        Generate candidates concurrently and rank them.
+
+        Args:
+            content_type: Type of the content
+            generate_fn: Function generating one candidate
+            count: Number of candidates to generate
+
+        Returns:
+            The distinct candidates that were generated, best first
+        """
+        return self.rank(content_type, generate_candidates(generate_fn, count))
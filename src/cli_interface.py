@@ -137,10 +137,10 @@ class CLIInterface:
         print(f"\n{Fore.CYAN}What content would you like to generate?{Style.RESET_ALL}")
         
         options = {
-            "twitter_thread": self._get_yes_no("Generate Twitter Thread?", default=True),
-            "article_summary": self._get_yes_no("Generate Article Summary?", default=False),
-            "detailed_posts": self._get_yes_no("Generate Detailed Posts?", default=False),
-            "image_prompts": self._get_yes_no("Generate Image Prompts?", default=False),
+            "twitter_thread": self.confirm("Generate Twitter Thread?", default=True),
+            "article_summary": self.confirm("Generate Article Summary?", default=False),
+            "detailed_posts": self.confirm("Generate Detailed Posts?", default=False),
+            "image_prompts": self.confirm("Generate Image Prompts?", default=False),
         }
         
         # Print selected options
@@ -153,7 +153,7 @@ class CLIInterface:
         
         return options
     
-    def _get_yes_no(self, prompt: str, default: bool = True) -> bool:
+    def confirm(self, prompt: str, default: bool = True) -> bool:
         """
         Ask a yes/no question and return a boolean.
         
@@ -174,7 +174,7 @@ class CLIInterface:
     
     def get_user_feedback(self, thread_path: str, content_type: str = "content", 
                          content_text: str = "", original_prompt: str = "", 
-                         generation_time: float = None) -> tuple:
+                         generation_time: float = None, alternatives: int = 0) -> tuple:
         """
         Get user feedback on generated content.
         
@@ -184,19 +184,26 @@ class CLIInterface:
             content_text: The actual generated content text
             original_prompt: The prompt used to generate the content
             generation_time: Time taken to generate the content in seconds
+            alternatives: Number of other generated candidates the user can switch to
             
         Returns:
-            Tuple of (feedback_type, feedback_content)
+            Tuple of (feedback_type, feedback_content); feedback_type is "next"
+            when the user asks to see the next candidate
         """
         print(f"\n{Fore.CYAN}Generated content saved to: {thread_path}{Style.RESET_ALL}")
+        self._warn_near_duplicates(content_type, content_text)
         print(f"\n{Fore.CYAN}What would you like to do with this content?{Style.RESET_ALL}")
         print("1. Accept as is")
         print("2. Edit manually")
         print("3. Request revision (provide feedback)")
+        max_choice = 3
+        if alternatives:
+            print(f"4. Show next candidate ({alternatives} other{'s' if alternatives > 1 else ''} generated)")
+            max_choice = 4
         
         while True:
             try:
-                choice = input(f"{Fore.GREEN}Enter your choice (1-3) [1]: {Style.RESET_ALL}")
+                choice = input(f"{Fore.GREEN}Enter your choice (1-{max_choice}) [1]: {Style.RESET_ALL}")
                 
                 if not choice:
                     # Default to accept
@@ -236,11 +243,31 @@ class CLIInterface:
                         return ("revise", feedback)
                     else:
                         print(f"{Fore.RED}No feedback provided. Please try again.{Style.RESET_ALL}")
+                elif option == 4 and alternatives:
+                    # Switch to another candidate; nothing is recorded since no candidate was judged yet
+                    return ("next", "")
                 else:
-                    print(f"{Fore.RED}Invalid choice. Please enter a number between 1 and 3.{Style.RESET_ALL}")
+                    print(f"{Fore.RED}Invalid choice. Please enter a number between 1 and {max_choice}.{Style.RESET_ALL}")
             except ValueError:
                 print(f"{Fore.RED}Please enter a valid number.{Style.RESET_ALL}")
     
+    def _warn_near_duplicates(self, content_type: str, content_text: str):
+        """
+        Warn when content nearly repeats something the user accepted before.
+        
+        Args:
+            content_type: Type of content generated
+            content_text: The generated content
+        """
+        if not self.memory_manager or not content_text:
+            return
+        
+        for match in self.memory_manager.find_near_duplicates(content_type, content_text):
+            accepted_on = match['timestamp'][:10]
+            preview = " ".join(match['content_text'].split())[:80]
+            print(f"{Fore.YELLOW}Warning: this is {match['similarity']:.0%} similar to content accepted on "
+                  f"{accepted_on}: \"{preview}...\"{Style.RESET_ALL}")
+    
     def _open_file_in_editor(self, file_path: str):
         """
         Open a file in the user's default editor.
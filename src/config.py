@@ -49,6 +49,36 @@ if not OPENAI_API_KEY:
 DEFAULT_OPENAI_MODEL = "gpt-4.1-mini-2025-04-14"  # User requested 'mini' variant
 OPENAI_MODEL = DEFAULT_OPENAI_MODEL  # Export as the standard model name
 
+# LLM resilience settings (timeouts in seconds)
+LLM_REQUEST_TIMEOUT = 120
+LLM_DEFAULT_STAGE_DEADLINE = 300
+LLM_STAGE_DEADLINES = {
+    "key_findings": 180,
+    "twitter_thread": 360,
+    "twitter_thread_revision": 360,
+    "article_summary": 300,
+    "article_summary_revision": 300,
+    "detailed_post": 300,
+    "detailed_post_batch": 600,
+    "detailed_post_revision": 300,
+    "image_prompts": 120,
+    "formatting": 120,
+    "style_profile": 180,
+}
+LLM_MAX_RETRIES = 3
+LLM_BACKOFF_BASE = 1.0
+LLM_BACKOFF_MAX = 30.0
+LLM_CIRCUIT_FAILURE_THRESHOLD = 5
+LLM_CIRCUIT_RESET_SECONDS = 60
+LLM_HEDGED_REQUESTS_ENABLED = False
+LLM_HEDGE_MIN_SAMPLES = 20
+
+# Client-side rate limits shared by all generators
+LLM_REQUESTS_PER_MINUTE = 500
+LLM_TOKENS_PER_MINUTE = 200000
+LLM_MAX_CONCURRENT_REQUESTS = 8
+LLM_EXPECTED_OUTPUT_TOKENS = 2000
+
 # File paths
 INPUT_DIR = os.path.join("data", "input")
 OUTPUT_DIR = os.path.join("data", "output")
@@ -58,10 +88,98 @@ MEMORY_DIR = os.path.join("data", "memory")
 # Valid file extensions for articles
 VALID_EXTENSIONS = [".txt", ".md", ".docx", ".pdf"]
 
+# Text and Markdown inputs are memory-mapped and decoded one section at a time;
+# sections longer than this many bytes are split at paragraph breaks
+STREAM_SECTION_MAX_BYTES = 64 * 1024
+
+# PDF pages are extracted by a process pool once a document has this many pages;
+# running headers and footers are detected on the first PDF_MARGIN_SAMPLE_PAGES pages
+PDF_EXTRACT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PARALLEL_MIN_PAGES = 16
+PDF_MARGIN_SAMPLE_PAGES = 8
+
+# Parsed documents kept in memory, keyed by file hash
+DOCUMENT_CACHE_SIZE = 16
+
 # Memory system settings
 MEMORY_DATABASE_PATH = os.path.join(MEMORY_DIR, "content_agent_memory.db")
 MEMORY_MAX_RECORDS = 2000
 MEMORY_ENABLED = True
+MEMORY_WAL_ENABLED = True  # Write-ahead logging: readers never block, writers queue for the lock
+MEMORY_BUSY_TIMEOUT = 30  # Seconds a writer waits for another process's lock before failing
+
+# Learned preferences: evidence fades with this half-life, and confidence is the posterior
+# mean of a Beta prior worth PREFERENCE_PRIOR_STRENGTH events at PREFERENCE_PRIOR_CONFIDENCE
+PREFERENCE_HALF_LIFE_DAYS = 30
+PREFERENCE_PRIOR_CONFIDENCE = 0.3
+PREFERENCE_PRIOR_STRENGTH = 4
+
+# The cached dashboard snapshot is rebuilt after this many seconds even without writes,
+# so decayed preference confidences never go stale
+DASHBOARD_SNAPSHOT_MAX_AGE = 3600
+
+# Columnar export of memory data (python memory_analytics.py export)
+EXPORT_DIR = os.path.join("data", "exports")
+EXPORT_CHUNK_SIZE = 5000  # Rows read and written per batch
+
+# Near-duplicate detection (MinHash signatures of accepted content, banded for LSH lookups)
+NEAR_DUPLICATE_THRESHOLD = 0.8  # Estimated Jaccard similarity of word shingles
+MINHASH_NUM_PERM = 128
+MINHASH_BANDS = 32
+
+# Speculative revision settings (pre-generate likely revisions while the user reviews)
+SPECULATIVE_REVISIONS_ENABLED = False
+SPECULATIVE_MAX_DIRECTIONS = 2
+
+# Targeted revisions rewrite only the tweets or paragraphs the feedback is about
+# (python run_agent.py --full-revisions rewrites the whole thread or post instead)
+TARGETED_REVISIONS_ENABLED = True
+
+# Extractive compression shortens long articles locally before key findings, image prompts
+# and per-argument posts (threads and summaries always see the full article)
+EXTRACTIVE_COMPRESSION_ENABLED = False
+EXTRACTIVE_TARGET_TOKENS = 4000
+TEXTRANK_MAX_SENTENCES = 2000  # Longer articles are ranked by similarity to their centroid instead
+
+# Detailed posts get only the article sections that support their argument, plus a short synopsis,
+# once the article is longer than ARGUMENT_CONTEXT_MAX_TOKENS (python run_agent.py --full-article-posts to disable)
+ARGUMENT_EXCERPTS_ENABLED = True
+ARGUMENT_CONTEXT_MAX_TOKENS = 3000
+ARTICLE_SYNOPSIS_TOKENS = 300
+
+# Style profiles replace raw writing samples and instruction files in prompts
+# (python run_agent.py --style-profile); they are rebuilt when the samples change
+STYLE_PROFILE_ENABLED = False
+STYLE_PROFILE_DIR = os.path.join(MEMORY_DIR, "style_profiles")
+STYLE_PROFILE_MAX_WORDS = 350
+
+# Candidates generated per thread, summary and detailed post, ranked locally by learned preferences
+# (python run_agent.py --candidates K); the others can be switched to during review
+CANDIDATE_COUNT = 1
+
+# Readability settings: the local rule-based pass rewrites wording and sentence breaks, so it is
+# off by default to keep the voice of the writing samples (python run_agent.py --readability-pass);
+# the LLM is an opt-in fallback on top of it
+READABILITY_PASS_ENABLED = False
+READABILITY_MAX_SENTENCE_WORDS = 25
+READABILITY_LLM_FALLBACK = False
+
+# Image prompts are generated concurrently, one request per content item; None sends every
+# request at once and leaves the throttling to the shared rate limiter
+IMAGE_PROMPT_MAX_WORKERS = None
+
+# Local HTTP service settings (python run_agent.py --serve)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_MAX_CONCURRENT_JOBS = 2
+SERVICE_MAX_FINISHED_JOBS = 200
+
+# Persistent job queue settings (python run_agent.py --enqueue / --workers)
+JOB_QUEUE_DATABASE_PATH = os.path.join(MEMORY_DIR, "job_queue.db")
+JOB_VISIBILITY_TIMEOUT = 900  # Seconds before an unfinished claimed job can be claimed again
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30
+JOB_POLL_INTERVAL = 2.0
 
 # Create required directories
 for directory in [INPUT_DIR, OUTPUT_DIR, SAMPLES_DIR, MEMORY_DIR]:
@@ -81,7 +199,47 @@ class Config:
         self.memory_database_path = MEMORY_DATABASE_PATH
         self.memory_max_records = MEMORY_MAX_RECORDS
         self.memory_enabled = MEMORY_ENABLED
+        self.memory_wal_enabled = MEMORY_WAL_ENABLED
+        self.memory_busy_timeout = MEMORY_BUSY_TIMEOUT
+        self.preference_half_life_days = PREFERENCE_HALF_LIFE_DAYS
+        self.preference_prior_confidence = PREFERENCE_PRIOR_CONFIDENCE
+        self.preference_prior_strength = PREFERENCE_PRIOR_STRENGTH
+        self.dashboard_snapshot_max_age = DASHBOARD_SNAPSHOT_MAX_AGE
         self.valid_extensions = VALID_EXTENSIONS
+        self.stream_section_max_bytes = STREAM_SECTION_MAX_BYTES
+        self.pdf_extract_max_workers = PDF_EXTRACT_MAX_WORKERS
+        self.pdf_parallel_min_pages = PDF_PARALLEL_MIN_PAGES
+        self.document_cache_size = DOCUMENT_CACHE_SIZE
+        self.export_dir = EXPORT_DIR
+        self.export_chunk_size = EXPORT_CHUNK_SIZE
+        self.near_duplicate_threshold = NEAR_DUPLICATE_THRESHOLD
+        self.speculative_revisions_enabled = SPECULATIVE_REVISIONS_ENABLED
+        self.speculative_max_directions = SPECULATIVE_MAX_DIRECTIONS
+        self.targeted_revisions_enabled = TARGETED_REVISIONS_ENABLED
+        self.extractive_compression_enabled = EXTRACTIVE_COMPRESSION_ENABLED
+        self.extractive_target_tokens = EXTRACTIVE_TARGET_TOKENS
+        self.argument_excerpts_enabled = ARGUMENT_EXCERPTS_ENABLED
+        self.argument_context_max_tokens = ARGUMENT_CONTEXT_MAX_TOKENS
+        self.style_profile_enabled = STYLE_PROFILE_ENABLED
+        self.style_profile_dir = STYLE_PROFILE_DIR
+        self.candidate_count = CANDIDATE_COUNT
+        self.readability_pass_enabled = READABILITY_PASS_ENABLED
+        self.readability_max_sentence_words = READABILITY_MAX_SENTENCE_WORDS
+        self.readability_llm_fallback = READABILITY_LLM_FALLBACK
+        self.image_prompt_max_workers = IMAGE_PROMPT_MAX_WORKERS
+        self.service_host = SERVICE_HOST
+        self.service_port = SERVICE_PORT
+        self.service_max_concurrent_jobs = SERVICE_MAX_CONCURRENT_JOBS
+        self.job_queue_database_path = JOB_QUEUE_DATABASE_PATH
+        self.job_visibility_timeout = JOB_VISIBILITY_TIMEOUT
+        self.job_max_attempts = JOB_MAX_ATTEMPTS
+        self.llm_request_timeout = LLM_REQUEST_TIMEOUT
+        self.llm_stage_deadlines = LLM_STAGE_DEADLINES
+        self.llm_max_retries = LLM_MAX_RETRIES
+        self.llm_hedged_requests_enabled = LLM_HEDGED_REQUESTS_ENABLED
+        self.llm_requests_per_minute = LLM_REQUESTS_PER_MINUTE
+        self.llm_tokens_per_minute = LLM_TOKENS_PER_MINUTE
+        self.llm_max_concurrent_requests = LLM_MAX_CONCURRENT_REQUESTS
 
 def get_api_key(key_name: str) -> str:
     """
@@ -10,9 +10,10 @@ import re
 from typing import Dict, List, Any
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-from src.config import OPENAI_MODEL, get_api_key
+from src.config import READABILITY_LLM_FALLBACK
+from src.llm_resilience import create_chat_model, invoke_with_resilience
+from src.readability import improve_readability as improve_readability_locally
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +22,7 @@ class ContentFormatter:
     
     def __init__(self):
         """Initialize the content formatter."""
-        self.model = ChatOpenAI(
-            model=OPENAI_MODEL,
-            openai_api_key=get_api_key("OPENAI_API_KEY"),
+        self.model = create_chat_model(
             temperature=0.3
         )
         
@@ -62,11 +61,11 @@ class ContentFormatter:
         logger.info(f"Formatting content for {platform}")
         
         try:
-            result = self.format_chain.invoke({
+            result = invoke_with_resilience(self.format_chain, {
                 "content": content,
                 "platform": platform,
                 "style_preferences": style_preferences
-            })
+            }, stage="formatting")
             return result.content
         except Exception as e:
             logger.error(f"Error formatting content: {e}")
@@ -99,61 +98,48 @@ class ContentFormatter:
         emoji_chain = emoji_prompt | self.model
         
         try:
-            result = emoji_chain.invoke({
+            result = invoke_with_resilience(emoji_chain, {
                 "content": content,
                 "frequency": frequency
-            })
+            }, stage="formatting")
             return result.content
         except Exception as e:
             logger.error(f"Error adding emojis: {e}")
             return content  # Return original content if emoji addition fails
     
-    def improve_readability(self, content: str) -> str:
+    def improve_readability(self, content: str, llm_fallback: bool = READABILITY_LLM_FALLBACK) -> str:
         """
         Improve the readability of the content.
         
         Args:
             content: The content to improve
+            llm_fallback: Ask the LLM to simplify text that still has many long
+                words after the local pass
             
         Returns:
             Content with improved readability
         """
-        # Basic readability improvements
-        improved = content
-        
-        # Break up very long paragraphs (more than 6 sentences)
-        paragraphs = improved.split("\n\n")
-        result_paragraphs = []
-        
-        for para in paragraphs:
-            sentences = re.split(r'(?<=[.!?])\s+', para)
-            if len(sentences) > 6:
-                # Split into smaller paragraphs of 3-4 sentences
-                new_paras = []
-                for i in range(0, len(sentences), 4):
-                    new_paras.append(" ".join(sentences[i:i+4]))
-                result_paragraphs.extend(new_paras)
-            else:
-                result_paragraphs.append(para)
-        
-        improved = "\n\n".join(result_paragraphs)
-        
-        # Replace very long words with simpler alternatives using LLM
-        if len(re.findall(r'\b\w{15,}\b', improved)) > 3:
-            simplify_prompt = ChatPromptTemplate.from_template("""
-            Improve this text by replacing overly complex words with simpler alternatives.
-            Focus on clarity and readability without changing the meaning.
-            
-            Text:
-            {text}
-            """)
-            
-            simplify_chain = simplify_prompt | self.model
-            
-            try:
-                result = simplify_chain.invoke({"text": improved})
-                improved = result.content
-            except Exception as e:
-                logger.error(f"Error simplifying text: {e}")
+        # Simplify wording, split long sentences and reflow paragraphs locally
+        improved = improve_readability_locally(content)
+        
+        if not llm_fallback or len(re.findall(r'\b\w{15,}\b', improved)) <= 3:
+            return improved
+        
+        # Replace remaining very long words with simpler alternatives using LLM
+        simplify_prompt = ChatPromptTemplate.from_template("""
+        Improve this text by replacing overly complex words with simpler alternatives.
+        Focus on clarity and readability without changing the meaning.
+        
+        Text:
+        {text}
+        """)
+        
+        simplify_chain = simplify_prompt | self.model
+        
+        try:
+            result = invoke_with_resilience(simplify_chain, {"text": improved}, stage="formatting")
+            improved = result.content
+        except Exception as e:
+            logger.error(f"Error simplifying text: {e}")
         
-        return improved 
\ No newline at end of file
+        return improved
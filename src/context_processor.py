@@ -8,12 +8,14 @@ that provide supplementary information for generating better content.
 import os
 import glob
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 from docx import Document
 from colorama import Fore, Style
 
 from src.config import VALID_EXTENSIONS
+from src.pdf_extractor import iter_pdf_sections
+from src.section_stream import file_digest, iter_buffer_sections, iter_file_sections
 
 logger = logging.getLogger(__name__)
 
@@ -44,15 +46,46 @@ class ContextProcessor:
         context_files = []
         
         # Find files with supported extensions
-        for ext in [".txt", ".md", ".docx"]:
+        for ext in [".txt", ".md", ".docx", ".pdf"]:
             context_files.extend(glob.glob(os.path.join(self.context_dir, f"*{ext}")))
         
         return sorted(context_files)
     
+    def iter_context_sections(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the normalized sections of all context files.
+        
+        Text and Markdown files are memory-mapped and decoded one section at a
+        time, so consumers that chunk or index the sections as they arrive
+        never hold a whole text file. DOCX files are extracted in full first.
+        
+        Returns:
+            Iterator of section dictionaries ('title', 'text', and 'offset'/'size' or 'page')
+            with the 'file' name each section came from
+        """
+        for file_path in self.get_available_context_files():
+            for section in self._iter_file_sections(file_path):
+                section["file"] = os.path.basename(file_path)
+                yield section
+    
+    def _iter_file_sections(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield the sections of one context file."""
+        file_ext = os.path.splitext(file_path)[1].lower()
+        if file_ext == ".docx":
+            return iter_buffer_sections(self._extract_docx_content(file_path).encode("utf-8"))
+        if file_ext == ".pdf":
+            return iter_pdf_sections(file_path)
+        return iter_file_sections(file_path)
+    
     def process_context_files(self) -> Dict[str, Any]:
         """
         Load and process all available context files.
         
+        Files are read section by section, without building a string per file,
+        but the sections are collected and joined into one combined string, so
+        peak memory is about twice the combined size. Use
+        iter_context_sections() to process the context without holding it all.
+        
         Returns:
             Dictionary with combined context content and metadata
         """
@@ -63,41 +96,46 @@ class ContextProcessor:
             print(f"{Fore.YELLOW}No additional context files found in {self.context_dir}{Style.RESET_ALL}")
             return {"content": "", "files": [], "has_context": False}
         
-        # Process each file
-        context_contents = []
+        # Pieces of the combined content, joined once at the end
+        context_parts = []
         processed_files = []
         
         for file_path in context_files:
             file_name = os.path.basename(file_path)
-            file_ext = os.path.splitext(file_path)[1].lower()
             
             try:
-                # Process different file types
-                if file_ext == ".docx":
-                    content = self._extract_docx_content(file_path)
-                else:  # .txt or .md
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
+                # Format content with file name as header
+                file_parts = [f"--- CONTEXT DOCUMENT: {file_name} ---\n\n"]
+                section_count = 0
+                for section in self._iter_file_sections(file_path):
+                    if section_count:
+                        file_parts.append("\n\n")
+                    file_parts.append(section["text"])
+                    section_count += 1
+                file_parts.append("\n\n")
                 
-                # Add file metadata
+                if context_parts:
+                    context_parts.append("\n")
+                context_parts.extend(file_parts)
+                
+                # Add file metadata; the hash identifies the file without its content
+                digest = file_digest(file_path)
                 processed_files.append({
                     "path": file_path,
                     "name": file_name,
-                    "size": os.path.getsize(file_path)
+                    "size": digest["size"],
+                    "sha256": digest["sha256"],
+                    "sections": section_count
                 })
                 
-                # Format content with file name as header
-                formatted_content = f"--- CONTEXT DOCUMENT: {file_name} ---\n\n{content}\n\n"
-                context_contents.append(formatted_content)
-                
-                logger.info(f"Processed context file: {file_name}")
+                logger.info(f"Processed context file: {file_name} ({section_count} sections)")
             
             except Exception as e:
                 logger.error(f"Error processing context file {file_name}: {e}")
                 print(f"{Fore.RED}Error processing context file {file_name}: {e}{Style.RESET_ALL}")
         
         # Combine all context content
-        combined_content = "\n".join(context_contents)
+        combined_content = "".join(context_parts)
         
         if combined_content:
             print(f"{Fore.GREEN}Loaded {len(processed_files)} additional context files{Style.RESET_ALL}")
@@ -12,35 +12,36 @@ import logging
 from typing import Dict, List, Tuple, Optional, Any, Union
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from colorama import Fore, Style
 
-from src.config import OPENAI_MODEL, get_api_key
+from src.llm_resilience import create_chat_model, invoke_with_resilience
+from src.targeted_revision import TargetedReviser, PARAGRAPH_SEPARATOR
+from src.style_profile import PROFILE_INSTRUCTIONS
 
 logger = logging.getLogger(__name__)
 
 class DetailedPostGenerator:
     """Generates substantive, long-form social media posts from key arguments."""
     
-    def __init__(self, samples_dir: str = "data/samples", memory_manager=None):
+    def __init__(self, samples_dir: str = "data/samples", memory_manager=None, style_profiler=None):
         """
         Initialize the detailed post generator.
         
         Args:
             samples_dir: Directory containing writing samples and instructions
+            style_profiler: Optional StyleProfiler whose profile replaces the raw samples and instructions
         """
         # Set samples directories
         self.samples_dir = samples_dir
         self.post_samples_dir = os.path.join(samples_dir, "sample_posts")
         self.memory_manager = memory_manager
+        self.style_profiler = style_profiler
         
         # Create sample directories if they don't exist
         os.makedirs(self.post_samples_dir, exist_ok=True)
         
         # Initialize the LLM (OpenAI)
-        self.model = ChatOpenAI(
-            model=OPENAI_MODEL,
-            openai_api_key=get_api_key("OPENAI_API_KEY"),
+        self.model = create_chat_model(
             temperature=0.7  # Increased for more creative, less generic output
         )
         
@@ -136,6 +137,9 @@ REVISED POST:
         
         self.revision_chain = self.revision_prompt | self.model
         
+        # Rewrites only the paragraphs that revision feedback is about
+        self.targeted_reviser = TargetedReviser(self.model, "detailed social media post", "paragraph", PARAGRAPH_SEPARATOR)
+        
     def load_writing_instructions(self) -> str:
         """
         Load writing instructions for detailed posts.
@@ -202,6 +206,26 @@ REVISED POST:
             
         return formatted_samples
     
+    def load_style_guidance(self, max_samples: int = 2) -> Tuple[str, str]:
+        """
+        Load the writing instructions and samples for a detailed post prompt.
+        
+        With a style profiler, the distilled style profile is used in place of
+        the raw samples and instructions.
+        
+        Args:
+            max_samples: Maximum number of raw samples to include
+            
+        Returns:
+            Tuple of (style instructions, sample posts)
+        """
+        style_instructions = self.load_writing_instructions()
+        if self.style_profiler:
+            profile = self.style_profiler.get_profile("post", style_instructions, self.post_samples_dir)
+            if profile:
+                return PROFILE_INSTRUCTIONS, profile
+        return style_instructions, self.load_post_samples(max_samples)
+    
     def _prepare_additional_context_instructions(self, additional_context: Optional[Dict[str, Any]] = None) -> str:
         """
         Prepare instructions for incorporating additional context.
@@ -269,8 +293,7 @@ REVISED POST:
             The generated detailed post
         """
         logger.info(f"Generating detailed post for argument: {argument[:30]}...")
-        style_instructions = self.load_writing_instructions()
-        sample_posts = self.load_post_samples()
+        style_instructions, sample_posts = self.load_style_guidance()
         if custom_instructions:
             style_instructions = f"{style_instructions}\n\nAdditional instructions: {custom_instructions}"
         
@@ -282,13 +305,13 @@ REVISED POST:
         
         additional_context_instructions = self._prepare_additional_context_instructions(additional_context)
         try:
-            result = self.detailed_post_chain.invoke({
+            result = invoke_with_resilience(self.detailed_post_chain, {
                 "argument": argument,
                 "context": context,
                 "style_instructions": style_instructions,
                 "sample_posts": sample_posts,
                 "additional_context_instructions": additional_context_instructions
-            })
+            }, stage="detailed_post")
             clean_result = self._clean_output(result.content)
             return clean_result
         except Exception as e:
@@ -315,8 +338,7 @@ REVISED POST:
             Dictionary mapping arguments to their generated posts
         """
         logger.info(f"Generating detailed posts for {len(arguments)} arguments")
-        style_instructions = self.load_writing_instructions()
-        sample_posts = self.load_post_samples()
+        style_instructions, sample_posts = self.load_style_guidance()
         if custom_instructions:
             style_instructions = f"{style_instructions}\n\nAdditional instructions: {custom_instructions}"
         additional_context_instructions = self._prepare_additional_context_instructions(additional_context)
@@ -335,13 +357,13 @@ REVISED POST:
         # For larger batches, use a batch processing approach
         try:
             arguments_text = "\n\n".join([f"- {arg}" for arg in arguments])
-            result = self.post_batch_chain.invoke({
+            result = invoke_with_resilience(self.post_batch_chain, {
                 "arguments": arguments_text,
                 "context": context,
                 "style_instructions": style_instructions,
                 "sample_posts": sample_posts,
                 "additional_context_instructions": additional_context_instructions
-            })
+            }, stage="detailed_post_batch")
             # Parse the batch result into individual posts
             return self._parse_batch_posts(result.content, arguments)
         except Exception as e:
@@ -408,7 +430,8 @@ REVISED POST:
         context: str, 
         feedback: str,
         custom_instructions: str = "",
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Dict[str, Any]] = None,
+        targeted: bool = False
     ) -> str:
         """
         Revise a detailed post based on user feedback.
@@ -420,13 +443,14 @@ REVISED POST:
             feedback: User feedback for revision
             custom_instructions: Custom style instructions
             additional_context: Optional additional context documents
+            targeted: Rewrite only the paragraphs the feedback is about,
+                falling back to rewriting the whole post if that fails
             
         Returns:
             The revised post
         """
         logger.info(f"Revising post for argument: {argument[:30]}...")
-        style_instructions = self.load_writing_instructions()
-        sample_posts = self.load_post_samples(max_samples=1)
+        style_instructions, sample_posts = self.load_style_guidance(max_samples=1)
         if custom_instructions:
             style_instructions = f"{style_instructions}\n\nAdditional instructions: {custom_instructions}"
         
@@ -438,7 +462,15 @@ REVISED POST:
         
         additional_context_instructions = self._prepare_additional_context_instructions(additional_context)
         try:
-            result = self.revision_chain.invoke({
+            if targeted:
+                revised_post = self.targeted_reviser.revise(
+                    original_post, feedback, f"{context}\n\n{additional_context_instructions}",
+                    style_instructions, stage="detailed_post_revision"
+                )
+                if revised_post is not None:
+                    return self._clean_output(revised_post)
+            
+            result = invoke_with_resilience(self.revision_chain, {
                 "original_post": original_post,
                 "argument": argument,
                 "context": context,
@@ -446,7 +478,7 @@ REVISED POST:
                 "style_instructions": style_instructions,
                 "sample_posts": sample_posts,
                 "additional_context_instructions": additional_context_instructions
-            })
+            }, stage="detailed_post_revision")
             clean_result = self._clean_output(result.content)
             return clean_result
         except Exception as e:
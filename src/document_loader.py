@@ -1,22 +1,37 @@
 """
 Document loader for the ContentAgent system.
-Handles loading and parsing of Markdown and DOCX files.
+Handles loading and parsing of Markdown, plain text, DOCX and PDF files.
 """
 import os
 import datetime
-from typing import Dict, List, Optional, Union
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.config import DOCUMENT_CACHE_SIZE
+from src.pdf_extractor import iter_pdf_sections
+from src.section_stream import file_digest, iter_buffer_sections, iter_file_sections, join_sections
+
+SUPPORTED_FORMATS = ['.md', '.txt', '.docx', '.pdf']
 
 class DocumentProcessor:
     """
     Handles loading and processing documents for the ContentAgent system.
-    Currently supports Markdown and DOCX files.
+    Supports Markdown, plain text, DOCX and PDF files.
     """
     
-    def __init__(self):
-        """Initialize the document processor."""
-        pass
+    def __init__(self, cache_size: int = DOCUMENT_CACHE_SIZE):
+        """
+        Initialize the document processor.
+        
+        Args:
+            cache_size: Number of parsed documents kept in memory, keyed by file hash
+        """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
-    def process_document(self, file_path: str) -> Dict[str, str]:
+    def process_document(self, file_path: str) -> Dict[str, Any]:
         """
         Load and process a document as a single entity without chunking.
         
@@ -34,13 +49,18 @@ class DocumentProcessor:
         file_extension = os.path.splitext(file_path)[1].lower()
         file_title = os.path.splitext(file_name)[0].replace('_', ' ').title()
         
-        # Process based on file type
-        if file_extension == '.md':
-            content = self._load_markdown(file_path)
-        elif file_extension == '.docx':
-            content = self._load_docx(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: .md, .docx")
+        if file_extension not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported file format: {file_extension}. "
+                             f"Supported formats: {', '.join(SUPPORTED_FORMATS)}")
+        
+        # Hashed from a memory map, without another copy of the file
+        digest = file_digest(file_path)
+        
+        # Documents are only parsed again when their bytes change
+        content = self._get_cached(digest["sha256"], file_extension)
+        if content is None:
+            content = self._load_content(file_path, file_extension)
+            self._put_cached(digest["sha256"], file_extension, content)
         
         # Extract title from content if available
         article_title = self._extract_title(content) or file_title
@@ -53,13 +73,74 @@ class DocumentProcessor:
             "title": article_title,
             "file_path": file_path,
             "file_name": file_name,
-            "processed_at": timestamp
+            "processed_at": timestamp,
+            "sha256": digest["sha256"],
+            "size": digest["size"]
         }
     
+    def iter_sections(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the normalized sections of a document.
+        
+        Markdown and text files are memory-mapped and decoded one section at
+        a time, and PDF pages are yielded as soon as they are extracted, so
+        chunking and retrieval can consume large documents without loading
+        them whole.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Returns:
+            Iterator of section dictionaries with 'title' and 'text', plus the
+            byte 'offset' and 'size' of text sections or the 'page' of PDF sections
+        """
+        file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension in ('.md', '.txt'):
+            return iter_file_sections(file_path)
+        if file_extension == '.docx':
+            return iter_buffer_sections(self._load_docx(file_path).encode("utf-8"))
+        if file_extension == '.pdf':
+            return iter_pdf_sections(file_path)
+        raise ValueError(f"Unsupported file format: {file_extension}. "
+                         f"Supported formats: {', '.join(SUPPORTED_FORMATS)}")
+    
+    def _load_content(self, file_path: str, file_extension: str) -> str:
+        """Parse a document into its text."""
+        if file_extension == '.md':
+            return self._load_markdown(file_path)
+        if file_extension == '.txt':
+            return self._load_text(file_path)
+        if file_extension == '.pdf':
+            return self._load_pdf(file_path)
+        return self._load_docx(file_path)
+    
+    def _get_cached(self, file_hash: str, file_extension: str) -> Optional[str]:
+        """Get previously parsed content of a file, if it is cached."""
+        key = (file_hash, file_extension)
+        with self._cache_lock:
+            content = self._cache.get(key)
+            if content is not None:
+                self._cache.move_to_end(key)
+            return content
+    
+    def _put_cached(self, file_hash: str, file_extension: str, content: str):
+        """Cache the parsed content of a file, evicting the least recently used."""
+        with self._cache_lock:
+            self._cache[(file_hash, file_extension)] = content
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
     def _load_markdown(self, file_path: str) -> str:
-        """Load content from a Markdown file."""
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        """Load content from a Markdown file, normalized section by section."""
+        return join_sections(iter_file_sections(file_path))
+    
+    def _load_text(self, file_path: str) -> str:
+        """Load content from a plain text file, normalized section by section."""
+        return join_sections(iter_file_sections(file_path))
+    
+    def _load_pdf(self, file_path: str) -> str:
+        """Load content from a PDF file, page by page without running headers and footers."""
+        return join_sections(iter_pdf_sections(file_path))
     
     def _load_docx(self, file_path: str) -> str:
         """Load content from a DOCX file."""
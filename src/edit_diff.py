@@ -0,0 +1,379 @@
+"""
+Edit Diff Engine for ContentAgent.
+
+This module compares original and user-edited content in two levels: first
+segment by segment (lines, split at each sentence end), then word by word
+inside the changed segments only. Both levels split the sequences at
+elements that occur exactly once on each side (as in patience/histogram
+diff), recursively inside each gap, and run Myers' O(ND) algorithm over the
+short gaps left between them, so typical edits are analyzed in close to
+linear time. The edited text's vocabulary is derived from the original's
+word counts and the diff, so unchanged text is only tokenized once.
+
+Texts shorter than SHORT_TEXT_CHARS (single posts) skip the positional diff
+and compare word counts, which is cheaper than any diff at that size.
+"""
+
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Maximal runs of word characters, the same tokens as r'\b\w+\b' but faster to match
+WORD_PATTERN = re.compile(r'\w+')
+
+# Text is diffed in segments first: lines, split further at sentence-ending punctuation.
+# Breaks are never word characters, so no token spans two segments.
+SEGMENT_BREAK = re.compile(r'[.!?\n]\s*')
+
+# Below this combined length, texts are compared by word counts: diffing a
+# single post costs more than the whole count-based analysis
+SHORT_TEXT_CHARS = 4000
+
+# Gaps between anchors are split at their own unique elements this many times at most
+MAX_ANCHOR_DEPTH = 4
+
+# Beyond this many edits inside one gap, the gap is treated as fully rewritten
+MAX_DIFF_EDITS = 2000
+
+
+def _common_affix_lengths(a: Sequence, b: Sequence) -> Tuple[int, int]:
+    """Get the lengths of the common prefix and suffix of two sequences."""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    return prefix, suffix
+
+
+def _myers_edits(a: Sequence, b: Sequence, max_edits: int) -> Optional[List[Tuple[str, int]]]:
+    """
+    Compute a shortest edit script between two sequences.
+
+    Args:
+        a: Original elements
+        b: Edited elements
+        max_edits: Give up once more edits than this are needed
+
+    Returns:
+        List of ('-', index in a) deletions and ('+', index in b) insertions in
+        document order, or None if the sequences differ by more than max_edits
+    """
+    n, m = len(a), len(b)
+    max_d = min(n + m, max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        # Keep the furthest-reaching x of each diagonal from the previous round
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+
+            if x >= n and y >= m:
+                return _backtrack(n, m, trace, d)
+
+    return None
+
+
+def _backtrack(n: int, m: int, trace: List[List[int]], final_d: int) -> List[Tuple[str, int]]:
+    """Walk the recorded diagonals back from the end to recover the edit script."""
+    edits = []
+    x, y = n, m
+
+    for d in range(final_d, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1 + d] < v[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d]
+        prev_y = prev_x - prev_k
+
+        # Skip the diagonal (matching) run that followed the edit
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+
+        if x == prev_x:
+            edits.append(('+', prev_y))
+        else:
+            edits.append(('-', prev_x))
+        x, y = prev_x, prev_y
+
+    edits.reverse()
+    return edits
+
+
+def _unique_anchors(a: Sequence, b: Sequence) -> List[Tuple[int, int]]:
+    """
+    Find matching positions of elements that occur exactly once in each sequence.
+
+    Returns the longest chain of such matches that is increasing in both
+    sequences (patience sorting), which splits the diff into independent gaps.
+    """
+    b_counts = Counter(b)
+    unique = {element for element, count in Counter(a).items()
+              if count == 1 and b_counts.get(element) == 1}
+    if not unique:
+        return []
+
+    b_positions = {element: j for j, element in enumerate(b) if element in unique}
+    candidates = [(i, b_positions[element]) for i, element in enumerate(a) if element in unique]
+
+    # Longest increasing subsequence of b positions, O(n log n)
+    tails = []
+    tail_index = []
+    previous = [-1] * len(candidates)
+    for index, (_, j) in enumerate(candidates):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pos] = j
+            tail_index[pos] = index
+        previous[index] = tail_index[pos - 1] if pos > 0 else -1
+
+    chain = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        chain.append(candidates[index])
+        index = previous[index]
+    chain.reverse()
+    return chain
+
+
+def _diff_single(a: Sequence, b: Sequence, a_offset: int, b_offset: int,
+                 deleted: List[int], inserted: List[int]):
+    """Diff two sequences of which at least one has exactly one element, without Myers."""
+    if len(a) == 1:
+        try:
+            match = b.index(a[0])
+        except ValueError:
+            deleted.append(a_offset)
+            inserted.extend(range(b_offset, b_offset + len(b)))
+            return
+        inserted.extend(j for j in range(b_offset, b_offset + len(b)) if j != b_offset + match)
+        return
+
+    try:
+        match = a.index(b[0])
+    except ValueError:
+        deleted.extend(range(a_offset, a_offset + len(a)))
+        inserted.append(b_offset)
+        return
+    deleted.extend(i for i in range(a_offset, a_offset + len(a)) if i != a_offset + match)
+
+
+def _diff_region(a: Sequence, b: Sequence, a_offset: int, b_offset: int, max_edits: int,
+                 deleted: List[int], inserted: List[int], depth: int = 0):
+    """
+    Diff one region, appending changed indices to the output lists.
+
+    The region's common prefix and suffix are stripped, then it is split at
+    elements unique on both sides within the region. Words that repeat across
+    a whole post are often unique inside one gap, so gaps are split again
+    (up to MAX_ANCHOR_DEPTH levels) before Myers runs on what is left.
+    """
+    prefix, suffix = _common_affix_lengths(a, b)
+    a_end = len(a) - suffix
+    b_end = len(b) - suffix
+    if prefix == a_end or prefix == b_end:
+        deleted.extend(range(a_offset + prefix, a_offset + a_end))
+        inserted.extend(range(b_offset + prefix, b_offset + b_end))
+        return
+
+    # A single remaining element on one side (typically one replaced or
+    # inserted word) either matches once in the other side or not at all
+    if a_end - prefix == 1 or b_end - prefix == 1:
+        _diff_single(a[prefix:a_end], b[prefix:b_end], a_offset + prefix, b_offset + prefix, deleted, inserted)
+        return
+
+    a_mid = a[prefix:a_end]
+    b_mid = b[prefix:b_end]
+    a_offset += prefix
+    b_offset += prefix
+
+    anchors = _unique_anchors(a_mid, b_mid) if depth < MAX_ANCHOR_DEPTH else []
+    if anchors:
+        a_start = b_start = 0
+        for i, j in anchors + [(len(a_mid), len(b_mid))]:
+            # Most gaps between consecutive anchors are empty
+            if i > a_start and j > b_start:
+                _diff_region(a_mid[a_start:i], b_mid[b_start:j], a_offset + a_start, b_offset + b_start,
+                             max_edits, deleted, inserted, depth + 1)
+            else:
+                deleted.extend(range(a_offset + a_start, a_offset + i))
+                inserted.extend(range(b_offset + b_start, b_offset + j))
+            a_start, b_start = i + 1, j + 1
+        return
+
+    edits = _myers_edits(a_mid, b_mid, max_edits)
+    if edits is None:
+        deleted.extend(range(a_offset, a_offset + len(a_mid)))
+        inserted.extend(range(b_offset, b_offset + len(b_mid)))
+        return
+
+    for op, index in edits:
+        if op == '-':
+            deleted.append(a_offset + index)
+        else:
+            inserted.append(b_offset + index)
+
+
+def diff_indices(a: Sequence, b: Sequence, max_edits: int = MAX_DIFF_EDITS) -> Tuple[List[int], List[int]]:
+    """
+    Diff two sequences.
+
+    The sequences are split at unique anchor elements, recursively inside
+    each gap, and each remaining gap is diffed after stripping its common
+    prefix and suffix, so Myers only ever runs over small changed regions.
+
+    Args:
+        a: Original elements
+        b: Edited elements
+        max_edits: Edit budget per gap before falling back to a full replacement
+
+    Returns:
+        Tuple of (indices deleted from a, indices inserted from b), ascending
+    """
+    deleted, inserted = [], []
+    _diff_region(a, b, 0, 0, max_edits, deleted, inserted)
+    return deleted, inserted
+
+
+def diff_tokens(a: List[str], b: List[str], max_edits: int = MAX_DIFF_EDITS) -> Tuple[List[str], List[str]]:
+    """
+    Diff two token lists.
+
+    Args:
+        a: Original tokens
+        b: Edited tokens
+        max_edits: Edit budget per gap before falling back to a full replacement
+
+    Returns:
+        Tuple of (deleted tokens, inserted tokens) in document order
+    """
+    deleted, inserted = diff_indices(a, b, max_edits)
+    return [a[i] for i in deleted], [b[j] for j in inserted]
+
+
+def _tokens(text: str) -> List[str]:
+    """Get the lowercased word tokens used for vocabulary analysis."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def _unique(tokens: List[str]) -> List[str]:
+    """Deduplicate tokens while keeping their first-seen order."""
+    return list(dict.fromkeys(tokens))
+
+
+def _net_changes(tokens: List[str], counts: Counter, other_counts: Counter, differing: set) -> List[str]:
+    """Get the occurrences of tokens beyond their count in the other text, in document order."""
+    surplus = {token: counts[token] - other_counts[token] for token in differing
+               if counts[token] > other_counts[token]}
+    candidates = [token for token in tokens if token in surplus]
+    if all(surplus[token] == counts[token] for token in surplus):
+        # Typically the edit removed every occurrence of each changed word
+        return candidates
+    changes = []
+    for token in candidates:
+        if surplus[token] > 0:
+            changes.append(token)
+            surplus[token] -= 1
+    return changes
+
+
+def _word_changes(original: str, edited: str) -> Tuple[List[str], List[str], Counter, Counter]:
+    """
+    Get the words deleted and inserted by an edit, and the word counts of both texts.
+
+    Returns:
+        Tuple of (deleted tokens, inserted tokens, original counts, edited counts)
+    """
+    if len(original) + len(edited) < SHORT_TEXT_CHARS:
+        # Short texts: the net change in word counts, without a positional diff
+        original_tokens = _tokens(original)
+        edited_tokens = _tokens(edited)
+        original_counts = Counter(original_tokens)
+        edited_counts = Counter(edited_tokens)
+        differing = {token for token, _ in set(original_counts.items()) ^ set(edited_counts.items())}
+        return (_net_changes(original_tokens, original_counts, edited_counts, differing),
+                _net_changes(edited_tokens, edited_counts, original_counts, differing),
+                original_counts, edited_counts)
+
+    original_segments = SEGMENT_BREAK.split(original)
+    edited_segments = SEGMENT_BREAK.split(edited)
+
+    # Words never span a segment break, so a word diff of the changed segments
+    # is the word diff of the whole text; single-paragraph posts only pay for
+    # the words of the sentences that were edited
+    deleted_segments, inserted_segments = diff_indices(original_segments, edited_segments)
+    changed_tokens = _tokens('\n'.join(original_segments[i] for i in deleted_segments))
+    deleted, inserted = diff_tokens(
+        changed_tokens,
+        _tokens('\n'.join(edited_segments[j] for j in inserted_segments))
+    )
+
+    # Each original segment is tokenized once: the changed ones above, the rest here
+    original_counts = Counter(changed_tokens)
+    if len(deleted_segments) < len(original_segments):
+        changed = set(deleted_segments)
+        original_counts.update(_tokens('\n'.join(
+            segment for i, segment in enumerate(original_segments) if i not in changed
+        )))
+    edited_counts = original_counts.copy()
+    edited_counts.subtract(deleted)
+    edited_counts.update(inserted)
+    return deleted, inserted, original_counts, edited_counts
+
+
+def analyze_edit(original: str, edited: str) -> Dict[str, Any]:
+    """
+    Compare original and edited content and compute edit pattern features.
+
+    Args:
+        original: The generated content
+        edited: The content after the user's manual edits
+
+    Returns:
+        Dictionary with whether anything changed, word counts, formatting
+        changes, the words deleted and inserted by the edit (for texts shorter
+        than SHORT_TEXT_CHARS, the net change in word counts), and the
+        vocabulary added or removed by the edit
+    """
+    deleted, inserted, original_counts, edited_counts = _word_changes(original, edited)
+
+    original_words = len(original.split())
+    edited_words = len(edited.split())
+
+    return {
+        'changed': original != edited,
+        'original_words': original_words,
+        'edited_words': edited_words,
+        'word_diff': edited_words - original_words,
+        'added_bold': '**' in edited and '**' not in original,
+        'paragraph_structure_changed': original.count('\n') != edited.count('\n'),
+        'added_bullets': '•' in edited and '•' not in original,
+        'deleted_tokens': deleted,
+        'inserted_tokens': inserted,
+        # A word is new vocabulary only if the edit inserted it and it was not already used
+        'added_vocabulary': [token for token in _unique(inserted) if original_counts[token] == 0],
+        'removed_vocabulary': [token for token in _unique(deleted) if edited_counts[token] <= 0],
+    }
@@ -0,0 +1,313 @@
+"""
+Extractive Compression for ContentAgent.
+
+This module shortens long articles locally, before they are sent to the
+model, by keeping only their most central sentences. Sentences are split
+with NLTK's Punkt tokenizer when its data is installed (a rule-based
+splitter otherwise), turned into hashed TF-IDF vectors and ranked with
+TextRank: PageRank over the sentence similarity graph. Very long articles
+fall back to scoring each sentence against the article's centroid, which is
+linear instead of quadratic in the number of sentences.
+
+Headings are always kept and the selected sentences stay in their original
+order and paragraphs, so the result still reads as the article. Results are
+cached by article hash, so each article is compressed once.
+"""
+
+import logging
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import EXTRACTIVE_TARGET_TOKENS, TEXTRANK_MAX_SENTENCES
+from src.text_metrics import content_hash
+
+try:
+    import nltk
+except ImportError:  # Optional: the rule-based sentence splitter is used instead
+    nltk = None
+
+logger = logging.getLogger(__name__)
+
+# Same rough rule as the rate limiter's token estimates
+CHARS_PER_TOKEN = 4
+
+# Sentence vectors are hashed into this many dimensions
+VECTOR_DIMENSIONS = 2048
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 100
+TEXTRANK_TOLERANCE = 1e-6
+
+# Maximum number of compressed articles kept in memory
+COMPRESSION_CACHE_SIZE = 32
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'-]*")
+_HEADING_PATTERN = re.compile(r'^#{1,6}\s')
+_LIST_ITEM_PATTERN = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+# Sentence ends: . ! or ? (plus closing quotes/brackets), whitespace, then an uppercase letter, digit or quote
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])["\')\]]*\s+(?=["\'(\[]?[A-Z0-9])')
+_ABBREVIATION_END = re.compile(r'\b(?:[A-Z]|Mr|Mrs|Ms|Dr|Prof|Sr|Jr|St|vs|etc|e\.g|i\.e|U\.S|Inc|Ltd|Co|No|Fig)\.$')
+
+_punkt_available: Optional[bool] = None
+
+
+def _split_with_rules(text: str) -> List[str]:
+    """Split text into sentences at punctuation, without breaking after common abbreviations."""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_BREAK.finditer(text):
+        candidate = text[start:match.start()].rstrip()
+        if _ABBREVIATION_END.search(candidate):
+            continue
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    sentences.append(text[start:].strip())
+    return [sentence for sentence in sentences if sentence]
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split prose into sentences.
+
+    Uses NLTK's Punkt tokenizer when its data is installed, otherwise a
+    rule-based splitter.
+
+    Args:
+        text: Prose text
+
+    Returns:
+        List of sentences
+    """
+    global _punkt_available
+    if nltk is not None and _punkt_available is not False:
+        try:
+            sentences = nltk.sent_tokenize(text)
+            _punkt_available = True
+            return sentences
+        except LookupError:
+            logger.info("NLTK Punkt data not installed; using rule-based sentence splitting")
+            _punkt_available = False
+    return _split_with_rules(text)
+
+
+def _parse_units(text: str) -> Tuple[List[Tuple[str, int, str]], List[str]]:
+    """
+    Break an article into units: headings, list items and sentences.
+
+    Returns:
+        Tuple of (units, paragraph joiners); each unit is (kind, paragraph
+        index, text) with kind 'heading' or 'text', and joiners[i] is the
+        string that joins the kept units of paragraph i
+    """
+    units = []
+    joiners = []
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        lines = [line.strip() for line in paragraph.split('\n') if line.strip()]
+        if not lines:
+            continue
+        index = len(joiners)
+        if all(_HEADING_PATTERN.match(line) or _LIST_ITEM_PATTERN.match(line) for line in lines):
+            joiners.append("\n")
+            for line in lines:
+                units.append(('heading' if _HEADING_PATTERN.match(line) else 'text', index, line))
+            continue
+        # A heading directly above its first paragraph gets its own line
+        if _HEADING_PATTERN.match(lines[0]):
+            units.append(('heading', index, lines[0]))
+            joiners.append("\n")
+            lines = lines[1:]
+            index = len(joiners)
+        joiners.append(" ")
+        for sentence in split_sentences(" ".join(lines)):
+            units.append(('text', index, sentence))
+    return units, joiners
+
+
+def term_counts(texts: List[str]) -> np.ndarray:
+    """
+    Count the non-stopword terms of texts, hashing words into VECTOR_DIMENSIONS columns.
+
+    Args:
+        texts: Sentences or other short texts
+
+    Returns:
+        Matrix with one row of term counts per text
+    """
+    columns: Dict[str, int] = {}
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if word in STOPWORDS:
+                continue
+            column = columns.get(word)
+            if column is None:
+                # crc32 rather than hash(): stable across processes, so results are reproducible
+                column = columns[word] = zlib.crc32(word.encode('utf-8')) % VECTOR_DIMENSIONS
+            rows.append(row)
+            cols.append(column)
+
+    counts = np.zeros((len(texts), VECTOR_DIMENSIONS), dtype=np.float32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    return counts
+
+
+def inverse_document_frequency(counts: np.ndarray) -> np.ndarray:
+    """Get the smoothed inverse document frequency of each column of a term count matrix."""
+    document_frequency = np.count_nonzero(counts, axis=0)
+    return (np.log((1 + len(counts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows as they are."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _tfidf_vectors(sentences: List[str]) -> np.ndarray:
+    """Build L2-normalized TF-IDF vectors of sentences."""
+    counts = term_counts(sentences)
+    return normalize_rows(counts * inverse_document_frequency(counts))
+
+
+def textrank_scores(vectors: np.ndarray) -> np.ndarray:
+    """
+    Rank sentences with PageRank over their cosine similarity graph.
+
+    Args:
+        vectors: L2-normalized sentence vectors
+
+    Returns:
+        Score of each sentence (the scores sum to 1)
+    """
+    count = len(vectors)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    weights = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no words with others link to every sentence equally
+    transition = np.divide(similarity, weights, out=np.full_like(similarity, 1.0 / count), where=weights > 0)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / count + TEXTRANK_DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def centroid_scores(vectors: np.ndarray) -> np.ndarray:
+    """Score sentences by their cosine similarity to the centroid of all sentences."""
+    centroid = vectors.sum(axis=0)
+    norm = np.linalg.norm(centroid)
+    return vectors @ (centroid / norm) if norm > 0 else np.zeros(len(vectors))
+
+
+def compress_text(text: str, target_tokens: int = EXTRACTIVE_TARGET_TOKENS) -> str:
+    """
+    Shorten a text to about a token budget by keeping its most central sentences.
+
+    Texts already within the budget are returned unchanged.
+
+    Args:
+        text: Article or other Markdown/prose text
+        target_tokens: Approximate token budget of the result
+
+    Returns:
+        The compressed text
+    """
+    budget = target_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget:
+        return text
+
+    units, joiners = _parse_units(text)
+    sentence_indices = [index for index, (kind, _, _) in enumerate(units) if kind == 'text']
+    if not sentence_indices:
+        return text[:budget]
+
+    vectors = _tfidf_vectors([units[index][2] for index in sentence_indices])
+    if len(sentence_indices) <= TEXTRANK_MAX_SENTENCES:
+        scores = textrank_scores(vectors)
+    else:
+        scores = centroid_scores(vectors)
+
+    # Headings are always kept; sentences are added by rank while they fit.
+    # Each unit is charged for the longest joiner ("\n\n") that may follow it.
+    keep = {index for index, (kind, _, _) in enumerate(units) if kind == 'heading'}
+    used = sum(len(units[index][2]) + 2 for index in keep)
+    seen = set()
+    for position in np.argsort(-scores, kind='stable'):
+        index = sentence_indices[position]
+        sentence = units[index][2]
+        # Repeated boilerplate ranks high but adds nothing the second time
+        if sentence in seen or used + len(sentence) + 2 > budget:
+            continue
+        keep.add(index)
+        seen.add(sentence)
+        used += len(sentence) + 2
+
+    paragraphs: Dict[int, List[str]] = OrderedDict()
+    for index, (_, paragraph, unit_text) in enumerate(units):
+        if index in keep:
+            paragraphs.setdefault(paragraph, []).append(unit_text)
+    compressed = "\n\n".join(joiners[paragraph].join(kept) for paragraph, kept in paragraphs.items())
+
+    logger.info(f"Compressed text from ~{len(text) // CHARS_PER_TOKEN} to ~{len(compressed) // CHARS_PER_TOKEN} tokens "
+                f"({len(seen)} of {len(sentence_indices)} sentences kept)")
+    return compressed
+
+
+class ArticleCompressor:
+    """Compresses articles once and caches the result by article hash."""
+
+    def __init__(self, target_tokens: int = EXTRACTIVE_TARGET_TOKENS, max_size: int = COMPRESSION_CACHE_SIZE):
+        """
+        Initialize the compressor.
+
+        Args:
+            target_tokens: Approximate token budget of compressed articles
+            max_size: Maximum number of compressed articles to keep, least recently used are evicted
+        """
+        self.target_tokens = target_tokens
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compress(self, article: str) -> str:
+        """
+        Get the compressed version of an article, computing it only on first use.
+
+        Args:
+            article: Full article text
+
+        Returns:
+            The article shortened to about target_tokens tokens
+        """
+        key = (content_hash(article), self.target_tokens)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        compressed = compress_text(article, self.target_tokens)
+
+        with self._lock:
+            self._cache[key] = compressed
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return compressed
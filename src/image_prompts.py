@@ -7,23 +7,34 @@ These prompts describe visuals that would complement the article content.
 
 import logging
 import os
-from typing import Dict, List, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional, Tuple
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-from src.config import OPENAI_MODEL, OUTPUT_DIR, SAMPLES_DIR, get_api_key
+from src.config import OUTPUT_DIR, SAMPLES_DIR, IMAGE_PROMPT_MAX_WORKERS, EXTRACTIVE_COMPRESSION_ENABLED
+from src.extractive_summary import compress_text
+from src.llm_resilience import create_chat_model, invoke_with_resilience
 
 logger = logging.getLogger(__name__)
 
+# Longer content is cut to about this many tokens before it is sent to the model
+IMAGE_PROMPT_CONTENT_TOKENS = 500
+
 class ImagePromptGenerator:
     """Generates text prompts for AI image generation tools."""
     
-    def __init__(self):
-        """Initialize the image prompt generator."""
-        self.model = ChatOpenAI(
-            model=OPENAI_MODEL,
-            openai_api_key=get_api_key("OPENAI_API_KEY"),
+    def __init__(self, compress_content: bool = EXTRACTIVE_COMPRESSION_ENABLED):
+        """
+        Initialize the image prompt generator.
+        
+        Args:
+            compress_content: Shorten long content to its most central sentences
+                instead of keeping only its beginning
+        """
+        self.compress_content = compress_content
+        self.model = create_chat_model(
             temperature=0.7
         )
         
@@ -69,6 +80,9 @@ class ImagePromptGenerator:
         """)
         
         self.image_prompt_chain = self.image_prompt_template | self.model
+        
+        # Serializes appends to the prompts file from concurrent workers
+        self._file_lock = threading.Lock()
     
     def _load_style_instructions(self) -> str:
         """
@@ -105,53 +119,163 @@ class ImagePromptGenerator:
         """
         logger.info(f"Generating image prompt for {content_type}: {content_title}")
         
-        # For longer content, use just the first portion to focus the prompt
-        content_excerpt = content[:2000] if len(content) > 2000 else content
+        # For longer content, use just the first portion (or its key sentences) to focus the prompt
+        if self.compress_content:
+            content_excerpt = compress_text(content, IMAGE_PROMPT_CONTENT_TOKENS)
+        else:
+            content_excerpt = content[:2000] if len(content) > 2000 else content
         
         try:
-            result = self.image_prompt_chain.invoke({
+            result = invoke_with_resilience(self.image_prompt_chain, {
                 "content": content_excerpt,
                 "content_type": content_type,
                 "content_title": content_title,
                 "style_instructions": self.style_instructions
-            })
+            }, stage="image_prompts")
             return result.content
         except Exception as e:
             logger.error(f"Error generating image prompt: {e}")
             raise
     
-    def generate_content_specific_prompts(self, content_items: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    def _expand_content_items(self, content_items: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str, str, str]]:
+        """
+        Flatten content items into one prompt request per piece of content.
+        
+        Detailed posts are stored as a mapping of argument to post, so each
+        post gets its own prompt. List content such as key arguments is
+        joined into a single text.
+        
+        Args:
+            content_items: Dictionary of content items with their metadata
+            
+        Returns:
+            List of (prompt key, content type, content, title) tuples
+        """
+        requests = []
+        
+        for content_type, item in content_items.items():
+            content = item.get("content")
+            if not content:
+                continue
+            
+            if isinstance(content, dict):
+                item_type = content_type[:-1] if content_type.endswith("s") else content_type
+                for index, (title, text) in enumerate(content.items(), 1):
+                    if text:
+                        requests.append((f"{item_type}_{index}", item_type, text, title))
+            elif isinstance(content, list):
+                text = "\n".join(f"- {entry}" for entry in content)
+                requests.append((content_type, content_type, text, item.get("title", "Untitled")))
+            else:
+                requests.append((content_type, content_type, content, item.get("title", "Untitled")))
+        
+        return requests
+    
+    def generate_content_specific_prompts(self, content_items: Dict[str, Dict[str, Any]],
+                                          on_prompt: Optional[Callable[[str, str, str], None]] = None,
+                                          max_workers: Optional[int] = IMAGE_PROMPT_MAX_WORKERS) -> Dict[str, str]:
         """
-        Generate one image prompt for each piece of content.
+        Generate one image prompt for each piece of content, concurrently.
         
         Args:
             content_items: Dictionary of content items with their metadata
                 Format: {
                     "content_type": {
-                        "content": str,
+                        "content": str | list | dict,
                         "title": str,
                         "file_path": str
                     }
                 }
+            on_prompt: Optional callback receiving (prompt key, title, prompt)
+                in content order, as soon as the prompt and all prompts
+                before it have completed
+            max_workers: Maximum number of prompts generated at the same time
+                (None generates all of them at once)
             
         Returns:
-            Dictionary of content types and their corresponding image prompts
+            Dictionary of prompt keys and their corresponding image prompts,
+            in content order. Detailed posts are keyed per post.
         """
-        prompts = {}
+        requests = self._expand_content_items(content_items)
+        if not requests:
+            return {}
         
-        for content_type, item in content_items.items():
-            if not item.get("content"):
-                continue
+        results = {}
+        finished = [False] * len(requests)
+        next_index = 0
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers or len(requests), len(requests)),
+                                thread_name_prefix="image_prompt") as executor:
+            futures = {
+                executor.submit(self.generate_image_prompt, content, content_type, title): index
+                for index, (key, content_type, content, title) in enumerate(requests)
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                key = requests[index][0]
+                finished[index] = True
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.error(f"Skipping image prompt for {key}: {e}")
                 
-            prompt = self.generate_image_prompt(
-                item["content"], 
-                content_type, 
-                item.get("title", "Untitled")
-            )
+                # Report completed prompts in content order, holding back any
+                # that finished before an earlier one
+                while next_index < len(requests) and finished[next_index]:
+                    key, _, _, title = requests[next_index]
+                    if on_prompt and key in results:
+                        on_prompt(key, title, results[key])
+                    next_index += 1
+        
+        return {key: results[key] for key, _, _, _ in requests if key in results}
+    
+    def _prompts_path(self, article_title: str, output_dir: Optional[str]) -> str:
+        """Get the path of the image prompts file, creating its directory."""
+        if not output_dir:
+            output_dir = os.path.join(OUTPUT_DIR, f"{article_title.replace(' ', '_')}_output")
+            
+        os.makedirs(output_dir, exist_ok=True)
+        
+        return os.path.join(output_dir, "image_prompts.md")
+    
+    def _format_section(self, key: str, prompt: str, title: Optional[str] = None) -> str:
+        """Format one prompt as a section of the image prompts file."""
+        heading = key.replace("_", " ").title()
+        if title:
+            heading = f"{heading}: {title}"
+        return f"## For {heading}\n\n{prompt}\n\n---\n\n"
+    
+    def generate_and_save_prompts(self, content_items: Dict[str, Dict[str, Any]], article_title: str,
+                                  output_dir: str = None) -> str:
+        """
+        Generate image prompts concurrently and append them to the file in content order.
+        
+        Args:
+            content_items: Dictionary of content items with their metadata
+            article_title: The title of the original article
+            output_dir: Directory to save the prompts (defaults to config OUTPUT_DIR)
             
-            prompts[content_type] = prompt
+        Returns:
+            The path to the saved file
+        """
+        output_path = self._prompts_path(article_title, output_dir)
+        
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(f"# Image Prompts: {article_title}\n\n")
+        
+        def append_prompt(key: str, title: str, prompt: str):
+            with self._file_lock:
+                with open(output_path, "a", encoding="utf-8") as f:
+                    # Individual posts are labelled with their argument
+                    label = None if key in content_items else title
+                    f.write(self._format_section(key, prompt, label))
+            logger.info(f"Image prompt for {key} appended to {output_path}")
         
-        return prompts
+        prompts = self.generate_content_specific_prompts(content_items, on_prompt=append_prompt)
+        
+        logger.info(f"{len(prompts)} image prompts saved to {output_path}")
+        return output_path
     
     def save_image_prompts(self, prompts: Dict[str, str], article_title: str, output_dir: str = None) -> str:
         """
@@ -165,21 +289,13 @@ class ImagePromptGenerator:
         Returns:
             The path to the saved file
         """
-        if not output_dir:
-            output_dir = os.path.join(OUTPUT_DIR, f"{article_title.replace(' ', '_')}_output")
-            
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "image_prompts.md")
+        output_path = self._prompts_path(article_title, output_dir)
         
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(f"# Image Prompts: {article_title}\n\n")
             
             for content_type, prompt in prompts.items():
-                formatted_type = content_type.replace("_", " ").title()
-                f.write(f"## For {formatted_type}\n\n")
-                f.write(prompt)
-                f.write("\n\n---\n\n")
+                f.write(self._format_section(content_type, prompt))
             
         logger.info(f"Image prompts saved to {output_path}")
-        return output_path 
\ No newline at end of file
+        return output_path
@@ -0,0 +1,288 @@
+"""
+Persistent Job Queue for ContentAgent.
+
+This module provides a SQLite-backed queue of article processing jobs that
+can be shared by several worker processes. Workers claim a job for a
+visibility timeout; a job whose worker dies becomes claimable again once the
+timeout expires, and failed jobs are retried until they run out of attempts.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+from src.config import JOB_QUEUE_DATABASE_PATH, JOB_VISIBILITY_TIMEOUT, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Get a percentile of a list of values, or None if it is empty."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+class JobQueue:
+    """SQLite-backed job queue with claim/complete semantics and retries."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the job queue.
+
+        Args:
+            db_path: Path of the queue database (defaults to next to the memory database)
+        """
+        self.db_path = db_path or JOB_QUEUE_DATABASE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection that waits for other processes instead of failing.
+
+        The connection is in autocommit mode, so using it as a context manager
+        neither commits nor closes it; callers close it with closing().
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        """Create the jobs table and indexes."""
+        try:
+            with closing(self._connect()) as conn:
+                # WAL lets workers read while another process claims a job
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        payload TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        attempts INTEGER DEFAULT 0,
+                        max_attempts INTEGER NOT NULL,
+                        available_at REAL NOT NULL,
+                        enqueued_at REAL NOT NULL,
+                        first_claimed_at REAL,
+                        claimed_at REAL,
+                        claimed_by TEXT,
+                        finished_at REAL,
+                        result TEXT,
+                        error TEXT
+                    )
+                ''')
+                conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_jobs_claimable
+                    ON jobs(status, available_at)
+                ''')
+        except sqlite3.Error as e:
+            logger.error(f"Job queue initialization error: {e}")
+            raise
+
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int = JOB_MAX_ATTEMPTS) -> int:
+        """
+        Add a job to the queue.
+
+        Args:
+            payload: JSON-serializable job description
+            max_attempts: Number of times the job is tried before it is marked failed
+
+        Returns:
+            ID of the new job
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute('''
+                INSERT INTO jobs (payload, status, max_attempts, available_at, enqueued_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (json.dumps(payload), JOB_QUEUED, max_attempts, now, now))
+            return cursor.lastrowid
+
+    def claim(self, worker_id: str, visibility_timeout: float = JOB_VISIBILITY_TIMEOUT) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest available job.
+
+        Queued jobs and running jobs whose visibility timeout has expired are
+        both available. Expired jobs without attempts left are marked failed.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            visibility_timeout: Seconds the job stays hidden from other workers
+
+        Returns:
+            The claimed job with its decoded payload, or None if nothing is available
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            # Take the write lock up front so two workers never claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute('''
+                UPDATE jobs
+                SET status = ?, finished_at = ?, error = COALESCE(error, 'Visibility timeout expired')
+                WHERE status = ? AND available_at <= ? AND attempts >= max_attempts
+            ''', (JOB_FAILED, now, JOB_RUNNING, now))
+
+            row = conn.execute('''
+                SELECT * FROM jobs
+                WHERE status IN (?, ?) AND available_at <= ? AND attempts < max_attempts
+                ORDER BY available_at, id
+                LIMIT 1
+            ''', (JOB_QUEUED, JOB_RUNNING, now)).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute('''
+                UPDATE jobs
+                SET status = ?, attempts = attempts + 1, available_at = ?, claimed_at = ?,
+                    claimed_by = ?, first_claimed_at = COALESCE(first_claimed_at, ?)
+                WHERE id = ?
+            ''', (JOB_RUNNING, now + visibility_timeout, now, worker_id, now, row["id"]))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            # BEGIN IMMEDIATE itself may have failed (e.g. database busy), leaving nothing to roll back
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["attempts"] += 1
+        return job
+
+    def extend(self, job_id: int, worker_id: str, visibility_timeout: float = JOB_VISIBILITY_TIMEOUT) -> bool:
+        """
+        Extend the visibility timeout of a job that is still being processed.
+
+        Args:
+            job_id: ID of the claimed job
+            worker_id: Worker holding the claim
+            visibility_timeout: Seconds from now the job stays hidden
+
+        Returns:
+            True if the worker still holds the claim
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute('''
+                UPDATE jobs SET available_at = ?
+                WHERE id = ? AND status = ? AND claimed_by = ?
+            ''', (time.time() + visibility_timeout, job_id, JOB_RUNNING, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Mark a claimed job as done.
+
+        Args:
+            job_id: ID of the claimed job
+            worker_id: Worker holding the claim
+            result: Optional JSON-serializable result
+
+        Returns:
+            True if the job was completed, False if the claim was lost
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute('''
+                UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = NULL
+                WHERE id = ? AND status = ? AND claimed_by = ?
+            ''', (JOB_DONE, time.time(), json.dumps(result), job_id, JOB_RUNNING, worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_delay: float = JOB_RETRY_DELAY) -> bool:
+        """
+        Record a failed attempt, requeueing the job if it has attempts left.
+
+        Args:
+            job_id: ID of the claimed job
+            worker_id: Worker holding the claim
+            error: Description of the failure
+            retry_delay: Seconds before a retry, doubled for every earlier attempt
+
+        Returns:
+            True if the failure was recorded, False if the claim was lost
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute('''
+                UPDATE jobs
+                SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END,
+                    available_at = ? + ? * (1 << (attempts - 1)),
+                    finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+                    error = ?
+                WHERE id = ? AND status = ? AND claimed_by = ?
+            ''', (JOB_QUEUED, JOB_FAILED, now, retry_delay, now, error, job_id, JOB_RUNNING, worker_id))
+            return cursor.rowcount == 1
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            The job with decoded payload and result, or None if it does not exist
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get_stats(self, window_seconds: float = 3600) -> Dict[str, Any]:
+        """
+        Get queue depth, throughput and latency metrics.
+
+        Args:
+            window_seconds: Time window for throughput and latency figures
+
+        Returns:
+            Dictionary with job counts by status, jobs finished per minute,
+            and p50/p95 queue latency (enqueue to first claim) and
+            processing time (last claim to finish) in seconds
+        """
+        since = time.time() - window_seconds
+        with closing(self._connect()) as conn:
+            counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED)}
+            for row in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                counts[row[0]] = row[1]
+
+            finished = conn.execute('''
+                SELECT enqueued_at, first_claimed_at, claimed_at, finished_at
+                FROM jobs WHERE status = ? AND finished_at >= ?
+            ''', (JOB_DONE, since)).fetchall()
+
+        queue_latency = [row["first_claimed_at"] - row["enqueued_at"] for row in finished]
+        processing_time = [row["finished_at"] - row["claimed_at"] for row in finished]
+        throughput = 0.0
+        if finished:
+            # Measured from the first claim to the last finish of the jobs in the window
+            busy_seconds = max(row["finished_at"] for row in finished) - min(row["first_claimed_at"] for row in finished)
+            throughput = len(finished) / max(busy_seconds / 60, 1e-9)
+
+        return {
+            "counts": counts,
+            "finished_in_window": len(finished),
+            "throughput_per_minute": throughput,
+            "queue_latency_p50": _percentile(queue_latency, 50),
+            "queue_latency_p95": _percentile(queue_latency, 95),
+            "processing_time_p50": _percentile(processing_time, 50),
+            "processing_time_p95": _percentile(processing_time, 95),
+        }
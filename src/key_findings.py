@@ -11,9 +11,9 @@ import re
 from typing import Dict, List, Any
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-from src.config import OPENAI_MODEL, OUTPUT_DIR, get_api_key
+from src.config import OUTPUT_DIR
+from src.llm_resilience import create_chat_model, invoke_with_resilience
 from colorama import Fore, Style
 
 logger = logging.getLogger(__name__)
@@ -23,9 +23,7 @@ class KeyFindingsExtractor:
     
     def __init__(self):
         """Initialize the key arguments extractor."""
-        self.model = ChatOpenAI(
-            model=OPENAI_MODEL,
-            openai_api_key=get_api_key("OPENAI_API_KEY"),
+        self.model = create_chat_model(
             temperature=0.2  # Slightly higher temperature for more interpretive ability
         )
         
@@ -65,50 +63,73 @@ class KeyFindingsExtractor:
         
         self.arguments_chain = self.arguments_prompt | self.model
     
-    def extract_findings(self, content: str) -> Dict[str, List[str]]:
+    def extract_arguments(self, content: str) -> List[str]:
         """
-        Extract key arguments from the provided content and let user confirm which to keep.
+        Extract key arguments from the provided content without user confirmation.
         
         Args:
             content: The article content to analyze
             
         Returns:
-            Dictionary with confirmed arguments
+            List of extracted arguments
         """
         logger.info("Extracting key arguments from article")
         
         try:
             print(f"{Fore.CYAN}Extracting key arguments from article...{Style.RESET_ALL}")
-            result = self.arguments_chain.invoke({"content": content})
-            arguments = self._parse_arguments(result.content)
-            
-            if arguments:
-                print(f"\n{Fore.CYAN}=== Main Arguments ==={Style.RESET_ALL}")
-                confirmed_arguments = []
-                
-                for i, argument in enumerate(arguments):
-                    print(f"\n{Fore.GREEN}{i+1}. {argument}{Style.RESET_ALL}")
-                    keep = input(f"Keep this argument for creating a post? (y/n) [y]: ")
-                    if keep.lower() != 'n':
-                        confirmed_arguments.append(argument)
-                
-                # Ask for any missing arguments
-                while True:
-                    print(f"\n{Fore.YELLOW}Add a missing argument or press Enter to continue:{Style.RESET_ALL}")
-                    new_argument = input("> ")
-                    if not new_argument:
-                        break
-                    confirmed_arguments.append(new_argument)
-                
-                return {"Main Arguments": confirmed_arguments}
-            else:
-                print(f"{Fore.RED}No arguments could be extracted from the article.{Style.RESET_ALL}")
-                return {"Main Arguments": []}
+            result = invoke_with_resilience(self.arguments_chain, {"content": content}, stage="key_findings")
+            return self._parse_arguments(result.content)
             
         except Exception as e:
             logger.error(f"Error extracting key arguments: {e}")
             raise
     
+    def confirm_arguments(self, arguments: List[str]) -> List[str]:
+        """
+        Let the user confirm which extracted arguments to keep and add missing ones.
+        
+        Args:
+            arguments: Extracted arguments
+            
+        Returns:
+            List of confirmed arguments
+        """
+        if not arguments:
+            print(f"{Fore.RED}No arguments could be extracted from the article.{Style.RESET_ALL}")
+            return []
+        
+        print(f"\n{Fore.CYAN}=== Main Arguments ==={Style.RESET_ALL}")
+        confirmed_arguments = []
+        
+        for i, argument in enumerate(arguments):
+            print(f"\n{Fore.GREEN}{i+1}. {argument}{Style.RESET_ALL}")
+            keep = input(f"Keep this argument for creating a post? (y/n) [y]: ")
+            if keep.lower() != 'n':
+                confirmed_arguments.append(argument)
+        
+        # Ask for any missing arguments
+        while True:
+            print(f"\n{Fore.YELLOW}Add a missing argument or press Enter to continue:{Style.RESET_ALL}")
+            new_argument = input("> ")
+            if not new_argument:
+                break
+            confirmed_arguments.append(new_argument)
+        
+        return confirmed_arguments
+    
+    def extract_findings(self, content: str) -> Dict[str, List[str]]:
+        """
+        Extract key arguments from the provided content and let user confirm which to keep.
+        
+        Args:
+            content: The article content to analyze
+            
+        Returns:
+            Dictionary with confirmed arguments
+        """
+        arguments = self.extract_arguments(content)
+        return {"Main Arguments": self.confirm_arguments(arguments)}
+    
     def _parse_arguments(self, arguments_text: str) -> List[str]:
         """
         Parse the raw arguments text into a list of arguments.
@@ -0,0 +1,391 @@
+"""
+LLM Resilience Layer for ContentAgent.
+
+This module wraps every LLM call made by the generators with per-attempt
+timeouts, per-stage deadlines, exponential backoff with jitter, a circuit
+breaker and optional hedged requests, so a stuck API call can never hang
+the application. Every request also passes through the shared rate limiter.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+
+import openai
+from langchain_openai import ChatOpenAI
+
+from src.config import (
+    OPENAI_MODEL, get_api_key,
+    LLM_REQUEST_TIMEOUT, LLM_STAGE_DEADLINES, LLM_DEFAULT_STAGE_DEADLINE,
+    LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX,
+    LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS,
+    LLM_HEDGED_REQUESTS_ENABLED, LLM_HEDGE_MIN_SAMPLES, LLM_EXPECTED_OUTPUT_TOKENS
+)
+from src.rate_limiter import RateLimiter, rate_limiter, priority_for_stage
+
+logger = logging.getLogger(__name__)
+
+# Errors that are worth retrying; anything else (auth, bad request) fails fast
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    TimeoutError,
+)
+
+
+def estimate_tokens(inputs: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a request will use from its prompt inputs.
+
+    Uses the rough 4 characters per token rule plus the expected completion size.
+
+    Args:
+        inputs: Inputs passed to the chain
+
+    Returns:
+        Estimated prompt plus completion tokens
+    """
+    prompt_chars = sum(len(str(value)) for value in inputs.values())
+    return prompt_chars // 4 + LLM_EXPECTED_OUTPUT_TOKENS
+
+
+def _reported_tokens(result) -> Optional[int]:
+    """Get the total tokens reported by the provider for a result, if available."""
+    usage = getattr(result, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return usage["total_tokens"]
+    return None
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker is open and calls are being rejected."""
+
+
+class StageDeadlineExceeded(TimeoutError):
+    """Raised when a stage runs out of time across all of its attempts."""
+
+
+class RateLimitWaitExceeded(StageDeadlineExceeded):
+    """Raised when a stage runs out of time waiting for local rate limit capacity, before any request was sent."""
+
+
+def create_chat_model(temperature: float, model_name: str = OPENAI_MODEL) -> ChatOpenAI:
+    """
+    Create a ChatOpenAI client with a request timeout.
+
+    Retries are disabled on the client because they are handled by the
+    resilience layer, which also enforces the overall stage deadline.
+
+    Args:
+        temperature: Sampling temperature for the model
+        model_name: OpenAI model to use
+
+    Returns:
+        Configured ChatOpenAI instance
+    """
+    return ChatOpenAI(
+        model=model_name,
+        openai_api_key=get_api_key("OPENAI_API_KEY"),
+        temperature=temperature,
+        timeout=LLM_REQUEST_TIMEOUT,
+        max_retries=0
+    )
+
+
+class CircuitBreaker:
+    """Stops sending requests after repeated failures and probes again after a cool-down."""
+
+    def __init__(self, failure_threshold: int = LLM_CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = LLM_CIRCUIT_RESET_SECONDS):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_seconds: Seconds to wait before letting a probe request through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_at = None
+        # Start time of the half-open probe, while one is in flight
+        self.probe_started_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError if calls are currently being rejected.
+
+        Returns:
+            True if the call is the half-open probe, False otherwise
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_seconds:
+                # Half-open: let one probe through while the other callers are
+                # still rejected; a probe that never reported back is replaced
+                # after another cool-down
+                if self.probe_started_at is None or now - self.probe_started_at >= self.reset_seconds:
+                    self.probe_started_at = now
+                    return True
+                raise CircuitOpenError("LLM circuit half-open, waiting for the probe request to finish")
+            remaining = self.reset_seconds - (now - self.opened_at)
+            raise CircuitOpenError(f"LLM circuit open after repeated failures, retry in {remaining:.0f}s")
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.probe_started_at = None
+
+    def record_failure(self):
+        """Count a failure and open the circuit once the threshold is reached."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.probe_started_at is not None:
+                # The probe failed: re-open for another full cool-down
+                self.opened_at = time.monotonic()
+                self.probe_started_at = None
+                logger.warning("LLM circuit re-opened after its probe request failed")
+            elif self.consecutive_failures >= self.failure_threshold and self.opened_at is None:
+                self.opened_at = time.monotonic()
+                logger.warning(f"LLM circuit opened after {self.consecutive_failures} consecutive failures")
+
+    def release_probe(self):
+        """End a probe that finished without a success or failure being recorded."""
+        with self._lock:
+            self.probe_started_at = None
+
+
+class LatencyTracker:
+    """Keeps a window of recent call latencies per stage."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the latency tracker.
+
+        Args:
+            window: Number of recent latencies to keep per stage
+        """
+        self.window = window
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        """Record the latency of a successful call."""
+        with self._lock:
+            self._latencies.setdefault(stage, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, stage: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a latency percentile for a stage.
+
+        Args:
+            stage: Stage name
+            pct: Percentile between 0 and 100
+            min_samples: Minimum number of samples required
+
+        Returns:
+            Latency in seconds, or None if there are not enough samples
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(stage, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Get the sample count and p50/p95 latency of every stage."""
+        with self._lock:
+            stages = list(self._latencies)
+        summary = {}
+        for stage in stages:
+            summary[stage] = {
+                "samples": len(self._latencies[stage]),
+                "p50": self.percentile(stage, 50),
+                "p95": self.percentile(stage, 95),
+            }
+        return summary
+
+
+class LLMResilience:
+    """Runs LLM calls with deadlines, retries, circuit breaking and optional hedging."""
+
+    def __init__(self, max_retries: int = LLM_MAX_RETRIES, hedging_enabled: bool = LLM_HEDGED_REQUESTS_ENABLED,
+                 limiter: Optional[RateLimiter] = None):
+        """
+        Initialize the resilience layer.
+
+        Args:
+            max_retries: Retries after the first attempt for retryable errors
+            hedging_enabled: Fire a second request when the first exceeds the stage's p95 latency
+            limiter: Rate limiter requests must pass through (defaults to the shared limiter)
+        """
+        self.max_retries = max_retries
+        self.hedging_enabled = hedging_enabled
+        self.limiter = limiter or rate_limiter
+        self.circuit_breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+    def stage_deadline(self, stage: str) -> float:
+        """Get the total time budget in seconds for a stage."""
+        return LLM_STAGE_DEADLINES.get(stage, LLM_DEFAULT_STAGE_DEADLINE)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry attempt."""
+        return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt)))
+
+    def _timed_call(self, runnable, inputs: Dict[str, Any], stage: str, estimated_tokens: int):
+        """Invoke the runnable, record its latency on success and release its rate limit slot."""
+        result = None
+        try:
+            start = time.monotonic()
+            result = runnable.invoke(inputs)
+            self.latency.record(stage, time.monotonic() - start)
+            return result
+        finally:
+            self.limiter.release(estimated_tokens, _reported_tokens(result))
+
+    def _submit(self, runnable, inputs: Dict[str, Any], stage: str, timeout: float):
+        """
+        Wait for rate limit capacity and start a request in the background.
+
+        Args:
+            runnable: LangChain runnable to invoke
+            inputs: Inputs passed to runnable.invoke
+            stage: Pipeline stage name
+            timeout: Maximum seconds to wait for capacity
+
+        Returns:
+            Future for the request, or None if no capacity became available in time
+        """
+        estimated_tokens = estimate_tokens(inputs)
+        if not self.limiter.acquire(estimated_tokens, priority_for_stage(stage), timeout=max(0.0, timeout)):
+            return None
+        return self._executor.submit(self._timed_call, runnable, inputs, stage, estimated_tokens)
+
+    def _run_attempt(self, runnable, inputs: Dict[str, Any], stage: str, deadline: float):
+        """
+        Run a single attempt, hedging it if enabled, bounded by the stage deadline.
+
+        Returns:
+            The result of whichever request finished successfully first
+        """
+        primary = self._submit(runnable, inputs, stage, deadline - time.monotonic())
+        if primary is None:
+            raise RateLimitWaitExceeded(f"LLM call for {stage} timed out waiting for rate limit capacity")
+        futures = [primary]
+
+        hedge_after = None
+        if self.hedging_enabled:
+            hedge_after = self.latency.percentile(stage, 95, min_samples=LLM_HEDGE_MIN_SAMPLES)
+
+        if hedge_after is not None:
+            done, _ = wait(futures, timeout=min(hedge_after, max(0.0, deadline - time.monotonic())))
+            if not done and time.monotonic() < deadline:
+                # Only hedge when capacity is free right away; never queue behind other requests
+                hedge = self._submit(runnable, inputs, stage, timeout=0)
+                if hedge is not None:
+                    logger.info(f"Hedging {stage} request after {hedge_after:.1f}s (p95 latency)")
+                    futures.append(hedge)
+
+        last_error = None
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+
+        if last_error is not None and not pending:
+            raise last_error
+        raise StageDeadlineExceeded(f"LLM call for {stage} exceeded its {self.stage_deadline(stage):.0f}s deadline")
+
+    def invoke(self, runnable, inputs: Dict[str, Any], stage: str):
+        """
+        Invoke a runnable (chain or model) with the resilience policy for a stage.
+
+        Args:
+            runnable: LangChain runnable to invoke
+            inputs: Inputs passed to runnable.invoke
+            stage: Pipeline stage name, used for deadlines and latency tracking
+
+        Returns:
+            The runnable's result
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is rejecting calls
+            StageDeadlineExceeded: If the stage ran out of time (RateLimitWaitExceeded
+                if it ran out waiting for rate limit capacity)
+        """
+        deadline = time.monotonic() + self.stage_deadline(stage)
+        attempt = 0
+
+        while True:
+            probe = self.circuit_breaker.before_call()
+            try:
+                result = self._run_attempt(runnable, inputs, stage, deadline)
+                self.circuit_breaker.record_success()
+                return result
+            except RateLimitWaitExceeded:
+                # Nothing reached the API: a local queue says nothing about its health
+                if probe:
+                    self.circuit_breaker.release_probe()
+                raise
+            except StageDeadlineExceeded:
+                self.circuit_breaker.record_failure()
+                raise
+            except RETRYABLE_ERRORS as e:
+                self.circuit_breaker.record_failure()
+                if isinstance(e, openai.RateLimitError):
+                    self.limiter.on_rate_limited()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                if time.monotonic() + delay >= deadline:
+                    raise StageDeadlineExceeded(
+                        f"LLM call for {stage} has no time left to retry after: {e}"
+                    ) from e
+                attempt += 1
+                logger.warning(f"Retrying {stage} in {delay:.1f}s (attempt {attempt + 1}) after error: {e}")
+                time.sleep(delay)
+            except Exception:
+                # Errors that say nothing about the API's health still end a probe
+                if probe:
+                    self.circuit_breaker.release_probe()
+                raise
+
+
+# Shared resilience layer used by all generators
+llm_resilience = LLMResilience()
+
+
+def invoke_with_resilience(runnable, inputs: Dict[str, Any], stage: str):
+    """
+    Invoke a runnable through the shared resilience layer.
+
+    Args:
+        runnable: LangChain runnable to invoke
+        inputs: Inputs passed to runnable.invoke
+        stage: Pipeline stage name
+
+    Returns:
+        The runnable's result
+    """
+    return llm_resilience.invoke(runnable, inputs, stage)
@@ -2,16 +2,29 @@
 Main application module for ContentAgent.
 Integrates all components and provides the main entry point.
 """
+import argparse
 import os
 import datetime
+import logging
 import re
-from typing import Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple, Callable, Optional, Union
 
 from src.document_loader import DocumentProcessor
 from src.twitter_generator import TwitterThreadGenerator
 from src.cli_interface import CLIInterface
-from src.config import INPUT_DIR, OUTPUT_DIR
+from src.config import (
+    INPUT_DIR, OUTPUT_DIR, SPECULATIVE_REVISIONS_ENABLED, TARGETED_REVISIONS_ENABLED,
+    EXTRACTIVE_COMPRESSION_ENABLED, ARGUMENT_EXCERPTS_ENABLED, STYLE_PROFILE_ENABLED, CANDIDATE_COUNT,
+    READABILITY_PASS_ENABLED,
+    SERVICE_HOST, SERVICE_PORT
+)
 from src.memory_manager import MemoryManager
+from src.speculative_revision import SpeculativeReviser, SpeculativeRevisionSet
+from src.run_checkpoint import RunCheckpoint, find_resumable_run, hash_inputs
+from src.service import serve, DEFAULT_JOB_OPTIONS
+from src.job_queue import JobQueue
+from src.queue_worker import run_worker_pool, print_queue_stats
 
 # Import Stage 2 modules
 from src.article_summary import ArticleSummaryGenerator
@@ -20,38 +33,163 @@ from src.detailed_post import DetailedPostGenerator
 from src.image_prompts import ImagePromptGenerator
 from src.content_formatter import ContentFormatter
 from src.context_processor import ContextProcessor
+from src.extractive_summary import ArticleCompressor
+from src.section_index import SectionIndexCache
+from src.style_profile import StyleProfiler
+from src.candidate_ranking import CandidateRanker
 from colorama import Fore, Style
 
+logger = logging.getLogger(__name__)
+
 class ContentAgent:
     """
     Main ContentAgent application class.
     Integrates all components and manages the workflow.
     """
     
-    def __init__(self):
+    def __init__(self, targeted_revisions: bool = TARGETED_REVISIONS_ENABLED,
+                 extractive_compression: bool = EXTRACTIVE_COMPRESSION_ENABLED,
+                 argument_excerpts: bool = ARGUMENT_EXCERPTS_ENABLED,
+                 style_profile: bool = STYLE_PROFILE_ENABLED,
+                 candidate_count: int = CANDIDATE_COUNT,
+                 readability_pass: bool = READABILITY_PASS_ENABLED):
         """
         Initialize the ContentAgent application.
+        
+        Args:
+            targeted_revisions: Revise only the tweets or paragraphs that feedback
+                is about instead of regenerating the whole thread or post
+            extractive_compression: Shorten long articles locally before key
+                argument extraction, detailed posts and image prompts
+            argument_excerpts: Give each detailed post only the article sections
+                that support its argument, plus a synopsis of the article
+            style_profile: Use a style profile distilled once from the writing
+                samples and instructions in place of the raw samples
+            candidate_count: Candidates generated per thread, summary and detailed
+                post; they are ranked by learned preferences and the best is shown first
+            readability_pass: Run the local readability rules over generated and
+                revised threads, summaries and detailed posts
         """
         print("Initializing ContentAgent...")
+        self.targeted_revisions = targeted_revisions
+        self.article_compressor = ArticleCompressor() if extractive_compression else None
+        self.section_indexes = SectionIndexCache() if argument_excerpts else None
         
         # Initialize memory manager first
         self.memory_manager = MemoryManager()
+        self.style_profiler = StyleProfiler() if style_profile else None
         
         # Stage 1 components
         self.document_processor = DocumentProcessor()
-        self.twitter_generator = TwitterThreadGenerator(memory_manager=self.memory_manager)
+        self.twitter_generator = TwitterThreadGenerator(
+            memory_manager=self.memory_manager, style_profiler=self.style_profiler
+        )
         self.cli = CLIInterface(memory_manager=self.memory_manager)
         
         # Stage 2 components
-        self.article_summary_generator = ArticleSummaryGenerator(memory_manager=self.memory_manager)
+        self.article_summary_generator = ArticleSummaryGenerator(
+            memory_manager=self.memory_manager, style_profiler=self.style_profiler
+        )
         self.key_findings_extractor = KeyFindingsExtractor()
-        self.detailed_post_generator = DetailedPostGenerator(memory_manager=self.memory_manager)
-        self.image_prompt_generator = ImagePromptGenerator()
+        self.detailed_post_generator = DetailedPostGenerator(
+            memory_manager=self.memory_manager, style_profiler=self.style_profiler
+        )
+        self.image_prompt_generator = ImagePromptGenerator(compress_content=extractive_compression)
         self.content_formatter = ContentFormatter()
         self.context_processor = ContextProcessor()
+        self.speculative_reviser = SpeculativeReviser(memory_manager=self.memory_manager)
+        self.readability_pass = readability_pass
+        self.candidate_count = max(1, candidate_count)
+        self.candidate_ranker = CandidateRanker(memory_manager=self.memory_manager)
         
         print("ContentAgent initialized.")
     
+    def _prompt_article(self, article_content: str) -> str:
+        """
+        Get the article text for prompts that do not need the full article.
+        
+        Threads and summaries always use the full article; key arguments and
+        detailed posts use its compressed version when compression is enabled.
+        The compression runs once per article and is cached.
+        """
+        if self.article_compressor is None:
+            return article_content
+        return self.article_compressor.compress(article_content)
+    
+    def _post_context(self, article_content: str, argument: str) -> str:
+        """
+        Get the article context for the detailed post about an argument.
+        
+        With argument excerpts enabled, long articles are indexed into sections
+        once and each post gets only the sections supporting its argument.
+        """
+        if self.section_indexes is None:
+            return self._prompt_article(article_content)
+        return self.section_indexes.get(article_content).context_for(argument)
+    
+    def _generate_candidates(self, content_type: str, generate_fn: Callable[[], str]) -> List[str]:
+        """
+        Generate the configured number of candidates and rank them by learned preferences.
+        
+        Args:
+            content_type: Type of content being generated
+            generate_fn: Function generating one candidate
+            
+        Returns:
+            The distinct candidates, best first
+        """
+        # Candidates are ranked as the user will see them, after the readability pass
+        candidate_fn = (lambda: self._readable(generate_fn())) if self.readability_pass else generate_fn
+        return self.candidate_ranker.generate(content_type, candidate_fn, self.candidate_count)
+    
+    def _readable(self, content: str) -> str:
+        """Apply the local readability pass to generated or revised content, if enabled."""
+        if not self.readability_pass:
+            return content
+        return self.content_formatter.improve_readability(content)
+    
+    def _start_speculation(self, content_type: str, revise_fn: Callable[[str], str]) -> Optional[SpeculativeRevisionSet]:
+        """
+        Start pre-generating likely revisions while the user reviews content.
+        
+        Args:
+            content_type: Type of content being reviewed
+            revise_fn: Function taking feedback text and returning revised content
+            
+        Returns:
+            The pending revision drafts, or None if speculation is disabled
+        """
+        if not SPECULATIVE_REVISIONS_ENABLED:
+            return None
+        return self.speculative_reviser.start(content_type, revise_fn)
+    
+    def _finish_speculation(self, speculation: Optional[SpeculativeRevisionSet], 
+                            feedback_type: str, feedback_content: str) -> Optional[str]:
+        """
+        Resolve speculative drafts once the user has given feedback.
+        
+        Args:
+            speculation: The pending revision drafts
+            feedback_type: The feedback type returned by the CLI
+            feedback_content: The revision feedback entered by the user
+            
+        Returns:
+            A pre-generated revision the user chose to use, or None
+        """
+        if not speculation:
+            return None
+        
+        revised = None
+        try:
+            direction = speculation.match(feedback_content) if feedback_type == "revise" else None
+            if direction and self.cli.confirm(
+                "A pre-generated revision matching this feedback is ready. Use it?", default=True
+            ):
+                revised = speculation.take(direction)
+        finally:
+            speculation.discard()
+        return revised
+    
     def _create_topic_based_folder_name(self, article_title: str) -> str:
         """
         Create a safe, topic-based folder name from the article title.
@@ -88,18 +226,205 @@ class ContentAgent:
         
         return final_folder_name
     
-    def run(self):
+    def _prepare_run(self, resume: Union[bool, str]) -> Optional[Tuple[str, Dict[str, bool], str, RunCheckpoint]]:
         """
-        Run the ContentAgent workflow.
+        Set up a new run, or reopen an interrupted one.
+        
+        Args:
+            resume: False for a new run, True to resume the latest unfinished
+                run, or the output folder of the run to resume
+            
+        Returns:
+            Tuple of (input file, generation options, output folder, checkpoint),
+            or None if there is nothing to run
         """
+        if resume:
+            if isinstance(resume, str):
+                checkpoint = RunCheckpoint.load(resume)
+            else:
+                checkpoint = find_resumable_run()
+            
+            if not checkpoint or not checkpoint.run_info:
+                print(f"{Fore.RED}No interrupted run found to resume.{Style.RESET_ALL}")
+                return None
+            
+            run_info = checkpoint.run_info
+            print(f"{Fore.CYAN}Resuming run in: {checkpoint.output_dir}{Style.RESET_ALL}")
+            pending = checkpoint.pending_stages()
+            if pending:
+                print(f"Unfinished stages: {', '.join(pending)}")
+            return run_info["input_file"], run_info["generate_options"], checkpoint.output_dir, checkpoint
+        
         # Get input file path from user
         input_file = self.cli.get_article_path()
         if not input_file:
             print(f"{Fore.RED}No valid input file specified. Exiting.{Style.RESET_ALL}")
-            return
+            return None
         
         # Get output options from user
         generate_options = self.cli.get_generation_options()
+        return input_file, generate_options, None, None
+    
+    def _create_output_dir(self, article_title: str) -> str:
+        """
+        Create a new topic-based output folder for a run.
+        
+        Args:
+            article_title: The title of the article
+            
+        Returns:
+            Path of the created folder
+        """
+        # Creating the folder claims its name, also against runs in other worker
+        # processes; when another run took the name first, try the next counter
+        while True:
+            output_dir = os.path.join(OUTPUT_DIR, self._create_topic_based_folder_name(article_title))
+            try:
+                os.makedirs(output_dir)
+                return output_dir
+            except FileExistsError:
+                continue
+    
+    def _report_near_duplicates(self, content_type: str, content: str, report: Callable[[str], None]):
+        """
+        Report previously accepted content that generated content nearly repeats.
+        
+        Args:
+            content_type: Type of the generated content
+            content: The generated content
+            report: Progress callback receiving the warnings
+        """
+        for match in self.memory_manager.find_near_duplicates(content_type, content):
+            report(f"Warning: {content_type} is {match['similarity']:.0%} similar to "
+                   f"feedback #{match['feedback_id']} accepted on {match['timestamp'][:10]}")
+    
+    def generate(self, article_content: str, article_title: str, generate_options: Dict[str, bool],
+                 progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Run the workflow without user interaction, accepting all generated content.
+        
+        Independent stages run concurrently: the thread, the summary and the key
+        arguments first, then one detailed post per argument, then the image
+        prompts. No feedback is recorded in memory since nothing is reviewed.
+        
+        Args:
+            article_content: The article text
+            article_title: The article title
+            generate_options: Content types to generate
+            progress: Optional callback receiving a message as each stage completes
+            
+        Returns:
+            Dictionary with the output folder and the path of each generated file
+        """
+        def report(message: str):
+            logger.info(message)
+            if progress:
+                progress(message)
+        
+        output_dir = self._create_output_dir(article_title)
+        outputs = {"output_dir": output_dir}
+        generated_content = {}
+        report(f"Output folder created: {output_dir}")
+        
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="stage") as executor:
+            thread_future = summary_future = arguments_future = None
+            if generate_options.get("twitter_thread"):
+                thread_future = executor.submit(
+                    lambda: self._generate_candidates(
+                        "twitter_thread",
+                        lambda: self.twitter_generator.generate_thread_from_document(article_content)
+                    )[0]
+                )
+            if generate_options.get("article_summary"):
+                summary_future = executor.submit(
+                    lambda: self._generate_candidates(
+                        "article_summary", lambda: self.article_summary_generator.generate_summary(article_content)
+                    )[0]
+                )
+            if generate_options.get("detailed_posts"):
+                arguments_future = executor.submit(self.key_findings_extractor.extract_arguments,
+                                                   self._prompt_article(article_content))
+            
+            if thread_future:
+                thread_content = thread_future.result()
+                outputs["twitter_thread"] = self.cli.save_thread(thread_content, output_dir=output_dir)
+                generated_content["twitter_thread"] = {
+                    "content": thread_content,
+                    "title": f"{article_title} - Social Media Thread",
+                    "file_path": outputs["twitter_thread"]
+                }
+                report("Social media thread generated")
+                self._report_near_duplicates("twitter_thread", thread_content, report)
+            
+            if summary_future:
+                summary = summary_future.result()
+                summary_result = self.article_summary_generator.save_summary(summary, article_title, output_dir)
+                outputs["article_summary"] = summary_result["file_path"]
+                generated_content["article_summary"] = {
+                    "content": summary,
+                    "title": f"{article_title} - Article Summary",
+                    "file_path": outputs["article_summary"]
+                }
+                report("Article summary generated")
+            
+            arguments = arguments_future.result() if arguments_future else []
+        
+        if arguments:
+            report(f"Extracted {len(arguments)} key arguments")
+            generated_content["key_findings"] = {
+                "content": arguments,
+                "title": f"{article_title} - Key Arguments"
+            }
+            additional_context = self.context_processor.process_context_files()
+            
+            all_posts = {}
+            outputs["detailed_posts"] = []
+            with ThreadPoolExecutor(max_workers=len(arguments), thread_name_prefix="post") as executor:
+                futures = {
+                    executor.submit(
+                        lambda argument=argument: self._generate_candidates(
+                            "detailed_post",
+                            lambda: self.detailed_post_generator.generate_post_for_argument(
+                                argument, self._post_context(article_content, argument), "", additional_context
+                            )
+                        )[0]
+                    ): argument
+                    for argument in arguments
+                }
+                for future in as_completed(futures):
+                    argument = futures[future]
+                    all_posts[argument] = future.result()
+                    outputs["detailed_posts"].append(self.detailed_post_generator.save_individual_post(
+                        argument, all_posts[argument], article_title, output_dir
+                    ))
+                    report(f"Detailed post {len(all_posts)}/{len(arguments)} generated")
+                    self._report_near_duplicates("detailed_post", all_posts[argument], report)
+            
+            generated_content["detailed_posts"] = {
+                "content": {argument: all_posts[argument] for argument in arguments},
+                "title": f"{article_title} - Detailed Posts"
+            }
+        
+        if generate_options.get("image_prompts", False) and generated_content:
+            outputs["image_prompts"] = self.image_prompt_generator.generate_and_save_prompts(
+                generated_content, article_title, output_dir
+            )
+            report("Image prompts generated")
+        
+        return outputs
+    
+    def run(self, resume: Union[bool, str] = False):
+        """
+        Run the ContentAgent workflow.
+        
+        Args:
+            resume: False for a new run, True to resume the latest unfinished
+                run, or the output folder of the run to resume
+        """
+        prepared = self._prepare_run(resume)
+        if not prepared:
+            return
+        input_file, generate_options, output_dir, checkpoint = prepared
         
         # Load document
         print(f"Processing document: {os.path.basename(input_file)}")
@@ -107,61 +432,103 @@ class ContentAgent:
         article_content = doc_result["content"]
         article_title = doc_result["title"]
         
-        # Create output directory with topic-based name
-        topic_folder_name = self._create_topic_based_folder_name(article_title)
-        output_dir = os.path.join(OUTPUT_DIR, topic_folder_name)
-        os.makedirs(output_dir, exist_ok=True)
+        if not output_dir:
+            # Create output directory with topic-based name
+            output_dir = self._create_output_dir(article_title)
+            print(f"{Fore.CYAN}Topic-based folder: {os.path.basename(output_dir)}{Style.RESET_ALL}")
+            
+            checkpoint = RunCheckpoint(output_dir)
+            checkpoint.start_run(input_file, article_title, generate_options)
         print(f"Output will be saved to: {output_dir}")
-        print(f"{Fore.CYAN}Topic-based folder: {topic_folder_name}{Style.RESET_ALL}")
+        
+        # Stages are only reused from the checkpoint when the article is unchanged
+        article_hash = hash_inputs(article_content)
         
         # Store all generated content for image prompts
         generated_content = {}
         
         # Generate requested outputs
         if generate_options.get("twitter_thread"):
-            # Generate initial thread (Stage 1)
-            print("Generating social media thread...")
-            thread_content = self.twitter_generator.generate_thread_from_document(
-                article_content
-            )
-            thread_path = self.cli.save_thread(thread_content, output_dir=output_dir)
-            print(f"Social media thread saved to {thread_path}")
+            saved = checkpoint.get_stage("twitter_thread", article_hash)
             
-            # Get user feedback loop
-            while True:
-                feedback_type, feedback_content = self.cli.get_user_feedback(
-                    thread_path, 
-                    content_type="twitter_thread",
-                    content_text=thread_content,
-                    original_prompt=f"Generate Twitter thread from: {article_title}"
-                )
+            if saved and saved["accepted"]:
+                print(f"{Fore.GREEN}Social media thread already accepted, skipping.{Style.RESET_ALL}")
+                thread_content, thread_path = saved["output"], saved["file_path"]
+            else:
+                if saved:
+                    print("Restoring social media thread from checkpoint...")
+                    candidates = [saved["output"]]
+                else:
+                    # Generate initial thread (Stage 1)
+                    print("Generating social media thread...")
+                    candidates = self._generate_candidates(
+                        "twitter_thread",
+                        lambda: self.twitter_generator.generate_thread_from_document(article_content)
+                    )
+                thread_content = candidates[0]
+                thread_path = self.cli.save_thread(thread_content, output_dir=output_dir)
+                checkpoint.record_stage("twitter_thread", article_hash, thread_content, file_path=thread_path)
+                print(f"Social media thread saved to {thread_path}")
                 
-                if feedback_type == "accept":
-                    # User accepted the thread, save it to output
-                    break
-                    
-                elif feedback_type == "edited":
-                    # User edited thread manually
-                    print("Thread has been manually edited.")
-                    # Read the edited content from the file
-                    with open(thread_path, "r", encoding="utf-8") as f:
-                        thread_content = f.read()
-                    break
-                    
-                elif feedback_type == "revise":
-                    # User requested revision
-                    print("Revising thread based on feedback...")
-                    
-                    # Update the thread with revised content using the proper revision method
-                    revised_thread = self.twitter_generator.revise_thread(
-                        original_thread=thread_content,
-                        article_text=article_content,
-                        feedback=feedback_content
+                # Get user feedback loop
+                while True:
+                    speculation = self._start_speculation(
+                        "twitter_thread",
+                        lambda feedback, thread=thread_content: self.twitter_generator.revise_thread(
+                            original_thread=thread,
+                            article_text=article_content,
+                            feedback=feedback,
+                            targeted=self.targeted_revisions
+                        )
                     )
+                    feedback_type, feedback_content = self.cli.get_user_feedback(
+                        thread_path, 
+                        content_type="twitter_thread",
+                        content_text=thread_content,
+                        original_prompt=f"Generate Twitter thread from: {article_title}",
+                        alternatives=len(candidates) - 1
+                    )
+                    speculative_revision = self._finish_speculation(speculation, feedback_type, feedback_content)
                     
-                    # Save the revised thread
-                    thread_path = self.cli.save_thread(revised_thread, output_dir=output_dir)
-                    thread_content = revised_thread
+                    if feedback_type == "next":
+                        # Show the next candidate; the current one goes to the back of the list
+                        candidates = candidates[1:] + candidates[:1]
+                        thread_content = candidates[0]
+                        thread_path = self.cli.save_thread(thread_content, output_dir=output_dir)
+                        checkpoint.record_stage("twitter_thread", article_hash, thread_content, file_path=thread_path)
+                        
+                    elif feedback_type == "accept":
+                        # User accepted the thread, save it to output
+                        break
+                        
+                    elif feedback_type == "edited":
+                        # User edited thread manually
+                        print("Thread has been manually edited.")
+                        # Read the edited content from the file
+                        with open(thread_path, "r", encoding="utf-8") as f:
+                            thread_content = f.read()
+                        break
+                        
+                    elif feedback_type == "revise":
+                        # User requested revision
+                        print("Revising thread based on feedback...")
+                        
+                        # Update the thread with revised content using the proper revision method
+                        revised_thread = self._readable(speculative_revision or self.twitter_generator.revise_thread(
+                            original_thread=thread_content,
+                            article_text=article_content,
+                            feedback=feedback_content,
+                            targeted=self.targeted_revisions
+                        ))
+                        
+                        # Save the revised thread
+                        thread_path = self.cli.save_thread(revised_thread, output_dir=output_dir)
+                        thread_content = revised_thread
+                        candidates = [thread_content]
+                        checkpoint.record_stage("twitter_thread", article_hash, thread_content, file_path=thread_path)
+                
+                checkpoint.record_stage("twitter_thread", article_hash, thread_content,
+                                        accepted=True, file_path=thread_path)
             
             # Store generated thread content for image prompts
             generated_content["twitter_thread"] = {
@@ -172,45 +539,80 @@ class ContentAgent:
         
         # Generate Stage 2 outputs
         if generate_options.get("article_summary", False):
-            print("Generating article summary...")
-            summary = self.article_summary_generator.generate_summary(article_content)
-            summary_result = self.article_summary_generator.save_summary(summary, article_title, output_dir)
-            summary_path = summary_result["file_path"]
-            print(f"Article summary saved to: {summary_path}")
+            saved = checkpoint.get_stage("article_summary", article_hash)
             
-            # Get user feedback loop for article summary
-            while True:
-                feedback_type, feedback_content = self.cli.get_user_feedback(
-                    summary_path,
-                    content_type="article_summary", 
-                    content_text=summary,
-                    original_prompt=f"Generate article summary for: {article_title}"
-                )
+            if saved and saved["accepted"]:
+                print(f"{Fore.GREEN}Article summary already accepted, skipping.{Style.RESET_ALL}")
+                summary, summary_path = saved["output"], saved["file_path"]
+            else:
+                if saved:
+                    print("Restoring article summary from checkpoint...")
+                    candidates = [saved["output"]]
+                else:
+                    print("Generating article summary...")
+                    candidates = self._generate_candidates(
+                        "article_summary", lambda: self.article_summary_generator.generate_summary(article_content)
+                    )
+                summary = candidates[0]
+                summary_result = self.article_summary_generator.save_summary(summary, article_title, output_dir)
+                summary_path = summary_result["file_path"]
+                checkpoint.record_stage("article_summary", article_hash, summary, file_path=summary_path)
+                print(f"Article summary saved to: {summary_path}")
                 
-                if feedback_type == "accept":
-                    # User accepted the summary
-                    break
-                    
-                elif feedback_type == "edited":
-                    # User edited the summary manually
-                    print("Summary has been manually edited.")
-                    # Read the edited content from the file
-                    with open(summary_path, "r", encoding="utf-8") as f:
-                        summary = f.read()
-                    break
-                    
-                elif feedback_type == "revise":
-                    # User requested revision
-                    print("Revising summary based on feedback...")
-                    
-                    # Generate revised summary
-                    summary = self.article_summary_generator.revise_summary(
-                        summary, article_content, feedback_content
+                # Get user feedback loop for article summary
+                while True:
+                    speculation = self._start_speculation(
+                        "article_summary",
+                        lambda feedback, original=summary: self.article_summary_generator.revise_summary(
+                            original, article_content, feedback
+                        )
+                    )
+                    feedback_type, feedback_content = self.cli.get_user_feedback(
+                        summary_path,
+                        content_type="article_summary", 
+                        content_text=summary,
+                        original_prompt=f"Generate article summary for: {article_title}",
+                        alternatives=len(candidates) - 1
                     )
+                    speculative_revision = self._finish_speculation(speculation, feedback_type, feedback_content)
                     
-                    # Save revised summary
-                    summary_result = self.article_summary_generator.save_summary(summary, article_title, output_dir)
-                    summary_path = summary_result["file_path"]
+                    if feedback_type == "next":
+                        # Show the next candidate; the current one goes to the back of the list
+                        candidates = candidates[1:] + candidates[:1]
+                        summary = candidates[0]
+                        summary_result = self.article_summary_generator.save_summary(summary, article_title, output_dir)
+                        summary_path = summary_result["file_path"]
+                        checkpoint.record_stage("article_summary", article_hash, summary, file_path=summary_path)
+                        
+                    elif feedback_type == "accept":
+                        # User accepted the summary
+                        break
+                        
+                    elif feedback_type == "edited":
+                        # User edited the summary manually
+                        print("Summary has been manually edited.")
+                        # Read the edited content from the file
+                        with open(summary_path, "r", encoding="utf-8") as f:
+                            summary = f.read()
+                        break
+                        
+                    elif feedback_type == "revise":
+                        # User requested revision
+                        print("Revising summary based on feedback...")
+                        
+                        # Generate revised summary
+                        summary = self._readable(speculative_revision or self.article_summary_generator.revise_summary(
+                            summary, article_content, feedback_content
+                        ))
+                        
+                        # Save revised summary
+                        summary_result = self.article_summary_generator.save_summary(summary, article_title, output_dir)
+                        summary_path = summary_result["file_path"]
+                        candidates = [summary]
+                        checkpoint.record_stage("article_summary", article_hash, summary, file_path=summary_path)
+                
+                checkpoint.record_stage("article_summary", article_hash, summary,
+                                        accepted=True, file_path=summary_path)
             
             # Store generated summary content for image prompts
             generated_content["article_summary"] = {
@@ -222,9 +624,19 @@ class ContentAgent:
         # Process detailed posts - extract arguments and generate posts
         if generate_options.get("detailed_posts", False):
             # Extract key arguments from article for detailed posts
-            print("Extracting key arguments from article...")
-            findings = self.key_findings_extractor.extract_findings(article_content)
-            arguments = findings.get("Main Arguments", [])
+            saved = checkpoint.get_stage("key_findings", article_hash)
+            if saved and saved["accepted"]:
+                print(f"{Fore.GREEN}Key arguments already confirmed, skipping.{Style.RESET_ALL}")
+                arguments = saved["output"]
+            else:
+                if saved:
+                    extracted = saved["output"]
+                else:
+                    print("Extracting key arguments from article...")
+                    extracted = self.key_findings_extractor.extract_arguments(self._prompt_article(article_content))
+                    checkpoint.record_stage("key_findings", article_hash, extracted)
+                arguments = self.key_findings_extractor.confirm_arguments(extracted)
+                checkpoint.record_stage("key_findings", article_hash, arguments, accepted=True)
             
             if arguments:
                 # Store key arguments for image prompts only - don't save as file
@@ -240,15 +652,34 @@ class ContentAgent:
                 # Process each argument individually
                 all_posts = {}
                 for argument in arguments:
-                    print(f"\nGenerating detailed post for argument: {argument[:50]}...")
+                    stage = f"detailed_post:{argument}"
+                    post_context = self._post_context(article_content, argument)
+                    # Context files are identified by their hashes rather than re-serializing their content
+                    post_hash = hash_inputs(article_content, argument, additional_context["files"])
+                    saved = checkpoint.get_stage(stage, post_hash)
                     
-                    # Generate post for this argument
-                    post_content = self.detailed_post_generator.generate_post_for_argument(
-                        argument, 
-                        article_content,
-                        "",  # No custom instructions
-                        additional_context
-                    )
+                    if saved and saved["accepted"]:
+                        print(f"{Fore.GREEN}Post for argument already accepted, skipping:{Style.RESET_ALL} {argument[:50]}...")
+                        all_posts[argument] = saved["output"]
+                        continue
+                    
+                    if saved:
+                        print(f"\nRestoring detailed post for argument from checkpoint: {argument[:50]}...")
+                        candidates = [saved["output"]]
+                    else:
+                        print(f"\nGenerating detailed post for argument: {argument[:50]}...")
+                        
+                        # Generate post for this argument
+                        candidates = self._generate_candidates(
+                            "detailed_post",
+                            lambda: self.detailed_post_generator.generate_post_for_argument(
+                                argument,
+                                post_context,
+                                "",  # No custom instructions
+                                additional_context
+                            )
+                        )
+                    post_content = candidates[0]
                     
                     # Save post to individual file
                     post_path = self.detailed_post_generator.save_individual_post(
@@ -257,59 +688,93 @@ class ContentAgent:
                         article_title,
                         output_dir
                     )
+                    checkpoint.record_stage(stage, post_hash, post_content, file_path=post_path)
                     
                     # Get user feedback for this post
                     print(f"\n{Fore.CYAN}Review the post for argument:{Style.RESET_ALL} {argument[:50]}...")
-                    feedback_type, feedback_content = self.cli.get_user_feedback(
-                        post_path,
-                        content_type="detailed_post",
-                        content_text=post_content,
-                        original_prompt=f"Generate detailed post for argument: {argument[:50]}"
-                    )
+                    while True:
+                        speculation = self._start_speculation(
+                            "detailed_post",
+                            lambda feedback, post=post_content, arg=argument: self.detailed_post_generator.revise_post(
+                                post,
+                                arg,
+                                post_context,
+                                feedback,
+                                "",
+                                additional_context,
+                                targeted=self.targeted_revisions
+                            )
+                        )
+                        feedback_type, feedback_content = self.cli.get_user_feedback(
+                            post_path,
+                            content_type="detailed_post",
+                            content_text=post_content,
+                            original_prompt=f"Generate detailed post for argument: {argument[:50]}",
+                            alternatives=len(candidates) - 1
+                        )
+                        speculative_revision = self._finish_speculation(speculation, feedback_type, feedback_content)
                     
-                    if feedback_type == "accept":
-                        # User accepted the post
-                        all_posts[argument] = post_content
-                        print(f"{Fore.GREEN}Post accepted.{Style.RESET_ALL}")
-                        
-                    elif feedback_type == "edited":
-                        # User edited the post manually
-                        print(f"{Fore.GREEN}Post has been manually edited.{Style.RESET_ALL}")
-                        # Read the edited content from the file
-                        with open(post_path, "r", encoding="utf-8") as f:
-                            edited_content = f.read()
-                        # Extract just the post content (remove title and argument)
-                        match = re.search(r'\*\*.*?\*\*\s*\n\n(.*)', edited_content, re.DOTALL)
-                        if match:
-                            edited_post = match.group(1).strip()
-                            all_posts[argument] = edited_post
-                        else:
+                        if feedback_type == "next":
+                            # Show the next candidate and ask again
+                            candidates = candidates[1:] + candidates[:1]
+                            post_content = candidates[0]
+                            post_path = self.detailed_post_generator.save_individual_post(
+                                argument,
+                                post_content,
+                                article_title,
+                                output_dir
+                            )
+                            checkpoint.record_stage(stage, post_hash, post_content, file_path=post_path)
+                            continue
+                    
+                        if feedback_type == "accept":
+                            # User accepted the post
                             all_posts[argument] = post_content
+                            print(f"{Fore.GREEN}Post accepted.{Style.RESET_ALL}")
+                        
+                        elif feedback_type == "edited":
+                            # User edited the post manually
+                            print(f"{Fore.GREEN}Post has been manually edited.{Style.RESET_ALL}")
+                            # Read the edited content from the file
+                            with open(post_path, "r", encoding="utf-8") as f:
+                                edited_content = f.read()
+                            # Extract just the post content (remove title and argument)
+                            match = re.search(r'\*\*.*?\*\*\s*\n\n(.*)', edited_content, re.DOTALL)
+                            if match:
+                                edited_post = match.group(1).strip()
+                                all_posts[argument] = edited_post
+                            else:
+                                all_posts[argument] = post_content
                             
-                    elif feedback_type == "revise":
-                        # User requested revision
-                        print(f"{Fore.GREEN}Revising post based on feedback...{Style.RESET_ALL}")
+                        elif feedback_type == "revise":
+                            # User requested revision
+                            print(f"{Fore.GREEN}Revising post based on feedback...{Style.RESET_ALL}")
                         
-                        # Generate revised post
-                        revised_post = self.detailed_post_generator.revise_post(
-                            post_content,
-                            argument, 
-                            article_content,
-                            feedback_content,
-                            "",  # No custom instructions
-                            additional_context
-                        )
+                            # Generate revised post
+                            revised_post = self._readable(speculative_revision or self.detailed_post_generator.revise_post(
+                                post_content,
+                                argument, 
+                                post_context,
+                                feedback_content,
+                                "",  # No custom instructions
+                                additional_context,
+                                targeted=self.targeted_revisions
+                            ))
                         
-                        # Save revised post
-                        revised_path = self.detailed_post_generator.save_individual_post(
-                            argument,
-                            revised_post,
-                            article_title,
-                            output_dir
-                        )
+                            # Save revised post
+                            post_path = self.detailed_post_generator.save_individual_post(
+                                argument,
+                                revised_post,
+                                article_title,
+                                output_dir
+                            )
                         
-                        all_posts[argument] = revised_post
-                        print(f"{Fore.GREEN}Revised post saved.{Style.RESET_ALL}")
+                            all_posts[argument] = revised_post
+                            print(f"{Fore.GREEN}Revised post saved.{Style.RESET_ALL}")
+                        break
+                    
+                    checkpoint.record_stage(stage, post_hash, all_posts.get(argument, post_content),
+                                            accepted=True, file_path=post_path)
                 
                 # Store all generated posts for image prompts
                 generated_content["detailed_posts"] = {
@@ -321,10 +786,21 @@ class ContentAgent:
 
         # Generate image prompts for each type of content
         if generate_options.get("image_prompts", False) and generated_content:
-            print("Generating image prompts for each content piece...")
-            image_prompts = self.image_prompt_generator.generate_content_specific_prompts(generated_content)
-            prompts_path = self.image_prompt_generator.save_image_prompts(image_prompts, article_title, output_dir)
+            prompts_hash = hash_inputs(generated_content)
+            saved = checkpoint.get_stage("image_prompts", prompts_hash)
+            
+            if saved and saved["accepted"]:
+                print(f"{Fore.GREEN}Image prompts already generated, skipping.{Style.RESET_ALL}")
+                prompts_path = saved["file_path"]
+            else:
+                print("Generating image prompts for each content piece...")
+                prompts_path = self.image_prompt_generator.generate_and_save_prompts(
+                    generated_content, article_title, output_dir
+                )
+                checkpoint.record_stage("image_prompts", prompts_hash, None, accepted=True, file_path=prompts_path)
             print(f"Image prompts saved to: {prompts_path}")
+        
+        checkpoint.mark_completed()
             
         # Print completion message
         self.cli.print_completion()
@@ -333,16 +809,104 @@ def main():
     """
     Main entry point for the application.
     """
+    parser = argparse.ArgumentParser(description="Generate social media content from articles.")
+    parser.add_argument(
+        "--resume", nargs="?", const=True, default=False, metavar="OUTPUT_DIR",
+        help="resume the latest interrupted run, or the run in OUTPUT_DIR"
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="run as a local HTTP service that accepts generation jobs"
+    )
+    parser.add_argument("--host", default=SERVICE_HOST, help="interface for --serve to bind")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="port for --serve to listen on")
+    parser.add_argument(
+        "--enqueue", nargs="+", metavar="ARTICLE",
+        help="add articles to the persistent job queue and exit"
+    )
+    parser.add_argument(
+        "--generate", metavar="TYPES",
+        help=f"comma-separated content types for --enqueue ({', '.join(DEFAULT_JOB_OPTIONS)})"
+    )
+    parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="process queued jobs with N worker processes"
+    )
+    parser.add_argument(
+        "--exit-when-empty", action="store_true",
+        help="stop --workers once the queue is drained"
+    )
+    parser.add_argument("--queue-stats", action="store_true", help="show job queue metrics and exit")
+    parser.add_argument(
+        "--full-revisions", action="store_true",
+        help="rewrite the whole thread or post on every revision instead of only the parts the feedback is about"
+    )
+    parser.add_argument(
+        "--compress-article", action="store_true",
+        help="shorten long articles locally before extracting key arguments and writing detailed posts"
+    )
+    parser.add_argument(
+        "--full-article-posts", action="store_true",
+        help="give every detailed post the whole article instead of the sections its argument is about"
+    )
+    parser.add_argument(
+        "--style-profile", action="store_true",
+        help="use a style profile distilled once from the writing samples instead of the raw samples"
+    )
+    parser.add_argument(
+        "--readability-pass", action="store_true",
+        help="simplify wording and split long sentences of generated content with local rules"
+    )
+    parser.add_argument(
+        "--candidates", type=int, default=CANDIDATE_COUNT, metavar="K",
+        help="generate K candidates per thread, summary and post and show the best match for your preferences first"
+    )
+    args = parser.parse_args()
+    
+    if args.enqueue or args.queue_stats:
+        queue = JobQueue()
+        if args.enqueue:
+            options = dict(DEFAULT_JOB_OPTIONS)
+            if args.generate:
+                requested = [name.strip() for name in args.generate.split(",") if name.strip()]
+                unknown = set(requested) - set(options)
+                if unknown:
+                    parser.error(f"unknown content types: {', '.join(sorted(unknown))}")
+                options = {name: name in requested for name in options}
+            for article in args.enqueue:
+                job_id = queue.enqueue({"input_file": os.path.abspath(article), "options": options})
+                print(f"Queued job {job_id}: {article}")
+        print_queue_stats(queue)
+        return
+    
+    # Queue workers build their agents from the same flags
+    agent_options = {
+        "targeted_revisions": TARGETED_REVISIONS_ENABLED and not args.full_revisions,
+        "extractive_compression": EXTRACTIVE_COMPRESSION_ENABLED or args.compress_article,
+        "argument_excerpts": ARGUMENT_EXCERPTS_ENABLED and not args.full_article_posts,
+        "style_profile": STYLE_PROFILE_ENABLED or args.style_profile,
+        "candidate_count": args.candidates,
+        "readability_pass": READABILITY_PASS_ENABLED or args.readability_pass,
+    }
+    
+    if args.workers:
+        run_worker_pool(args.workers, exit_when_empty=args.exit_when_empty, agent_options=agent_options)
+        return
+    
     try:
         print("Starting ContentAgent...")
-        agent = ContentAgent()
-        agent.run()
+        agent = ContentAgent(**agent_options)
+        if args.serve:
+            serve(agent, host=args.host, port=args.port)
+        else:
+            agent.run(resume=args.resume)
     except KeyboardInterrupt:
         print("\nApplication terminated by user.")
+        print("Run again with --resume to continue where you left off.")
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,278 @@
+"""
+Memory Export for ContentAgent.
+
+This module exports the memory database to columnar files for offline
+analysis. Rows are streamed from SQLite in fixed-size chunks and written out
+chunk by chunk, so memory use does not grow with the size of the history.
+
+Parquet files are written when pyarrow is installed; otherwise each chunk is
+saved as a NumPy .npz file (strings as UTF-8 bytes plus offsets, with a
+validity mask per column), readable with read_npz_part().
+
+The append-only tables (feedback_history, quality_metrics) are exported
+incrementally: a watermark of the last exported id is kept per table, and
+later exports only move newer rows. edit_patterns and user_preferences are
+updated in place, so they are re-exported as a full snapshot every time.
+"""
+
+import datetime
+import json
+import logging
+import os
+import shutil
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.config import EXPORT_DIR, EXPORT_CHUNK_SIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: exports fall back to NumPy .npz files
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_STATE_FILENAME = "export_state.json"
+
+# Tables exported incrementally by id, and tables re-exported in full
+INCREMENTAL_TABLES = ["feedback_history", "quality_metrics"]
+SNAPSHOT_TABLES = ["edit_patterns", "user_preferences"]
+
+FORMAT_PARQUET = "parquet"
+FORMAT_NPZ = "npz"
+
+
+def _column_kinds(conn: sqlite3.Connection, table: str) -> Dict[str, str]:
+    """Map each column of a table to 'int', 'float' or 'str' from its declared type."""
+    kinds = {}
+    for _, name, declared, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        declared = (declared or "").upper()
+        if "INT" in declared:
+            kinds[name] = "int"
+        elif any(word in declared for word in ("REAL", "FLOA", "DOUB")):
+            kinds[name] = "float"
+        else:
+            kinds[name] = "str"
+    return kinds
+
+
+class _ParquetWriter:
+    """Writes chunks as row groups of a single Parquet file."""
+
+    extension = ".parquet"
+
+    def __init__(self, path: str, kinds: Dict[str, str]):
+        arrow_types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+        self.schema = pa.schema([(name, arrow_types[kind]) for name, kind in kinds.items()])
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, columns: Dict[str, List[Any]]):
+        arrays = [pa.array(columns[field.name], type=field.type) for field in self.schema]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class _NpzWriter:
+    """Writes chunks as numbered .npz files in a part directory."""
+
+    extension = ""
+
+    def __init__(self, path: str, kinds: Dict[str, str]):
+        self.path = path
+        self.kinds = kinds
+        self._chunks = 0
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, columns: Dict[str, List[Any]]):
+        arrays = {}
+        for name, kind in self.kinds.items():
+            values = columns[name]
+            valid = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+            arrays[f"{name}.valid"] = valid
+            if kind == "int":
+                arrays[name] = np.array([value if value is not None else 0 for value in values], dtype=np.int64)
+            elif kind == "float":
+                arrays[name] = np.array([value if value is not None else np.nan for value in values], dtype=np.float64)
+            else:
+                encoded = [str(value).encode("utf-8") if value is not None else b"" for value in values]
+                arrays[f"{name}.offsets"] = np.cumsum([0] + [len(item) for item in encoded], dtype=np.int64)
+                arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        np.savez_compressed(os.path.join(self.path, f"chunk-{self._chunks:05d}.npz"), **arrays)
+        self._chunks += 1
+
+    def close(self):
+        pass
+
+
+def _remove(path: str):
+    """Delete an export file or part directory if it exists."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def read_npz_part(path: str) -> Dict[str, List[Any]]:
+    """
+    Read an .npz export part back into columns.
+
+    Args:
+        path: A part directory written by an NPZ export
+
+    Returns:
+        Dictionary mapping column names to lists of values (None for NULL)
+    """
+    columns: Dict[str, List[Any]] = {}
+    for chunk_name in sorted(os.listdir(path)):
+        with np.load(os.path.join(path, chunk_name)) as chunk:
+            names = [key[:-len(".valid")] for key in chunk.files if key.endswith(".valid")]
+            for name in names:
+                valid = chunk[f"{name}.valid"]
+                if f"{name}.offsets" in chunk.files:
+                    offsets, data = chunk[f"{name}.offsets"], chunk[f"{name}.data"].tobytes()
+                    values = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(valid))]
+                else:
+                    values = chunk[name].tolist()
+                columns.setdefault(name, []).extend(
+                    value if is_valid else None for value, is_valid in zip(values, valid)
+                )
+    return columns
+
+
+class MemoryExporter:
+    """Streams memory database tables to columnar files."""
+
+    def __init__(self, db_path: str, output_dir: str = EXPORT_DIR, export_format: Optional[str] = None,
+                 chunk_size: int = EXPORT_CHUNK_SIZE):
+        """
+        Initialize the exporter.
+
+        Args:
+            db_path: Path of the memory database
+            output_dir: Directory receiving one subdirectory per table and the watermark state
+            export_format: "parquet" or "npz"; defaults to Parquet when pyarrow is installed
+            chunk_size: Rows read and written per batch
+
+        Raises:
+            ValueError: If Parquet is requested without pyarrow installed
+        """
+        if export_format is None:
+            export_format = FORMAT_PARQUET if pa is not None else FORMAT_NPZ
+        if export_format == FORMAT_PARQUET and pa is None:
+            raise ValueError("Parquet export requires pyarrow (pip install pyarrow); use the npz format instead")
+        if export_format not in (FORMAT_PARQUET, FORMAT_NPZ):
+            raise ValueError(f"Unknown export format: {export_format}")
+
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+        self.state_path = os.path.join(output_dir, EXPORT_STATE_FILENAME)
+
+    def load_state(self) -> Dict[str, Any]:
+        """Get the watermarks of previous exports."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]):
+        """Write the watermarks atomically so a crash never loses or corrupts them."""
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def _export_table(self, conn: sqlite3.Connection, table: str, part_name: str,
+                      after_id: int = 0, write_empty: bool = False) -> Dict[str, Any]:
+        """Stream the rows of a table with an id above a watermark into one export part."""
+        kinds = _column_kinds(conn, table)
+        names = list(kinds)
+        table_dir = os.path.join(self.output_dir, table)
+        os.makedirs(table_dir, exist_ok=True)
+
+        writer_class = _ParquetWriter if self.export_format == FORMAT_PARQUET else _NpzWriter
+        final_path = os.path.join(table_dir, part_name + writer_class.extension)
+        temp_path = final_path + ".partial"
+        _remove(temp_path)  # Left over from an interrupted export
+
+        cursor = conn.execute(f"SELECT {', '.join(names)} FROM {table} WHERE id > ? ORDER BY id", (after_id,))
+        writer = writer_class(temp_path, kinds) if write_empty else None
+        rows_exported, last_id = 0, after_id
+        try:
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                if writer is None:
+                    writer = writer_class(temp_path, kinds)
+                writer.write({name: list(values) for name, values in zip(names, zip(*rows))})
+                rows_exported += len(rows)
+                last_id = rows[-1][names.index("id")]
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            return {"rows": 0, "last_id": after_id, "path": None}
+
+        _remove(final_path)
+        os.replace(temp_path, final_path)
+        return {"rows": rows_exported, "last_id": last_id, "path": final_path}
+
+    def export(self, incremental: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Export all memory tables.
+
+        All tables are read in one transaction, so the export is consistent
+        even while ContentAgent keeps recording feedback.
+
+        Args:
+            incremental: Only export rows newer than the stored watermarks;
+                False exports everything and resets the watermarks
+
+        Returns:
+            Dictionary mapping each table to the rows exported, its new
+            watermark and the written file (None if there was nothing new)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        state = self.load_state() if incremental else {}
+        if state.get("format", self.export_format) != self.export_format:
+            raise ValueError(f"{self.output_dir} holds {state['format']} exports; "
+                             f"export to another directory or run a full export")
+        if not incremental:
+            for table in INCREMENTAL_TABLES:
+                _remove(os.path.join(self.output_dir, table))
+        results = {}
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("BEGIN")
+            for table in INCREMENTAL_TABLES:
+                after_id = state.get(table, {}).get("last_id", 0)
+                # Named by the first id, so a part orphaned by a crash is overwritten on retry
+                result = self._export_table(conn, table, f"part-{after_id + 1:010d}", after_id)
+                results[table] = result
+                state[table] = {
+                    "last_id": result["last_id"],
+                    "rows": state.get(table, {}).get("rows", 0) + result["rows"],
+                    "updated": datetime.datetime.now().isoformat(),
+                }
+            for table in SNAPSHOT_TABLES:
+                results[table] = self._export_table(conn, table, "snapshot", write_empty=True)
+            conn.rollback()
+        finally:
+            conn.close()
+
+        # Watermarks only move once every part has been written
+        state["format"] = self.export_format
+        self._save_state(state)
+        logger.info(f"Exported memory data to {self.output_dir}: "
+                    + ", ".join(f"{table} {result['rows']}" for table, result in results.items()))
+        return results
@@ -1,134 +1,173 @@
 import sqlite3
 import os
 import json
+import math
+import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import logging
-import difflib
-import re
+import threading
+import time
 from collections import Counter, defaultdict
-import textstat
-from src.config import Config
+import numpy as np
+from src.config import Config, NEAR_DUPLICATE_THRESHOLD
+from src.edit_diff import analyze_edit
+from src.memory_migrations import apply_migrations, LATEST_SCHEMA_VERSION
+from src.near_duplicates import MinHasher, MinHashLSH
+from src.text_metrics import text_metrics, score_counts, content_hash
 
 logger = logging.getLogger(__name__)
 
+# Keywords in revision feedback that map to a learned "avoid" preference
+REJECTION_REASON_KEYWORDS = {
+    'avoid_long_content': ['too long', 'verbose', 'lengthy'],
+    'avoid_short_content': ['too short', 'brief', 'more detail'],
+    'avoid_technical': ['technical', 'complex', 'difficult'],
+    'avoid_simple': ['simple', 'basic', 'more depth'],
+}
+
+# Columns of a feedback entry, selected by name in the order _feedback_from_row reads them
+# so that columns added by later migrations never shift the fields
+FEEDBACK_COLUMNS = ('id', 'timestamp', 'content_type', 'content_text', 'user_action',
+                    'original_prompt', 'generation_time', 'content_hash', 'metadata')
+FEEDBACK_SELECT = ', '.join(FEEDBACK_COLUMNS)
+
+# Formatting preferences learned from accepted content, and how each is detected in a text
+FORMATTING_PREFERENCES = {
+    'uses_bold': lambda text: '**' in text,
+    'uses_bullets': lambda text: '•' in text or '-' in text,
+    'prefers_paragraphs': lambda text: text.count('\n\n') > 2,
+}
+
+def classify_revision_reason(reason: str) -> List[str]:
+    """Return the rejection directions (preference types) mentioned in revision feedback."""
+    reason = reason.lower()
+    return [direction for direction, keywords in REJECTION_REASON_KEYWORDS.items()
+            if any(word in reason for word in keywords)]
+
+def _decay(days: Optional[float], half_life: float) -> float:
+    """Weight left after some days of exponential decay; registered as the SQL function decay()."""
+    if days is None or days <= 0:
+        return 1.0
+    return 0.5 ** (days / half_life)
+
+# Decay of a preference's evidence since its last update, for the UPSERT in _update_user_preferences
+PREFERENCE_DECAY_SQL = "decay(julianday(excluded.last_updated) - julianday(last_updated), :half_life)"
+
 class MemoryManager:
     def __init__(self, db_path: Optional[str] = None):
         self.config = Config()
         self.db_path = db_path or os.path.join(self.config.data_dir, "memory", "content_agent_memory.db")
         self.max_records = 2000
-        
+        self.search_enabled = False
+        self.minhasher = MinHasher()
+        # Per content type LSH index of accepted content, loaded on first use
+        self._duplicate_index: Optional[Dict[str, MinHashLSH]] = None
+        self._duplicate_lock = threading.Lock()
+        # Dashboard snapshot, cached until another connection commits a change
+        self._snapshot_conn: Optional[sqlite3.Connection] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_built_at = 0.0
+        self._snapshot_lock = threading.Lock()
+
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         self._initialize_database()
     
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Open a connection that waits for other processes' locks instead of failing."""
+        conn = sqlite3.connect(self.db_path, timeout=self.config.memory_busy_timeout,
+                               check_same_thread=check_same_thread)
+        if self.config.memory_wal_enabled:
+            # Safe with WAL: a crash can lose the last commits but never corrupts the database
+            conn.execute('PRAGMA synchronous=NORMAL')
+        # Not every SQLite build has math functions, so preference decay is registered here
+        conn.create_function('decay', 2, _decay, deterministic=True)
+        return conn
+    
+    def close(self):
+        """Close the persistent connection used for dashboard snapshots."""
+        with self._snapshot_lock:
+            if self._snapshot_conn is not None:
+                self._snapshot_conn.close()
+                self._snapshot_conn = None
+                self._snapshot = None
+    
     def _initialize_database(self):
-        """Initialize the SQLite database with required tables."""
+        """Bring the SQLite database up to the latest schema version."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS feedback_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        content_type TEXT NOT NULL,
-                        content_text TEXT NOT NULL,
-                        user_action TEXT NOT NULL,
-                        original_prompt TEXT,
-                        generation_time REAL,
-                        content_hash TEXT,
-                        metadata TEXT
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS generation_stats (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        content_type TEXT NOT NULL,
-                        total_generated INTEGER DEFAULT 0,
-                        total_accepted INTEGER DEFAULT 0,
-                        total_rejected INTEGER DEFAULT 0,
-                        total_edited INTEGER DEFAULT 0,
-                        avg_generation_time REAL DEFAULT 0.0,
-                        last_updated TEXT NOT NULL
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS edit_patterns (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        content_type TEXT NOT NULL,
-                        edit_type TEXT NOT NULL,
-                        pattern_description TEXT,
-                        frequency INTEGER DEFAULT 1,
-                        examples TEXT,
-                        last_seen TEXT NOT NULL
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS quality_metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        feedback_id INTEGER,
-                        content_type TEXT NOT NULL,
-                        user_action TEXT NOT NULL,
-                        readability_score REAL,
-                        complexity_score REAL,
-                        length_chars INTEGER,
-                        length_words INTEGER,
-                        timestamp TEXT NOT NULL,
-                        FOREIGN KEY (feedback_id) REFERENCES feedback_history (id)
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS user_preferences (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        content_type TEXT NOT NULL,
-                        preference_type TEXT NOT NULL,
-                        preference_value TEXT,
-                        confidence_score REAL DEFAULT 0.0,
-                        last_updated TEXT NOT NULL
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_feedback_timestamp 
-                    ON feedback_history(timestamp)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_feedback_content_type 
-                    ON feedback_history(content_type)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_feedback_action 
-                    ON feedback_history(user_action)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_edit_patterns_type 
-                    ON edit_patterns(content_type, edit_type)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_quality_metrics_type 
-                    ON quality_metrics(content_type, user_action)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_user_preferences_type 
-                    ON user_preferences(content_type, preference_type)
-                ''')
-                
+            with self._connect() as conn:
+                if self.config.memory_wal_enabled:
+                    # Persistent setting of the database file; lets several processes
+                    # record feedback while others read
+                    conn.execute('PRAGMA journal_mode=WAL')
+                applied = apply_migrations(conn)
+                self._initialize_search_index(conn.cursor())
                 conn.commit()
-                logger.info(f"Memory database initialized at {self.db_path}")
+                
+                if applied:
+                    logger.info(f"Memory database at {self.db_path} migrated to schema version {LATEST_SCHEMA_VERSION}")
+                else:
+                    logger.info(f"Memory database initialized at {self.db_path}")
                 
         except sqlite3.Error as e:
             logger.error(f"Database initialization error: {e}")
             raise
-    
+
+    def _initialize_search_index(self, cursor: sqlite3.Cursor):
+        """
+        Create the full-text index over feedback history and the triggers keeping it in sync.
+        
+        Kept outside the versioned migrations because it depends on the SQLite
+        build: the index is created whenever FTS5 becomes available.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feedback_fts'")
+        index_exists = cursor.fetchone() is not None
+
+        try:
+            # External content table: the text lives only in feedback_history
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5(
+                    content_text, original_prompt,
+                    content='feedback_history', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5; search falls back to LIKE scans
+            logger.warning(f"Full-text search unavailable: {e}")
+            self.search_enabled = False
+            return
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_insert AFTER INSERT ON feedback_history BEGIN
+                INSERT INTO feedback_fts (rowid, content_text, original_prompt)
+                VALUES (new.id, new.content_text, new.original_prompt);
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_delete AFTER DELETE ON feedback_history BEGIN
+                INSERT INTO feedback_fts (feedback_fts, rowid, content_text, original_prompt)
+                VALUES ('delete', old.id, old.content_text, old.original_prompt);
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_update
+            AFTER UPDATE OF content_text, original_prompt ON feedback_history BEGIN
+                INSERT INTO feedback_fts (feedback_fts, rowid, content_text, original_prompt)
+                VALUES ('delete', old.id, old.content_text, old.original_prompt);
+                INSERT INTO feedback_fts (rowid, content_text, original_prompt)
+                VALUES (new.id, new.content_text, new.original_prompt);
+            END
+        ''')
+
+        # Databases created before the index existed need their history indexed once
+        if not index_exists:
+            cursor.execute("INSERT INTO feedback_fts (feedback_fts) VALUES ('rebuild')")
+
+        self.search_enabled = True
+
     def record_feedback(self, 
                        content_type: str,
                        content_text: str,
@@ -136,205 +175,220 @@ class MemoryManager:
                        original_prompt: Optional[str] = None,
                        generation_time: Optional[float] = None,
                        metadata: Optional[Dict[str, Any]] = None) -> bool:
-        """Record user feedback for generated content."""
+        """
+        Record user feedback for generated content.
+        
+        The content is analyzed first; the feedback and everything learned
+        from it are then written in one transaction that takes the write lock
+        up front. Several processes can record feedback at once without
+        "database is locked" errors, and every statistic is updated by an
+        atomic SQL statement, so no update is lost.
+        """
         try:
             timestamp = datetime.now().isoformat()
-            content_hash = str(hash(content_text))
+            text_hash = content_hash(content_text)
             metadata_json = json.dumps(metadata) if metadata else None
+            edited_content = metadata.get('edited_content') if metadata else None
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # Analysis happens before taking the write lock, so other writers only wait for the inserts
+                metrics = self._analyze_content_quality(cursor, content_text, text_hash)
+                
+                # For edit actions, analyze edit patterns if we have previous content
+                patterns = {}
+                if user_action == 'edit' and edited_content is not None:
+                    patterns = self._analyze_edit_patterns(content_text, edited_content)
+                
+                # Accepted content (or the user's edited version) is what new content must not repeat
+                indexed_text = content_text if user_action == 'accept' else edited_content if user_action == 'edit' else None
+                signature = self.minhasher.signature(indexed_text) if indexed_text and indexed_text.strip() else None
+                
+                # Waits up to the busy timeout for other writers, then holds the lock until commit
+                cursor.execute('BEGIN IMMEDIATE')
+                
                 cursor.execute('''
                     INSERT INTO feedback_history 
                     (timestamp, content_type, content_text, user_action, 
                      original_prompt, generation_time, content_hash, metadata)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (timestamp, content_type, content_text, user_action,
-                      original_prompt, generation_time, content_hash, metadata_json))
+                      original_prompt, generation_time, text_hash, metadata_json))
                 
                 feedback_id = cursor.lastrowid
-                conn.commit()
                 
-                # Analyze content quality
-                self._analyze_content_quality(feedback_id, content_type, user_action, content_text)
+                if metrics:
+                    self._store_quality_metrics(cursor, feedback_id, content_type, user_action, metrics)
+                if patterns:
+                    self._store_edit_patterns(cursor, content_type, patterns)
+                self._update_generation_stats(cursor, content_type, user_action, generation_time)
+                self._update_user_preferences(cursor, content_type, user_action, content_text, metadata, metrics)
+                if signature is not None:
+                    self._index_content(cursor, feedback_id, content_type, signature)
                 
-                # For edit actions, analyze edit patterns if we have previous content
-                if user_action == 'edit' and metadata and 'edited_content' in metadata:
-                    self._analyze_edit_patterns(content_type, content_text, metadata['edited_content'])
+                removed = self._enforce_record_limit(cursor)
                 
-                self._update_generation_stats(content_type, user_action, generation_time)
-                self._update_user_preferences(content_type, user_action, content_text, metadata)
-                self._enforce_record_limit()
-                
-                logger.info(f"Recorded {user_action} feedback for {content_type}")
-                return True
+                conn.commit()
+            
+            # The in-memory duplicate index only changes once the transaction is committed
+            with self._duplicate_lock:
+                if removed:
+                    # Rebuilt from the remaining signatures on next use
+                    self._duplicate_index = None
+                elif signature is not None and self._duplicate_index is not None:
+                    self._duplicate_index.setdefault(content_type, MinHashLSH()).insert(feedback_id, signature)
+            
+            logger.info(f"Recorded {user_action} feedback for {content_type}")
+            return True
                 
         except sqlite3.Error as e:
             logger.error(f"Error recording feedback: {e}")
             return False
     
-    def _update_generation_stats(self, content_type: str, user_action: str, generation_time: Optional[float]):
+    def _update_generation_stats(self, cursor: sqlite3.Cursor, content_type: str, user_action: str,
+                                 generation_time: Optional[float]):
         """Update generation statistics for a content type."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT * FROM generation_stats WHERE content_type = ?
-                ''', (content_type,))
-                
-                stats = cursor.fetchone()
-                timestamp = datetime.now().isoformat()
-                
-                if stats:
-                    total_generated = stats[2] + 1
-                    total_accepted = stats[3] + (1 if user_action == 'accept' else 0)
-                    total_rejected = stats[4] + (1 if user_action == 'reject' else 0)
-                    total_edited = stats[5] + (1 if user_action == 'edit' else 0)
-                    
-                    if generation_time and stats[6]:
-                        avg_generation_time = (stats[6] * stats[2] + generation_time) / total_generated
-                    else:
-                        avg_generation_time = generation_time or stats[6] or 0.0
-                    
-                    cursor.execute('''
-                        UPDATE generation_stats 
-                        SET total_generated = ?, total_accepted = ?, total_rejected = ?, 
-                            total_edited = ?, avg_generation_time = ?, last_updated = ?
-                        WHERE content_type = ?
-                    ''', (total_generated, total_accepted, total_rejected, 
-                          total_edited, avg_generation_time, timestamp, content_type))
-                else:
-                    total_accepted = 1 if user_action == 'accept' else 0
-                    total_rejected = 1 if user_action == 'reject' else 0
-                    total_edited = 1 if user_action == 'edit' else 0
-                    
-                    cursor.execute('''
-                        INSERT INTO generation_stats 
-                        (content_type, total_generated, total_accepted, total_rejected, 
-                         total_edited, avg_generation_time, last_updated)
-                        VALUES (?, 1, ?, ?, ?, ?, ?)
-                    ''', (content_type, total_accepted, total_rejected, 
-                          total_edited, generation_time or 0.0, timestamp))
-                
-                conn.commit()
+            timestamp = datetime.now().isoformat()
+            
+            # Counters are incremented in SQL so concurrent writers never overwrite each other
+            cursor.execute('''
+                INSERT INTO generation_stats 
+                (content_type, total_generated, total_accepted, total_rejected, 
+                 total_edited, avg_generation_time, last_updated)
+                VALUES (?, 1, ?, ?, ?, ?, ?)
+                ON CONFLICT (content_type) DO UPDATE SET
+                    total_generated = total_generated + 1,
+                    total_accepted = total_accepted + excluded.total_accepted,
+                    total_rejected = total_rejected + excluded.total_rejected,
+                    total_edited = total_edited + excluded.total_edited,
+                    avg_generation_time = CASE
+                        WHEN excluded.avg_generation_time = 0 THEN COALESCE(avg_generation_time, 0.0)
+                        WHEN COALESCE(avg_generation_time, 0) = 0 THEN excluded.avg_generation_time
+                        ELSE (avg_generation_time * total_generated + excluded.avg_generation_time)
+                             / (total_generated + 1)
+                    END,
+                    last_updated = excluded.last_updated
+            ''', (content_type,
+                  1 if user_action == 'accept' else 0,
+                  1 if user_action == 'reject' else 0,
+                  1 if user_action == 'edit' else 0,
+                  generation_time or 0.0, timestamp))
                 
         except sqlite3.Error as e:
             logger.error(f"Error updating generation stats: {e}")
     
-    def _enforce_record_limit(self):
-        """Maintain maximum record limit by removing oldest entries."""
+    def _enforce_record_limit(self, cursor: sqlite3.Cursor) -> int:
+        """Maintain maximum record limit by removing oldest entries; returns the number removed."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM feedback_history')
+            count = cursor.fetchone()[0]
+            
+            if count > self.max_records:
+                excess = count - self.max_records
+                cursor.execute('''
+                    DELETE FROM feedback_history 
+                    WHERE id IN (
+                        SELECT id FROM feedback_history 
+                        ORDER BY timestamp ASC 
+                        LIMIT ?
+                    )
+                ''', (excess,))
                 
-                cursor.execute('SELECT COUNT(*) FROM feedback_history')
-                count = cursor.fetchone()[0]
-                
-                if count > self.max_records:
-                    excess = count - self.max_records
-                    cursor.execute('''
-                        DELETE FROM feedback_history 
-                        WHERE id IN (
-                            SELECT id FROM feedback_history 
-                            ORDER BY timestamp ASC 
-                            LIMIT ?
-                        )
-                    ''', (excess,))
-                    
-                    conn.commit()
-                    logger.info(f"Removed {excess} old records to maintain limit")
+                cursor.execute('''
+                    DELETE FROM content_signatures
+                    WHERE feedback_id NOT IN (SELECT id FROM feedback_history)
+                ''')
+                
+                logger.info(f"Removed {excess} old records to maintain limit")
+                return excess
                     
         except sqlite3.Error as e:
             logger.error(f"Error enforcing record limit: {e}")
+        return 0
     
-    def _analyze_content_quality(self, feedback_id: int, content_type: str, user_action: str, content_text: str):
-        """Analyze content quality metrics and store them."""
+    def _analyze_content_quality(self, cursor: sqlite3.Cursor, content_text: str,
+                                 text_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Analyze content quality metrics, reusing the stored metrics of identical content."""
         try:
-            # Calculate readability and complexity metrics
-            readability_score = textstat.flesch_reading_ease(content_text)
-            complexity_score = textstat.flesch_kincaid_grade(content_text)
-            length_chars = len(content_text)
-            length_words = textstat.lexicon_count(content_text)
-            
-            timestamp = datetime.now().isoformat()
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            if text_hash:
                 cursor.execute('''
-                    INSERT INTO quality_metrics 
-                    (feedback_id, content_type, user_action, readability_score, 
-                     complexity_score, length_chars, length_words, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (feedback_id, content_type, user_action, readability_score,
-                      complexity_score, length_chars, length_words, timestamp))
-                conn.commit()
+                    SELECT q.readability_score, q.complexity_score, q.length_chars,
+                           q.length_words, q.sentence_count, q.syllable_count
+                    FROM feedback_history f
+                    JOIN quality_metrics q ON q.feedback_id = f.id
+                    WHERE f.content_hash = ? AND q.sentence_count IS NOT NULL
+                    ORDER BY q.id DESC
+                    LIMIT 1
+                ''', (text_hash,))
+                row = cursor.fetchone()
+                if row:
+                    return dict(zip(('readability', 'complexity', 'chars', 'words',
+                                     'sentences', 'syllables'), row))
+            
+            # Counts are memoized, so later analysis of the same text is free
+            return text_metrics.analyze(content_text)
                 
         except Exception as e:
             logger.error(f"Error analyzing content quality: {e}")
+            return None
+    
+    def _store_quality_metrics(self, cursor: sqlite3.Cursor, feedback_id: int, content_type: str,
+                               user_action: str, metrics: Dict[str, Any]):
+        """Store the quality metrics of a feedback record."""
+        try:
+            cursor.execute('''
+                INSERT INTO quality_metrics 
+                (feedback_id, content_type, user_action, readability_score, 
+                 complexity_score, length_chars, length_words, sentence_count,
+                 syllable_count, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (feedback_id, content_type, user_action, metrics['readability'],
+                  metrics['complexity'], metrics['chars'], metrics['words'],
+                  metrics['sentences'], metrics['syllables'], datetime.now().isoformat()))
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error storing quality metrics: {e}")
     
-    def _analyze_edit_patterns(self, content_type: str, original_content: str, edited_content: str):
+    def _analyze_edit_patterns(self, original_content: str, edited_content: str) -> Dict[str, Dict]:
         """Analyze patterns in user edits to learn preferences."""
         try:
-            # Calculate diff between original and edited content
-            diff = list(difflib.unified_diff(
-                original_content.splitlines(keepends=True),
-                edited_content.splitlines(keepends=True),
-                fromfile='original',
-                tofile='edited',
-                n=3
-            ))
+            # Word-level diff between original and edited content
+            analysis = analyze_edit(original_content, edited_content)
             
-            if not diff:
-                return  # No changes detected
+            if not analysis['changed']:
+                return {}  # No changes detected
             
             # Analyze different types of edits
-            patterns = self._extract_edit_patterns(original_content, edited_content, diff)
-            
-            timestamp = datetime.now().isoformat()
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                for pattern_type, pattern_info in patterns.items():
-                    # Check if this pattern already exists
-                    cursor.execute('''
-                        SELECT id, frequency FROM edit_patterns 
-                        WHERE content_type = ? AND edit_type = ? AND pattern_description = ?
-                    ''', (content_type, pattern_type, pattern_info['description']))
-                    
-                    existing = cursor.fetchone()
-                    
-                    if existing:
-                        # Update frequency
-                        cursor.execute('''
-                            UPDATE edit_patterns 
-                            SET frequency = frequency + 1, last_seen = ?
-                            WHERE id = ?
-                        ''', (timestamp, existing[0]))
-                    else:
-                        # Insert new pattern
-                        cursor.execute('''
-                            INSERT INTO edit_patterns 
-                            (content_type, edit_type, pattern_description, frequency, examples, last_seen)
-                            VALUES (?, ?, ?, 1, ?, ?)
-                        ''', (content_type, pattern_type, pattern_info['description'], 
-                              json.dumps(pattern_info['examples']), timestamp))
-                
-                conn.commit()
+            return self._extract_edit_patterns(analysis)
                 
         except Exception as e:
             logger.error(f"Error analyzing edit patterns: {e}")
+            return {}
+    
+    def _store_edit_patterns(self, cursor: sqlite3.Cursor, content_type: str, patterns: Dict[str, Dict]):
+        """Store edit patterns; new patterns are inserted, known ones have their frequency bumped."""
+        try:
+            cursor.executemany('''
+                INSERT INTO edit_patterns 
+                (content_type, edit_type, pattern_description, frequency, examples, last_seen)
+                VALUES (?, ?, ?, 1, ?, ?)
+                ON CONFLICT (content_type, edit_type, pattern_description)
+                DO UPDATE SET frequency = frequency + 1, last_seen = excluded.last_seen
+            ''', [(content_type, pattern_type, pattern_info['description'],
+                   json.dumps(pattern_info['examples']), datetime.now().isoformat())
+                  for pattern_type, pattern_info in patterns.items()])
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error storing edit patterns: {e}")
     
-    def _extract_edit_patterns(self, original: str, edited: str, diff: List[str]) -> Dict[str, Dict]:
-        """Extract patterns from edit differences."""
+    def _extract_edit_patterns(self, analysis: Dict[str, Any]) -> Dict[str, Dict]:
+        """Extract patterns from the features computed by analyze_edit."""
         patterns = {}
         
         # Analyze length changes
-        orig_words = len(original.split())
-        edited_words = len(edited.split())
-        word_diff = edited_words - orig_words
+        word_diff = analysis['word_diff']
         
         if abs(word_diff) > 5:  # Significant length change
             if word_diff > 0:
@@ -350,11 +404,11 @@ class MemoryManager:
         
         # Analyze formatting changes
         formatting_changes = []
-        if '**' in edited and '**' not in original:
+        if analysis['added_bold']:
             formatting_changes.append('Added bold formatting')
-        if original.count('\n') != edited.count('\n'):
+        if analysis['paragraph_structure_changed']:
             formatting_changes.append('Changed paragraph structure')
-        if '•' in edited and '•' not in original:
+        if analysis['added_bullets']:
             formatting_changes.append('Added bullet points')
         
         if formatting_changes:
@@ -364,93 +418,103 @@ class MemoryManager:
             }
         
         # Analyze vocabulary changes
-        orig_words_set = set(re.findall(r'\b\w+\b', original.lower()))
-        edited_words_set = set(re.findall(r'\b\w+\b', edited.lower()))
-        
-        added_words = edited_words_set - orig_words_set
-        removed_words = orig_words_set - edited_words_set
+        added_words = analysis['added_vocabulary']
+        removed_words = analysis['removed_vocabulary']
         
         if len(added_words) > 3:
             patterns['vocabulary_addition'] = {
                 'description': 'Tends to add technical/specific vocabulary',
-                'examples': list(added_words)[:10]  # Limit examples
+                'examples': added_words[:10]  # Limit examples
             }
         
         if len(removed_words) > 3:
             patterns['vocabulary_removal'] = {
                 'description': 'Tends to remove certain types of words',
-                'examples': list(removed_words)[:10]  # Limit examples
+                'examples': removed_words[:10]  # Limit examples
             }
         
         return patterns
     
-    def _update_user_preferences(self, content_type: str, user_action: str, content_text: str, metadata: Optional[Dict]):
-        """Update user preferences based on feedback patterns."""
+    def _update_user_preferences(self, cursor: sqlite3.Cursor, content_type: str, user_action: str, content_text: str,
+                                 metadata: Optional[Dict], metrics: Optional[Dict[str, Any]] = None):
+        """
+        Update learned user preferences with one feedback event.
+        
+        Each preference keeps exponentially decayed sums of how many relevant
+        events supported it (evidence) out of how many were observed, and
+        numeric preferences keep a decayed running mean and variance of their
+        values. Every preference touched by the event is updated by a single
+        UPSERT statement, so the cost does not grow with the history.
+        """
         try:
             timestamp = datetime.now().isoformat()
             
-            # Calculate content characteristics
-            preferences = {}
+            # (preference type, whether the event supports it, numeric sample)
+            observations: List[Tuple[str, bool, Optional[float]]] = []
             
             if user_action == 'accept':
                 # Extract preferences from accepted content
-                word_count = len(content_text.split())
-                readability = textstat.flesch_reading_ease(content_text)
-                
-                preferences['preferred_length'] = str(word_count)
-                preferences['preferred_readability'] = str(readability)
-                
-                # Check for formatting preferences
-                if '**' in content_text:
-                    preferences['uses_bold'] = 'true'
-                if '•' in content_text or '-' in content_text:
-                    preferences['uses_bullets'] = 'true'
-                if content_text.count('\n\n') > 2:
-                    preferences['prefers_paragraphs'] = 'true'
+                metrics = metrics or text_metrics.analyze(content_text)
+                observations.append(('preferred_length', True, float(metrics['words'])))
+                observations.append(('preferred_readability', True, float(metrics['readability'])))
+                
+                # Formatting preferences, counted against accepted content without them
+                observations.extend((preference_type, detect(content_text), None)
+                                    for preference_type, detect in FORMATTING_PREFERENCES.items())
             
             elif user_action == 'reject':
                 # Learn what to avoid from rejected content
                 if metadata and 'revision_reason' in metadata:
-                    reason = metadata['revision_reason'].lower()
-                    if any(word in reason for word in ['too long', 'verbose', 'lengthy']):
-                        preferences['avoid_long_content'] = 'true'
-                    if any(word in reason for word in ['too short', 'brief', 'more detail']):
-                        preferences['avoid_short_content'] = 'true'
-                    if any(word in reason for word in ['technical', 'complex', 'difficult']):
-                        preferences['avoid_technical'] = 'true'
-                    if any(word in reason for word in ['simple', 'basic', 'more depth']):
-                        preferences['avoid_simple'] = 'true'
+                    directions = classify_revision_reason(metadata['revision_reason'])
+                    observations.extend((direction, direction in directions, None)
+                                        for direction in REJECTION_REASON_KEYWORDS)
             
-            # Store preferences
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                for pref_type, pref_value in preferences.items():
-                    # Check if preference already exists
-                    cursor.execute('''
-                        SELECT id, confidence_score FROM user_preferences 
-                        WHERE content_type = ? AND preference_type = ?
-                    ''', (content_type, pref_type))
-                    
-                    existing = cursor.fetchone()
-                    
-                    if existing:
-                        # Update confidence score
-                        new_confidence = min(1.0, existing[1] + 0.1)
-                        cursor.execute('''
-                            UPDATE user_preferences 
-                            SET preference_value = ?, confidence_score = ?, last_updated = ?
-                            WHERE id = ?
-                        ''', (pref_value, new_confidence, timestamp, existing[0]))
-                    else:
-                        # Insert new preference
-                        cursor.execute('''
-                            INSERT INTO user_preferences 
-                            (content_type, preference_type, preference_value, confidence_score, last_updated)
-                            VALUES (?, ?, ?, 0.3, ?)
-                        ''', (content_type, pref_type, pref_value, timestamp))
-                
-                conn.commit()
+            if not observations:
+                return
+            
+            prior_strength = self.config.preference_prior_strength
+            prior_a = self.config.preference_prior_confidence * prior_strength
+            params = {
+                'content_type': content_type,
+                'timestamp': timestamp,
+                'half_life': self.config.preference_half_life_days,
+                'prior_a': prior_a,
+                'prior_b': prior_strength - prior_a,
+            }
+            rows = []
+            for i, (pref_type, supported, sample) in enumerate(observations):
+                rows.append(f"(:content_type, :type{i}, :value{i}, :confidence{i}, :evidence{i}, 1.0, "
+                            f":sample{i}, :m2_{i}, :timestamp)")
+                params[f'type{i}'] = pref_type
+                params[f'value{i}'] = 'true' if sample is None else f"{sample:.1f}"
+                params[f'evidence{i}'] = 1.0 if supported else 0.0
+                params[f'confidence{i}'] = (params[f'evidence{i}'] + prior_a) / (1 + prior_strength)
+                params[f'sample{i}'] = sample
+                params[f'm2_{i}'] = None if sample is None else 0.0
+            
+            # Old values on the right-hand side are decayed to now before the new event is added
+            decayed_weight = f"(observations * {PREFERENCE_DECAY_SQL} + 1)"
+            new_mean = f"value_mean + (excluded.value_mean - value_mean) / {decayed_weight}"
+            cursor.execute(f'''
+                INSERT INTO user_preferences 
+                (content_type, preference_type, preference_value, confidence_score,
+                 evidence, observations, value_mean, value_m2, last_updated)
+                VALUES {", ".join(rows)}
+                ON CONFLICT (content_type, preference_type) DO UPDATE SET
+                    preference_value = CASE WHEN excluded.value_mean IS NULL THEN excluded.preference_value
+                                            ELSE printf('%.1f', {new_mean}) END,
+                    confidence_score = (evidence * {PREFERENCE_DECAY_SQL} + excluded.evidence + :prior_a)
+                                       / ({decayed_weight} + :prior_a + :prior_b),
+                    evidence = evidence * {PREFERENCE_DECAY_SQL} + excluded.evidence,
+                    observations = {decayed_weight},
+                    value_mean = CASE WHEN excluded.value_mean IS NULL THEN value_mean
+                                      ELSE {new_mean} END,
+                    value_m2 = CASE WHEN excluded.value_mean IS NULL THEN value_m2
+                                    ELSE value_m2 * {PREFERENCE_DECAY_SQL}
+                                         + (excluded.value_mean - value_mean) * (excluded.value_mean - value_mean)
+                                           * ({decayed_weight} - 1) / {decayed_weight} END,
+                    last_updated = excluded.last_updated
+            ''', params)
                 
         except Exception as e:
             logger.error(f"Error updating user preferences: {e}")
@@ -458,378 +522,737 @@ class MemoryManager:
     def get_generation_stats(self, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get generation statistics for content types."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if content_type:
-                    cursor.execute('''
-                        SELECT * FROM generation_stats WHERE content_type = ?
-                    ''', (content_type,))
-                else:
-                    cursor.execute('SELECT * FROM generation_stats')
-                
-                rows = cursor.fetchall()
-                
-                stats = []
-                for row in rows:
-                    stats.append({
-                        'content_type': row[1],
-                        'total_generated': row[2],
-                        'total_accepted': row[3],
-                        'total_rejected': row[4],
-                        'total_edited': row[5],
-                        'acceptance_rate': row[3] / row[2] if row[2] > 0 else 0,
-                        'avg_generation_time': row[6],
-                        'last_updated': row[7]
-                    })
-                
-                return stats
+            with self._connect() as conn:
+                return self._query_generation_stats(conn.cursor(), content_type)
                 
         except sqlite3.Error as e:
             logger.error(f"Error retrieving generation stats: {e}")
             return []
     
+    def _query_generation_stats(self, cursor: sqlite3.Cursor, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Query generation statistics with an open cursor."""
+        if content_type:
+            cursor.execute('''
+                SELECT * FROM generation_stats WHERE content_type = ?
+            ''', (content_type,))
+        else:
+            cursor.execute('SELECT * FROM generation_stats')
+        
+        stats = []
+        for row in cursor.fetchall():
+            stats.append({
+                'content_type': row[1],
+                'total_generated': row[2],
+                'total_accepted': row[3],
+                'total_rejected': row[4],
+                'total_edited': row[5],
+                'acceptance_rate': row[3] / row[2] if row[2] > 0 else 0,
+                'avg_generation_time': row[6],
+                'last_updated': row[7]
+            })
+        
+        return stats
+    
+    @staticmethod
+    def _feedback_from_row(row: Tuple) -> Dict[str, Any]:
+        """Convert a feedback_history row to a feedback entry."""
+        return {
+            'id': row[0],
+            'timestamp': row[1],
+            'content_type': row[2],
+            'content_text': row[3],
+            'user_action': row[4],
+            'original_prompt': row[5],
+            'generation_time': row[6],
+            'content_hash': row[7],
+            'metadata': json.loads(row[8]) if row[8] else {}
+        }
+    
     def get_recent_feedback(self, content_type: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent feedback entries."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._connect() as conn:
+                return self._query_recent_feedback(conn.cursor(), content_type, limit)
                 
-                if content_type:
-                    cursor.execute('''
-                        SELECT * FROM feedback_history 
-                        WHERE content_type = ?
-                        ORDER BY timestamp DESC 
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving recent feedback: {e}")
+            return []
+
+    def _query_recent_feedback(self, cursor: sqlite3.Cursor, content_type: Optional[str] = None,
+                               limit: int = 50) -> List[Dict[str, Any]]:
+        """Query recent feedback entries with an open cursor."""
+        if content_type:
+            cursor.execute(f'''
+                SELECT {FEEDBACK_SELECT} FROM feedback_history 
+                WHERE content_type = ?
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            ''', (content_type, limit))
+        else:
+            cursor.execute(f'''
+                SELECT {FEEDBACK_SELECT} FROM feedback_history 
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            ''', (limit,))
+        
+        return [self._feedback_from_row(row) for row in cursor.fetchall()]
+    
+    def search_feedback(self, query: str, content_type: Optional[str] = None,
+                        user_action: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Search feedback history by content and prompt text.
+
+        Every word of the query must match; a trailing '*' matches a prefix
+        (e.g. "thread* hook"). Results are ranked by BM25 relevance, with
+        matches in the content weighted above matches in the prompt.
+
+        Args:
+            query: Words to search for
+            content_type: Optional content type filter
+            user_action: Optional user action filter (accept, reject, edit)
+            limit: Maximum number of results
+
+        Returns:
+            Feedback entries like get_recent_feedback, best match first, each
+            with a 'snippet' of the matching text and its 'score'
+        """
+        terms = re.findall(r'\w+\*?', query)
+        if not terms:
+            return []
+
+        filters, params = [], []
+        if content_type:
+            filters.append('f.content_type = ?')
+            params.append(content_type)
+        if user_action:
+            filters.append('f.user_action = ?')
+            params.append(user_action)
+
+        columns = ', '.join(f'f.{column}' for column in FEEDBACK_COLUMNS)
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+
+                if self.search_enabled:
+                    # Quote each term so user input is never parsed as FTS5 syntax
+                    match = ' '.join(f'"{term.rstrip("*")}"' + ('*' if term.endswith('*') else '')
+                                     for term in terms)
+                    cursor.execute(f'''
+                        SELECT {columns},
+                               snippet(feedback_fts, 0, '[', ']', '...', 16),
+                               bm25(feedback_fts, 1.0, 0.5) AS score
+                        FROM feedback_fts
+                        JOIN feedback_history f ON f.id = feedback_fts.rowid
+                        WHERE feedback_fts MATCH ? {''.join(' AND ' + f for f in filters)}
+                        ORDER BY score
                         LIMIT ?
-                    ''', (content_type, limit))
+                    ''', [match] + params + [limit])
                 else:
-                    cursor.execute('''
-                        SELECT * FROM feedback_history 
-                        ORDER BY timestamp DESC 
+                    for term in terms:
+                        filters.append("(f.content_text LIKE ? OR f.original_prompt LIKE ?)")
+                        pattern = f"%{term.rstrip('*')}%"
+                        params.extend([pattern, pattern])
+                    cursor.execute(f'''
+                        SELECT {columns}, substr(f.content_text, 1, 120), 0.0
+                        FROM feedback_history f
+                        WHERE {' AND '.join(filters)}
+                        ORDER BY f.timestamp DESC
                         LIMIT ?
-                    ''', (limit,))
-                
+                    ''', params + [limit])
+
                 rows = cursor.fetchall()
-                
-                feedback = []
-                for row in rows:
-                    metadata = json.loads(row[8]) if row[8] else {}
-                    feedback.append({
-                        'id': row[0],
-                        'timestamp': row[1],
-                        'content_type': row[2],
-                        'content_text': row[3],
-                        'user_action': row[4],
-                        'original_prompt': row[5],
-                        'generation_time': row[6],
-                        'content_hash': row[7],
-                        'metadata': metadata
-                    })
-                
-                return feedback
-                
+
+            results = []
+            for row in rows:
+                result = self._feedback_from_row(row)
+                result['snippet'] = row[len(FEEDBACK_COLUMNS)]
+                # bm25() is lower for better matches; flip it so higher is better
+                result['score'] = round(-row[len(FEEDBACK_COLUMNS) + 1], 4) or 0.0
+                results.append(result)
+
+            return results
+
         except sqlite3.Error as e:
-            logger.error(f"Error retrieving recent feedback: {e}")
+            logger.error(f"Error searching feedback: {e}")
             return []
+
+    def _index_content(self, cursor: sqlite3.Cursor, feedback_id: int, content_type: str, signature: np.ndarray):
+        """Store the MinHash signature of accepted content."""
+        try:
+            cursor.execute('''
+                INSERT OR REPLACE INTO content_signatures (feedback_id, content_type, signature)
+                VALUES (?, ?, ?)
+            ''', (feedback_id, content_type, signature.tobytes()))
+                    
+        except sqlite3.Error as e:
+            logger.error(f"Error indexing content signature: {e}")
     
-    def get_database_info(self) -> Dict[str, Any]:
-        """Get general database information."""
+    def _get_duplicate_index(self) -> Dict[str, MinHashLSH]:
+        """Get the duplicate index, loading the stored signatures on first use."""
+        with self._duplicate_lock:
+            if self._duplicate_index is None:
+                index = {}
+                with self._connect() as conn:
+                    for feedback_id, content_type, signature in conn.execute(
+                        'SELECT feedback_id, content_type, signature FROM content_signatures'
+                    ):
+                        index.setdefault(content_type, MinHashLSH()).insert(
+                            feedback_id, np.frombuffer(signature, dtype=np.uint32)
+                        )
+                self._duplicate_index = index
+            return self._duplicate_index
+    
+    def find_near_duplicates(self, content_type: str, content_text: str,
+                             threshold: float = NEAR_DUPLICATE_THRESHOLD, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Find previously accepted content that new content nearly repeats.
+        
+        Args:
+            content_type: Type of the new content
+            content_text: The new content
+            threshold: Minimum estimated Jaccard similarity of word shingles
+            limit: Maximum number of matches
+            
+        Returns:
+            List of dicts with 'feedback_id', 'similarity', 'timestamp' and
+            'content_text' of each match, most similar first
+        """
+        if not content_text.strip():
+            return []
+        try:
+            index = self._get_duplicate_index().get(content_type)
+            if not index:
+                return []
+            
+            with self._duplicate_lock:
+                matches = index.query(self.minhasher.signature(content_text), threshold)[:limit]
+            if not matches:
+                return []
+            
+            with self._connect() as conn:
+                rows = conn.execute(f'''
+                    SELECT id, timestamp, content_text FROM feedback_history
+                    WHERE id IN ({','.join('?' * len(matches))})
+                ''', [feedback_id for feedback_id, _ in matches]).fetchall()
+            records = {row[0]: row for row in rows}
+            
+            return [{
+                'feedback_id': feedback_id,
+                'similarity': similarity,
+                'timestamp': records[feedback_id][1],
+                'content_text': records[feedback_id][2]
+            } for feedback_id, similarity in matches if feedback_id in records]
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error finding near duplicates: {e}")
+            return []
+    
+    def get_rejection_directions(self, content_type: str, limit: int = 200) -> List[Tuple[str, int]]:
+        """Get rejection directions for a content type, most frequent first."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                
-                cursor.execute('SELECT COUNT(*) FROM feedback_history')
-                total_feedback = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM generation_stats')
-                content_types = cursor.fetchone()[0]
-                
                 cursor.execute('''
-                    SELECT MIN(timestamp), MAX(timestamp) FROM feedback_history
-                ''')
-                date_range = cursor.fetchone()
-                
-                return {
-                    'database_path': self.db_path,
-                    'total_feedback_records': total_feedback,
-                    'content_types_tracked': content_types,
-                    'earliest_record': date_range[0],
-                    'latest_record': date_range[1],
-                    'max_records_limit': self.max_records
-                }
+                    SELECT metadata FROM feedback_history 
+                    WHERE content_type = ? AND user_action = 'reject' AND metadata IS NOT NULL
+                    ORDER BY timestamp DESC 
+                    LIMIT ?
+                ''', (content_type, limit))
+                rows = cursor.fetchall()
+            
+            counts = Counter()
+            for row in rows:
+                try:
+                    reason = json.loads(row[0]).get('revision_reason', '')
+                except (ValueError, AttributeError):
+                    continue
+                if reason:
+                    counts.update(classify_revision_reason(reason))
+            
+            return counts.most_common()
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving rejection directions: {e}")
+            return []
+    
+    def get_database_info(self) -> Dict[str, Any]:
+        """Get general database information."""
+        try:
+            with self._connect() as conn:
+                return self._query_database_info(conn.cursor())
                 
         except sqlite3.Error as e:
             logger.error(f"Error retrieving database info: {e}")
             return {}
     
+    def _query_database_info(self, cursor: sqlite3.Cursor) -> Dict[str, Any]:
+        """Query general database information with an open cursor."""
+        cursor.execute('SELECT COUNT(*) FROM feedback_history')
+        total_feedback = cursor.fetchone()[0]
+        
+        cursor.execute('SELECT COUNT(*) FROM generation_stats')
+        content_types = cursor.fetchone()[0]
+        
+        cursor.execute('''
+            SELECT MIN(timestamp), MAX(timestamp) FROM feedback_history
+        ''')
+        date_range = cursor.fetchone()
+        
+        return {
+            'database_path': self.db_path,
+            'total_feedback_records': total_feedback,
+            'content_types_tracked': content_types,
+            'earliest_record': date_range[0],
+            'latest_record': date_range[1],
+            'max_records_limit': self.max_records
+        }
+    
     def get_edit_patterns(self, content_type: Optional[str] = None, min_frequency: int = 2) -> List[Dict[str, Any]]:
         """Get discovered edit patterns."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if content_type:
-                    cursor.execute('''
-                        SELECT edit_type, pattern_description, frequency, examples, last_seen
-                        FROM edit_patterns 
-                        WHERE content_type = ? AND frequency >= ?
-                        ORDER BY frequency DESC
-                    ''', (content_type, min_frequency))
-                else:
-                    cursor.execute('''
-                        SELECT content_type, edit_type, pattern_description, frequency, examples, last_seen
-                        FROM edit_patterns 
-                        WHERE frequency >= ?
-                        ORDER BY content_type, frequency DESC
-                    ''', (min_frequency,))
-                
-                rows = cursor.fetchall()
-                
-                patterns = []
-                for row in rows:
-                    if content_type:
-                        pattern = {
-                            'edit_type': row[0],
-                            'description': row[1],
-                            'frequency': row[2],
-                            'examples': json.loads(row[3]) if row[3] else [],
-                            'last_seen': row[4]
-                        }
-                    else:
-                        pattern = {
-                            'content_type': row[0],
-                            'edit_type': row[1],
-                            'description': row[2],
-                            'frequency': row[3],
-                            'examples': json.loads(row[4]) if row[4] else [],
-                            'last_seen': row[5]
-                        }
-                    patterns.append(pattern)
-                
-                return patterns
+            with self._connect() as conn:
+                return self._query_edit_patterns(conn.cursor(), content_type, min_frequency)
                 
         except sqlite3.Error as e:
             logger.error(f"Error retrieving edit patterns: {e}")
             return []
     
+    def _query_edit_patterns(self, cursor: sqlite3.Cursor, content_type: Optional[str] = None, min_frequency: int = 2) -> List[Dict[str, Any]]:
+        """Query discovered edit patterns with an open cursor."""
+        if content_type:
+            cursor.execute('''
+                SELECT edit_type, pattern_description, frequency, examples, last_seen
+                FROM edit_patterns 
+                WHERE content_type = ? AND frequency >= ?
+                ORDER BY frequency DESC
+            ''', (content_type, min_frequency))
+        else:
+            cursor.execute('''
+                SELECT content_type, edit_type, pattern_description, frequency, examples, last_seen
+                FROM edit_patterns 
+                WHERE frequency >= ?
+                ORDER BY content_type, frequency DESC
+            ''', (min_frequency,))
+        
+        rows = cursor.fetchall()
+        
+        patterns = []
+        for row in rows:
+            if content_type:
+                pattern = {
+                    'edit_type': row[0],
+                    'description': row[1],
+                    'frequency': row[2],
+                    'examples': json.loads(row[3]) if row[3] else [],
+                    'last_seen': row[4]
+                }
+            else:
+                pattern = {
+                    'content_type': row[0],
+                    'edit_type': row[1],
+                    'description': row[2],
+                    'frequency': row[3],
+                    'examples': json.loads(row[4]) if row[4] else [],
+                    'last_seen': row[5]
+                }
+            patterns.append(pattern)
+        
+        return patterns
+    
     def get_quality_analysis(self, content_type: Optional[str] = None) -> Dict[str, Any]:
         """Get quality metrics analysis."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if content_type:
-                    cursor.execute('''
-                        SELECT user_action, AVG(readability_score), AVG(complexity_score), 
-                               AVG(length_words), COUNT(*) as count
-                        FROM quality_metrics 
-                        WHERE content_type = ?
-                        GROUP BY user_action
-                    ''', (content_type,))
-                else:
-                    cursor.execute('''
-                        SELECT content_type, user_action, AVG(readability_score), AVG(complexity_score), 
-                               AVG(length_words), COUNT(*) as count
-                        FROM quality_metrics 
-                        GROUP BY content_type, user_action
-                    ''')
-                
-                rows = cursor.fetchall()
-                
-                analysis = {}
-                for row in rows:
-                    if content_type:
-                        key = row[0]  # user_action
-                        analysis[key] = {
-                            'avg_readability': round(row[1], 2) if row[1] else 0,
-                            'avg_complexity': round(row[2], 2) if row[2] else 0,
-                            'avg_length': round(row[3], 2) if row[3] else 0,
-                            'sample_count': row[4]
-                        }
-                    else:
-                        content_key = row[0]
-                        action_key = row[1]
-                        if content_key not in analysis:
-                            analysis[content_key] = {}
-                        analysis[content_key][action_key] = {
-                            'avg_readability': round(row[2], 2) if row[2] else 0,
-                            'avg_complexity': round(row[3], 2) if row[3] else 0,
-                            'avg_length': round(row[4], 2) if row[4] else 0,
-                            'sample_count': row[5]
-                        }
-                
-                return analysis
+            with self._connect() as conn:
+                return self._query_quality_analysis(conn.cursor(), content_type)
                 
         except sqlite3.Error as e:
             logger.error(f"Error retrieving quality analysis: {e}")
             return {}
     
-    def get_user_preferences(self, content_type: Optional[str] = None, min_confidence: float = 0.5) -> Dict[str, Any]:
-        """Get learned user preferences."""
+    def _query_quality_analysis(self, cursor: sqlite3.Cursor, content_type: Optional[str] = None) -> Dict[str, Any]:
+        """Query quality metrics analysis with an open cursor."""
+        if content_type:
+            cursor.execute('''
+                SELECT user_action, AVG(readability_score), AVG(complexity_score), 
+                       AVG(length_words), COUNT(*) as count
+                FROM quality_metrics 
+                WHERE content_type = ?
+                GROUP BY user_action
+            ''', (content_type,))
+        else:
+            cursor.execute('''
+                SELECT content_type, user_action, AVG(readability_score), AVG(complexity_score), 
+                       AVG(length_words), COUNT(*) as count
+                FROM quality_metrics 
+                GROUP BY content_type, user_action
+            ''')
+        
+        rows = cursor.fetchall()
+        
+        analysis = {}
+        for row in rows:
+            if content_type:
+                key = row[0]  # user_action
+                analysis[key] = {
+                    'avg_readability': round(row[1], 2) if row[1] else 0,
+                    'avg_complexity': round(row[2], 2) if row[2] else 0,
+                    'avg_length': round(row[3], 2) if row[3] else 0,
+                    'sample_count': row[4]
+                }
+            else:
+                content_key = row[0]
+                action_key = row[1]
+                if content_key not in analysis:
+                    analysis[content_key] = {}
+                analysis[content_key][action_key] = {
+                    'avg_readability': round(row[2], 2) if row[2] else 0,
+                    'avg_complexity': round(row[3], 2) if row[3] else 0,
+                    'avg_length': round(row[4], 2) if row[4] else 0,
+                    'sample_count': row[5]
+                }
+        
+        return analysis
+
+    def recompute_quality_metrics(self) -> int:
+        """
+        Re-score all stored quality metrics with the current scoring formulas.
+
+        Rows recorded before counts were stored are counted once from their
+        feedback text; every row is then re-scored in one vectorized pass.
+
+        Returns:
+            Number of quality metric rows updated
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                
-                if content_type:
-                    cursor.execute('''
-                        SELECT preference_type, preference_value, confidence_score, last_updated
-                        FROM user_preferences 
-                        WHERE content_type = ? AND confidence_score >= ?
-                        ORDER BY confidence_score DESC
-                    ''', (content_type, min_confidence))
-                else:
-                    cursor.execute('''
-                        SELECT content_type, preference_type, preference_value, confidence_score, last_updated
-                        FROM user_preferences 
-                        WHERE confidence_score >= ?
-                        ORDER BY content_type, confidence_score DESC
-                    ''', (min_confidence,))
-                
+
+                # Backfill counts for rows that predate stored counts
+                cursor.execute('''
+                    SELECT q.id, f.content_text
+                    FROM quality_metrics q
+                    JOIN feedback_history f ON f.id = q.feedback_id
+                    WHERE q.sentence_count IS NULL OR q.syllable_count IS NULL
+                ''')
+                backfill = []
+                for metric_id, content_text in cursor.fetchall():
+                    counts = text_metrics.counts(content_text)
+                    backfill.append((counts['chars'], counts['words'], counts['sentences'],
+                                     counts['syllables'], metric_id))
+                cursor.executemany('''
+                    UPDATE quality_metrics
+                    SET length_chars = ?, length_words = ?, sentence_count = ?, syllable_count = ?
+                    WHERE id = ?
+                ''', backfill)
+
+                cursor.execute('''
+                    SELECT id, length_words, sentence_count, syllable_count
+                    FROM quality_metrics
+                    WHERE sentence_count IS NOT NULL AND syllable_count IS NOT NULL
+                ''')
                 rows = cursor.fetchall()
-                
-                preferences = {}
-                for row in rows:
-                    if content_type:
-                        preferences[row[0]] = {
-                            'value': row[1],
-                            'confidence': round(row[2], 2),
-                            'last_updated': row[3]
-                        }
-                    else:
-                        content_key = row[0]
-                        if content_key not in preferences:
-                            preferences[content_key] = {}
-                        preferences[content_key][row[1]] = {
-                            'value': row[2],
-                            'confidence': round(row[3], 2),
-                            'last_updated': row[4]
-                        }
-                
-                return preferences
+                if not rows:
+                    conn.commit()
+                    return 0
+
+                ids, words, sentences, syllables = (np.array(column) for column in zip(*rows))
+                scores = score_counts(words, sentences, syllables)
+
+                cursor.executemany('''
+                    UPDATE quality_metrics
+                    SET readability_score = ?, complexity_score = ?
+                    WHERE id = ?
+                ''', zip(scores['readability'].tolist(), scores['complexity'].tolist(), ids.tolist()))
+                conn.commit()
+
+                logger.info(f"Recomputed quality metrics for {len(rows)} records "
+                            f"({len(backfill)} backfilled from feedback history)")
+                return len(rows)
+
+        except sqlite3.Error as e:
+            logger.error(f"Error recomputing quality metrics: {e}")
+            return 0
+
+    def get_user_preferences(self, content_type: Optional[str] = None, min_confidence: float = 0.5) -> Dict[str, Any]:
+        """Get learned user preferences."""
+        try:
+            with self._connect() as conn:
+                return self._query_user_preferences(conn.cursor(), content_type, min_confidence)
                 
         except sqlite3.Error as e:
             logger.error(f"Error retrieving user preferences: {e}")
             return {}
     
+    def _query_user_preferences(self, cursor: sqlite3.Cursor, content_type: Optional[str] = None, min_confidence: float = 0.5) -> Dict[str, Any]:
+        """
+        Query learned user preferences with an open cursor.
+        
+        Confidence is decayed to the current time, so preferences that
+        have not been seen for a while fade back towards the prior.
+        Numeric preferences also report the mean and standard deviation
+        of their values.
+        """
+        prior_strength = self.config.preference_prior_strength
+        prior_a = self.config.preference_prior_confidence * prior_strength
+        params = {
+            'now': datetime.now().isoformat(),
+            'half_life': self.config.preference_half_life_days,
+            'prior_a': prior_a,
+            'prior_b': prior_strength - prior_a,
+            'content_type': content_type,
+            'min_confidence': min_confidence,
+        }
+        cursor.execute('''
+            SELECT content_type, preference_type, preference_value, confidence, last_updated,
+                   observations * weight, value_mean, value_m2 / observations
+            FROM (
+                SELECT *, (evidence * weight + :prior_a) / (observations * weight + :prior_a + :prior_b) AS confidence
+                FROM (
+                    SELECT *, decay(julianday(:now) - julianday(last_updated), :half_life) AS weight
+                    FROM user_preferences
+                    WHERE :content_type IS NULL OR content_type = :content_type
+                )
+            )
+            WHERE confidence >= :min_confidence
+            ORDER BY content_type, confidence DESC
+        ''', params)
+        
+        rows = cursor.fetchall()
+        
+        preferences = {}
+        for row in rows:
+            preference = {
+                'value': row[2],
+                'confidence': round(row[3], 2),
+                'last_updated': row[4],
+                'observations': round(row[5], 1),
+            }
+            if row[6] is not None:
+                preference['mean'] = round(row[6], 1)
+                preference['std'] = round(math.sqrt(max(row[7], 0.0)), 1)
+            
+            if content_type:
+                preferences[row[1]] = preference
+            else:
+                preferences.setdefault(row[0], {})[row[1]] = preference
+        
+        return preferences
+    
     def get_learning_insights(self, content_type: str) -> Dict[str, Any]:
         """Get comprehensive learning insights for a content type."""
         try:
-            insights = {
-                'generation_stats': self.get_generation_stats(content_type),
-                'edit_patterns': self.get_edit_patterns(content_type),
-                'quality_analysis': self.get_quality_analysis(content_type),
-                'user_preferences': self.get_user_preferences(content_type),
-                'recommendations': []
-            }
-            
-            # Generate recommendations based on patterns
-            recommendations = []
-            
-            # Quality-based recommendations
-            quality = insights['quality_analysis']
-            if 'accept' in quality and 'reject' in quality:
-                accepted = quality['accept']
-                rejected = quality['reject']
-                
-                if accepted['avg_readability'] > rejected['avg_readability']:
-                    recommendations.append(f"User prefers readability score around {accepted['avg_readability']}")
-                
-                if accepted['avg_length'] != rejected['avg_length']:
-                    if accepted['avg_length'] > rejected['avg_length']:
-                        recommendations.append(f"User prefers longer content (~{int(accepted['avg_length'])} words)")
-                    else:
-                        recommendations.append(f"User prefers shorter content (~{int(accepted['avg_length'])} words)")
-            
-            # Pattern-based recommendations
-            patterns = insights['edit_patterns']
-            if patterns:
-                for pattern in patterns[:3]:  # Top 3 patterns
-                    if pattern['frequency'] >= 3:
-                        recommendations.append(f"Common edit: {pattern['description']}")
-            
-            # Preference-based recommendations
-            preferences = insights['user_preferences']
-            for pref_type, pref_data in preferences.items():
-                if pref_data['confidence'] >= 0.7:
-                    recommendations.append(f"Strong preference: {pref_type} = {pref_data['value']}")
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                insights = {
+                    'generation_stats': self._query_generation_stats(cursor, content_type),
+                    'edit_patterns': self._query_edit_patterns(cursor, content_type),
+                    'quality_analysis': self._query_quality_analysis(cursor, content_type),
+                    'user_preferences': self._query_user_preferences(cursor, content_type),
+                }
             
-            insights['recommendations'] = recommendations
+            insights['recommendations'] = self._build_recommendations(
+                insights['quality_analysis'], insights['edit_patterns'], insights['user_preferences']
+            )
             return insights
             
         except Exception as e:
             logger.error(f"Error generating learning insights: {e}")
             return {}
     
+    @staticmethod
+    def _build_recommendations(quality: Dict[str, Any], patterns: List[Dict[str, Any]],
+                               preferences: Dict[str, Any]) -> List[str]:
+        """Build recommendations from a content type's quality analysis, edit patterns and preferences."""
+        # Generate recommendations based on patterns
+        recommendations = []
+        
+        # Quality-based recommendations
+        if 'accept' in quality and 'reject' in quality:
+            accepted = quality['accept']
+            rejected = quality['reject']
+        
+            if accepted['avg_readability'] > rejected['avg_readability']:
+                recommendations.append(f"User prefers readability score around {accepted['avg_readability']}")
+        
+            if accepted['avg_length'] != rejected['avg_length']:
+                if accepted['avg_length'] > rejected['avg_length']:
+                    recommendations.append(f"User prefers longer content (~{int(accepted['avg_length'])} words)")
+                else:
+                    recommendations.append(f"User prefers shorter content (~{int(accepted['avg_length'])} words)")
+        
+        # Pattern-based recommendations
+        if patterns:
+            for pattern in patterns[:3]:  # Top 3 patterns
+                if pattern['frequency'] >= 3:
+                    recommendations.append(f"Common edit: {pattern['description']}")
+        
+        # Preference-based recommendations
+        for pref_type, pref_data in preferences.items():
+            if pref_data['confidence'] >= 0.7:
+                recommendations.append(f"Strong preference: {pref_type} = {pref_data['value']}")
+        
+        return recommendations
+    
     def get_prompt_enhancements(self, content_type: str) -> str:
         """Generate prompt enhancements based on learned user preferences."""
         try:
-            preferences = self.get_user_preferences(content_type, min_confidence=0.4)
-            patterns = self.get_edit_patterns(content_type, min_frequency=2)
-            quality = self.get_quality_analysis(content_type)
-            
-            enhancements = []
-            
-            # Add length preferences
-            if 'preferred_length' in preferences and preferences['preferred_length']['confidence'] >= 0.5:
-                target_length = int(preferences['preferred_length']['value'])
-                enhancements.append(f"Target approximately {target_length} words based on user preferences.")
-            
-            # Add readability preferences
-            if 'preferred_readability' in preferences and preferences['preferred_readability']['confidence'] >= 0.5:
-                target_readability = float(preferences['preferred_readability']['value'])
-                if target_readability > 60:
-                    enhancements.append("Use clear, accessible language (user prefers higher readability).")
-                elif target_readability < 40:
-                    enhancements.append("Use more sophisticated, complex language (user prefers lower readability).")
-            
-            # Add formatting preferences
-            formatting_prefs = []
-            if 'uses_bold' in preferences and preferences['uses_bold']['confidence'] >= 0.5:
-                formatting_prefs.append("Use **bold** formatting for key terms")
-            if 'uses_bullets' in preferences and preferences['uses_bullets']['confidence'] >= 0.5:
-                formatting_prefs.append("Use bullet points or lists when appropriate")
-            if 'prefers_paragraphs' in preferences and preferences['prefers_paragraphs']['confidence'] >= 0.5:
-                formatting_prefs.append("Structure content in clear paragraphs")
-            
-            if formatting_prefs:
-                enhancements.append(f"Formatting preferences: {', '.join(formatting_prefs)}.")
-            
-            # Add content preferences based on rejection patterns
-            avoid_prefs = []
-            if 'avoid_long_content' in preferences:
-                avoid_prefs.append("avoid overly lengthy explanations")
-            if 'avoid_short_content' in preferences:
-                avoid_prefs.append("provide comprehensive detail")
-            if 'avoid_technical' in preferences:
-                avoid_prefs.append("use accessible, non-technical language")
-            if 'avoid_simple' in preferences:
-                avoid_prefs.append("include technical depth and complexity")
-            
-            if avoid_prefs:
-                enhancements.append(f"Content preferences: {', '.join(avoid_prefs)}.")
-            
-            # Add insights from edit patterns
-            edit_insights = []
-            for pattern in patterns[:2]:  # Top 2 most frequent patterns
-                if pattern['edit_type'] == 'vocabulary_addition' and pattern['frequency'] >= 3:
-                    edit_insights.append("User often adds technical vocabulary")
-                elif pattern['edit_type'] == 'formatting' and pattern['frequency'] >= 3:
-                    edit_insights.append("User frequently adjusts formatting")
-                elif pattern['edit_type'] == 'length_increase' and pattern['frequency'] >= 3:
-                    edit_insights.append("User often expands content length")
-                elif pattern['edit_type'] == 'length_decrease' and pattern['frequency'] >= 3:
-                    edit_insights.append("User often shortens content")
-            
-            if edit_insights:
-                enhancements.append(f"Based on edit history: {', '.join(edit_insights)}.")
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                preferences = self._query_user_preferences(cursor, content_type, min_confidence=0.4)
+                patterns = self._query_edit_patterns(cursor, content_type, min_frequency=2)
             
-            # Combine all enhancements
-            if enhancements:
-                enhancement_text = "\n\nUSER PREFERENCE ADJUSTMENTS:\n" + "\n".join(f"- {enhancement}" for enhancement in enhancements)
-                return enhancement_text
-            else:
-                return ""
+            return self._build_prompt_enhancements(preferences, patterns)
                 
         except Exception as e:
             logger.error(f"Error generating prompt enhancements: {e}")
-            return ""
\ No newline at end of file
+            return ""
+    
+    @staticmethod
+    def _build_prompt_enhancements(preferences: Dict[str, Any], patterns: List[Dict[str, Any]]) -> str:
+        """Build prompt enhancements from a content type's preferences (confidence >= 0.4) and edit patterns."""
+        enhancements = []
+        
+        # Add length preferences
+        if 'preferred_length' in preferences and preferences['preferred_length']['confidence'] >= 0.5:
+            length = preferences['preferred_length']
+            target_length = int(round(length.get('mean', float(length['value']))))
+            spread = int(round(length.get('std', 0)))
+            if spread and length['observations'] >= 2:
+                enhancements.append(f"Target approximately {target_length} words based on user preferences "
+                                    f"(accepted content usually runs {max(target_length - spread, 1)}-"
+                                    f"{target_length + spread} words).")
+            else:
+                enhancements.append(f"Target approximately {target_length} words based on user preferences.")
+        
+        # Add readability preferences
+        if 'preferred_readability' in preferences and preferences['preferred_readability']['confidence'] >= 0.5:
+            readability = preferences['preferred_readability']
+            target_readability = readability.get('mean', float(readability['value']))
+            if target_readability > 60:
+                enhancements.append("Use clear, accessible language (user prefers higher readability).")
+            elif target_readability < 40:
+                enhancements.append("Use more sophisticated, complex language (user prefers lower readability).")
+        
+        # Add formatting preferences
+        formatting_prefs = []
+        if 'uses_bold' in preferences and preferences['uses_bold']['confidence'] >= 0.5:
+            formatting_prefs.append("Use **bold** formatting for key terms")
+        if 'uses_bullets' in preferences and preferences['uses_bullets']['confidence'] >= 0.5:
+            formatting_prefs.append("Use bullet points or lists when appropriate")
+        if 'prefers_paragraphs' in preferences and preferences['prefers_paragraphs']['confidence'] >= 0.5:
+            formatting_prefs.append("Structure content in clear paragraphs")
+        
+        if formatting_prefs:
+            enhancements.append(f"Formatting preferences: {', '.join(formatting_prefs)}.")
+        
+        # Add content preferences based on rejection patterns
+        avoid_prefs = []
+        if 'avoid_long_content' in preferences:
+            avoid_prefs.append("avoid overly lengthy explanations")
+        if 'avoid_short_content' in preferences:
+            avoid_prefs.append("provide comprehensive detail")
+        if 'avoid_technical' in preferences:
+            avoid_prefs.append("use accessible, non-technical language")
+        if 'avoid_simple' in preferences:
+            avoid_prefs.append("include technical depth and complexity")
+        
+        if avoid_prefs:
+            enhancements.append(f"Content preferences: {', '.join(avoid_prefs)}.")
+        
+        # Add insights from edit patterns
+        edit_insights = []
+        for pattern in patterns[:2]:  # Top 2 most frequent patterns
+            if pattern['edit_type'] == 'vocabulary_addition' and pattern['frequency'] >= 3:
+                edit_insights.append("User often adds technical vocabulary")
+            elif pattern['edit_type'] == 'formatting' and pattern['frequency'] >= 3:
+                edit_insights.append("User frequently adjusts formatting")
+            elif pattern['edit_type'] == 'length_increase' and pattern['frequency'] >= 3:
+                edit_insights.append("User often expands content length")
+            elif pattern['edit_type'] == 'length_decrease' and pattern['frequency'] >= 3:
+                edit_insights.append("User often shortens content")
+        
+        if edit_insights:
+            enhancements.append(f"Based on edit history: {', '.join(edit_insights)}.")
+        
+        # Combine all enhancements
+        if enhancements:
+            enhancement_text = "\n\nUSER PREFERENCE ADJUSTMENTS:\n" + "\n".join(f"- {enhancement}" for enhancement in enhancements)
+            return enhancement_text
+        else:
+            return ""
+    
+    def get_dashboard_snapshot(self) -> Dict[str, Any]:
+        """
+        Get everything the analytics dashboard shows, read in one transaction.
+        
+        The snapshot is cached on a persistent connection and rebuilt when
+        SQLite's data_version shows another connection has committed a
+        change since it was taken, or once it is older than
+        DASHBOARD_SNAPSHOT_MAX_AGE, because preference confidence decays with
+        time even without writes. The returned dictionary is shared between
+        callers and must not be modified.
+        
+        Returns:
+            Dictionary with 'database' info, all 'generation_stats',
+            'recent_feedback' (last 10), and 'content_types' mapping each
+            content type to its generation stats, quality analysis, edit
+            patterns, preferences, recommendations and prompt enhancements
+        """
+        with self._snapshot_lock:
+            try:
+                if self._snapshot_conn is None:
+                    self._snapshot_conn = self._connect(check_same_thread=False)
+                conn = self._snapshot_conn
+                
+                data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+                if self._snapshot is not None and self._snapshot['data_version'] == data_version \
+                        and time.monotonic() - self._snapshot_built_at < self.config.dashboard_snapshot_max_age:
+                    return self._snapshot
+                
+                cursor = conn.cursor()
+                cursor.execute('BEGIN')
+                try:
+                    database = self._query_database_info(cursor)
+                    generation_stats = self._query_generation_stats(cursor)
+                    quality = self._query_quality_analysis(cursor)
+                    patterns = self._query_edit_patterns(cursor, min_frequency=2)
+                    # Lowest confidence used by any consumer; the dashboard itself shows >= 0.5
+                    preferences = self._query_user_preferences(cursor, min_confidence=0.4)
+                    recent_feedback = self._query_recent_feedback(cursor, limit=10)
+                finally:
+                    conn.rollback()
+                
+            except sqlite3.Error as e:
+                logger.error(f"Error building dashboard snapshot: {e}")
+                return {}
+            
+            content_types = {}
+            names = dict.fromkeys([stat['content_type'] for stat in generation_stats] +
+                                  list(quality) + [p['content_type'] for p in patterns] + list(preferences))
+            for content_type in names:
+                type_patterns = [{key: value for key, value in pattern.items() if key != 'content_type'}
+                                 for pattern in patterns if pattern['content_type'] == content_type]
+                type_preferences = preferences.get(content_type, {})
+                confident_preferences = {pref_type: pref_data for pref_type, pref_data in type_preferences.items()
+                                         if pref_data['confidence'] >= 0.5}
+                type_quality = quality.get(content_type, {})
+                
+                content_types[content_type] = {
+                    'generation_stats': [stat for stat in generation_stats if stat['content_type'] == content_type],
+                    'quality_analysis': type_quality,
+                    'edit_patterns': type_patterns,
+                    'user_preferences': confident_preferences,
+                    'recommendations': self._build_recommendations(type_quality, type_patterns, confident_preferences),
+                    'prompt_enhancements': self._build_prompt_enhancements(type_preferences, type_patterns),
+                }
+            
+            self._snapshot_built_at = time.monotonic()
+            self._snapshot = {
+                'data_version': data_version,
+                'taken_at': datetime.now().isoformat(),
+                'database': database,
+                'generation_stats': generation_stats,
+                'content_types': content_types,
+                'recent_feedback': recent_feedback,
+            }
+            return self._snapshot
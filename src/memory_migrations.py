@@ -0,0 +1,278 @@
+"""
+Memory Schema Migrations for ContentAgent.
+
+This module upgrades the memory database schema in place. Each migration
+moves the schema up by one version and runs in its own transaction; the
+versions applied so far are recorded in the schema_version table, so
+existing databases pick up schema changes the next time they are opened.
+
+To change the schema, append a migration to MIGRATIONS. Never edit a
+migration that has already shipped.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from src.text_metrics import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _column_names(cursor: sqlite3.Cursor, table: str) -> set:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _create_initial_schema(cursor: sqlite3.Cursor):
+    """Create the original tables and indexes."""
+    # IF NOT EXISTS: databases created before versioning already have them
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            content_type TEXT NOT NULL,
+            content_text TEXT NOT NULL,
+            user_action TEXT NOT NULL,
+            original_prompt TEXT,
+            generation_time REAL,
+            content_hash TEXT,
+            metadata TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS generation_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_type TEXT NOT NULL,
+            total_generated INTEGER DEFAULT 0,
+            total_accepted INTEGER DEFAULT 0,
+            total_rejected INTEGER DEFAULT 0,
+            total_edited INTEGER DEFAULT 0,
+            avg_generation_time REAL DEFAULT 0.0,
+            last_updated TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS edit_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_type TEXT NOT NULL,
+            edit_type TEXT NOT NULL,
+            pattern_description TEXT,
+            frequency INTEGER DEFAULT 1,
+            examples TEXT,
+            last_seen TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS quality_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feedback_id INTEGER,
+            content_type TEXT NOT NULL,
+            user_action TEXT NOT NULL,
+            readability_score REAL,
+            complexity_score REAL,
+            length_chars INTEGER,
+            length_words INTEGER,
+            timestamp TEXT NOT NULL,
+            FOREIGN KEY (feedback_id) REFERENCES feedback_history (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_type TEXT NOT NULL,
+            preference_type TEXT NOT NULL,
+            preference_value TEXT,
+            confidence_score REAL DEFAULT 0.0,
+            last_updated TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback_history(timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_content_type ON feedback_history(content_type)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_action ON feedback_history(user_action)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_edit_patterns_type ON edit_patterns(content_type, edit_type)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_quality_metrics_type ON quality_metrics(content_type, user_action)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_preferences_type ON user_preferences(content_type, preference_type)')
+
+
+def _add_quality_metric_counts(cursor: sqlite3.Cursor):
+    """Store sentence and syllable counts so scores can be recomputed without the text."""
+    columns = _column_names(cursor, 'quality_metrics')
+    for column in ('sentence_count', 'syllable_count'):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE quality_metrics ADD COLUMN {column} INTEGER")
+
+
+def _add_stable_content_hashes(cursor: sqlite3.Cursor):
+    """Rehash content with sha256, index the hashes and add near-duplicate signatures."""
+    # Older records used Python's per-process hash(), which cannot be looked up again
+    cursor.execute("SELECT id, content_text FROM feedback_history WHERE content_hash IS NULL OR length(content_hash) != 64")
+    cursor.executemany("UPDATE feedback_history SET content_hash = ? WHERE id = ?",
+                       [(content_hash(text), row_id) for row_id, text in cursor.fetchall()])
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_content_hash ON feedback_history(content_hash)')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS content_signatures (
+            feedback_id INTEGER PRIMARY KEY,
+            content_type TEXT NOT NULL,
+            signature BLOB NOT NULL,
+            FOREIGN KEY (feedback_id) REFERENCES feedback_history (id)
+        )
+    ''')
+
+
+def _add_unique_pattern_and_preference_keys(cursor: sqlite3.Cursor):
+    """Merge duplicate rows and make edit pattern and preference keys unique for UPSERTs."""
+    # Duplicate patterns keep the oldest row, with the combined frequency and latest sighting
+    cursor.execute('''
+        UPDATE edit_patterns
+        SET frequency = (SELECT SUM(e.frequency) FROM edit_patterns e
+                         WHERE e.content_type = edit_patterns.content_type
+                           AND e.edit_type = edit_patterns.edit_type
+                           AND e.pattern_description IS edit_patterns.pattern_description),
+            last_seen = (SELECT MAX(e.last_seen) FROM edit_patterns e
+                         WHERE e.content_type = edit_patterns.content_type
+                           AND e.edit_type = edit_patterns.edit_type
+                           AND e.pattern_description IS edit_patterns.pattern_description)
+        WHERE id IN (SELECT MIN(id) FROM edit_patterns
+                     GROUP BY content_type, edit_type, pattern_description HAVING COUNT(*) > 1)
+    ''')
+    cursor.execute('''
+        DELETE FROM edit_patterns
+        WHERE id NOT IN (SELECT MIN(id) FROM edit_patterns
+                         GROUP BY content_type, edit_type, pattern_description)
+    ''')
+    cursor.execute('DROP INDEX IF EXISTS idx_edit_patterns_type')
+    cursor.execute('''
+        CREATE UNIQUE INDEX idx_edit_patterns_type
+        ON edit_patterns(content_type, edit_type, pattern_description)
+    ''')
+
+    # Duplicate preferences keep the most recently updated value
+    cursor.execute('''
+        DELETE FROM user_preferences
+        WHERE id NOT IN (SELECT MAX(id) FROM user_preferences
+                         GROUP BY content_type, preference_type)
+    ''')
+    cursor.execute('DROP INDEX IF EXISTS idx_user_preferences_type')
+    cursor.execute('''
+        CREATE UNIQUE INDEX idx_user_preferences_type
+        ON user_preferences(content_type, preference_type)
+    ''')
+
+
+def _add_unique_generation_stats_key(cursor: sqlite3.Cursor):
+    """Merge duplicate generation stats rows and make content types unique for UPSERTs."""
+    # Concurrent first inserts could create several rows for one content type
+    cursor.execute('''
+        UPDATE generation_stats
+        SET total_generated = (SELECT SUM(g.total_generated) FROM generation_stats g
+                               WHERE g.content_type = generation_stats.content_type),
+            total_accepted = (SELECT SUM(g.total_accepted) FROM generation_stats g
+                              WHERE g.content_type = generation_stats.content_type),
+            total_rejected = (SELECT SUM(g.total_rejected) FROM generation_stats g
+                              WHERE g.content_type = generation_stats.content_type),
+            total_edited = (SELECT SUM(g.total_edited) FROM generation_stats g
+                            WHERE g.content_type = generation_stats.content_type),
+            avg_generation_time = (SELECT SUM(g.avg_generation_time * g.total_generated)
+                                          / MAX(SUM(g.total_generated), 1)
+                                   FROM generation_stats g
+                                   WHERE g.content_type = generation_stats.content_type),
+            last_updated = (SELECT MAX(g.last_updated) FROM generation_stats g
+                            WHERE g.content_type = generation_stats.content_type)
+        WHERE id IN (SELECT MIN(id) FROM generation_stats
+                     GROUP BY content_type HAVING COUNT(*) > 1)
+    ''')
+    cursor.execute('''
+        DELETE FROM generation_stats
+        WHERE id NOT IN (SELECT MIN(id) FROM generation_stats GROUP BY content_type)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_generation_stats_type
+        ON generation_stats(content_type)
+    ''')
+
+
+def _add_decayed_preference_statistics(cursor: sqlite3.Cursor):
+    """Track decayed evidence and running value statistics for learned preferences."""
+    columns = _column_names(cursor, 'user_preferences')
+    for column in ('evidence', 'observations', 'value_mean', 'value_m2'):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE user_preferences ADD COLUMN {column} REAL")
+
+    # Confidence started at 0.3 and gained 0.1 per supporting event
+    cursor.execute('''
+        UPDATE user_preferences
+        SET evidence = ROUND((confidence_score - 0.3) / 0.1) + 1,
+            observations = ROUND((confidence_score - 0.3) / 0.1) + 1
+    ''')
+
+    # Numeric preferences only kept their latest sample, which seeds the running mean
+    cursor.execute('''
+        UPDATE user_preferences
+        SET value_mean = CAST(preference_value AS REAL), value_m2 = 0
+        WHERE preference_type IN ('preferred_length', 'preferred_readability')
+    ''')
+
+
+# (version, migration) pairs, applied in order
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _create_initial_schema),
+    (2, _add_quality_metric_counts),
+    (3, _add_stable_content_hashes),
+    (4, _add_unique_pattern_and_preference_keys),
+    (5, _add_unique_generation_stats_key),
+    (6, _add_decayed_preference_statistics),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the last migration applied to a database, or 0 for an unversioned one."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Bring a database up to the latest schema version.
+
+    Each migration takes the write lock before checking the version, so two
+    processes opening the same database never apply a migration twice.
+
+    Args:
+        conn: Open connection to the memory database
+
+    Returns:
+        Number of migrations applied
+    """
+    applied = 0
+    for version, migration in MIGRATIONS:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if get_schema_version(conn) >= version:
+                conn.commit()
+                continue
+            migration(conn.cursor())
+            conn.execute('INSERT INTO schema_version (version, applied_at) VALUES (?, ?)',
+                         (version, datetime.now().isoformat()))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied += 1
+        logger.info(f"Applied memory schema migration {version}: {migration.__doc__}")
+    return applied
@@ -0,0 +1,156 @@
+"""
+Near-Duplicate Detection for ContentAgent.
+
+This module estimates how similar two texts are from MinHash signatures of
+their word shingles, and indexes signatures with locality-sensitive hashing
+(LSH) so that a new text is only compared against the few stored texts that
+share a band with it, instead of the whole history.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+import numpy as np
+
+from src.config import MINHASH_NUM_PERM, MINHASH_BANDS
+
+# Number of consecutive words in a shingle
+SHINGLE_SIZE = 3
+
+# Prime just above 2**32 for the universal hash family
+_MERSENNE_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Hash the overlapping word n-grams of a text.
+
+    Args:
+        text: Text to shingle
+        size: Number of words per shingle
+
+    Returns:
+        Set of 32-bit shingle hashes (stable across processes)
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """Computes fixed-size MinHash signatures with a seeded family of hash functions."""
+
+    def __init__(self, num_perm: int = MINHASH_NUM_PERM, seed: int = 1):
+        """
+        Initialize the hash functions.
+
+        Args:
+            num_perm: Number of hash functions (signature length)
+            seed: Seed of the hash family; signatures are only comparable with the same seed
+        """
+        self.num_perm = num_perm
+        generator = np.random.RandomState(seed)
+        # a < 2**31 keeps a * x + b within 64 bits for 32-bit shingle hashes
+        self._a = generator.randint(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Text to sign
+
+        Returns:
+            Array of num_perm 32-bit minimum hash values
+        """
+        values = np.fromiter(shingles(text), dtype=np.uint64)
+        if values.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashed = (np.outer(values, self._a) + self._b) % _MERSENNE_PRIME
+        return (hashed & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+
+def estimate_similarity(signature: np.ndarray, other: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return float(np.count_nonzero(signature == other)) / len(signature)
+
+
+class MinHashLSH:
+    """In-memory LSH index of MinHash signatures."""
+
+    def __init__(self, num_perm: int = MINHASH_NUM_PERM, bands: int = MINHASH_BANDS):
+        """
+        Initialize an empty index.
+
+        Args:
+            num_perm: Signature length
+            bands: Number of bands; two signatures become candidates when
+                all rows of any band are equal
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [defaultdict(set) for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        """
+        Add a signature to the index, replacing any signature stored under the same key.
+
+        Args:
+            key: Identifier returned by query()
+            signature: MinHash signature
+        """
+        self.remove(key)
+        self._signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a signature from the index if present."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            keys = bucket.get(band_key)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band_key]
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[Hashable, float]]:
+        """
+        Find indexed signatures similar to a signature.
+
+        Args:
+            signature: MinHash signature to look up
+            threshold: Minimum estimated similarity
+
+        Returns:
+            List of (key, estimated similarity), most similar first
+        """
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_similarity(signature, self._signatures[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
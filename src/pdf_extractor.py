@@ -0,0 +1,171 @@
+"""
+PDF Extraction for ContentAgent.
+
+This module extracts the text of PDF documents page by page. Long documents
+are split into page ranges that are extracted in parallel by a process pool
+(text extraction is CPU-bound, so threads would not help), and pages are
+yielded in order as soon as their range is done. Running headers and footers,
+such as titles and page numbers repeated on every page, are detected on the
+first pages and stripped from all of them.
+
+Requires pypdf (pip install pypdf).
+"""
+
+import itertools
+import logging
+import math
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from src.config import PDF_EXTRACT_MAX_WORKERS, PDF_PARALLEL_MIN_PAGES, PDF_MARGIN_SAMPLE_PAGES
+from src.section_stream import normalize_text
+
+try:
+    import pypdf
+except ImportError:  # Optional: only needed to load .pdf files
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+# Lines at the top and bottom of each page that may be a running header or footer
+MARGIN_LINES = 2
+
+# Share of sampled pages a line must repeat on to count as a header or footer
+MARGIN_MIN_SHARE = 0.6
+
+# Page numbers and dates change from page to page, so digits are ignored when comparing lines
+_DIGITS_PATTERN = re.compile(r'\d+')
+
+
+def _require_pypdf():
+    """Raise a helpful error when pypdf is not installed."""
+    if pypdf is None:
+        raise ValueError("Loading PDF files requires pypdf (pip install pypdf)")
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop); runs in a worker process."""
+    reader = pypdf.PdfReader(file_path)
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def extract_pages(file_path: str, max_workers: int = PDF_EXTRACT_MAX_WORKERS) -> Iterator[str]:
+    """
+    Extract the raw text of each page of a PDF, in page order.
+
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages are extracted by a
+    process pool; smaller ones page by page in this process.
+
+    Args:
+        file_path: Path of the PDF file
+        max_workers: Maximum number of extraction processes
+
+    Returns:
+        Iterator of page texts
+    """
+    _require_pypdf()
+    reader = pypdf.PdfReader(file_path)
+    page_count = len(reader.pages)
+
+    if max_workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    # Several ranges per worker keep the pool busy when some pages are slower than others
+    batch_size = math.ceil(page_count / (max_workers * 4))
+    starts = list(range(0, page_count, batch_size))
+    stops = [min(start + batch_size, page_count) for start in starts]
+    logger.info(f"Extracting {page_count} PDF pages with {max_workers} processes")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for pages in executor.map(_extract_page_range, itertools.repeat(file_path), starts, stops):
+            yield from pages
+
+
+def _margin_key(line: str) -> str:
+    """Get the form of a line used to recognize it on other pages."""
+    return _DIGITS_PATTERN.sub('#', line.strip().lower())
+
+
+def find_repeated_margins(pages: List[str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Find running headers and footers in a sample of pages.
+
+    Args:
+        pages: Raw page texts
+
+    Returns:
+        Margin keys of the repeated top lines and of the repeated bottom lines
+    """
+    if len(pages) < 3:
+        return set(), set()
+
+    top, bottom = Counter(), Counter()
+    for text in pages:
+        lines = [line for line in text.splitlines() if line.strip()]
+        top.update({_margin_key(line) for line in lines[:MARGIN_LINES]})
+        bottom.update({_margin_key(line) for line in lines[-MARGIN_LINES:]})
+
+    min_pages = max(2, math.ceil(len(pages) * MARGIN_MIN_SHARE))
+    return ({key for key, count in top.items() if count >= min_pages},
+            {key for key, count in bottom.items() if count >= min_pages})
+
+
+def strip_margins(text: str, top: Set[str], bottom: Set[str]) -> str:
+    """
+    Remove running headers and footers from a page and normalize its text.
+
+    Args:
+        text: Raw page text
+        top: Margin keys of repeated header lines
+        bottom: Margin keys of repeated footer lines
+
+    Returns:
+        Normalized page text
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    start, stop = 0, len(lines)
+    while start < min(MARGIN_LINES, stop) and _margin_key(lines[start]) in top:
+        start += 1
+    while stop > max(start, len(lines) - MARGIN_LINES) and _margin_key(lines[stop - 1]) in bottom:
+        stop -= 1
+    return normalize_text("\n".join(lines[start:stop]))
+
+
+def iter_pdf_pages(file_path: str, max_workers: int = PDF_EXTRACT_MAX_WORKERS) -> Iterator[str]:
+    """
+    Lazily yield the cleaned text of each page of a PDF.
+
+    Headers and footers are detected on the first PDF_MARGIN_SAMPLE_PAGES
+    pages, so later pages are yielded as soon as they are extracted.
+
+    Args:
+        file_path: Path of the PDF file
+        max_workers: Maximum number of extraction processes
+
+    Returns:
+        Iterator of normalized page texts, without running headers and footers
+    """
+    pages = extract_pages(file_path, max_workers)
+    sample = list(itertools.islice(pages, PDF_MARGIN_SAMPLE_PAGES))
+    top, bottom = find_repeated_margins(sample)
+    for text in itertools.chain(sample, pages):
+        yield strip_margins(text, top, bottom)
+
+
+def iter_pdf_sections(file_path: str, max_workers: int = PDF_EXTRACT_MAX_WORKERS) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield one section per non-empty PDF page.
+
+    Args:
+        file_path: Path of the PDF file
+        max_workers: Maximum number of extraction processes
+
+    Returns:
+        Iterator of section dictionaries with 'title' ("Page N"), 'text' and 'page'
+    """
+    for number, text in enumerate(iter_pdf_pages(file_path, max_workers), 1):
+        if text:
+            yield {"title": f"Page {number}", "text": text, "page": number}
@@ -0,0 +1,191 @@
+"""
+Quality Trends for ContentAgent.
+
+This module shows how acceptance and content quality change over time. The
+quality metrics history is loaded into NumPy arrays once, and rolling means,
+per-week acceptance rates and per-week percentiles are computed with
+vectorized operations (cumulative sums, bincount and one sort), so analysis
+stays fast on hundreds of thousands of records.
+"""
+
+import sqlite3
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Metric names and the quality_metrics columns they are loaded from
+TREND_METRICS = {
+    "readability": "readability_score",
+    "complexity": "complexity_score",
+    "length": "length_words",
+}
+
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+_EPOCH_WEEKDAY_OFFSET = 3
+
+
+class QualityTrends:
+    """Time-ordered quality metrics of one or all content types, held as NumPy arrays."""
+
+    def __init__(self, timestamps: np.ndarray, accepted: np.ndarray, metrics: Dict[str, np.ndarray]):
+        """
+        Initialize from arrays sorted by time.
+
+        Args:
+            timestamps: datetime64 timestamps of the records
+            accepted: Boolean array, True where the user accepted the content
+            metrics: Metric name to float array (NaN where missing)
+        """
+        self.timestamps = timestamps
+        self.accepted = accepted
+        self.metrics = metrics
+        self._weeks: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def load(cls, db_path: str, content_type: Optional[str] = None) -> "QualityTrends":
+        """
+        Load the quality metrics history from the memory database.
+
+        Args:
+            db_path: Path of the memory database
+            content_type: Only load this content type
+
+        Returns:
+            The loaded trends
+        """
+        # NULL metrics arrive as 'nan', which NumPy parses as a float
+        columns = ", ".join(f"IFNULL({column}, 'nan')" for column in TREND_METRICS.values())
+        query = f"SELECT timestamp, user_action = 'accept', {columns} FROM quality_metrics"
+        params: Tuple = ()
+        if content_type:
+            query += " WHERE content_type = ?"
+            params = (content_type,)
+
+        # Rows go straight into a structured array, avoiding a per-column Python transpose
+        dtype = [("timestamp", "datetime64[us]"), ("accepted", bool)]
+        dtype += [(name, np.float64) for name in TREND_METRICS]
+        with sqlite3.connect(db_path, timeout=30) as conn:
+            records = np.array(conn.execute(query, params).fetchall(), dtype=dtype)
+
+        # quality_metrics has no timestamp index; sorting here is cheaper than ORDER BY
+        records = records[np.argsort(records["timestamp"], kind="stable")]
+        return cls(
+            records["timestamp"],
+            records["accepted"],
+            {name: records[name] for name in TREND_METRICS},
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _week_groups(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the week numbers that have records and the week index of every record."""
+        if self._weeks is None:
+            days = self.timestamps.astype("datetime64[D]").astype(np.int64)
+            week_numbers = (days + _EPOCH_WEEKDAY_OFFSET) // 7
+            # Records are sorted by time, so each week is one contiguous run
+            starts_week = np.concatenate(([True], week_numbers[1:] != week_numbers[:-1]))
+            self._weeks = (week_numbers[starts_week], np.cumsum(starts_week) - 1)
+        return self._weeks
+
+    def rolling_mean(self, metric: str, window_days: float = 7) -> np.ndarray:
+        """
+        Get the mean of a metric over the trailing time window at each record.
+
+        Args:
+            metric: "acceptance" or one of TREND_METRICS
+            window_days: Length of the trailing window in days
+
+        Returns:
+            Array aligned with timestamps; NaN where the window holds no values
+        """
+        values = self.accepted.astype(np.float64) if metric == "acceptance" else self.metrics[metric]
+        present = ~np.isnan(values)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(present)))
+
+        seconds = self.timestamps.astype("datetime64[s]").astype(np.int64)
+        start = np.searchsorted(seconds, seconds - int(window_days * 86400), side="right")
+        end = np.arange(1, len(values) + 1)
+
+        window_counts = counts[end] - counts[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(window_counts > 0, (sums[end] - sums[start]) / window_counts, np.nan)
+
+    def weekly(self, metric: str = "readability", percentiles: Sequence[float] = (25, 50, 75)) -> Dict[str, np.ndarray]:
+        """
+        Aggregate the history by calendar week (Monday to Sunday).
+
+        Args:
+            metric: Metric summarized with its mean and percentiles
+            percentiles: Percentiles of the metric to compute per week
+
+        Returns:
+            Dictionary of arrays with one entry per week that has records:
+            'week_start' (datetime64[D]), 'samples', 'acceptance_rate',
+            'mean' and 'percentiles' (weeks x len(percentiles)); weeks
+            without values of the metric get NaN
+        """
+        if not len(self):
+            return {
+                "week_start": np.array([], dtype="datetime64[D]"),
+                "samples": np.array([], dtype=np.int64),
+                "acceptance_rate": np.array([]),
+                "mean": np.array([]),
+                "percentiles": np.empty((0, len(percentiles))),
+            }
+
+        weeks, group = self._week_groups()
+        samples = np.bincount(group)
+        acceptance_rate = np.bincount(group, weights=self.accepted) / samples
+
+        values = self.metrics[metric]
+        present = ~np.isnan(values)
+        value_counts = np.bincount(group[present], minlength=len(weeks))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(group[present], weights=values[present], minlength=len(weeks)) / value_counts
+
+        # Sorting by value, then stably by week, lays out each week's values in order
+        present_values, present_group = values[present], group[present]
+        order = np.argsort(present_values)
+        order = order[np.argsort(present_group[order], kind="stable")]
+        ordered = present_values[order]
+        starts = np.concatenate(([0], np.cumsum(value_counts)[:-1]))
+        result = np.full((len(weeks), len(percentiles)), np.nan)
+        has_values = value_counts > 0
+        for column, pct in enumerate(percentiles):
+            # Linear interpolation between the closest ranks, as np.percentile does
+            position = starts[has_values] + pct / 100 * (value_counts[has_values] - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            result[has_values, column] = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+        return {
+            "week_start": (weeks * 7 - _EPOCH_WEEKDAY_OFFSET).astype("datetime64[D]"),
+            "samples": samples,
+            "acceptance_rate": acceptance_rate,
+            "mean": mean,
+            "percentiles": result,
+        }
+
+    def acceptance_slope(self, weeks: Optional[int] = None) -> Optional[float]:
+        """
+        Get the drift of the weekly acceptance rate.
+
+        Args:
+            weeks: Only fit the most recent weeks that have records
+
+        Returns:
+            Change in acceptance rate per week from a least-squares line
+            through the weekly rates, or None with fewer than two weeks
+        """
+        if not len(self):
+            return None
+        week_numbers, group = self._week_groups()
+        week_index = week_numbers.astype(np.float64)
+        rates = np.bincount(group, weights=self.accepted) / np.bincount(group)
+        if weeks:
+            week_index, rates = week_index[-weeks:], rates[-weeks:]
+        if len(rates) < 2:
+            return None
+        return float(np.polyfit(week_index, rates, 1)[0])
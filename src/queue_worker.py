@@ -0,0 +1,178 @@
+"""
+Job Queue Workers for ContentAgent.
+
+This module runs queued article processing jobs unattended. Each worker
+process builds its own ContentAgent once and then claims jobs from the
+persistent queue until it is stopped, keeping its claim alive while a job
+runs and reporting failures back to the queue for retry.
+"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from colorama import Fore, Style
+
+from src.config import JOB_VISIBILITY_TIMEOUT, JOB_POLL_INTERVAL
+from src.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class _ClaimKeeper:
+    """Extends a job's visibility timeout in the background while it is processed."""
+
+    def __init__(self, queue: JobQueue, job_id: int, worker_id: str, visibility_timeout: float):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.visibility_timeout = visibility_timeout
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.visibility_timeout / 3):
+            if not self.queue.extend(self.job_id, self.worker_id, self.visibility_timeout):
+                logger.warning(f"Worker {self.worker_id} lost its claim on job {self.job_id}")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def process_job(agent, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the ContentAgent stages for one job.
+
+    Args:
+        agent: Initialized ContentAgent
+        payload: Job payload with "input_file" or "content"/"title", and "options"
+
+    Returns:
+        Dictionary with the output folder and generated file paths
+    """
+    if payload.get("input_file"):
+        document = agent.document_processor.process_document(payload["input_file"])
+        content, title = document["content"], document["title"]
+    else:
+        content, title = payload["content"], payload.get("title") or "Untitled"
+
+    return agent.generate(content, title, payload.get("options", {}))
+
+
+def run_worker(worker_index: int = 0, db_path: Optional[str] = None,
+               visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+               exit_when_empty: bool = False, agent=None,
+               agent_options: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Claim and process jobs until stopped.
+
+    Args:
+        worker_index: Index of this worker within the pool
+        db_path: Path of the queue database
+        visibility_timeout: Seconds a claimed job stays hidden from other workers
+        exit_when_empty: Return once no job is available instead of polling
+        agent: ContentAgent to use (a new one is created if omitted)
+        agent_options: Keyword arguments for the ContentAgent created when
+            agent is omitted, e.g. the command line flags the pool was started with
+
+    Returns:
+        Number of jobs completed by this worker
+    """
+    if agent is None:
+        # Imported here so the pool's parent process stays light
+        from src.main import ContentAgent
+        agent = ContentAgent(**(agent_options or {}))
+
+    queue = JobQueue(db_path)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+    completed = 0
+
+    while True:
+        job = queue.claim(worker_id, visibility_timeout)
+        if job is None:
+            if exit_when_empty:
+                return completed
+            time.sleep(JOB_POLL_INTERVAL)
+            continue
+
+        logger.info(f"Worker {worker_id} processing job {job['id']} (attempt {job['attempts']})")
+        try:
+            with _ClaimKeeper(queue, job["id"], worker_id, visibility_timeout):
+                result = process_job(agent, job["payload"])
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {e}")
+            queue.fail(job["id"], worker_id, str(e))
+            continue
+
+        if queue.complete(job["id"], worker_id, result):
+            completed += 1
+            print(f"{Fore.GREEN}[worker {worker_index}] Job {job['id']} done: {result.get('output_dir')}{Style.RESET_ALL}")
+
+
+def print_queue_stats(queue: JobQueue):
+    """Print queue depth, throughput and latency metrics."""
+    stats = queue.get_stats()
+    counts = stats["counts"]
+
+    def seconds(value):
+        return "n/a" if value is None else f"{value:.1f}s"
+
+    print(f"\n{Fore.CYAN}Job queue: {queue.db_path}{Style.RESET_ALL}")
+    print(f"   Queued: {counts['queued']}  Running: {counts['running']}  "
+          f"Done: {counts['done']}  Failed: {counts['failed']}")
+    print(f"   Throughput (last hour): {stats['throughput_per_minute']:.2f} jobs/min "
+          f"over {stats['finished_in_window']} jobs")
+    print(f"   Queue latency p50/p95: {seconds(stats['queue_latency_p50'])} / {seconds(stats['queue_latency_p95'])}")
+    print(f"   Processing time p50/p95: {seconds(stats['processing_time_p50'])} / "
+          f"{seconds(stats['processing_time_p95'])}")
+
+
+def run_worker_pool(processes: int, db_path: Optional[str] = None,
+                    visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+                    exit_when_empty: bool = False, agent_options: Optional[Dict[str, Any]] = None):
+    """
+    Run several worker processes against the queue.
+
+    Args:
+        processes: Number of worker processes
+        db_path: Path of the queue database
+        visibility_timeout: Seconds a claimed job stays hidden from other workers
+        exit_when_empty: Stop the workers once the queue is drained
+        agent_options: Keyword arguments for each worker's ContentAgent
+    """
+    queue = JobQueue(db_path)
+    print(f"Starting {processes} worker process(es)...")
+
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(index, queue.db_path, visibility_timeout, exit_when_empty),
+            kwargs={"agent_options": agent_options},
+            name=f"content-worker-{index}"
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        print("\nStopping workers; unfinished jobs will be retried after their visibility timeout.")
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+    print_queue_stats(queue)
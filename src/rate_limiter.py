@@ -0,0 +1,245 @@
+"""
+Client-side Rate Limiter for ContentAgent.
+
+This module provides a token-bucket limiter shared by all generators. It
+enforces requests-per-minute, tokens-per-minute and a concurrency cap, and
+hands out capacity by priority so interactive revisions are served before
+generation, background prefetch and image prompts.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from src.config import (
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_CONCURRENT_REQUESTS
+)
+
+logger = logging.getLogger(__name__)
+
+# Request priorities, lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_GENERATION = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_GENERATION: "generation",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# Default priority of each pipeline stage
+STAGE_PRIORITIES = {
+    "twitter_thread_revision": PRIORITY_INTERACTIVE,
+    "article_summary_revision": PRIORITY_INTERACTIVE,
+    "detailed_post_revision": PRIORITY_INTERACTIVE,
+    "image_prompts": PRIORITY_BACKGROUND,
+}
+
+_priority_override = threading.local()
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    Override the priority of LLM requests made by the current thread.
+
+    Args:
+        priority: Priority to use for requests inside the block
+    """
+    previous = getattr(_priority_override, "value", None)
+    _priority_override.value = priority
+    try:
+        yield
+    finally:
+        _priority_override.value = previous
+
+
+def priority_for_stage(stage: str) -> int:
+    """
+    Get the priority for a request from the given stage.
+
+    A priority set with request_priority() on the current thread takes
+    precedence over the stage default.
+
+    Args:
+        stage: Pipeline stage name
+
+    Returns:
+        Request priority
+    """
+    override = getattr(_priority_override, "value", None)
+    if override is not None:
+        return override
+    return STAGE_PRIORITIES.get(stage, PRIORITY_GENERATION)
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            per_minute: Capacity and refill amount per minute
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        """Add the tokens accrued since the last refill."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until the bucket holds the requested amount."""
+        # Requests larger than the bucket only need a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Priority-aware limiter for requests per minute, tokens per minute and concurrency."""
+
+    def __init__(self, requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+                 max_concurrency: int = LLM_MAX_CONCURRENT_REQUESTS):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Sustained request budget
+            tokens_per_minute: Sustained token budget (prompt and completion)
+            max_concurrency: Maximum number of requests in flight
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+        self._metrics = {
+            name: {"acquired": 0, "timed_out": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+        self._max_queue_depth = 0
+        self._rate_limited = 0
+
+    def _ready_in(self, estimated_tokens: int) -> float:
+        """Seconds until a request of the given size fits all budgets (0 if it fits now)."""
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return max(self.requests.time_until(1), self.tokens.time_until(estimated_tokens))
+
+    def acquire(self, estimated_tokens: int, priority: int = PRIORITY_GENERATION,
+                timeout: Optional[float] = None) -> bool:
+        """
+        Wait for capacity for one request.
+
+        Args:
+            estimated_tokens: Estimated prompt plus completion tokens
+            priority: Request priority (PRIORITY_* constant)
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if capacity was acquired, False on timeout
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        entry = (priority, next(self._sequence))
+        metrics = self._metrics[PRIORITY_NAMES.get(priority, "generation")]
+
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+
+            while True:
+                wait_for = None
+                if self._waiters[0] == entry and self.in_flight < self.max_concurrency:
+                    wait_for = self._ready_in(estimated_tokens)
+                    if wait_for == 0:
+                        heapq.heappop(self._waiters)
+                        self.requests.tokens -= 1
+                        self.tokens.tokens -= min(estimated_tokens, self.tokens.capacity)
+                        self.in_flight += 1
+                        waited = time.monotonic() - start
+                        metrics["acquired"] += 1
+                        metrics["total_wait"] += waited
+                        metrics["max_wait"] = max(metrics["max_wait"], waited)
+                        self._condition.notify_all()
+                        return True
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._waiters.remove(entry)
+                        heapq.heapify(self._waiters)
+                        metrics["timed_out"] += 1
+                        self._condition.notify_all()
+                        return False
+                    wait_for = remaining if wait_for is None else min(wait_for, remaining)
+
+                self._condition.wait(wait_for)
+
+    def release(self, estimated_tokens: int = 0, actual_tokens: Optional[int] = None):
+        """
+        Release a request slot and correct the token budget with actual usage.
+
+        Args:
+            estimated_tokens: Tokens reserved when the request was acquired
+            actual_tokens: Tokens actually used, if the provider reported them
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if actual_tokens is not None:
+                self.tokens.tokens -= actual_tokens - min(estimated_tokens, self.tokens.capacity)
+            self._condition.notify_all()
+
+    def on_rate_limited(self):
+        """Drain the buckets after the provider returned a 429 so callers back off together."""
+        with self._condition:
+            self._rate_limited += 1
+            self.requests.tokens = min(self.requests.tokens, 0.0)
+            self.tokens.tokens = min(self.tokens.tokens, 0.0)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depth and wait time metrics.
+
+        Returns:
+            Dictionary with current and peak queue depth, in-flight requests,
+            provider rate-limit responses and per-priority wait statistics
+        """
+        with self._condition:
+            by_priority = {}
+            for name, data in self._metrics.items():
+                by_priority[name] = {
+                    "acquired": data["acquired"],
+                    "timed_out": data["timed_out"],
+                    "avg_wait": data["total_wait"] / data["acquired"] if data["acquired"] else 0.0,
+                    "max_wait": data["max_wait"],
+                }
+            return {
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self._max_queue_depth,
+                "in_flight": self.in_flight,
+                "rate_limited_responses": self._rate_limited,
+                "priorities": by_priority,
+            }
+
+
+# Shared limiter used by all generators
+rate_limiter = RateLimiter()
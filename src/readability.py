@@ -0,0 +1,204 @@
+"""
+Readability Engine for ContentAgent.
+
+This module improves the readability of generated content locally, without
+an LLM round trip. It replaces wordy phrases and complex words from a
+simplification lexicon, splits overly long sentences at clause boundaries
+and reflows long paragraphs. Structured blocks such as headings, bullet
+lists and thread separators keep their layout.
+"""
+
+import re
+from typing import List
+
+from src.config import READABILITY_MAX_SENTENCE_WORDS
+
+# Wordy phrases and complex words with plainer alternatives
+SIMPLIFICATION_LEXICON = {
+    # Phrases
+    "due to the fact that": "because",
+    "in spite of the fact that": "although",
+    "despite the fact that": "although",
+    "at this point in time": "now",
+    "at the present time": "now",
+    "in the event that": "if",
+    "in order to": "to",
+    "for the purpose of": "for",
+    "a large number of": "many",
+    "a majority of": "most",
+    "with regard to": "about",
+    "with respect to": "about",
+    "in relation to": "about",
+    "prior to": "before",
+    "subsequent to": "after",
+    "in the near future": "soon",
+    "has the ability to": "can",
+    "is able to": "can",
+    "are able to": "can",
+    "it is important to note that": "note that",
+    # Words
+    "utilize": "use",
+    "utilizes": "uses",
+    "utilized": "used",
+    "utilizing": "using",
+    "utilization": "use",
+    "facilitate": "help",
+    "facilitates": "helps",
+    "facilitated": "helped",
+    "commence": "start",
+    "commenced": "started",
+    "terminate": "end",
+    "terminated": "ended",
+    "endeavor": "try",
+    "approximately": "about",
+    "subsequently": "later",
+    "additionally": "also",
+    "furthermore": "also",
+    "consequently": "so",
+    "nevertheless": "still",
+    "notwithstanding": "despite",
+    "demonstrate": "show",
+    "demonstrates": "shows",
+    "demonstrated": "showed",
+    "demonstrating": "showing",
+    "ascertain": "find out",
+    "sufficient": "enough",
+    "insufficient": "not enough",
+    "numerous": "many",
+    "methodology": "method",
+    "methodologies": "methods",
+    "optimal": "best",
+    "paramount": "vital",
+    "endeavour": "try",
+    "necessitate": "require",
+    "necessitates": "requires",
+    "comprehensive": "complete",
+    "predominantly": "mainly",
+    "substantially": "greatly",
+    "remuneration": "pay",
+    "expeditiously": "quickly",
+    "henceforth": "from now on",
+}
+
+# Clause boundaries where a long sentence can be split, in order of preference
+CLAUSE_BOUNDARIES = [
+    re.compile(r';\s+'),
+    re.compile(r',\s+(?=(?:but|so|yet|which means)\b)'),
+    re.compile(r',\s+and\s+'),
+]
+
+# Both halves of a split sentence must have at least this many words
+MIN_CLAUSE_WORDS = 6
+
+# Paragraphs with more sentences than this are reflowed
+MAX_PARAGRAPH_SENTENCES = 6
+REFLOW_PARAGRAPH_SENTENCES = 4
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# Headings, bullets, numbered items, separators, quotes and tables are not prose
+STRUCTURAL_LINE = re.compile(r'^\s*(?:[#*•>|\[-]|\d+[.)]\s)')
+
+# Longest phrases first so they win over the single words they contain. Terms inside
+# mentions, hashtags, cashtags, URLs, paths and hyphenated words are left alone.
+_LEXICON_PATTERN = re.compile(
+    r'(?<![\w@#$/.-])(' +
+    '|'.join(re.escape(term) for term in sorted(SIMPLIFICATION_LEXICON, key=len, reverse=True)) +
+    r')(?![\w/-])',
+    re.IGNORECASE
+)
+
+
+def _match_case(original: str, replacement: str) -> str:
+    """Apply the capitalization of the original text to its replacement."""
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+def simplify_words(text: str) -> str:
+    """
+    Replace wordy phrases and complex words using the simplification lexicon.
+
+    Args:
+        text: Text to simplify
+
+    Returns:
+        The text with lexicon entries replaced, keeping their capitalization
+    """
+    return _LEXICON_PATTERN.sub(
+        lambda match: _match_case(match.group(0), SIMPLIFICATION_LEXICON[match.group(0).lower()]),
+        text
+    )
+
+
+def _capitalize_first(text: str) -> str:
+    """Capitalize the first character of a clause."""
+    return text[:1].upper() + text[1:] if text else text
+
+
+def split_long_sentence(sentence: str, max_words: int = READABILITY_MAX_SENTENCE_WORDS) -> List[str]:
+    """
+    Split a sentence that is too long at its clause boundaries.
+
+    Args:
+        sentence: Sentence to split
+        max_words: Sentences with more words than this are split
+
+    Returns:
+        List of one or more sentences
+    """
+    if len(sentence.split()) <= max_words:
+        return [sentence]
+
+    for boundary in CLAUSE_BOUNDARIES:
+        for match in boundary.finditer(sentence):
+            head = sentence[:match.start()].rstrip(',;')
+            tail = sentence[match.end():]
+            if len(head.split()) < MIN_CLAUSE_WORDS or len(tail.split()) < MIN_CLAUSE_WORDS:
+                continue
+            if not head.endswith(('.', '!', '?')):
+                head += '.'
+            return (split_long_sentence(head, max_words) +
+                    split_long_sentence(_capitalize_first(tail), max_words))
+
+    return [sentence]
+
+
+def _improve_paragraph(paragraph: str, max_words: int) -> List[str]:
+    """Simplify, split and reflow one prose paragraph, keeping its indentation."""
+    body = paragraph.lstrip()
+    indent = paragraph[:len(paragraph) - len(body)]
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(simplify_words(body.rstrip())):
+        sentences.extend(split_long_sentence(sentence, max_words))
+
+    if len(sentences) <= MAX_PARAGRAPH_SENTENCES:
+        return [indent + " ".join(sentences)]
+
+    return [indent + " ".join(sentences[i:i + REFLOW_PARAGRAPH_SENTENCES])
+            for i in range(0, len(sentences), REFLOW_PARAGRAPH_SENTENCES)]
+
+
+def improve_readability(content: str, max_sentence_words: int = READABILITY_MAX_SENTENCE_WORDS) -> str:
+    """
+    Improve the readability of content with local rules only.
+
+    Args:
+        content: The content to improve
+        max_sentence_words: Sentences longer than this are split at clause boundaries
+
+    Returns:
+        Content with simpler wording, shorter sentences and reflowed paragraphs
+    """
+    result_paragraphs = []
+    for paragraph in content.split("\n\n"):
+        # Structured blocks (lists, headings, separators, hard line breaks) keep their layout
+        if "\n" in paragraph or not paragraph.strip() or STRUCTURAL_LINE.match(paragraph):
+            result_paragraphs.append(simplify_words(paragraph))
+            continue
+        result_paragraphs.extend(_improve_paragraph(paragraph, max_sentence_words))
+
+    return "\n\n".join(result_paragraphs)
@@ -0,0 +1,196 @@
+"""
+Run Checkpoints for ContentAgent.
+
+This module keeps a journal of a run in its output folder. For every stage it
+records a hash of the stage inputs, the generated output and whether the user
+accepted it, so an interrupted run can be resumed without repeating LLM calls
+or reviews that were already done.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.config import OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILENAME = "checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+
+def hash_inputs(*parts: Any) -> str:
+    """
+    Hash the inputs of a stage.
+
+    Args:
+        *parts: JSON-serializable stage inputs
+
+    Returns:
+        Hex digest identifying the inputs
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RunCheckpoint:
+    """Journal of one run's stages, stored as JSON in the run's output folder."""
+
+    def __init__(self, output_dir: str, state: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            output_dir: Output folder of the run
+            state: Previously saved journal, or None for a new run
+        """
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+        self.state = state or {
+            "version": CHECKPOINT_VERSION,
+            "created": datetime.datetime.now().isoformat(),
+            "completed": False,
+            "run": {},
+            "stages": {},
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, output_dir: str) -> Optional["RunCheckpoint"]:
+        """
+        Load the checkpoint of an existing run.
+
+        Args:
+            output_dir: Output folder of the run
+
+        Returns:
+            The checkpoint, or None if the folder has no readable checkpoint
+        """
+        path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error reading checkpoint {path}: {e}")
+            return None
+
+        if state.get("version") != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {path} with unsupported version {state.get('version')}")
+            return None
+        return cls(output_dir, state)
+
+    def _save(self):
+        """Write the journal atomically so a crash never leaves a partial file."""
+        self.state["updated"] = datetime.datetime.now().isoformat()
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def start_run(self, input_file: str, article_title: str, generate_options: Dict[str, bool]):
+        """
+        Record what the run was started with, so it can be resumed unattended.
+
+        Args:
+            input_file: Path of the article being processed
+            article_title: Title of the article
+            generate_options: Content types selected by the user
+        """
+        with self._lock:
+            self.state["run"] = {
+                "input_file": os.path.abspath(input_file),
+                "article_title": article_title,
+                "generate_options": generate_options,
+            }
+            self._save()
+
+    @property
+    def run_info(self) -> Dict[str, Any]:
+        """The input file, article title and options the run was started with."""
+        return self.state.get("run", {})
+
+    def get_stage(self, stage: str, inputs_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a recorded stage if it was produced from the same inputs.
+
+        Args:
+            stage: Stage name
+            inputs_hash: Hash of the current stage inputs
+
+        Returns:
+            Dictionary with 'output', 'accepted' and 'file_path', or None if the
+            stage was not recorded or its inputs have changed
+        """
+        with self._lock:
+            entry = self.state["stages"].get(stage)
+        if not entry or entry.get("inputs_hash") != inputs_hash:
+            return None
+        return entry
+
+    def record_stage(self, stage: str, inputs_hash: str, output: Any,
+                     accepted: bool = False, file_path: Optional[str] = None):
+        """
+        Record the current output of a stage.
+
+        Args:
+            stage: Stage name
+            inputs_hash: Hash of the stage inputs
+            output: JSON-serializable stage output
+            accepted: Whether the user has accepted the output
+            file_path: File the output was saved to, if any
+        """
+        with self._lock:
+            self.state["stages"][stage] = {
+                "inputs_hash": inputs_hash,
+                "output": output,
+                "accepted": accepted,
+                "file_path": file_path,
+                "updated": datetime.datetime.now().isoformat(),
+            }
+            self._save()
+
+    def mark_completed(self):
+        """Mark the run as finished so it is no longer offered for resuming."""
+        with self._lock:
+            self.state["completed"] = True
+            self._save()
+
+    def pending_stages(self) -> List[str]:
+        """Get the recorded stages that have not been accepted yet."""
+        with self._lock:
+            return [name for name, entry in self.state["stages"].items() if not entry.get("accepted")]
+
+
+def find_resumable_run(output_root: str = OUTPUT_DIR) -> Optional[RunCheckpoint]:
+    """
+    Find the most recently updated run that has not completed.
+
+    Args:
+        output_root: Directory containing run output folders
+
+    Returns:
+        The checkpoint of that run, or None if there is nothing to resume
+    """
+    candidates = []
+    try:
+        folders = os.listdir(output_root)
+    except FileNotFoundError:
+        return None
+
+    for folder in folders:
+        if not os.path.isdir(os.path.join(output_root, folder)):
+            continue
+        checkpoint = RunCheckpoint.load(os.path.join(output_root, folder))
+        if checkpoint and not checkpoint.state.get("completed") and checkpoint.run_info:
+            candidates.append(checkpoint)
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda checkpoint: checkpoint.state.get("updated", ""))
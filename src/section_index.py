@@ -0,0 +1,179 @@
+"""
+Section Index for ContentAgent.
+
+This module lets each detailed post prompt carry only the parts of the article
+its argument is about. The article is split once into sections (with
+the section stream, so long sections are cut at paragraph breaks), and each
+section gets a TF-IDF vector. An argument is matched to the sections most
+similar to it. The prompt gets those sections plus a short extractive
+synopsis of the whole article, instead of the full article once per argument.
+
+"[Section N]" citations written by the key argument extractor are ignored:
+the model numbers sections by its own reading of the (possibly compressed)
+article, which does not match this index's numbering.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from src.config import ARGUMENT_CONTEXT_MAX_TOKENS, ARTICLE_SYNOPSIS_TOKENS
+from src.extractive_summary import (
+    CHARS_PER_TOKEN, compress_text, inverse_document_frequency, normalize_rows, term_counts
+)
+from src.section_stream import iter_buffer_sections
+from src.text_metrics import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Sections longer than this are split at paragraph breaks, so an argument only pulls in the part it needs
+SECTION_INDEX_MAX_BYTES = 4 * 1024
+
+# Maximum number of article indexes kept in memory
+SECTION_INDEX_CACHE_SIZE = 16
+
+# "[Section 3]", "Section 2 and 4", "Sections 1-3"
+_SECTION_REFERENCE = re.compile(r'\[?\bsections?\s+\d+(?:\s*(?:,|-|–|&|and)\s*\d+)*\]?', re.IGNORECASE)
+
+
+def strip_section_references(argument: str) -> str:
+    """
+    Remove section citations from an argument, e.g. "[Section 2] The protocol..." becomes "The protocol...".
+
+    Args:
+        argument: Key argument text
+
+    Returns:
+        The argument without section citations
+    """
+    return " ".join(_SECTION_REFERENCE.sub(" ", argument).split())
+
+
+class SectionIndex:
+    """Numbered sections of one article, with a synopsis and vectors for matching arguments."""
+
+    def __init__(self, article: str, max_tokens: int = ARGUMENT_CONTEXT_MAX_TOKENS,
+                 synopsis_tokens: int = ARTICLE_SYNOPSIS_TOKENS):
+        """
+        Build the index of an article.
+
+        Args:
+            article: Full article text
+            max_tokens: Approximate token budget of the sections given to one argument
+            synopsis_tokens: Approximate token budget of the article synopsis
+        """
+        self.article = article
+        self.max_tokens = max_tokens
+        self.sections: List[Dict[str, Any]] = [
+            {"title": section["title"], "text": section["text"]}
+            for section in iter_buffer_sections(article.encode("utf-8"), SECTION_INDEX_MAX_BYTES)
+        ]
+
+        counts = term_counts([section["text"] for section in self.sections])
+        self.idf = inverse_document_frequency(counts)
+        self.vectors = normalize_rows(counts * self.idf)
+
+        # Articles that fit the budget are sent whole, so they need no synopsis
+        self.synopsis = "" if self.fits_budget else compress_text(article, synopsis_tokens)
+        logger.info(f"Indexed article into {len(self.sections)} sections")
+
+    @property
+    def fits_budget(self) -> bool:
+        """Whether the whole article fits the per-argument budget."""
+        return len(self.article) <= self.max_tokens * CHARS_PER_TOKEN
+
+    def sections_for(self, argument: str) -> List[Dict[str, Any]]:
+        """
+        Select the sections that support an argument.
+
+        The sections most similar to the argument are taken while they fit
+        the budget; section citations in the argument are not used.
+
+        Args:
+            argument: Key argument text
+
+        Returns:
+            Selected sections in article order (empty if nothing matches)
+        """
+        vector = normalize_rows(term_counts([strip_section_references(argument)]) * self.idf)[0]
+        similarity = self.vectors @ vector
+
+        budget = self.max_tokens * CHARS_PER_TOKEN
+        selected, used = set(), 0
+        for index in sorted(range(len(self.sections)), key=lambda index: -similarity[index]):
+            if similarity[index] <= 0:
+                break
+            length = len(self.sections[index]["text"]) + 2
+            if used + length > budget:
+                continue
+            selected.add(index)
+            used += length
+        return [self.sections[index] for index in sorted(selected)]
+
+    def context_for(self, argument: str) -> str:
+        """
+        Get the article context for the post about an argument.
+
+        Args:
+            argument: Key argument text
+
+        Returns:
+            The whole article if it fits the budget or no section matches the
+            argument, otherwise the synopsis followed by the supporting sections
+        """
+        if self.fits_budget:
+            return self.article
+
+        sections = self.sections_for(argument)
+        if not sections:
+            logger.info(f"No article sections matched argument {argument[:30]}...; using the whole article")
+            return self.article
+
+        logger.info(f"Using {len(sections)} of {len(self.sections)} article sections for argument {argument[:30]}...")
+        excerpts = "\n\n".join(section["text"] for section in sections)
+        return (f"ARTICLE SYNOPSIS:\n{self.synopsis}\n\n"
+                f"ARTICLE SECTIONS RELEVANT TO THIS ARGUMENT:\n{excerpts}")
+
+
+class SectionIndexCache:
+    """Builds the section index of each article once and caches it by article hash."""
+
+    def __init__(self, max_tokens: int = ARGUMENT_CONTEXT_MAX_TOKENS, max_size: int = SECTION_INDEX_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            max_tokens: Approximate token budget of the sections given to one argument
+            max_size: Maximum number of indexes to keep, least recently used are evicted
+        """
+        self.max_tokens = max_tokens
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, article: str) -> SectionIndex:
+        """
+        Get the section index of an article, building it only on first use.
+
+        Args:
+            article: Full article text
+
+        Returns:
+            The article's section index
+        """
+        key = content_hash(article)
+        with self._lock:
+            index = self._cache.get(key)
+            if index is not None:
+                self._cache.move_to_end(key)
+                return index
+
+        index = SectionIndex(article, self.max_tokens)
+
+        with self._lock:
+            self._cache[key] = index
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return index
@@ -0,0 +1,182 @@
+"""
+Section Stream for ContentAgent.
+
+This module reads large text and Markdown files lazily. A file is memory-mapped
+instead of read into a string, Markdown headings are found directly in the
+mapped bytes, and the document is yielded one normalized section at a time,
+so only the section being processed is ever decoded. Oversized sections are
+split at paragraph breaks. File hashes are computed from the mapping as well,
+without copying the file into memory.
+"""
+
+import codecs
+import hashlib
+import itertools
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import Any, AnyStr, Dict, Iterator, List, Optional
+
+from src.config import STREAM_SECTION_MAX_BYTES
+
+# A Markdown heading (group 1 = title) or the opening/closing line of a code fence (group 2)
+_BOUNDARY = rb'(?:#{1,6}[ \t]+([^\r\n]*)|(```|~~~))'
+# Anchoring on a literal newline lets the scan skip ahead line by line (much faster than '^' with MULTILINE)
+_LINE_BOUNDARY_PATTERN = re.compile(rb'\n' + _BOUNDARY)
+_LEADING_BOUNDARY_PATTERN = re.compile(_BOUNDARY)
+
+
+def _collapse_lines(lines: List[AnyStr]) -> List[AnyStr]:
+    """Strip trailing whitespace from lines, collapse blank runs to one and drop leading/trailing blanks."""
+    kept = []
+    previous_blank = True
+    for line in lines:
+        line = line.rstrip()
+        if line or not previous_blank:
+            kept.append(line)
+        previous_blank = not line
+    if kept and not kept[-1]:
+        kept.pop()
+    return kept
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize the text of a section.
+
+    Line endings become \\n, trailing whitespace is removed from every line,
+    runs of blank lines are collapsed to one and leading/trailing blank lines
+    are dropped.
+
+    Args:
+        text: Raw section text
+
+    Returns:
+        Normalized text
+    """
+    return "\n".join(_collapse_lines(text.replace("\r\n", "\n").replace("\r", "\n").split("\n")))
+
+
+def _normalize_bytes(data: bytes) -> str:
+    """Normalize UTF-8 bytes like normalize_text, decoding only the result (byte operations are faster)."""
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    if b" \n" not in data and b"\t\n" not in data and b"\n\n\n" not in data:
+        # Already clean, which is the common case: skip the line-by-line pass
+        return data.strip(b"\n").rstrip().decode("utf-8")
+    return b"\n".join(_collapse_lines(data.split(b"\n"))).decode("utf-8")
+
+
+@contextmanager
+def _mapped(file_path: str) -> Iterator[Any]:
+    """Memory-map a file read-only; empty files (which cannot be mapped) give b''."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def _split_point(buffer: Any, start: int, limit: int) -> int:
+    """Find where to cut a section that is longer than the limit: a paragraph break, a line break or a character boundary."""
+    for separator in (b'\n\n', b'\n\r\n', b'\n'):
+        position = buffer.rfind(separator, start, limit)
+        if position > start:
+            return position + len(separator)
+    # One very long line: cut before a UTF-8 continuation byte so every piece decodes
+    position = limit
+    while position > start + 1 and buffer[position] & 0xC0 == 0x80:
+        position -= 1
+    return position
+
+
+def _sections_between(buffer: Any, start: int, end: int, title: Optional[str],
+                      max_bytes: int) -> Iterator[Dict[str, Any]]:
+    """Yield one section for a byte range, or several if it is longer than max_bytes."""
+    while start < end:
+        stop = end if end - start <= max_bytes else _split_point(buffer, start, start + max_bytes)
+        text = _normalize_bytes(buffer[start:stop])
+        if text:
+            yield {"title": title, "text": text, "offset": start, "size": stop - start}
+        start = stop
+
+
+def iter_buffer_sections(buffer: Any, max_bytes: int = STREAM_SECTION_MAX_BYTES) -> Iterator[Dict[str, Any]]:
+    """
+    Split UTF-8 Markdown or plain text held in a bytes-like object into sections.
+
+    A new section starts at every Markdown heading outside a code fence; text
+    without headings is split at paragraph breaks every max_bytes.
+
+    Args:
+        buffer: bytes or a memory map of the document
+        max_bytes: Largest number of source bytes decoded as one section
+
+    Returns:
+        Iterator of dictionaries with the section 'title' (text of its heading,
+        None before the first heading), normalized 'text', and the byte
+        'offset' and 'size' of its source range
+    """
+    start = len(codecs.BOM_UTF8) if buffer[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+    title = None
+    in_fence = False
+
+    leading = _LEADING_BOUNDARY_PATTERN.match(buffer, start)
+    matches = itertools.chain([leading] if leading else [], _LINE_BOUNDARY_PATTERN.finditer(buffer, start))
+
+    for match in matches:
+        if match.group(2):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        # Line boundaries match from the newline before the heading
+        line_start = match.start() if match is leading else match.start() + 1
+        heading = match.group(1).decode('utf-8', errors='replace').rstrip(' \t#') or None
+        if line_start > start:
+            yield from _sections_between(buffer, start, line_start, title, max_bytes)
+        start, title = line_start, heading
+
+    yield from _sections_between(buffer, start, len(buffer), title, max_bytes)
+
+
+def iter_file_sections(file_path: str, max_bytes: int = STREAM_SECTION_MAX_BYTES) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the normalized sections of a UTF-8 text or Markdown file.
+
+    The file is memory-mapped for as long as the iterator is in use; only the
+    section being yielded is decoded into a string.
+
+    Args:
+        file_path: Path of the file
+        max_bytes: Largest number of source bytes decoded as one section
+
+    Returns:
+        Iterator of section dictionaries (see iter_buffer_sections)
+    """
+    with _mapped(file_path) as buffer:
+        yield from iter_buffer_sections(buffer, max_bytes)
+
+
+def join_sections(sections: Iterator[Dict[str, Any]]) -> str:
+    """Reassemble sections into one normalized document."""
+    return "\n\n".join(section["text"] for section in sections)
+
+
+def file_digest(file_path: str) -> Dict[str, Any]:
+    """
+    Hash a file without reading it into memory.
+
+    Args:
+        file_path: Path of the file
+
+    Returns:
+        Dictionary with the hex 'sha256' of the file bytes and its 'size'
+    """
+    digest = hashlib.sha256()
+    with _mapped(file_path) as buffer:
+        digest.update(buffer)
+        size = len(buffer)
+    return {"sha256": digest.hexdigest(), "size": size}
@@ -0,0 +1,286 @@
+"""
+Local HTTP Service for ContentAgent.
+
+This module keeps one ContentAgent warm in a long-running process and accepts
+generation jobs over a local HTTP API, so other tools only pay the LLM latency
+instead of interpreter startup, imports and client construction per article.
+
+Endpoints:
+    POST /jobs          Submit a job: {"input_file": path} or {"content": text,
+                        "title": str}, plus optional "options" of content types
+    GET  /jobs          List jobs
+    GET  /jobs/<id>     Job status, progress messages and output paths
+    GET  /metrics       Job counts, LLM latencies and rate limiter queues
+    GET  /health        Liveness check
+"""
+
+import datetime
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from src.config import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_MAX_CONCURRENT_JOBS, SERVICE_MAX_FINISHED_JOBS
+)
+from src.llm_resilience import llm_resilience
+from src.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Content generated when a job does not specify options
+DEFAULT_JOB_OPTIONS = {
+    "twitter_thread": True,
+    "article_summary": False,
+    "detailed_posts": False,
+    "image_prompts": False,
+}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class ContentService:
+    """Runs generation jobs concurrently on a shared, warm ContentAgent."""
+
+    def __init__(self, agent, max_concurrent_jobs: int = SERVICE_MAX_CONCURRENT_JOBS):
+        """
+        Initialize the service.
+
+        Args:
+            agent: ContentAgent instance whose components are reused by all jobs
+            max_concurrent_jobs: Maximum number of jobs running at the same time
+        """
+        self.agent = agent
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and queue a generation job.
+
+        Args:
+            request: Job request with "input_file" or "content"/"title", and
+                optional "options"
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If the request has no article, or options that are not
+                an object of known content types
+        """
+        if not request.get("input_file") and not request.get("content"):
+            raise ValueError("Request needs either 'input_file' or 'content'")
+
+        options = dict(DEFAULT_JOB_OPTIONS)
+        requested = request.get("options") or {}
+        if not isinstance(requested, dict):
+            raise ValueError("'options' must be an object mapping content types to booleans")
+        if not all(isinstance(name, str) for name in requested):
+            raise ValueError("Option names must be strings")
+        unknown = set(requested) - set(DEFAULT_JOB_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+        options.update({name: bool(value) for name, value in requested.items()})
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": JOB_QUEUED,
+            "options": options,
+            "progress": [],
+            "outputs": None,
+            "error": None,
+            "created": datetime.datetime.now().isoformat(),
+            "started": None,
+            "finished": None,
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._evict_finished_jobs()
+
+        self._executor.submit(self._run_job, job["id"], request, options)
+        logger.info(f"Queued job {job['id']}")
+        return self.get_job(job["id"])
+
+    def _evict_finished_jobs(self):
+        """Forget the oldest finished jobs beyond the retention limit."""
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job["status"] in (JOB_COMPLETED, JOB_FAILED)]
+        for job_id in finished[:max(0, len(finished) - SERVICE_MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _update_job(self, job_id: str, **fields):
+        """Update fields of a job."""
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run_job(self, job_id: str, request: Dict[str, Any], options: Dict[str, bool]):
+        """Run one job on a worker thread."""
+        self._update_job(job_id, status=JOB_RUNNING, started=datetime.datetime.now().isoformat())
+
+        def progress(message: str):
+            with self._lock:
+                self._jobs[job_id]["progress"].append(message)
+
+        try:
+            if request.get("input_file"):
+                document = self.agent.document_processor.process_document(request["input_file"])
+                content, title = document["content"], document["title"]
+            else:
+                content, title = request["content"], request.get("title") or "Untitled"
+            progress(f"Loaded article: {title}")
+
+            outputs = self.agent.generate(content, title, options, progress=progress)
+            self._update_job(job_id, status=JOB_COMPLETED, outputs=outputs,
+                             finished=datetime.datetime.now().isoformat())
+            logger.info(f"Job {job_id} completed")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self._update_job(job_id, status=JOB_FAILED, error=str(e),
+                             finished=datetime.datetime.now().isoformat())
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a copy of a job.
+
+        Args:
+            job_id: Job ID returned by submit()
+
+        Returns:
+            The job, or None if it is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Get a summary of all known jobs, oldest first."""
+        with self._lock:
+            return [{"id": job["id"], "status": job["status"], "created": job["created"]}
+                    for job in self._jobs.values()]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get service metrics.
+
+        Returns:
+            Dictionary with job counts by status, per-stage LLM latencies,
+            circuit breaker state and rate limiter queue metrics
+        """
+        with self._lock:
+            counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED)}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+
+        return {
+            "jobs": counts,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "llm_latency": llm_resilience.latency.summary(),
+            "llm_consecutive_failures": llm_resilience.circuit_breaker.consecutive_failures,
+            "rate_limiter": rate_limiter.get_metrics(),
+        }
+
+    def shutdown(self):
+        """Stop accepting jobs and wait for running jobs to finish."""
+        self._executor.shutdown(wait=True)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """Maps HTTP requests onto the ContentService."""
+
+    service: ContentService = None
+
+    def _send_json(self, status: int, payload: Any):
+        """Send a JSON response."""
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Handle job status, job list, metrics and health requests."""
+        path = self.path.rstrip("/")
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            self._send_json(200, self.service.get_metrics())
+        elif path == "/jobs":
+            self._send_json(200, {"jobs": self.service.list_jobs()})
+        elif path.startswith("/jobs/"):
+            job = self.service.get_job(path[len("/jobs/"):])
+            if job:
+                self._send_json(200, job)
+            else:
+                self._send_json(404, {"error": "Job not found"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        """Handle job submissions."""
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object")
+            job = self.service.submit(request)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        self._send_json(202, job)
+
+    def log_message(self, format: str, *args):
+        """Route access logs through the logging module instead of stderr."""
+        logger.info(f"{self.address_string()} - {format % args}")
+
+
+def create_server(service: ContentService, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    """
+    Create the HTTP server for a service.
+
+    Args:
+        service: The service handling requests
+        host: Interface to bind, local only by default
+        port: Port to listen on (0 picks a free port)
+
+    Returns:
+        The server, not yet serving
+    """
+    handler = type("BoundServiceRequestHandler", (ServiceRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(agent, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+          max_concurrent_jobs: int = SERVICE_MAX_CONCURRENT_JOBS):
+    """
+    Serve generation jobs until interrupted.
+
+    Args:
+        agent: Initialized ContentAgent
+        host: Interface to bind
+        port: Port to listen on
+        max_concurrent_jobs: Maximum number of jobs running at the same time
+    """
+    service = ContentService(agent, max_concurrent_jobs)
+    server = create_server(service, host, port)
+    print(f"ContentAgent service listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.shutdown()
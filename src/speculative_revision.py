@@ -0,0 +1,141 @@
+"""
+Speculative Revision Drafts for ContentAgent.
+
+This module pre-generates revisions along the user's most frequent historical
+feedback directions while they review content, so that a matching revision
+request can be served without waiting for another LLM round trip.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from src.config import SPECULATIVE_MAX_DIRECTIONS
+from src.memory_manager import classify_revision_reason
+from src.rate_limiter import PRIORITY_BACKGROUND, request_priority
+
+logger = logging.getLogger(__name__)
+
+# Feedback sent to the reviser for each learned rejection direction
+SPECULATIVE_FEEDBACK = {
+    'avoid_long_content': "Make it more concise. Tighten long explanations and cut repetition without losing key points.",
+    'avoid_short_content': "Add more detail. Expand the key points with supporting context, data and examples from the article.",
+    'avoid_technical': "Make the language more accessible. Replace jargon and technical phrasing with plain explanations.",
+    'avoid_simple': "Add more depth. Include technical detail and nuance instead of staying at a basic level.",
+}
+
+
+class SpeculativeRevisionSet:
+    """Revision drafts being generated in the background for one piece of content."""
+
+    def __init__(self, executor: ThreadPoolExecutor, drafts: Dict[str, Future]):
+        """
+        Initialize the set of speculative drafts.
+
+        Args:
+            executor: Executor running the draft revisions
+            drafts: Mapping of feedback direction to its pending revision
+        """
+        self.executor = executor
+        self.drafts = drafts
+
+    def match(self, feedback: str) -> Optional[str]:
+        """
+        Find the draft that matches the user's revision feedback.
+
+        A draft only matches when the feedback points in exactly one known
+        direction and that direction was speculated on.
+
+        Args:
+            feedback: The revision feedback entered by the user
+
+        Returns:
+            Feedback direction of the matching draft, or None
+        """
+        directions = classify_revision_reason(feedback)
+        if len(directions) == 1 and directions[0] in self.drafts:
+            return directions[0]
+        return None
+
+    def take(self, direction: str) -> Optional[str]:
+        """
+        Get the revised content for a direction, waiting if it is still running.
+
+        Args:
+            direction: Feedback direction returned by match()
+
+        Returns:
+            The revised content, or None if the draft failed
+        """
+        future = self.drafts.get(direction)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Speculative revision for {direction} failed: {e}")
+            return None
+
+    def discard(self):
+        """Cancel drafts that have not started and release the executor."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SpeculativeReviser:
+    """Starts revision drafts for the user's most frequent feedback directions."""
+
+    def __init__(self, memory_manager=None, max_directions: int = SPECULATIVE_MAX_DIRECTIONS):
+        """
+        Initialize the speculative reviser.
+
+        Args:
+            memory_manager: MemoryManager instance providing feedback history
+            max_directions: Maximum number of drafts to generate per content piece
+        """
+        self.memory_manager = memory_manager
+        self.max_directions = max_directions
+
+    def get_feedback_directions(self, content_type: str) -> List[str]:
+        """
+        Get the most frequent feedback directions for a content type.
+
+        Args:
+            content_type: Type of content being reviewed
+
+        Returns:
+            List of feedback directions, most frequent first
+        """
+        if not self.memory_manager:
+            return []
+
+        directions = self.memory_manager.get_rejection_directions(content_type)
+        return [direction for direction, _ in directions
+                if direction in SPECULATIVE_FEEDBACK][:self.max_directions]
+
+    def start(self, content_type: str, revise_fn: Callable[[str], str]) -> Optional[SpeculativeRevisionSet]:
+        """
+        Start generating revision drafts in the background.
+
+        Args:
+            content_type: Type of content being reviewed
+            revise_fn: Function taking feedback text and returning revised content
+
+        Returns:
+            The set of pending drafts, or None if there is no history to speculate on
+        """
+        directions = self.get_feedback_directions(content_type)
+        if not directions:
+            return None
+
+        logger.info(f"Starting speculative revisions for {content_type}: {', '.join(directions)}")
+        executor = ThreadPoolExecutor(max_workers=len(directions), thread_name_prefix="speculative")
+        drafts = {
+            direction: executor.submit(self._run_draft, revise_fn, SPECULATIVE_FEEDBACK[direction])
+            for direction in directions
+        }
+        return SpeculativeRevisionSet(executor, drafts)
+
+    def _run_draft(self, revise_fn: Callable[[str], str], feedback: str) -> str:
+        """Run one draft revision at background priority so it never delays interactive requests."""
+        with request_priority(PRIORITY_BACKGROUND):
+            return revise_fn(feedback)
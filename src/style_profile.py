@@ -0,0 +1,219 @@
+"""
+Style Profiles for ContentAgent.
+
+This module distills the user's writing samples and writing instructions into
+a compact style profile: voice, structure, formatting and the explicit rules,
+with a few short excerpts. Generators can send the profile in place of the raw
+samples and instruction files, which are thousands of tokens that are the same
+in every prompt.
+
+A profile is built by one model call per kind of samples (threads or posts),
+or two if the first answer is over the word limit, and cached in memory and on disk, keyed by a hash of the samples and the
+instructions. Editing, adding or removing a sample builds a new profile.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.config import STYLE_PROFILE_DIR, STYLE_PROFILE_MAX_WORDS
+from src.llm_resilience import create_chat_model, invoke_with_resilience
+
+logger = logging.getLogger(__name__)
+
+# Kinds of samples, with the name used for one sample in the prompt
+SAMPLE_KINDS = {"thread": "social media thread", "post": "social media post"}
+
+# A profile over the word limit is requested once more with this fraction of the limit
+STRICTER_LIMIT_FACTOR = 0.7
+
+# Replaces the writing instructions in prompts that use a profile; the profile already contains them
+PROFILE_INSTRUCTIONS = ("Follow the style profile given with the samples. It was distilled from the user's "
+                        "writing instructions and sample content, and every rule in it is binding.")
+
+STYLE_PROFILE_PROMPT = """
+You are an expert editor. Distill the writing instructions and the sample {sample_name}s below into a compact style profile that another writer can follow to produce new {sample_name}s indistinguishable from the samples.
+
+The profile must cover:
+- Voice and persona (who is speaking, tone, attitude toward the reader)
+- Structure (how pieces open, develop and close; typical length; paragraph or segment length)
+- Formatting (separators, line breaks, lists, capitalization, punctuation habits)
+- Vocabulary and phrasing (recurring words, sentence patterns, things the writer never says)
+- Every explicit rule from the writing instructions, restated as a short imperative; do not drop or soften any rule
+- Two or three short verbatim excerpts from the samples that best show the voice
+
+Write at most {max_words} words. Output ONLY the profile as a bulleted list under the headings above, with no introduction or commentary.
+
+WRITING INSTRUCTIONS:
+{instructions}
+
+SAMPLE {sample_name_upper}S:
+{samples}
+
+STYLE PROFILE:
+"""
+
+
+def read_samples(samples_dir: str) -> List[Tuple[str, str]]:
+    """
+    Read every writing sample in a directory.
+
+    Args:
+        samples_dir: Directory of .txt and .md samples
+
+    Returns:
+        List of (file name, content) pairs sorted by file name, skipping
+        empty files and writing instruction files
+    """
+    paths = glob.glob(os.path.join(samples_dir, "*.txt")) + glob.glob(os.path.join(samples_dir, "*.md"))
+    samples = []
+    for path in sorted(paths):
+        name = os.path.basename(path)
+        if name.startswith("writing_instructions_"):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+        except Exception as e:
+            logger.error(f"Error loading sample {path}: {e}")
+            continue
+        if content:
+            samples.append((name, content))
+    return samples
+
+
+def profile_key(kind: str, instructions: str, samples: List[Tuple[str, str]]) -> str:
+    """Get the cache key of a profile: a hash of the kind, the instructions and every sample."""
+    digest = hashlib.sha256()
+    for part in [kind, instructions.strip()] + [f"{name}\0{content}" for name, content in samples]:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0\0")
+    return digest.hexdigest()
+
+
+class StyleProfiler:
+    """Builds style profiles once per version of the samples and caches them."""
+
+    def __init__(self, profile_dir: str = STYLE_PROFILE_DIR, max_words: int = STYLE_PROFILE_MAX_WORDS, llm=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            profile_dir: Directory where built profiles are stored between runs
+            max_words: Word limit for each profile, given to the model and
+                enforced on its answer; profiles that stay over it are not used
+            llm: Chat model used to distill profiles (created if not given)
+        """
+        self.profile_dir = profile_dir
+        self.max_words = max_words
+        self.llm = llm or create_chat_model(temperature=0.2)
+        self.chain = ChatPromptTemplate.from_template(STYLE_PROFILE_PROMPT) | self.llm | StrOutputParser()
+        self._profiles: Dict[str, str] = {}
+        # Held while a profile is built, so concurrent generators distill it only once
+        self._lock = threading.Lock()
+
+    def _profile_path(self, key: str) -> str:
+        """Get the file a profile is stored in."""
+        return os.path.join(self.profile_dir, f"{key}.json")
+
+    def _load_stored(self, key: str) -> Optional[str]:
+        """Load a profile stored by an earlier run, if there is one."""
+        try:
+            with open(self._profile_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["profile"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable style profile {self._profile_path(key)}: {e}")
+            return None
+
+    def _store(self, key: str, kind: str, profile: str, sample_count: int):
+        """Store a profile for later runs, replacing the file atomically."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = self._profile_path(key)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "kind": kind,
+                "sample_count": sample_count,
+                "created_at": datetime.now().isoformat(),
+                "profile": profile,
+            }, f, indent=2)
+        os.replace(temporary_path, path)
+
+    def _build(self, kind: str, instructions: str, samples: List[Tuple[str, str]]) -> str:
+        """Distill a profile with the model."""
+        sample_name = SAMPLE_KINDS[kind]
+        formatted_samples = "\n\n".join(f"SAMPLE {number} ({name}):\n{content}"
+                                        for number, (name, content) in enumerate(samples, 1))
+        logger.info(f"Building {kind} style profile from {len(samples)} samples")
+
+        # The limit in the prompt is only a request. A profile over it is asked
+        # for again with a stricter limit, never cut: cutting would drop the
+        # binding rules, which the profile replaces in every prompt
+        for limit in (self.max_words, int(self.max_words * STRICTER_LIMIT_FACTOR)):
+            profile = invoke_with_resilience(self.chain, {
+                "sample_name": sample_name,
+                "sample_name_upper": sample_name.upper(),
+                "max_words": limit,
+                "instructions": instructions.strip(),
+                "samples": formatted_samples or "(no samples available)",
+            }, stage="style_profile").strip()
+            word_count = len(profile.split())
+            if word_count <= self.max_words:
+                return profile
+            logger.warning(f"{kind.capitalize()} style profile has {word_count} words, "
+                           f"over the limit of {self.max_words}")
+
+        raise ValueError(f"{kind} style profile stayed over the limit of {self.max_words} words")
+
+    def get_profile(self, kind: str, instructions: str, samples_dir: str, build: bool = True) -> Optional[str]:
+        """
+        Get the style profile for the current samples and instructions.
+
+        The profile is built on first use and reused until the samples or the
+        instructions change.
+
+        Args:
+            kind: Kind of samples, a key of SAMPLE_KINDS ("thread" or "post")
+            instructions: Writing instructions for the content
+            samples_dir: Directory of the samples
+            build: Build the profile if it is not cached yet; otherwise only
+                cached profiles are returned
+
+        Returns:
+            The style profile, or None if it is not cached and could not (or
+            should not) be built; callers then fall back to the raw samples
+            and instructions
+        """
+        samples = read_samples(samples_dir)
+        key = profile_key(kind, instructions, samples)
+
+        with self._lock:
+            profile = self._profiles.get(key) or self._load_stored(key)
+            if profile is None:
+                if not build:
+                    return None
+                try:
+                    profile = self._build(kind, instructions, samples)
+                except Exception as e:
+                    logger.error(f"Error building {kind} style profile, using raw samples: {e}")
+                    return None
+                if not profile:
+                    logger.warning(f"Model returned an empty {kind} style profile, using raw samples")
+                    return None
+                try:
+                    self._store(key, kind, profile, len(samples))
+                except OSError as e:
+                    logger.warning(f"Could not store {kind} style profile: {e}")
+            self._profiles[key] = profile
+
+        return f"Style profile distilled from the user's sample {SAMPLE_KINDS[kind]}s:\n\n{profile}"
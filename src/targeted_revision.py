@@ -0,0 +1,185 @@
+"""
+Targeted Revision for ContentAgent.
+
+This module revises only the parts of a piece of content that the user's
+feedback is about. The content is split into segments (the tweets of a
+thread, the paragraphs of a post), the model sees all of them numbered but
+writes back only the segments it changes, and the changes are merged into
+the original locally. Output tokens, and with them latency, scale with the
+size of the change instead of the size of the content.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.llm_resilience import invoke_with_resilience
+
+logger = logging.getLogger(__name__)
+
+# Thread tweets are separated by a line of dashes (------); post paragraphs by blank lines
+THREAD_SEPARATOR = re.compile(r'(\s*\n[ \t]*-{3,}[ \t]*\n\s*)')
+PARAGRAPH_SEPARATOR = re.compile(r'(\s*\n[ \t]*\n\s*)')
+
+# Written by the model in place of a segment's text to remove that segment
+DELETE_MARKER = "DELETE"
+
+_SEGMENT_NUMBER = re.compile(r'^\[(\d+)\][ \t]*$', re.MULTILINE)
+
+TARGETED_REVISION_PROMPT = """
+You are to revise parts of a {content_name} based on user feedback, leaving everything else exactly as it is.
+
+The {content_name} is shown below split into numbered {segment_name}s. Rewrite ONLY the {segment_name}s that the feedback is about. Keep the voice, formatting and length conventions of the {segment_name}s around them, and follow the writing instructions.
+
+Output format: for every {segment_name} you change, write its number in square brackets on a line of its own, for example [3], followed by the complete new text of that {segment_name}. To remove a {segment_name}, write its number followed by the single word {delete_marker}. Do NOT output {segment_name}s you leave unchanged, and do NOT add any other text, analysis or explanation.
+
+INSTRUCTIONS:
+{style_instructions}
+
+USER FEEDBACK:
+{feedback}
+
+ARTICLE:
+{article_text}
+
+NUMBERED {segment_name_upper}S:
+{numbered_segments}
+
+CHANGED {segment_name_upper}S:
+"""
+
+
+def split_segments(text: str, separator: Pattern) -> Tuple[List[str], List[str]]:
+    """
+    Split content into segments, keeping the separators between them.
+
+    Args:
+        text: Content to split
+        separator: Pattern with one capturing group matching a separator
+
+    Returns:
+        Tuple of (segments, separators); separators[i] follows segments[i]
+    """
+    parts = separator.split(text.strip())
+    return parts[0::2], parts[1::2]
+
+
+def number_segments(segments: List[str]) -> str:
+    """Format segments for the prompt, each under its 1-based number."""
+    return "\n\n".join(f"[{number}]\n{segment}" for number, segment in enumerate(segments, 1))
+
+
+def parse_replacements(response: str, segment_count: int) -> Optional[Dict[int, str]]:
+    """
+    Parse the changed segments written by the model.
+
+    Args:
+        response: Model output in the [N] / new text format
+        segment_count: Number of segments in the original content
+
+    Returns:
+        Mapping of 0-based segment index to its new text ('' to remove it),
+        or None if the output does not follow the format
+    """
+    markers = list(_SEGMENT_NUMBER.finditer(response))
+    if not markers or response[:markers[0].start()].strip():
+        return None
+
+    replacements = {}
+    for marker, next_marker in zip(markers, markers[1:] + [None]):
+        number = int(marker.group(1))
+        if not 1 <= number <= segment_count or number - 1 in replacements:
+            return None
+        end = next_marker.start() if next_marker else len(response)
+        text = response[marker.end():end].strip()
+        if not text:
+            return None
+        replacements[number - 1] = "" if text == DELETE_MARKER else text
+    return replacements
+
+
+def merge_segments(segments: List[str], separators: List[str], replacements: Dict[int, str]) -> str:
+    """
+    Rebuild content with some segments replaced or removed.
+
+    Args:
+        segments: Original segments
+        separators: Original separators between the segments
+        replacements: Mapping of segment index to new text ('' removes the segment)
+
+    Returns:
+        The merged content
+    """
+    kept = [(replacements.get(index, segment), separators[index - 1] if index else "")
+            for index, segment in enumerate(segments)]
+    kept = [(segment, separator) for segment, separator in kept if segment]
+
+    # Each kept segment brings the separator before it, except the new first segment
+    return "".join(separator + segment if position else segment
+                   for position, (segment, separator) in enumerate(kept))
+
+
+class TargetedReviser:
+    """Revises only the segments of one kind of content that feedback is about."""
+
+    def __init__(self, llm, content_name: str, segment_name: str, separator: Pattern):
+        """
+        Initialize the reviser.
+
+        Args:
+            llm: Chat model used for revisions
+            content_name: Name of the content in the prompt, e.g. "social media thread"
+            segment_name: Name of one segment in the prompt, e.g. "tweet"
+            separator: Pattern with one capturing group matching the separators between segments
+        """
+        self.content_name = content_name
+        self.segment_name = segment_name
+        self.separator = separator
+        self.chain = ChatPromptTemplate.from_template(TARGETED_REVISION_PROMPT) | llm | StrOutputParser()
+
+    def revise(self, content: str, feedback: str, article_text: str,
+               style_instructions: str, stage: str) -> Optional[str]:
+        """
+        Revise the segments of the content that the feedback is about.
+
+        Args:
+            content: Content to revise
+            feedback: User feedback for revision
+            article_text: The original article content
+            style_instructions: Writing instructions for the content type
+            stage: Pipeline stage name for the resilience layer
+
+        Returns:
+            The revised content, or None if it has a single segment or the
+            model did not answer usably in the segment format (the caller
+            should then fall back to a full revision)
+        """
+        segments, separators = split_segments(content, self.separator)
+        if len(segments) < 2:
+            return None
+
+        response = invoke_with_resilience(self.chain, {
+            "content_name": self.content_name,
+            "segment_name": self.segment_name,
+            "segment_name_upper": self.segment_name.upper(),
+            "delete_marker": DELETE_MARKER,
+            "style_instructions": style_instructions,
+            "feedback": feedback,
+            "article_text": article_text,
+            "numbered_segments": number_segments(segments),
+        }, stage=stage)
+
+        replacements = parse_replacements(response, len(segments))
+        if replacements is None:
+            logger.warning("Targeted revision output was not in the segment format; falling back to a full revision")
+            return None
+
+        revised = merge_segments(segments, separators, replacements)
+        if not revised:
+            logger.warning(f"Targeted revision removed every {self.segment_name}; falling back to a full revision")
+            return None
+        logger.info(f"Targeted revision changed {len(replacements)} of {len(segments)} {self.segment_name}s")
+        return revised
@@ -0,0 +1,172 @@
+"""
+Text Metrics for ContentAgent.
+
+This module computes the readability statistics used by the memory system.
+The expensive part, counting words, sentences and syllables, is done once per
+text and memoized by content hash. Scores are derived from the stored counts
+with vectorized formulas, so the whole history can be re-scored in one pass
+when the scoring rules change.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+import numpy as np
+import textstat
+
+logger = logging.getLogger(__name__)
+
+# Flesch Reading Ease: base - sentence length weight * WPS - syllable weight * SPW
+FLESCH_READING_EASE_WEIGHTS = (206.835, 1.015, 84.6)
+
+# Flesch-Kincaid Grade: sentence length weight * WPS + syllable weight * SPW + intercept
+FLESCH_KINCAID_GRADE_WEIGHTS = (0.39, 11.8, -15.59)
+
+# Maximum number of texts kept in the metrics memo
+METRICS_CACHE_SIZE = 512
+
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+WORD_LETTERS = re.compile(r'[a-z]+')
+
+
+def content_hash(text: str) -> str:
+    """Get a stable hash of a text, used as the memo key."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _estimate_syllables(text: str) -> int:
+    """Estimate syllables from vowel groups when textstat's dictionaries are unavailable."""
+    total = 0
+    for word in WORD_LETTERS.findall(text.lower()):
+        syllables = len(VOWEL_GROUPS.findall(word))
+        if word.endswith('e') and not word.endswith(('le', 'ee')) and syllables > 1:
+            syllables -= 1
+        total += max(1, syllables)
+    return total
+
+
+def count_text(text: str) -> Dict[str, int]:
+    """
+    Count the raw statistics of a text.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        Dictionary with char, word, sentence and syllable counts
+    """
+    try:
+        syllables = textstat.syllable_count(text)
+    except LookupError:
+        syllables = _estimate_syllables(text)
+
+    return {
+        'chars': len(text),
+        'words': textstat.lexicon_count(text),
+        'sentences': textstat.sentence_count(text),
+        'syllables': syllables,
+    }
+
+
+def score_counts(words, sentences, syllables) -> Dict[str, np.ndarray]:
+    """
+    Compute readability scores from counts.
+
+    Accepts scalars or arrays, so a single text and a whole history are
+    scored by the same formulas. Texts without words or sentences score 0,
+    as in textstat.
+
+    Args:
+        words: Word count(s)
+        sentences: Sentence count(s)
+        syllables: Syllable count(s)
+
+    Returns:
+        Dictionary with 'readability' (Flesch Reading Ease) and 'complexity'
+        (Flesch-Kincaid Grade) arrays, rounded to two decimals
+    """
+    words = np.asarray(words, dtype=float)
+    sentences = np.asarray(sentences, dtype=float)
+    syllables = np.asarray(syllables, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        words_per_sentence = np.where(sentences > 0, words / sentences, 0.0)
+        syllables_per_word = np.where(words > 0, syllables / words, 0.0)
+    valid = (words_per_sentence > 0) & (syllables_per_word > 0)
+
+    base, sentence_weight, syllable_weight = FLESCH_READING_EASE_WEIGHTS
+    readability = base - sentence_weight * words_per_sentence - syllable_weight * syllables_per_word
+
+    sentence_weight, syllable_weight, intercept = FLESCH_KINCAID_GRADE_WEIGHTS
+    complexity = sentence_weight * words_per_sentence + syllable_weight * syllables_per_word + intercept
+
+    return {
+        'readability': np.round(np.where(valid, readability, 0.0), 2),
+        'complexity': np.round(np.where(valid, complexity, 0.0), 2),
+    }
+
+
+class TextMetrics:
+    """Memoized text statistics keyed by content hash."""
+
+    def __init__(self, max_size: int = METRICS_CACHE_SIZE):
+        """
+        Initialize the metrics memo.
+
+        Args:
+            max_size: Maximum number of texts to keep, least recently used are evicted
+        """
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        Get the raw counts of a text, computing them only on first use.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Dictionary with char, word, sentence and syllable counts
+        """
+        key = content_hash(text)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        counts = count_text(text)
+
+        with self._lock:
+            self._cache[key] = counts
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return counts
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Get counts and readability scores of a text.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Dictionary with counts plus 'readability' and 'complexity' scores
+        """
+        counts = self.counts(text)
+        scores = score_counts(counts['words'], counts['sentences'], counts['syllables'])
+        return {
+            **counts,
+            'readability': float(scores['readability']),
+            'complexity': float(scores['complexity']),
+        }
+
+
+# Shared memo used by the memory system
+text_metrics = TextMetrics()
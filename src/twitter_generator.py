@@ -5,17 +5,19 @@ Uses Anthropic's Claude model to generate social media threads from articles.
 import os
 import glob
 import re
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.documents import Document
 import logging
 
 # Import from centralized config
-from src.config import OPENAI_API_KEY, OPENAI_MODEL
+from src.config import OPENAI_MODEL
+from src.llm_resilience import create_chat_model, invoke_with_resilience
+from src.targeted_revision import TargetedReviser, THREAD_SEPARATOR
+from src.style_profile import PROFILE_INSTRUCTIONS
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +66,8 @@ class TwitterThreadGenerator:
         thread_prompt: Optional[str] = None,
         model_name: str = OPENAI_MODEL,
         samples_dir: str = "data/samples",
-        memory_manager=None
+        memory_manager=None,
+        style_profiler=None
     ): 
         """
         Initialize the thread generator.
@@ -74,19 +77,19 @@ class TwitterThreadGenerator:
             thread_prompt: Custom prompt template for thread generation
             model_name: Anthropic model to use
             samples_dir: Directory containing writing samples and instructions
+            style_profiler: Optional StyleProfiler whose profile replaces the raw samples and instructions
         """
         # Set samples directories
         self.samples_dir = samples_dir
         self.thread_samples_dir = os.path.join(samples_dir, "sample_threads")
         self.memory_manager = memory_manager
+        self.style_profiler = style_profiler
         
         # Create sample directories if they don't exist
         os.makedirs(self.thread_samples_dir, exist_ok=True)
         
         # Initialize the LLM (OpenAI)
-        self.llm = ChatOpenAI(
-            model=OPENAI_MODEL,
-            openai_api_key=OPENAI_API_KEY,
+        self.llm = create_chat_model(
             temperature=0.7  # Increased for more creative, less generic output
         )
         
@@ -108,6 +111,9 @@ class TwitterThreadGenerator:
             | self.llm
             | StrOutputParser()
         )
+        
+        # Rewrites only the tweets that revision feedback is about
+        self.targeted_reviser = TargetedReviser(self.llm, "social media thread", "tweet", THREAD_SEPARATOR)
     
     def load_writing_instructions(self) -> str:
         """
@@ -175,6 +181,23 @@ class TwitterThreadGenerator:
             
         return formatted_samples
     
+    def load_style_guidance(self) -> Tuple[str, str]:
+        """
+        Load the writing instructions and samples for a thread prompt.
+        
+        With a style profiler, the distilled style profile is used in place of
+        the raw samples and instructions.
+        
+        Returns:
+            Tuple of (style instructions, sample threads)
+        """
+        style_instructions = self.load_writing_instructions()
+        if self.style_profiler:
+            profile = self.style_profiler.get_profile("thread", style_instructions, self.thread_samples_dir)
+            if profile:
+                return PROFILE_INSTRUCTIONS, profile
+        return style_instructions, self.load_thread_samples()
+    
     def generate_thread(
         self,
         article_text: str,
@@ -191,8 +214,7 @@ class TwitterThreadGenerator:
             Generated thread as a string
         """
         # Load writing instructions and samples
-        style_instructions = self.load_writing_instructions()
-        sample_threads = self.load_thread_samples()
+        style_instructions, sample_threads = self.load_style_guidance()
         
         # Add any custom instructions
         if custom_instructions:
@@ -204,12 +226,14 @@ class TwitterThreadGenerator:
             if memory_enhancements:
                 style_instructions = f"{style_instructions}{memory_enhancements}"
         
-        return self.chain.invoke(
+        return invoke_with_resilience(
+            self.chain,
             {
                 "article_text": article_text, 
                 "style_instructions": style_instructions,
                 "sample_threads": sample_threads
-            }
+            },
+            stage="twitter_thread"
         )
     
     def generate_thread_from_document(
@@ -253,7 +277,8 @@ class TwitterThreadGenerator:
         original_thread: str,
         article_text: str,
         feedback: str,
-        custom_instructions: str = ""
+        custom_instructions: str = "",
+        targeted: bool = False
     ) -> str:
         """
         Revise a thread based on user feedback while preserving style guidelines.
@@ -263,6 +288,8 @@ class TwitterThreadGenerator:
             article_text: The original article content
             feedback: User feedback for revision
             custom_instructions: Any additional custom instructions
+            targeted: Rewrite only the tweets the feedback is about, falling
+                back to rewriting the whole thread if that fails
             
         Returns:
             Revised thread as a string
@@ -270,8 +297,7 @@ class TwitterThreadGenerator:
         logger.info("Revising thread based on feedback while preserving style")
         
         # Load writing instructions and samples (same as original generation)
-        style_instructions = self.load_writing_instructions()
-        sample_threads = self.load_thread_samples()
+        style_instructions, sample_threads = self.load_style_guidance()
         
         # Combine feedback with custom instructions
         revision_instructions = custom_instructions
@@ -284,6 +310,14 @@ class TwitterThreadGenerator:
             if memory_enhancements:
                 style_instructions = f"{style_instructions}{memory_enhancements}"
         
+        if targeted:
+            revised_thread = self.targeted_reviser.revise(
+                original_thread, revision_instructions, article_text, style_instructions,
+                stage="twitter_thread_revision"
+            )
+            if revised_thread is not None:
+                return revised_thread
+        
         # Create a revision-specific prompt that includes the original thread for context
         revision_prompt_template = PromptTemplate(
             input_variables=["article_text", "style_instructions", "sample_threads", "original_thread", "revision_instructions"],
@@ -338,10 +372,10 @@ REVISED THREAD:
             | StrOutputParser()
         )
         
-        return revision_chain.invoke({
+        return invoke_with_resilience(revision_chain, {
             "article_text": article_text,
             "style_instructions": style_instructions,
             "sample_threads": sample_threads,
             "original_thread": original_thread,
             "revision_instructions": revision_instructions
-        }) 
\ No newline at end of file
+        }, stage="twitter_thread_revision") 
\ No newline at end of file
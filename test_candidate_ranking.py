@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for candidate ranking.
+Tests concurrent candidate generation and ranking by learned length,
+formatting and revision preferences.
+"""
+import itertools
+import os
+import sys
+import threading
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.candidate_ranking import CandidateRanker, generate_candidates
+
+SHORT = "Staking rewards fell this quarter. Validators noticed first."
+MEDIUM = " ".join(["Staking rewards fell this quarter as more validators joined the network."] * 8)
+LONG = " ".join(["Staking rewards fell this quarter as more validators joined the network."] * 30)
+
+
+class FakeMemoryManager:
+    """Memory manager stand-in returning fixed preferences and quality metrics."""
+
+    def __init__(self, preferences=None, quality=None):
+        self.preferences = preferences or {}
+        self.quality = quality or {}
+
+    def get_user_preferences(self, content_type=None, min_confidence=0.5):
+        return self.preferences
+
+    def get_quality_analysis(self, content_type=None):
+        return self.quality
+
+
+def test_generate_candidates():
+    """Test that candidates are generated concurrently, deduplicated and failures tolerated."""
+    print("Testing candidate generation...")
+
+    answers = itertools.cycle(["first", "second", "first", "third"])
+    lock = threading.Lock()
+
+    def generate():
+        with lock:
+            return next(answers)
+
+    candidates = generate_candidates(generate, 4)
+    if sorted(candidates) != ["first", "second", "third"]:
+        print(f"[FAIL] Unexpected candidates: {candidates}")
+        return False
+
+    calls = itertools.count()
+
+    def flaky():
+        if next(calls) % 2:
+            raise RuntimeError("rate limited")
+        return "only"
+
+    if generate_candidates(flaky, 3) != ["only"]:
+        print("[FAIL] A failed call discarded the successful ones")
+        return False
+
+    def failing():
+        raise RuntimeError("service unavailable")
+
+    try:
+        generate_candidates(failing, 2)
+    except RuntimeError:
+        pass
+    else:
+        print("[FAIL] Generation succeeded although every call failed")
+        return False
+
+    print("[PASS] Distinct candidates kept, partial failures tolerated, total failure raised")
+    return True
+
+
+def test_rank_by_length():
+    """Test ranking by the learned preferred length and by accepted content."""
+    print("Testing ranking by preferred length...")
+
+    medium_words = len(MEDIUM.split())
+    ranker = CandidateRanker(FakeMemoryManager(preferences={
+        'preferred_length': {'mean': medium_words, 'std': 10.0, 'confidence': 0.8}
+    }))
+    ranked = ranker.rank("detailed_post", [LONG, SHORT, MEDIUM])
+    if ranked[0] != MEDIUM:
+        print(f"[FAIL] Candidate closest to the preferred length not first: {[len(c.split()) for c in ranked]}")
+        return False
+
+    # Without learned preferences the lengths of accepted content are used
+    ranker = CandidateRanker(FakeMemoryManager(quality={'accept': {'avg_length': 12}}))
+    if ranker.rank("detailed_post", [LONG, MEDIUM, SHORT])[0] != SHORT:
+        print("[FAIL] Quality metrics of accepted content were not used")
+        return False
+
+    # Without any data the generation order is kept
+    ranker = CandidateRanker(FakeMemoryManager())
+    if ranker.rank("detailed_post", [LONG, SHORT, MEDIUM]) != [LONG, SHORT, MEDIUM]:
+        print("[FAIL] Order changed without preference data")
+        return False
+
+    print("[PASS] Closest length ranked first; order kept without data")
+    return True
+
+
+def test_rank_by_formatting_and_revisions():
+    """Test ranking by formatting preferences and revision directions."""
+    print("Testing ranking by formatting and revision preferences...")
+
+    plain = "Rewards fell this quarter. Validators noticed first and adjusted their stakes."
+    bold = "**Rewards fell** this quarter. Validators noticed first and adjusted their stakes."
+    ranker = CandidateRanker(FakeMemoryManager(preferences={'uses_bold': {'confidence': 0.9}}))
+    if ranker.rank("twitter_thread", [plain, bold])[0] != bold:
+        print("[FAIL] Preferred bold formatting not ranked first")
+        return False
+    ranker = CandidateRanker(FakeMemoryManager(preferences={'uses_bold': {'confidence': 0.1}}))
+    if ranker.rank("twitter_thread", [bold, plain])[0] != plain:
+        print("[FAIL] Avoided bold formatting not ranked last")
+        return False
+
+    ranker = CandidateRanker(FakeMemoryManager(preferences={'avoid_long_content': {'confidence': 0.9}}))
+    if ranker.rank("article_summary", [LONG, MEDIUM, SHORT]) != [SHORT, MEDIUM, LONG]:
+        print("[FAIL] Frequent requests for shorter content did not favour short candidates")
+        return False
+
+    print("[PASS] Formatting and revision directions reorder candidates")
+    return True
+
+
+def main():
+    """Run all candidate ranking tests."""
+    print("=" * 70)
+    print("ContentAgent Candidate Ranking Tests")
+    print("=" * 70)
+
+    tests = [
+        test_generate_candidates,
+        test_rank_by_length,
+        test_rank_by_formatting_and_revisions
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} candidate ranking tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
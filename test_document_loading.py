@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Test script for document and context loading.
+Tests the memory-mapped section stream, oversized section splitting,
+streaming of additional context files, plain text and PDF loading and the
+parsed-document cache.
+"""
+import codecs
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.pdf_extractor as pdf_extractor
+from src.context_processor import ContextProcessor
+from src.document_loader import DocumentProcessor
+from src.section_stream import iter_buffer_sections, normalize_text
+
+MARKDOWN = (
+    "# The Title\r\n"
+    "Intro line with trailing spaces.   \r\n"
+    "\r\n\r\n\r\n"
+    "## First Section ##\r\n"
+    "Body of the first section.\r\n"
+    "```\r\n"
+    "# not a heading inside a code fence\r\n"
+    "```\r\n"
+    "## Second Section\r\n"
+    "Body of the second section, café.\r\n"
+)
+
+
+def write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per entry of each page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 11 Tf 14 TL 72 760 Td\n" + "\n".join(f"({line}) Tj T*" for line in lines) + "\nET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref_offset = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_markdown_sections():
+    """Test that Markdown files stream as normalized sections with hashes."""
+    print("Testing Markdown section stream...")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(temp_dir, "article.md")
+        raw = codecs.BOM_UTF8 + MARKDOWN.encode("utf-8")
+        with open(file_path, "wb") as f:
+            f.write(raw)
+
+        processor = DocumentProcessor()
+        sections = list(processor.iter_sections(file_path))
+        titles = [section["title"] for section in sections]
+        if titles != ["The Title", "First Section", "Second Section"]:
+            print(f"[FAIL] Unexpected section titles: {titles}")
+            return False
+        if sections[0]["text"] != "# The Title\nIntro line with trailing spaces.":
+            print(f"[FAIL] Section not normalized: {sections[0]['text']!r}")
+            return False
+
+        document = processor.process_document(file_path)
+        expected = (
+            "# The Title\nIntro line with trailing spaces.\n\n"
+            "## First Section ##\nBody of the first section.\n```\n# not a heading inside a code fence\n```\n\n"
+            "## Second Section\nBody of the second section, café."
+        )
+        if document["title"] != "The Title" or document["content"] != expected:
+            print(f"[FAIL] Document content differs from the normalized file: {document['content']!r}")
+            return False
+        if document["sha256"] != hashlib.sha256(raw).hexdigest() or document["size"] != len(raw):
+            print("[FAIL] Document hash or size does not match the file")
+            return False
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("[PASS] Sections follow headings outside code fences and rejoin into the normalized document")
+    return True
+
+
+def test_oversized_sections():
+    """Test that sections longer than the limit are split at paragraph and character boundaries."""
+    print("Testing oversized section splitting...")
+
+    paragraphs = "\n\n".join(f"Paragraph {i} " + "word " * 20 for i in range(50))
+    sections = list(iter_buffer_sections(paragraphs.encode("utf-8"), max_bytes=500))
+    if len(sections) < 2 or any(section["size"] > 500 for section in sections):
+        print(f"[FAIL] Sections not limited to 500 bytes: {[section['size'] for section in sections]}")
+        return False
+    if not all(section["text"].startswith("Paragraph") for section in sections):
+        print("[FAIL] A section was not cut at a paragraph break")
+        return False
+    if "\n\n".join(section["text"] for section in sections) != normalize_text(paragraphs):
+        print("[FAIL] Split sections do not rejoin into the original text")
+        return False
+
+    # A single line of multi-byte characters has to be cut between characters
+    line = "é" * 1000
+    pieces = [section["text"] for section in iter_buffer_sections(line.encode("utf-8"), max_bytes=301)]
+    if "".join(pieces) != line:
+        print("[FAIL] A multi-byte character was split")
+        return False
+
+    print("[PASS] Oversized sections split at paragraph and character boundaries")
+    return True
+
+
+def test_context_streaming():
+    """Test that context files are combined from streamed sections."""
+    print("Testing context file streaming...")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(temp_dir, "a_notes.txt"), "w", encoding="utf-8") as f:
+            f.write("Plain notes.\n\nSecond paragraph.\n")
+        with open(os.path.join(temp_dir, "b_research.md"), "w", encoding="utf-8") as f:
+            f.write("# Research\n\nFinding one.\n\n## Details\n\nFinding two.\n")
+        open(os.path.join(temp_dir, "c_empty.md"), "w").close()
+
+        processor = ContextProcessor(temp_dir)
+        context = processor.process_context_files()
+        expected = (
+            "--- CONTEXT DOCUMENT: a_notes.txt ---\n\nPlain notes.\n\nSecond paragraph.\n\n"
+            "\n--- CONTEXT DOCUMENT: b_research.md ---\n\n# Research\n\nFinding one.\n\n## Details\n\nFinding two.\n\n"
+            "\n--- CONTEXT DOCUMENT: c_empty.md ---\n\n\n\n"
+        )
+        if context["content"] != expected:
+            print(f"[FAIL] Unexpected combined content: {context['content']!r}")
+            return False
+        if [(info["name"], info["sections"]) for info in context["files"]] != [
+                ("a_notes.txt", 1), ("b_research.md", 2), ("c_empty.md", 0)]:
+            print(f"[FAIL] Unexpected file metadata: {context['files']}")
+            return False
+        if context["files"][2]["sha256"] != hashlib.sha256(b"").hexdigest():
+            print("[FAIL] Empty file hash is wrong")
+            return False
+
+        sections = [(section["file"], section["title"]) for section in processor.iter_context_sections()]
+        if sections != [("a_notes.txt", None), ("b_research.md", "Research"), ("b_research.md", "Details")]:
+            print(f"[FAIL] Unexpected context sections: {sections}")
+            return False
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("[PASS] Context files combined from streamed sections with hashes")
+    return True
+
+
+def test_text_loading_and_cache():
+    """Test that plain text files load and parsed documents are cached by content hash."""
+    print("Testing plain text loading and the parsed-document cache...")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(temp_dir, "field_notes.txt")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("First note.  \n\n\n\nSecond note.\n")
+
+        processor = DocumentProcessor()
+        loads = []
+        load_content = processor._load_content
+        processor._load_content = lambda *args: loads.append(args) or load_content(*args)
+
+        first = processor.process_document(file_path)
+        second = processor.process_document(file_path)
+        if first["content"] != "First note.\n\nSecond note." or first["title"] != "Field Notes":
+            print(f"[FAIL] Unexpected text document: {first['content']!r} / {first['title']!r}")
+            return False
+        if len(loads) != 1 or second["content"] != first["content"]:
+            print(f"[FAIL] Unchanged file was parsed {len(loads)} times")
+            return False
+
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("Third note.\n")
+        third = processor.process_document(file_path)
+        if len(loads) != 2 or not third["content"].endswith("Third note."):
+            print("[FAIL] Changed file was served from the cache")
+            return False
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("[PASS] Text files load and are only parsed again when they change")
+    return True
+
+
+def test_pdf_loading():
+    """Test PDF extraction in parallel with running headers and footers stripped."""
+    print("Testing PDF loading...")
+
+    if pdf_extractor.pypdf is None:
+        print("[SKIP] pypdf is not installed")
+        return True
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(temp_dir, "report.pdf")
+        page_count = pdf_extractor.PDF_PARALLEL_MIN_PAGES + 4
+        write_pdf(file_path, [
+            ["Annual Report", f"Finding {chr(64 + number)} is discussed on this page.", "More detail follows.",
+             f"Page {number} of {page_count}"]
+            for number in range(1, page_count + 1)
+        ])
+
+        sequential = list(pdf_extractor.extract_pages(file_path, max_workers=1))
+        parallel = list(pdf_extractor.extract_pages(file_path, max_workers=2))
+        if len(parallel) != page_count or parallel != sequential:
+            print("[FAIL] Parallel extraction differs from sequential extraction")
+            return False
+
+        document = DocumentProcessor().process_document(file_path)
+        if "Annual Report" in document["content"] or "of 20" in document["content"]:
+            print(f"[FAIL] Headers or footers left in content: {document['content'][:200]!r}")
+            return False
+        if document["content"].count("is discussed on this page.") != page_count:
+            print("[FAIL] Page body text is missing")
+            return False
+        sections = list(DocumentProcessor().iter_sections(file_path))
+        if [section["page"] for section in sections] != list(range(1, page_count + 1)):
+            print("[FAIL] PDF sections are not one per page in order")
+            return False
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("[PASS] PDF pages extracted in parallel, in order, without headers and footers")
+    return True
+
+
+def main():
+    """Run all document loading tests."""
+    print("=" * 70)
+    print("ContentAgent Document Loading Tests")
+    print("=" * 70)
+
+    tests = [
+        test_markdown_sections,
+        test_oversized_sections,
+        test_context_streaming,
+        test_text_loading_and_cache,
+        test_pdf_loading
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} document loading tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
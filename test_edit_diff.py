@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for the edit diff engine.
+Tests that Myers finds minimal edit scripts and the anchored diff valid
+ones on random sequences, the single-element shortcut, and that short and
+long texts report the same vocabulary changes.
+"""
+import os
+import random
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.edit_diff import MAX_DIFF_EDITS, SHORT_TEXT_CHARS, _myers_edits, analyze_edit, diff_indices, diff_tokens
+
+
+def lcs_length(a, b):
+    """Length of the longest common subsequence, by dynamic programming."""
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def is_valid_diff(a, b, deleted, inserted):
+    """Check that the kept elements of both sequences are the same sequence."""
+    if deleted != sorted(set(deleted)) or inserted != sorted(set(inserted)):
+        return False
+    removed, added = set(deleted), set(inserted)
+    kept_a = [x for i, x in enumerate(a) if i not in removed]
+    kept_b = [y for j, y in enumerate(b) if j not in added]
+    return kept_a == kept_b
+
+
+def random_edit(a, rng, alphabet):
+    """Apply a few random replacements, insertions, deletions and moves."""
+    b = list(a)
+    for _ in range(rng.randint(0, 8)):
+        action = rng.random()
+        if action < 0.3 and b:
+            b[rng.randrange(len(b))] = rng.choice(alphabet)
+        elif action < 0.6:
+            b.insert(rng.randint(0, len(b)), rng.choice(alphabet))
+        elif action < 0.85 and b:
+            del b[rng.randrange(len(b))]
+        elif b:
+            b.insert(rng.randint(0, len(b)), b.pop(rng.randrange(len(b))))
+    return b
+
+
+def test_minimal_random_diffs():
+    """Test that random diffs are valid and as short as the LCS allows."""
+    print("Testing random diffs against an LCS reference...")
+
+    rng = random.Random(7)
+    for trial in range(1500):
+        # Small alphabets give many repeated elements, large ones many unique anchors
+        alphabet = [f"w{number}" for number in range(rng.choice([2, 4, 12, 60]))]
+        a = [rng.choice(alphabet) for _ in range(rng.randint(0, 40))]
+        b = random_edit(a, rng, alphabet) if rng.random() < 0.8 else \
+            [rng.choice(alphabet) for _ in range(rng.randint(0, 40))]
+        minimal = len(a) + len(b) - 2 * lcs_length(a, b)
+
+        edits = _myers_edits(a, b, MAX_DIFF_EDITS)
+        if len(edits) != minimal:
+            print(f"[FAIL] Myers found {len(edits)} edits for {a} -> {b}, minimum {minimal}")
+            return False
+
+        # Anchoring on unique elements is a heuristic (as in patience diff):
+        # the result is always a valid diff but may be longer than the minimum
+        deleted, inserted = diff_indices(a, b)
+        if not is_valid_diff(a, b, deleted, inserted):
+            print(f"[FAIL] Invalid diff for {a} -> {b}: -{deleted} +{inserted}")
+            return False
+
+        # Without repeated elements every element is an anchor, and the
+        # anchor chain is a longest common subsequence
+        distinct = rng.sample(range(1000), rng.randint(0, 40))
+        edited = random_edit(distinct, rng, range(1000, 1100))
+        edited = list(dict.fromkeys(edited))
+        deleted, inserted = diff_indices(distinct, edited)
+        minimal = len(distinct) + len(edited) - 2 * lcs_length(distinct, edited)
+        if not is_valid_diff(distinct, edited, deleted, inserted) or len(deleted) + len(inserted) != minimal:
+            print(f"[FAIL] Non-minimal diff of distinct elements {distinct} -> {edited}")
+            return False
+
+    print("[PASS] 1500 random diffs valid and Myers minimal; distinct elements diffed minimally")
+    return True
+
+
+def test_edit_budget():
+    """Test that gaps over the edit budget fall back to a full replacement."""
+    print("\nTesting the edit budget fallback...")
+
+    a = ["x", "y"] * 20
+    b = ["y", "x"] * 20 + ["z"]
+    deleted, inserted = diff_indices(a, b, max_edits=1)
+    if not is_valid_diff(a, b, deleted, inserted) or len(deleted) + len(inserted) > len(a) + len(b):
+        print(f"[FAIL] Invalid fallback diff: -{deleted} +{inserted}")
+        return False
+
+    print("[PASS] Over-budget gap replaced as a whole")
+    return True
+
+
+def test_single_element_gaps():
+    """Test the shortcut for gaps with one element on either side."""
+    print("\nTesting single-element gaps...")
+
+    cases = [
+        (["a", "b", "c"], ["a", "x", "c"], ["b"], ["x"]),
+        (["a", "c"], ["a", "b", "c"], [], ["b"]),
+        (["a", "b", "c"], ["a", "c"], ["b"], []),
+        (["b"], ["x", "b", "y"], [], ["x", "y"]),
+        (["x", "b", "y"], ["b"], ["x", "y"], []),
+        (["b"], ["x", "y"], ["b"], ["x", "y"]),
+    ]
+    for a, b, expected_deleted, expected_inserted in cases:
+        if diff_tokens(a, b) != (expected_deleted, expected_inserted):
+            print(f"[FAIL] {a} -> {b} gave {diff_tokens(a, b)}")
+            return False
+
+    print("[PASS] Replaced, inserted and deleted words found")
+    return True
+
+
+def test_short_and_long_texts():
+    """Test that the count-based and diff-based paths agree on the vocabulary change."""
+    print("\nTesting short and long text analysis...")
+
+    original = "Staking rewards fell this quarter. Validators noticed first and adjusted their stakes."
+    edited = "Staking **yields** fell sharply this quarter. Validators noticed first and adjusted stakes."
+    short = analyze_edit(original, edited)
+    if sorted(short['added_vocabulary']) != ["sharply", "yields"] \
+            or sorted(short['removed_vocabulary']) != ["rewards", "their"] or not short['added_bold']:
+        print(f"[FAIL] Unexpected short text analysis: {short}")
+        return False
+
+    # Repeat the post until it takes the segment diff path
+    repeats = SHORT_TEXT_CHARS // len(original) + 1
+    long_original = "\n".join([original] * repeats)
+    long_edited = "\n".join([original] * (repeats - 1) + [edited])
+    long = analyze_edit(long_original, long_edited)
+    if long['added_vocabulary'] != short['added_vocabulary'] \
+            or long['deleted_tokens'] != ["rewards", "their"] or long['removed_vocabulary']:
+        print(f"[FAIL] Unexpected long text analysis: {long}")
+        return False
+
+    if analyze_edit(original, original)['changed'] or analyze_edit(original, original)['deleted_tokens']:
+        print("[FAIL] Unchanged text reported as edited")
+        return False
+
+    print("[PASS] Both paths report the same vocabulary changes")
+    return True
+
+
+def main():
+    """Run all edit diff tests."""
+    print("=" * 70)
+    print("ContentAgent Edit Diff Tests")
+    print("=" * 70)
+
+    tests = [
+        test_minimal_random_diffs,
+        test_edit_budget,
+        test_single_element_gaps,
+        test_short_and_long_texts
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} edit diff tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for extractive article compression.
+Tests sentence splitting, the token budget, preserved headings and order,
+determinism, caching and the centroid fallback for very long articles.
+"""
+import os
+import sys
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.extractive_summary as extractive_summary
+from src.extractive_summary import ArticleCompressor, compress_text, split_sentences, CHARS_PER_TOKEN
+
+TOPICS = ["staking rewards", "validator sets", "fee markets", "bridge security", "token unlocks"]
+ASIDES = [
+    "Coffee at the conference was surprisingly good.", "My cat ignored the livestream entirely.",
+    "Rain delayed the train by twenty minutes.", "Someone brought homemade lemon cake.",
+    "The venue wifi kept dropping out.", "Parking downtown costs a fortune now.",
+    "A street band played jazz outside.", "Lunch ran late because of a fire drill."
+]
+
+
+def build_article(sections: int = 6, paragraphs: int = 4) -> str:
+    """Build a Markdown article whose sentences mostly discuss a few recurring topics."""
+    parts = ["# Protocol Deep Dive"]
+    for section in range(sections):
+        parts.append(f"## Section {section + 1}: {TOPICS[section % len(TOPICS)].title()}")
+        for paragraph in range(paragraphs):
+            topic = TOPICS[(section + paragraph) % len(TOPICS)]
+            parts.append(
+                f"The protocol changes {topic} in round {paragraph + 1} of section {section + 1}. "
+                f"Analysts expect {topic} to shape validator incentives and fee markets in part {section + 1}. "
+                f"{ASIDES[(section * paragraphs + paragraph) % len(ASIDES)]} "
+                f"Overall, {topic} and staking rewards remain the core of section {section + 1}."
+            )
+        parts.append(f"- Key point on {TOPICS[section % len(TOPICS)]}\n- Another point for section {section + 1}")
+    return "\n\n".join(parts)
+
+
+def test_sentence_splitting():
+    """Test that prose is split into sentences without breaking at abbreviations."""
+    print("Testing sentence splitting...")
+
+    text = "Dr. Smith met the U.S. team at 5 p.m. on Monday. Fees fell 20%! Why? Because e.g. demand dropped."
+    sentences = extractive_summary._split_with_rules(text)
+    expected = ["Dr. Smith met the U.S. team at 5 p.m. on Monday.", "Fees fell 20%!", "Why?",
+                "Because e.g. demand dropped."]
+    if sentences != expected:
+        print(f"[FAIL] Unexpected sentences: {sentences}")
+        return False
+    if len(split_sentences("First sentence here. Second sentence here.")) != 2:
+        print("[FAIL] split_sentences did not find two sentences")
+        return False
+
+    print("[PASS] Sentences split at punctuation, not after abbreviations")
+    return True
+
+
+def test_budget_and_structure():
+    """Test that compression respects the budget and keeps headings and order."""
+    print("Testing budget and structure...")
+
+    article = build_article()
+    short = "# Title\n\nA short article that already fits."
+    if compress_text(short, 100) != short:
+        print("[FAIL] Text within the budget was changed")
+        return False
+
+    target_tokens = len(article) // CHARS_PER_TOKEN // 3
+    compressed = compress_text(article, target_tokens)
+    if len(compressed) > target_tokens * CHARS_PER_TOKEN or len(compressed) < target_tokens * CHARS_PER_TOKEN // 2:
+        print(f"[FAIL] Compressed length {len(compressed)} is not close to the budget {target_tokens * CHARS_PER_TOKEN}")
+        return False
+
+    headings = [line for line in article.splitlines() if line.startswith("#")]
+    if [line for line in compressed.splitlines() if line.startswith("#")] != headings:
+        print("[FAIL] Headings were dropped or reordered")
+        return False
+
+    kept = []
+    for line in filter(None, compressed.splitlines()):
+        kept.extend([line] if line.startswith(("#", "- ")) else split_sentences(line))
+    positions = [article.find(unit) for unit in kept]
+    if -1 in positions or positions != sorted(positions):
+        print("[FAIL] Kept sentences are not verbatim or not in their original order")
+        return False
+    if sum(aside in compressed for aside in ASIDES) >= len(ASIDES) // 2:
+        print("[FAIL] Off-topic sentences were not ranked below on-topic ones")
+        return False
+    if compress_text(article, target_tokens) != compressed:
+        print("[FAIL] Compression is not deterministic")
+        return False
+
+    print(f"[PASS] Compressed {len(article)} to {len(compressed)} chars, headings and order kept")
+    return True
+
+
+def test_cache_and_fallback():
+    """Test that articles are compressed once and very long ones use centroid scoring."""
+    print("Testing cache and centroid fallback...")
+
+    article = build_article()
+    compressor = ArticleCompressor(target_tokens=300)
+    with mock.patch.object(extractive_summary, "compress_text", wraps=compress_text) as compress:
+        first = compressor.compress(article)
+        second = compressor.compress(article)
+    if compress.call_count != 1 or first != second:
+        print(f"[FAIL] Article compressed {compress.call_count} times")
+        return False
+
+    with mock.patch.object(extractive_summary, "TEXTRANK_MAX_SENTENCES", 10), \
+            mock.patch.object(extractive_summary, "textrank_scores") as textrank:
+        compressed = compress_text(article, 300)
+    if textrank.called or not compressed.startswith("# Protocol Deep Dive") or len(compressed) > 300 * CHARS_PER_TOKEN:
+        print("[FAIL] Long article did not fall back to centroid scoring")
+        return False
+
+    print("[PASS] Compression cached per article; long articles fall back to centroid scoring")
+    return True
+
+
+def main():
+    """Run all extractive compression tests."""
+    print("=" * 70)
+    print("ContentAgent Extractive Compression Tests")
+    print("=" * 70)
+
+    tests = [
+        test_sentence_splitting,
+        test_budget_and_structure,
+        test_cache_and_fallback
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} extractive compression tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent image prompt generation.
+Tests that every prompt request is in flight at once and that prompts are
+reported and saved in content order whatever order they complete in.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.image_prompts import ImagePromptGenerator
+
+POSTS = {f"Argument {number}": f"Post about argument {number}." for number in range(1, 7)}
+CONTENT_ITEMS = {
+    "twitter_thread": {"content": "Thread text", "title": "Staking Economics"},
+    "article_summary": {"content": "Summary text", "title": "Staking Economics"},
+    "detailed_posts": {"content": POSTS, "title": "Staking Economics"},
+}
+CONTENTS = ["Thread text", "Summary text"] + list(POSTS.values())
+EXPECTED_KEYS = ["twitter_thread", "article_summary"] + [f"detailed_post_{number}" for number in range(1, 7)]
+
+
+class FakeImagePromptGenerator(ImagePromptGenerator):
+    """Generator whose model calls wait until all requests are in flight, then finish in reverse order."""
+
+    def __init__(self, fail_on=None):
+        self._file_lock = threading.Lock()
+        self.fail_on = fail_on
+        self.in_flight = threading.Barrier(len(EXPECTED_KEYS), timeout=5)
+
+    def generate_image_prompt(self, content, content_type, content_title):
+        self.in_flight.wait()
+        # Later content finishes first
+        time.sleep(0.01 * (len(CONTENTS) - CONTENTS.index(content)))
+        if content == self.fail_on:
+            raise RuntimeError("content filter")
+        return f"Image of {content}"
+
+
+def test_all_requests_in_flight():
+    """Test that prompts are generated in one round and reported in content order."""
+    print("Testing concurrent prompt generation...")
+
+    generator = FakeImagePromptGenerator()
+    reported = []
+    prompts = generator.generate_content_specific_prompts(
+        CONTENT_ITEMS, on_prompt=lambda key, title, prompt: reported.append(key)
+    )
+
+    if list(prompts) != EXPECTED_KEYS or prompts["detailed_post_2"] != "Image of Post about argument 2.":
+        print(f"[FAIL] Unexpected prompts: {prompts}")
+        return False
+    if reported != EXPECTED_KEYS:
+        print(f"[FAIL] Prompts reported out of content order: {reported}")
+        return False
+
+    print(f"[PASS] {len(EXPECTED_KEYS)} requests in flight at once, reported in content order")
+    return True
+
+
+def test_saved_file_order():
+    """Test that the saved file lists prompts in content order and skips failed ones."""
+    print("\nTesting the saved prompts file...")
+
+    generator = FakeImagePromptGenerator(fail_on="Post about argument 3.")
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = generator.generate_and_save_prompts(CONTENT_ITEMS, "Staking Economics", output_dir)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+
+    headings = [line for line in text.splitlines() if line.startswith("## ")]
+    expected = ["## For Twitter Thread", "## For Article Summary"] + [
+        f"## For Detailed Post {number}: Argument {number}" for number in (1, 2, 4, 5, 6)
+    ]
+    if headings != expected:
+        print(f"[FAIL] Unexpected sections: {headings}")
+        return False
+
+    print("[PASS] Sections saved in content order; failed prompt skipped")
+    return True
+
+
+def main():
+    """Run all image prompt tests."""
+    print("=" * 70)
+    print("ContentAgent Image Prompt Tests")
+    print("=" * 70)
+
+    tests = [
+        test_all_requests_in_flight,
+        test_saved_file_order
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} image prompt tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent job queue.
+Tests claiming, reclaiming after the visibility timeout, rejection of lost
+claims, retry exhaustion and that concurrent worker processes claim each job
+exactly once and create separate output folders.
+"""
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.main as main_module
+from src.job_queue import JobQueue, JOB_DONE, JOB_FAILED, JOB_QUEUED
+from src.main import ContentAgent
+
+
+def new_queue(directory: str) -> JobQueue:
+    """Create an empty queue in a temporary directory."""
+    return JobQueue(os.path.join(directory, "jobs.db"))
+
+
+def claim_all(db_path: str, worker_id: str, claimed):
+    """Claim and complete jobs until none is left, reporting each claimed job ID."""
+    queue = JobQueue(db_path)
+    while True:
+        job = queue.claim(worker_id, visibility_timeout=60)
+        if job is None:
+            return
+        claimed.put(job["id"])
+        queue.complete(job["id"], worker_id, {"worker": worker_id})
+
+
+def create_output_dirs(output_root: str, created, count: int):
+    """Create output folders for one article title, reporting each folder."""
+    with mock.patch.object(main_module, "OUTPUT_DIR", output_root):
+        agent = ContentAgent.__new__(ContentAgent)
+        for _ in range(count):
+            created.put(agent._create_output_dir("Staking Economics"))
+
+
+def test_claim_and_complete():
+    """Test that a claimed job is hidden from other workers and can be completed."""
+    print("Testing claim and complete...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = new_queue(directory)
+        job_id = queue.enqueue({"content": "Article", "options": {}})
+
+        job = queue.claim("worker-a", visibility_timeout=60)
+        if job is None or job["id"] != job_id or job["attempts"] != 1 or job["payload"]["content"] != "Article":
+            print(f"[FAIL] Unexpected claimed job: {job}")
+            return False
+        if queue.claim("worker-b", visibility_timeout=60) is not None:
+            print("[FAIL] Claimed job was visible to another worker")
+            return False
+        if not queue.complete(job_id, "worker-a", {"output_dir": "out"}):
+            print("[FAIL] Claim holder could not complete the job")
+            return False
+
+        stored = queue.get_job(job_id)
+        if stored["status"] != JOB_DONE or stored["result"] != {"output_dir": "out"}:
+            print(f"[FAIL] Unexpected completed job: {stored}")
+            return False
+
+    print("[PASS] Claimed job hidden from other workers and completed")
+    return True
+
+
+def test_reclaim_and_lost_claim():
+    """Test that an expired claim is reclaimed and the old worker's updates are rejected."""
+    print("\nTesting visibility timeout reclaim...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = new_queue(directory)
+        job_id = queue.enqueue({"content": "Article"})
+
+        queue.claim("worker-a", visibility_timeout=0.05)
+        time.sleep(0.1)
+        job = queue.claim("worker-b", visibility_timeout=60)
+        if job is None or job["id"] != job_id or job["attempts"] != 2:
+            print(f"[FAIL] Expired job was not reclaimed: {job}")
+            return False
+
+        if queue.extend(job_id, "worker-a") or queue.complete(job_id, "worker-a") \
+                or queue.fail(job_id, "worker-a", "late failure"):
+            print("[FAIL] Worker that lost its claim could still update the job")
+            return False
+        if not queue.complete(job_id, "worker-b"):
+            print("[FAIL] New claim holder could not complete the job")
+            return False
+
+    print("[PASS] Expired claim reclaimed; lost claim rejected")
+    return True
+
+
+def test_retry_exhaustion():
+    """Test that failed jobs are retried until they run out of attempts."""
+    print("\nTesting retry exhaustion...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = new_queue(directory)
+        job_id = queue.enqueue({"content": "Article"}, max_attempts=2)
+
+        queue.claim("worker-a")
+        queue.fail(job_id, "worker-a", "rate limited", retry_delay=0)
+        if queue.get_job(job_id)["status"] != JOB_QUEUED:
+            print("[FAIL] Job with attempts left was not requeued")
+            return False
+
+        if queue.claim("worker-a") is None:
+            print("[FAIL] Requeued job could not be claimed")
+            return False
+        queue.fail(job_id, "worker-a", "rate limited again", retry_delay=0)
+        job = queue.get_job(job_id)
+        if job["status"] != JOB_FAILED or job["error"] != "rate limited again":
+            print(f"[FAIL] Job without attempts left not marked failed: {job}")
+            return False
+        if queue.claim("worker-a") is not None:
+            print("[FAIL] Failed job was claimed again")
+            return False
+
+        # A worker dying on the last attempt fails the job once its timeout expires
+        job_id = queue.enqueue({"content": "Article"}, max_attempts=1)
+        queue.claim("worker-a", visibility_timeout=0.05)
+        time.sleep(0.1)
+        if queue.claim("worker-b") is not None or queue.get_job(job_id)["status"] != JOB_FAILED:
+            print("[FAIL] Expired job without attempts left was not marked failed")
+            return False
+
+    print("[PASS] Failures retried until attempts ran out")
+    return True
+
+
+def test_busy_database():
+    """Test that a claim on a locked database raises the locking error."""
+    print("\nTesting claims on a busy database...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = new_queue(directory)
+        queue.enqueue({"content": "Article"})
+
+        holder = sqlite3.connect(queue.db_path, isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            def impatient_connect():
+                conn = sqlite3.connect(queue.db_path, timeout=0.05, isolation_level=None)
+                conn.row_factory = sqlite3.Row
+                return conn
+
+            with mock.patch.object(queue, "_connect", impatient_connect):
+                queue.claim("worker-a")
+            print("[FAIL] Claim succeeded on a locked database")
+            return False
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e):
+                print(f"[FAIL] Locking error was replaced by: {e}")
+                return False
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+
+    print("[PASS] Busy database reported as locked")
+    return True
+
+
+def test_connections_closed():
+    """Test that queue operations close every connection they open."""
+    print("\nTesting connection cleanup...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = new_queue(directory)
+        opened = []
+        connect = queue._connect
+
+        def tracking_connect():
+            conn = connect()
+            opened.append(conn)
+            return conn
+
+        with mock.patch.object(queue, "_connect", tracking_connect):
+            job_id = queue.enqueue({"content": "Article"})
+            queue.claim("worker-a")
+            queue.extend(job_id, "worker-a")
+            queue.get_job(job_id)
+            queue.get_stats()
+            queue.complete(job_id, "worker-a")
+
+        still_open = 0
+        for conn in opened:
+            try:
+                conn.execute("SELECT 1")
+                still_open += 1
+            except sqlite3.ProgrammingError:
+                pass
+        if still_open:
+            print(f"[FAIL] {still_open} of {len(opened)} connections left open")
+            return False
+
+    print(f"[PASS] All {len(opened)} connections closed")
+    return True
+
+
+def test_concurrent_workers():
+    """Test that worker processes racing for jobs claim each job exactly once."""
+    print("\nTesting concurrent worker processes...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = new_queue(directory)
+        job_ids = [queue.enqueue({"content": f"Article {number}"}) for number in range(40)]
+
+        claimed = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=claim_all, args=(queue.db_path, f"worker-{index}", claimed))
+                   for index in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        claimed_ids = []
+        while not claimed.empty():
+            claimed_ids.append(claimed.get())
+
+        if sorted(claimed_ids) != job_ids:
+            print(f"[FAIL] Jobs claimed {len(claimed_ids)} times for {len(job_ids)} jobs")
+            return False
+        if queue.get_stats()["counts"][JOB_DONE] != len(job_ids):
+            print(f"[FAIL] Not every job completed: {queue.get_stats()['counts']}")
+            return False
+
+    print(f"[PASS] {len(job_ids)} jobs claimed exactly once by {len(workers)} processes")
+    return True
+
+
+def test_output_dir_race():
+    """Test that workers handling articles with the same title get separate output folders."""
+    print("\nTesting output folders of concurrent workers...")
+
+    with tempfile.TemporaryDirectory() as output_root:
+        # Another process creates the folder between the name check and makedirs
+        agent = ContentAgent.__new__(ContentAgent)
+        folder_name = agent._create_topic_based_folder_name
+
+        def stale_check(title):
+            name = folder_name(title)
+            os.makedirs(os.path.join(output_root, name), exist_ok=True)
+            return name
+
+        with mock.patch.object(main_module, "OUTPUT_DIR", output_root):
+            with mock.patch.object(agent, "_create_topic_based_folder_name", side_effect=[
+                stale_check("Staking Economics"), folder_name("Staking Economics")
+            ]):
+                output_dir = agent._create_output_dir("Staking Economics")
+        if os.path.basename(output_dir) != "staking_economics_2":
+            print(f"[FAIL] Folder taken by another process was reused: {output_dir}")
+            return False
+
+        created = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=create_output_dirs, args=(output_root, created, 10))
+                   for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        folders = []
+        while not created.empty():
+            folders.append(created.get())
+        if len(folders) != 40 or len(set(folders)) != 40:
+            print(f"[FAIL] {len(set(folders))} distinct folders for 40 runs")
+            return False
+
+    print("[PASS] Every run got its own output folder")
+    return True
+
+
+def main():
+    """Run all job queue tests."""
+    print("=" * 70)
+    print("ContentAgent Job Queue Tests")
+    print("=" * 70)
+
+    tests = [
+        test_claim_and_complete,
+        test_reclaim_and_lost_claim,
+        test_retry_exhaustion,
+        test_busy_database,
+        test_connections_closed,
+        test_concurrent_workers,
+        test_output_dir_race
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} job queue tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
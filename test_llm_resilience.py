@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM resilience layer.
+Tests retries with backoff, stage deadlines, circuit breaking, hedged requests
+and the priority-aware rate limiter.
+"""
+import os
+import sys
+import threading
+import time
+
+import httpx
+import openai
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.llm_resilience as llm_resilience
+from src.llm_resilience import (CircuitBreaker, LLMResilience, RateLimitWaitExceeded, StageDeadlineExceeded,
+                                CircuitOpenError)
+from src.rate_limiter import RateLimiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+
+class FlakyRunnable:
+    """Runnable that times out a fixed number of times before succeeding."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise openai.APITimeoutError(request=httpx.Request("POST", "https://api.openai.com"))
+        return "ok"
+
+
+class SlowRunnable:
+    """Runnable whose first call is slow and later calls are fast."""
+
+    def __init__(self, first_delay: float, later_delay: float = 0.01):
+        self.first_delay = first_delay
+        self.later_delay = later_delay
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        time.sleep(self.first_delay if self.calls == 1 else self.later_delay)
+        return f"call {self.calls}"
+
+
+def test_retries_with_backoff():
+    """Test that retryable errors are retried until success."""
+    print("Testing retries with backoff...")
+
+    llm_resilience.LLM_BACKOFF_BASE = 0.01
+    resilience = LLMResilience(max_retries=3)
+    runnable = FlakyRunnable(failures=2)
+
+    result = resilience.invoke(runnable, {}, stage="test_retries")
+    if result != "ok" or runnable.calls != 3:
+        print(f"[FAIL] Expected success on third call, got {result!r} after {runnable.calls} calls")
+        return False
+
+    print("[PASS] Retried timed out calls and succeeded")
+    return True
+
+
+def test_stage_deadline():
+    """Test that a hung call is abandoned at the stage deadline."""
+    print("\nTesting stage deadlines...")
+
+    llm_resilience.LLM_STAGE_DEADLINES["test_deadline"] = 0.2
+    resilience = LLMResilience()
+
+    start = time.monotonic()
+    try:
+        resilience.invoke(SlowRunnable(first_delay=2.0), {}, stage="test_deadline")
+        print("[FAIL] Slow call did not hit the deadline")
+        return False
+    except StageDeadlineExceeded:
+        elapsed = time.monotonic() - start
+
+    if elapsed > 1.0:
+        print(f"[FAIL] Deadline took {elapsed:.2f}s to fire")
+        return False
+
+    print(f"[PASS] Stage deadline fired after {elapsed:.2f}s")
+    return True
+
+
+def test_circuit_breaker():
+    """Test that repeated failures open the circuit."""
+    print("\nTesting circuit breaker...")
+
+    llm_resilience.LLM_BACKOFF_BASE = 0.0
+    resilience = LLMResilience(max_retries=0)
+    resilience.circuit_breaker.failure_threshold = 2
+
+    for _ in range(2):
+        try:
+            resilience.invoke(FlakyRunnable(failures=1), {}, stage="test_circuit")
+        except openai.APITimeoutError:
+            pass
+
+    try:
+        resilience.invoke(FlakyRunnable(failures=0), {}, stage="test_circuit")
+        print("[FAIL] Circuit did not open after repeated failures")
+        return False
+    except CircuitOpenError:
+        pass
+
+    print("[PASS] Circuit opened after repeated failures")
+    return True
+
+
+def test_half_open_probe():
+    """Test that a half-open circuit lets exactly one concurrent probe through."""
+    print("\nTesting half-open probes...")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    admitted = []
+    start = threading.Barrier(8)
+
+    def call():
+        start.wait()
+        try:
+            breaker.before_call()
+            admitted.append(True)
+        except CircuitOpenError:
+            pass
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if len(admitted) != 1:
+        print(f"[FAIL] {len(admitted)} concurrent probes let through")
+        return False
+
+    # A failed probe re-opens the circuit for a full cool-down
+    breaker.record_failure()
+    try:
+        breaker.before_call()
+        print("[FAIL] Circuit not re-opened after the probe failed")
+        return False
+    except CircuitOpenError:
+        pass
+
+    # A successful probe closes it for everyone
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.before_call()
+
+    # A probe ending in an unrelated error does not leave the circuit stuck
+    time.sleep(0.06)
+    breaker.record_failure()
+    time.sleep(0.06)
+    resilience = LLMResilience(max_retries=0)
+    resilience.circuit_breaker = breaker
+
+    class BrokenRunnable:
+        def invoke(self, inputs):
+            raise ValueError("bad prompt")
+
+    try:
+        resilience.invoke(BrokenRunnable(), {}, stage="test_probe")
+    except ValueError:
+        pass
+    breaker.before_call()
+
+    print("[PASS] One probe admitted; failure re-opens, success closes the circuit")
+    return True
+
+
+def test_rate_limit_waits():
+    """Test that running out of time waiting for rate limit capacity never opens the circuit."""
+    print("\nTesting rate limit waits and the circuit breaker...")
+
+    class FullLimiter:
+        """Limiter that never has capacity, as when background traffic holds every slot."""
+
+        def acquire(self, tokens, priority, timeout=None):
+            return False
+
+    llm_resilience.LLM_STAGE_DEADLINES["test_limiter"] = 0.05
+    resilience = LLMResilience(max_retries=0, limiter=FullLimiter())
+    resilience.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+
+    for _ in range(3):
+        try:
+            resilience.invoke(FlakyRunnable(failures=0), {}, stage="test_limiter")
+            print("[FAIL] Call went through without rate limit capacity")
+            return False
+        except RateLimitWaitExceeded:
+            pass
+    if resilience.circuit_breaker.opened_at is not None or resilience.circuit_breaker.consecutive_failures:
+        print("[FAIL] Rate limit waits counted as API failures")
+        return False
+
+    # A probe that never got capacity hands the probe to the next caller
+    resilience.circuit_breaker.record_failure()
+    resilience.circuit_breaker.record_failure()
+    time.sleep(0.06)
+    try:
+        resilience.invoke(FlakyRunnable(failures=0), {}, stage="test_limiter")
+    except RateLimitWaitExceeded:
+        pass
+    if not resilience.circuit_breaker.before_call():
+        print("[FAIL] Probe not released after waiting for rate limit capacity")
+        return False
+
+    print("[PASS] Rate limit waits left the circuit closed and released the probe")
+    return True
+
+
+def test_hedged_requests():
+    """Test that a slow request is hedged once it exceeds the p95 latency."""
+    print("\nTesting hedged requests...")
+
+    resilience = LLMResilience(hedging_enabled=True)
+    for _ in range(llm_resilience.LLM_HEDGE_MIN_SAMPLES):
+        resilience.latency.record("test_hedge", 0.05)
+
+    runnable = SlowRunnable(first_delay=1.0)
+    start = time.monotonic()
+    result = resilience.invoke(runnable, {}, stage="test_hedge")
+    elapsed = time.monotonic() - start
+
+    if result != "call 2" or elapsed > 0.8:
+        print(f"[FAIL] Expected hedged call to win, got {result!r} after {elapsed:.2f}s")
+        return False
+
+    print(f"[PASS] Hedged request returned after {elapsed:.2f}s")
+    return True
+
+
+def test_rate_limiter_priorities():
+    """Test that waiting interactive requests are served before background ones."""
+    print("\nTesting rate limiter priorities...")
+
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=100000, max_concurrency=1)
+    limiter.acquire(100)
+
+    order = []
+
+    def worker(name, priority):
+        limiter.acquire(100, priority)
+        order.append(name)
+        limiter.release(100)
+
+    background = threading.Thread(target=worker, args=("background", PRIORITY_BACKGROUND))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.05)
+
+    metrics = limiter.get_metrics()
+    limiter.release(100)
+    background.join(timeout=2)
+    interactive.join(timeout=2)
+
+    if order != ["interactive", "background"]:
+        print(f"[FAIL] Expected interactive request first, got {order}")
+        return False
+    if metrics["queue_depth"] != 2:
+        print(f"[FAIL] Expected queue depth 2, got {metrics['queue_depth']}")
+        return False
+    if limiter.acquire(100, timeout=0) is not True:
+        print("[FAIL] Limiter did not free capacity after release")
+        return False
+
+    print("[PASS] Interactive request served before background request")
+    return True
+
+
+def main():
+    """Run all resilience tests."""
+    print("=" * 70)
+    print("ContentAgent LLM Resilience Tests")
+    print("=" * 70)
+
+    tests = [
+        test_retries_with_backoff,
+        test_stage_deadline,
+        test_circuit_breaker,
+        test_half_open_probe,
+        test_rate_limit_waits,
+        test_hedged_requests,
+        test_rate_limiter_priorities
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} resilience tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
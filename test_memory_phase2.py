@@ -234,6 +234,548 @@ def test_database_schema():
         except:
             pass
 
+def test_quality_metrics_recompute():
+    """Test that stored quality metrics can be re-scored in bulk."""
+    print("\nTesting Quality Metrics Recompute...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        texts = [
+            "Short and clear. Easy to read.",
+            "Comprehensive methodologies necessitate sophisticated verification infrastructure.",
+        ]
+        for text in texts:
+            memory_manager.record_feedback("article_summary", text, "accept")
+
+        import sqlite3
+        from src.text_metrics import text_metrics
+        with sqlite3.connect(temp_db_path) as conn:
+            # Simulate stale scores and a row recorded before counts were stored
+            conn.execute("UPDATE quality_metrics SET readability_score = 0, complexity_score = 0")
+            conn.execute("UPDATE quality_metrics SET sentence_count = NULL WHERE id = 1")
+
+        updated = memory_manager.recompute_quality_metrics()
+        if updated != len(texts):
+            print(f"[FAIL] Expected {len(texts)} rows recomputed, got {updated}")
+            return False
+
+        with sqlite3.connect(temp_db_path) as conn:
+            scores = conn.execute(
+                "SELECT readability_score, complexity_score FROM quality_metrics ORDER BY id"
+            ).fetchall()
+
+        expected = [(text_metrics.analyze(text)['readability'], text_metrics.analyze(text)['complexity'])
+                    for text in texts]
+        if scores != expected:
+            print(f"[FAIL] Recomputed scores {scores} do not match {expected}")
+            return False
+
+        print("[PASS] Quality metrics recomputed from stored counts")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Quality metrics recompute test failed: {e}")
+        return False
+
+    finally:
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_feedback_search():
+    """Test full-text search over feedback history."""
+    print("\nTesting Feedback Search...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        memory_manager.record_feedback("twitter_thread", "Validators secure the network with staked capital.", "accept",
+                                       original_prompt="Write a thread about staking")
+        memory_manager.record_feedback("article_summary", "Rollups batch transactions to cut fees.", "reject")
+        memory_manager.record_feedback("twitter_thread", "Staking rewards depend on validator uptime.", "edit")
+
+        results = memory_manager.search_feedback("validator")
+        if {r['id'] for r in results} != {1, 3}:
+            print(f"[FAIL] Expected feedback 1 and 3 for 'validator', got {[r['id'] for r in results]}")
+            return False
+
+        results = memory_manager.search_feedback("staking", user_action="accept")
+        if [r['id'] for r in results] != [1] or '[' not in results[0]['snippet']:
+            print(f"[FAIL] Filtered prompt search returned {results}")
+            return False
+
+        if memory_manager.search_feedback('roll* "fees') == [] or memory_manager.search_feedback("AND (") != []:
+            print("[FAIL] Prefix search or FTS syntax handling is wrong")
+            return False
+
+        # A column added by a later migration must not shift the returned fields
+        import sqlite3
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("ALTER TABLE feedback_history ADD COLUMN reviewer TEXT DEFAULT 'someone'")
+        results = memory_manager.search_feedback("rollups")
+        recent = memory_manager.get_recent_feedback("article_summary")
+        if [r['content_text'] for r in results + recent] != ["Rollups batch transactions to cut fees."] * 2 \
+                or results[0]['metadata'] != {} or results[0]['score'] <= 0:
+            print(f"[FAIL] Fields shifted after adding a column: {results}")
+            return False
+
+        # Deleted history must drop out of the index
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("DELETE FROM feedback_history WHERE id = 2")
+        if memory_manager.search_feedback("rollups"):
+            print("[FAIL] Deleted feedback still returned by search")
+            return False
+
+        print("[PASS] Feedback search ranks, filters and stays in sync")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Feedback search test failed: {e}")
+        return False
+
+    finally:
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_near_duplicate_detection():
+    """Test that near duplicates of accepted content are found and identical content reuses its analysis."""
+    print("\nTesting Near-Duplicate Detection...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        accepted = ("Ethereum validators stake capital to secure the network. Misbehaving validators are "
+                    "slashed, which makes attacks expensive. Rewards depend on uptime and on the total "
+                    "amount staked across the whole validator set.")
+        memory_manager.record_feedback("twitter_thread", accepted, "accept")
+        memory_manager.record_feedback("twitter_thread", "Rollups batch transactions to cut fees.", "reject")
+
+        near = accepted + " Worth knowing."
+        matches = memory_manager.find_near_duplicates("twitter_thread", near)
+        if [m['feedback_id'] for m in matches] != [1] or not matches[0]['similarity'] >= 0.8:
+            print(f"[FAIL] Expected feedback 1 as a near duplicate, got {matches}")
+            return False
+
+        if memory_manager.find_near_duplicates("detailed_post", near):
+            print("[FAIL] Near duplicates should only match the same content type")
+            return False
+
+        if memory_manager.find_near_duplicates("twitter_thread", "Rollups batch transactions to cut fees."):
+            print("[FAIL] Rejected content should not be reported as a duplicate")
+            return False
+
+        # Identical content reuses the stored metrics instead of being analyzed again
+        import sqlite3
+        from unittest.mock import patch
+        with patch('src.memory_manager.text_metrics.analyze', side_effect=AssertionError("re-analyzed")):
+            memory_manager.record_feedback("twitter_thread", accepted, "accept")
+        with sqlite3.connect(temp_db_path) as conn:
+            rows = conn.execute(
+                "SELECT readability_score, length_words FROM quality_metrics WHERE feedback_id IN (1, 3)"
+            ).fetchall()
+        if len(rows) != 2 or rows[0] != rows[1]:
+            print(f"[FAIL] Identical content metrics not reused: {rows}")
+            return False
+
+        print("[PASS] Near duplicates detected and identical content reused")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Near-duplicate detection test failed: {e}")
+        return False
+
+    finally:
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_schema_migrations():
+    """Test that an unversioned database is migrated and duplicate keys are merged."""
+    print("\nTesting Schema Migrations...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        import sqlite3
+        from src.memory_migrations import MIGRATIONS, LATEST_SCHEMA_VERSION
+
+        # A database created before versioning, with duplicate stats, pattern and preference rows
+        with sqlite3.connect(temp_db_path) as conn:
+            MIGRATIONS[0][1](conn.cursor())
+            conn.executemany(
+                "INSERT INTO edit_patterns (content_type, edit_type, pattern_description, frequency, last_seen) "
+                "VALUES ('twitter_thread', 'shortening', 'Shortened content', ?, ?)",
+                [(2, '2025-01-01'), (3, '2025-02-01')]
+            )
+            conn.executemany(
+                "INSERT INTO user_preferences (content_type, preference_type, preference_value, confidence_score, last_updated) "
+                "VALUES ('twitter_thread', 'uses_bold', ?, 0.5, '2025-01-01')",
+                [('false',), ('true',)]
+            )
+            conn.executemany(
+                "INSERT INTO generation_stats (content_type, total_generated, total_accepted, avg_generation_time, last_updated) "
+                "VALUES ('twitter_thread', ?, ?, ?, ?)",
+                [(2, 1, 1.0, '2025-01-01'), (3, 2, 2.0, '2025-02-01')]
+            )
+
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        MemoryManager(db_path=temp_db_path)  # Reopening must not re-apply anything
+
+        with sqlite3.connect(temp_db_path) as conn:
+            versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+            patterns = conn.execute("SELECT frequency, last_seen FROM edit_patterns").fetchall()
+            preferences = conn.execute("SELECT preference_value FROM user_preferences").fetchall()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(quality_metrics)")}
+            stats = conn.execute("SELECT total_generated, total_accepted, avg_generation_time FROM generation_stats").fetchall()
+
+        if versions != list(range(1, LATEST_SCHEMA_VERSION + 1)) or 'syllable_count' not in columns:
+            print(f"[FAIL] Unexpected schema versions {versions}")
+            return False
+        if patterns != [(5, '2025-02-01')] or preferences != [('true',)] or stats != [(5, 3, 1.6)]:
+            print(f"[FAIL] Duplicates not merged: {patterns} {preferences} {stats}")
+            return False
+
+        # Repeated preferences and stats go through the UPSERT path; the legacy
+        # 0.5 confidence counts as three supporting events, decayed since 2025-01-01
+        memory_manager.record_feedback("twitter_thread", "A **bold** claim.", "accept", generation_time=4.0)
+        with sqlite3.connect(temp_db_path) as conn:
+            rows = conn.execute(
+                "SELECT COUNT(*), MAX(evidence), MAX(observations) FROM user_preferences WHERE preference_type = 'uses_bold'"
+            ).fetchone()
+            stats = conn.execute("SELECT total_generated, total_accepted, avg_generation_time FROM generation_stats").fetchall()
+        from datetime import datetime
+        weight = 0.5 ** ((datetime.now() - datetime(2025, 1, 1)).days / memory_manager.config.preference_half_life_days)
+        if rows[0] != 1 or abs(rows[1] - (3 * weight + 1)) > 1e-3 or abs(rows[2] - (3 * weight + 1)) > 1e-3:
+            print(f"[FAIL] Preference UPSERT produced {rows}")
+            return False
+        if len(stats) != 1 or stats[0][:2] != (6, 4) or abs(stats[0][2] - 2.0) > 1e-9:
+            print(f"[FAIL] Generation stats UPSERT produced {stats}")
+            return False
+
+        print("[PASS] Schema migrated to the latest version")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Schema migration test failed: {e}")
+        return False
+
+    finally:
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_dashboard_snapshot():
+    """Test that the dashboard snapshot matches the per-query API and is cached until data changes."""
+    print("\nTesting Dashboard Snapshot...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    memory_manager = None
+    try:
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        for i in range(4):
+            memory_manager.record_feedback("twitter_thread", f"A **bold** thread, take {i}.", "accept")
+        memory_manager.record_feedback("detailed_post", "Long post.", "reject",
+                                       metadata={"revision_reason": "Too long"})
+
+        snapshot = memory_manager.get_dashboard_snapshot()
+        for content_type, analysis in snapshot['content_types'].items():
+            if (analysis['generation_stats'] != memory_manager.get_generation_stats(content_type) or
+                    analysis['quality_analysis'] != memory_manager.get_quality_analysis(content_type) or
+                    analysis['user_preferences'] != memory_manager.get_user_preferences(content_type) or
+                    analysis['recommendations'] != memory_manager.get_learning_insights(content_type)['recommendations'] or
+                    analysis['prompt_enhancements'] != memory_manager.get_prompt_enhancements(content_type)):
+                print(f"[FAIL] Snapshot differs from the query API for {content_type}")
+                return False
+
+        if memory_manager.get_dashboard_snapshot() is not snapshot:
+            print("[FAIL] Unchanged database should return the cached snapshot")
+            return False
+
+        # A write from another connection invalidates the cache
+        MemoryManager(db_path=temp_db_path).record_feedback("twitter_thread", "Another thread.", "edit")
+        refreshed = memory_manager.get_dashboard_snapshot()
+        if refreshed is snapshot or refreshed['database']['total_feedback_records'] != 6:
+            print("[FAIL] Snapshot was not rebuilt after a change")
+            return False
+
+        # Without writes, an expired snapshot is rebuilt so decayed confidences stay current
+        memory_manager.config.dashboard_snapshot_max_age = 0
+        if memory_manager.get_dashboard_snapshot() is refreshed:
+            print("[FAIL] Expired snapshot was returned from the cache")
+            return False
+
+        print("[PASS] Dashboard snapshot consistent and cached")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Dashboard snapshot test failed: {e}")
+        return False
+
+    finally:
+        if memory_manager:
+            memory_manager.close()
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_memory_export():
+    """Test incremental columnar export of memory tables."""
+    print("\nTesting Memory Export...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+    export_dir = tempfile.mkdtemp()
+
+    try:
+        from src.memory_export import MemoryExporter, read_npz_part
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        memory_manager.record_feedback("twitter_thread", "First **thread**, with ünïcode.", "accept",
+                                       original_prompt="Write a thread")
+        memory_manager.record_feedback("detailed_post", "A post.", "reject",
+                                       metadata={"revision_reason": "too short"})
+
+        exporter = MemoryExporter(temp_db_path, export_dir, export_format="npz", chunk_size=1)
+        first = exporter.export()
+        memory_manager.record_feedback("twitter_thread", "Second thread.", "accept")
+        second = exporter.export()
+
+        if (first['feedback_history']['rows'], second['feedback_history']['rows']) != (2, 1):
+            print(f"[FAIL] Incremental export moved {first['feedback_history']} then {second['feedback_history']}")
+            return False
+
+        columns = read_npz_part(first['feedback_history']['path'])
+        if (columns['id'] != [1, 2] or columns['content_text'][0] != "First **thread**, with ünïcode." or
+                columns['original_prompt'] != ["Write a thread", None]):
+            print(f"[FAIL] Exported columns do not round-trip: {columns}")
+            return False
+
+        import sqlite3
+        with sqlite3.connect(temp_db_path) as conn:
+            preference_count = conn.execute("SELECT COUNT(*) FROM user_preferences").fetchone()[0]
+        preferences = read_npz_part(second['user_preferences']['path'])
+        if len(preferences['preference_type']) != preference_count:
+            print(f"[FAIL] Preference snapshot incomplete: {preferences}")
+            return False
+
+        print("[PASS] Memory tables exported incrementally")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Memory export test failed: {e}")
+        return False
+
+    finally:
+        import shutil
+        shutil.rmtree(export_dir, ignore_errors=True)
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_quality_trends():
+    """Test vectorized weekly and rolling quality trends against plain Python."""
+    print("\nTesting Quality Trends...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        import sqlite3
+        import numpy as np
+        from datetime import datetime, timedelta
+        from src.quality_trends import QualityTrends
+
+        MemoryManager(db_path=temp_db_path)
+        # Acceptance falls week by week; one readability score is missing
+        start = datetime(2025, 3, 3)  # A Monday
+        rows = []
+        for day in range(21):
+            for hour in (9, 15):
+                accepted = (day + hour) % (day // 7 + 2) == 0
+                readability = None if (day, hour) == (3, 9) else 40.0 + day + hour / 10
+                rows.append(("twitter_thread", "accept" if accepted else "reject", readability, 1.0,
+                             100 + day, (start + timedelta(days=day, hours=hour)).isoformat()))
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.executemany('''
+                INSERT INTO quality_metrics (content_type, user_action, readability_score,
+                                             complexity_score, length_words, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', reversed(rows))
+
+        trends = QualityTrends.load(temp_db_path, "twitter_thread")
+        weekly = trends.weekly("readability")
+        if [str(week) for week in weekly['week_start']] != ['2025-03-03', '2025-03-10', '2025-03-17']:
+            print(f"[FAIL] Unexpected weeks: {weekly['week_start']}")
+            return False
+
+        for week in range(3):
+            week_rows = rows[week * 14:(week + 1) * 14]
+            scores = [row[2] for row in week_rows if row[2] is not None]
+            expected_rate = sum(row[1] == "accept" for row in week_rows) / len(week_rows)
+            if (weekly['samples'][week] != 14 or abs(weekly['acceptance_rate'][week] - expected_rate) > 1e-9 or
+                    abs(weekly['mean'][week] - sum(scores) / len(scores)) > 1e-9 or
+                    not np.allclose(weekly['percentiles'][week], np.percentile(scores, [25, 50, 75]))):
+                print(f"[FAIL] Week {week} aggregates are wrong")
+                return False
+
+        # Trailing 2-day window at the last record (day 20, 15:00) excludes day 18, 15:00
+        rolling = trends.rolling_mean("readability", window_days=2)
+        expected = np.mean([row[2] for row in rows[-4:]])
+        if abs(rolling[-1] - expected) > 1e-9 or len(rolling) != len(rows):
+            print(f"[FAIL] Rolling mean {rolling[-1]} != {expected}")
+            return False
+
+        if not trends.acceptance_slope() < 0 or QualityTrends.load(temp_db_path, "detailed_post").acceptance_slope() is not None:
+            print("[FAIL] Acceptance drift not detected")
+            return False
+
+        print("[PASS] Quality trends computed correctly")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Quality trends test failed: {e}")
+        return False
+
+    finally:
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def test_decayed_preferences():
+    """Test decayed preference confidence and running mean/variance of numeric preferences."""
+    print("\nTesting Decayed Preferences...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        import sqlite3
+        import numpy as np
+
+        memory_manager = MemoryManager(db_path=temp_db_path)
+        for words in (10, 20, 30):
+            memory_manager.record_feedback("detailed_post", " ".join(["word"] * words), "accept")
+        memory_manager.record_feedback("detailed_post", "A **bold** " + " ".join(["word"] * 18), "accept")
+        lengths = np.array([10, 20, 30, 20], dtype=float)
+
+        preferences = memory_manager.get_user_preferences("detailed_post", min_confidence=0.0)
+        length = preferences['preferred_length']
+        # Beta prior worth 4 events at 0.3: (evidence + 1.2) / (observations + 4)
+        if (abs(length['mean'] - lengths.mean()) > 0.05 or abs(length['std'] - lengths.std()) > 0.05 or
+                abs(length['confidence'] - round(5.2 / 8, 2)) > 0.011 or
+                abs(preferences['uses_bold']['confidence'] - round(2.2 / 8, 2)) > 0.011):
+            print(f"[FAIL] Unexpected preference statistics: {preferences}")
+            return False
+
+        # A month later the old evidence counts half: the new sample moves the mean further
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("UPDATE user_preferences SET last_updated = datetime(last_updated, '-30 days')")
+        memory_manager.record_feedback("detailed_post", " ".join(["word"] * 60), "accept")
+        weights = np.array([0.5, 0.5, 0.5, 0.5, 1.0])
+        lengths = np.append(lengths, 60)
+        mean = np.average(lengths, weights=weights)
+        std = np.sqrt(np.average((lengths - mean) ** 2, weights=weights))
+
+        length = memory_manager.get_user_preferences("detailed_post", min_confidence=0.0)['preferred_length']
+        if abs(length['mean'] - mean) > 0.05 or abs(length['std'] - std) > 0.05 or abs(length['observations'] - 3.0) > 0.05:
+            print(f"[FAIL] Decayed statistics {length}, expected mean {mean:.1f} std {std:.1f}")
+            return False
+
+        enhancements = memory_manager.get_prompt_enhancements("detailed_post")
+        if f"Target approximately {int(round(mean))} words" not in enhancements or "usually runs" not in enhancements:
+            print(f"[FAIL] Prompt enhancements ignore the distribution: {enhancements}")
+            return False
+
+        print("[PASS] Preferences decay and track running statistics")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Decayed preferences test failed: {e}")
+        return False
+
+    finally:
+        try:
+            os.unlink(temp_db_path)
+        except:
+            pass
+
+def _record_feedback_worker(db_path, worker, records):
+    """Record feedback from a separate process for test_concurrent_writers."""
+    memory_manager = MemoryManager(db_path=db_path)
+    for index in range(records):
+        action = ["accept", "reject", "edit"][index % 3]
+        metadata = {"edited_content": "Edited with quite a few more words than the original had."} if action == "edit" else None
+        if not memory_manager.record_feedback("twitter_thread", f"Worker {worker}, item {index}.", action,
+                                              generation_time=1.0, metadata=metadata):
+            sys.exit(1)
+
+def test_concurrent_writers():
+    """Test that several processes can record feedback at once without losing updates."""
+    print("\nTesting Concurrent Writers...")
+
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
+        temp_db_path = tmp_db.name
+
+    try:
+        import multiprocessing
+        import sqlite3
+
+        MemoryManager(db_path=temp_db_path)
+        processes, records = 4, 15
+        workers = [multiprocessing.Process(target=_record_feedback_worker, args=(temp_db_path, worker, records))
+                   for worker in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if any(worker.exitcode != 0 for worker in workers):
+            print("[FAIL] A writer process failed to record feedback")
+            return False
+
+        with sqlite3.connect(temp_db_path) as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            feedback_count = conn.execute("SELECT COUNT(*) FROM feedback_history").fetchone()[0]
+            stats = conn.execute('''
+                SELECT total_generated, total_accepted, total_rejected, total_edited FROM generation_stats
+            ''').fetchall()
+
+        total = processes * records
+        if journal_mode != 'wal' or feedback_count != total or stats != [(total, total // 3, total // 3, total // 3)]:
+            print(f"[FAIL] Lost updates: {feedback_count} records, stats {stats} ({journal_mode})")
+            return False
+
+        print("[PASS] Concurrent writers recorded every update")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Concurrent writers test failed: {e}")
+        return False
+
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.unlink(temp_db_path + suffix)
+            except:
+                pass
+
 def main():
     """Run all Phase 2 memory tests."""
     print("=" * 70)
@@ -243,7 +785,16 @@ def main():
     tests = [
         test_database_schema,
         test_enhanced_memory_manager,
-        test_generator_memory_integration
+        test_generator_memory_integration,
+        test_quality_metrics_recompute,
+        test_feedback_search,
+        test_near_duplicate_detection,
+        test_schema_migrations,
+        test_dashboard_snapshot,
+        test_memory_export,
+        test_quality_trends,
+        test_concurrent_writers,
+        test_decayed_preferences
     ]
     
     results = []
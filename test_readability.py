@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the local readability rules.
+Tests lexicon replacement, protected tokens, long sentence splitting,
+paragraph reflow and preservation of structured blocks and indentation.
+"""
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.readability import improve_readability, simplify_words, split_long_sentence
+
+
+def test_simplify_words():
+    """Test that lexicon entries are replaced with matching capitalization."""
+    print("Testing word simplification...")
+
+    cases = {
+        "We utilize staking in order to secure the chain.": "We use staking to secure the chain.",
+        "Utilize it. UTILIZE it.": "Use it. USE it.",
+        "Due to the fact that fees rose, numerous users left.": "Because fees rose, many users left.",
+        "Approximately half were insufficient.": "About half were not enough.",
+    }
+    for text, expected in cases.items():
+        if simplify_words(text) != expected:
+            print(f"[FAIL] {text!r} became {simplify_words(text)!r}, expected {expected!r}")
+            return False
+
+    print("[PASS] Phrases and words replaced, capitalization kept")
+    return True
+
+
+def test_protected_tokens():
+    """Test that mentions, hashtags, cashtags, URLs and compound words are not rewritten."""
+    print("\nTesting protected tokens...")
+
+    for text in ("$SUFFICIENT", "#Utilize", "@numerous", "https://example.com/utilize", "docs/optimal",
+                 "non-optimal", "utilizer", "file.comprehensive"):
+        if simplify_words(text) != text:
+            print(f"[FAIL] {text!r} became {simplify_words(text)!r}")
+            return False
+
+    print("[PASS] Mentions, hashtags, cashtags, URLs and compound words left alone")
+    return True
+
+
+def test_sentence_splitting():
+    """Test that long sentences are split at clause boundaries and short ones are kept."""
+    print("\nTesting sentence splitting...")
+
+    sentence = ("Validators earn rewards for every block they propose on the network; "
+                "delegators share those rewards in proportion to the stake they delegated.")
+    parts = split_long_sentence(sentence, max_words=10)
+    if parts != ["Validators earn rewards for every block they propose on the network.",
+                 "Delegators share those rewards in proportion to the stake they delegated."]:
+        print(f"[FAIL] Unexpected split: {parts}")
+        return False
+
+    short = "Fees rose; users left."
+    if split_long_sentence(short, max_words=3) != [short]:
+        print("[FAIL] Clauses shorter than the minimum were split off")
+        return False
+
+    print("[PASS] Long sentences split at clause boundaries")
+    return True
+
+
+def test_paragraph_layout():
+    """Test reflow of long paragraphs and preservation of structure and indentation."""
+    print("\nTesting paragraph layout...")
+
+    long_paragraph = " ".join(f"Point number {number} stands alone." for number in range(8))
+    paragraphs = improve_readability(long_paragraph).split("\n\n")
+    if len(paragraphs) != 2 or not paragraphs[1].startswith("Point number 4"):
+        print(f"[FAIL] Long paragraph not reflowed into groups of four: {paragraphs}")
+        return False
+
+    thread = "First tweet is sufficient.\n\n------\n\n- A list item\n- Another item\n\n## A heading"
+    if improve_readability(thread) != thread.replace("sufficient", "enough"):
+        print(f"[FAIL] Structure not preserved: {improve_readability(thread)!r}")
+        return False
+
+    indented = "    An indented paragraph that is sufficient."
+    if improve_readability(indented) != "    An indented paragraph that is enough.":
+        print(f"[FAIL] Indentation lost: {improve_readability(indented)!r}")
+        return False
+
+    print("[PASS] Long paragraphs reflowed; structure and indentation kept")
+    return True
+
+
+def main():
+    """Run all readability tests."""
+    print("=" * 70)
+    print("ContentAgent Readability Tests")
+    print("=" * 70)
+
+    tests = [
+        test_simplify_words,
+        test_protected_tokens,
+        test_sentence_splitting,
+        test_paragraph_layout
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} readability tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
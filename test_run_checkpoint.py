@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test script for run checkpoints.
+Tests the checkpoint journal and resuming an interrupted run: accepted
+stages are skipped, unaccepted stages are restored for review, and stages
+of a changed article are generated again.
+"""
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.main as main_module
+from src.candidate_ranking import CandidateRanker
+from src.main import ContentAgent
+from src.run_checkpoint import RunCheckpoint, find_resumable_run, hash_inputs
+
+OPTIONS = {"twitter_thread": True, "article_summary": True, "detailed_posts": False, "image_prompts": False}
+
+
+class Interrupted(Exception):
+    """Stands in for the user stopping the run with Ctrl+C."""
+
+
+class FakeDocumentProcessor:
+    def __init__(self, content):
+        self.content = content
+
+    def process_document(self, path):
+        return {"content": self.content, "title": "Staking Economics"}
+
+
+class FakeGenerator:
+    """Thread and summary generator stand-in that counts generations."""
+
+    def __init__(self):
+        self.threads = 0
+        self.summaries = 0
+
+    def generate_thread_from_document(self, article):
+        self.threads += 1
+        return f"Thread {self.threads}"
+
+    def generate_summary(self, article):
+        self.summaries += 1
+        return f"Summary {self.summaries}"
+
+    def save_summary(self, summary, title, output_dir):
+        path = os.path.join(output_dir, "summary.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(summary)
+        return {"file_path": path}
+
+
+class FakeCLI:
+    """CLI stand-in that accepts content, or interrupts when shown a given content type."""
+
+    def __init__(self, input_file, interrupt_on=None):
+        self.input_file = input_file
+        self.interrupt_on = interrupt_on
+        self.reviewed = []
+
+    def get_article_path(self):
+        return self.input_file
+
+    def get_generation_options(self):
+        return dict(OPTIONS)
+
+    def save_thread(self, thread, output_dir):
+        path = os.path.join(output_dir, "thread.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(thread)
+        return path
+
+    def get_user_feedback(self, path, content_type="content", content_text="", original_prompt="",
+                          generation_time=None, alternatives=0):
+        if content_type == self.interrupt_on:
+            raise Interrupted()
+        self.reviewed.append((content_type, content_text))
+        return ("accept", "")
+
+    def print_completion(self):
+        pass
+
+
+def build_agent(article, generator, cli):
+    """Build a ContentAgent from stand-ins, without models or the memory database."""
+    agent = ContentAgent.__new__(ContentAgent)
+    agent.document_processor = FakeDocumentProcessor(article)
+    agent.twitter_generator = generator
+    agent.article_summary_generator = generator
+    agent.cli = cli
+    agent.targeted_revisions = False
+    agent.readability_pass = False
+    agent.candidate_count = 1
+    agent.candidate_ranker = CandidateRanker()
+    return agent
+
+
+def test_checkpoint_journal():
+    """Test recording, reloading and finding checkpoints."""
+    print("Testing checkpoint journal...")
+
+    with tempfile.TemporaryDirectory() as root:
+        output_dir = os.path.join(root, "run")
+        checkpoint = RunCheckpoint(output_dir)
+        checkpoint.start_run("article.md", "Staking Economics", OPTIONS)
+        article_hash = hash_inputs("Article text")
+        checkpoint.record_stage("twitter_thread", article_hash, "Thread", accepted=True, file_path="thread.md")
+        checkpoint.record_stage("article_summary", article_hash, "Summary")
+
+        reloaded = RunCheckpoint.load(output_dir)
+        if reloaded.get_stage("twitter_thread", article_hash)["output"] != "Thread" \
+                or reloaded.pending_stages() != ["article_summary"]:
+            print(f"[FAIL] Reloaded journal differs: {reloaded.state['stages']}")
+            return False
+        if reloaded.get_stage("twitter_thread", hash_inputs("Edited article text")) is not None:
+            print("[FAIL] Stage returned for changed inputs")
+            return False
+        if find_resumable_run(root).output_dir != output_dir:
+            print("[FAIL] Unfinished run not found")
+            return False
+
+        reloaded.mark_completed()
+        if find_resumable_run(root) is not None:
+            print("[FAIL] Completed run offered for resuming")
+            return False
+
+    print("[PASS] Stages reloaded, changed inputs rejected, completed runs not resumed")
+    return True
+
+
+def test_resume_interrupted_run():
+    """Test that resuming skips accepted stages and restores unaccepted ones."""
+    print("\nTesting resume of an interrupted run...")
+
+    with tempfile.TemporaryDirectory() as root, mock.patch.object(main_module, "OUTPUT_DIR", root):
+        article_path = os.path.join(root, "article.md")
+        generator = FakeGenerator()
+
+        # The user stops the run while reviewing the summary, after accepting the thread
+        agent = build_agent("Article text", generator, FakeCLI(article_path, interrupt_on="article_summary"))
+        try:
+            agent.run()
+            print("[FAIL] Run was not interrupted")
+            return False
+        except Interrupted:
+            pass
+
+        checkpoint = find_resumable_run(root)
+        if checkpoint is None or checkpoint.pending_stages() != ["article_summary"]:
+            print("[FAIL] Interrupted run has no checkpoint with the pending summary")
+            return False
+
+        cli = FakeCLI(article_path)
+        build_agent("Article text", generator, cli).run(resume=checkpoint.output_dir)
+        if generator.threads != 1 or generator.summaries != 1:
+            print(f"[FAIL] Stages generated again: {generator.threads} threads, {generator.summaries} summaries")
+            return False
+        if cli.reviewed != [("article_summary", "Summary 1")]:
+            print(f"[FAIL] Expected only the restored summary to be reviewed, got {cli.reviewed}")
+            return False
+        if not RunCheckpoint.load(checkpoint.output_dir).state["completed"]:
+            print("[FAIL] Resumed run not marked completed")
+            return False
+
+    print("[PASS] Accepted thread skipped, unaccepted summary restored for review")
+    return True
+
+
+def test_changed_article():
+    """Test that stages of an article edited since the interruption are generated again."""
+    print("\nTesting resume after the article changed...")
+
+    with tempfile.TemporaryDirectory() as root, mock.patch.object(main_module, "OUTPUT_DIR", root):
+        article_path = os.path.join(root, "article.md")
+        generator = FakeGenerator()
+
+        agent = build_agent("Article text", generator, FakeCLI(article_path, interrupt_on="article_summary"))
+        try:
+            agent.run()
+        except Interrupted:
+            pass
+        output_dir = find_resumable_run(root).output_dir
+
+        cli = FakeCLI(article_path)
+        build_agent("Edited article text", generator, cli).run(resume=output_dir)
+        if generator.threads != 2 or generator.summaries != 2:
+            print(f"[FAIL] Stages reused for a changed article: {generator.threads} threads, "
+                  f"{generator.summaries} summaries")
+            return False
+        if cli.reviewed != [("twitter_thread", "Thread 2"), ("article_summary", "Summary 2")]:
+            print(f"[FAIL] Unexpected reviews: {cli.reviewed}")
+            return False
+
+    print("[PASS] Changed article invalidated the checkpointed stages")
+    return True
+
+
+def main():
+    """Run all run checkpoint tests."""
+    print("=" * 70)
+    print("ContentAgent Run Checkpoint Tests")
+    print("=" * 70)
+
+    tests = [
+        test_checkpoint_journal,
+        test_resume_interrupted_run,
+        test_changed_article
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} run checkpoint tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
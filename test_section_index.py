@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for argument-scoped article excerpts.
+Tests section citation stripping, matching arguments to their supporting sections,
+the synopsis, the short-article passthrough and caching of the index.
+"""
+import os
+import sys
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.section_index as section_index
+from src.section_index import SectionIndex, SectionIndexCache, strip_section_references
+
+SECTIONS = {
+    "Staking Rewards": "Validators earn staking rewards for proposing blocks. Staking yields fell as more stake joined.",
+    "Fee Markets": "The fee market burns base fees. Priority tips go to block builders during congestion.",
+    "Bridge Security": "Bridges hold locked collateral. Multisig bridges were exploited, so light client bridges are safer.",
+    "Token Unlocks": "Investor token unlocks add supply. Vesting cliffs concentrate selling pressure on unlock dates.",
+}
+
+
+def build_article(repeat: int = 8) -> str:
+    """Build a Markdown article with one section per topic."""
+    parts = ["# Protocol Economics"]
+    for title, text in SECTIONS.items():
+        parts.append(f"## {title}")
+        parts.extend(f"{text} Detail {number} for {title.lower()}." for number in range(repeat))
+    return "\n\n".join(parts)
+
+
+def test_section_references():
+    """Test that section citations are removed before matching."""
+    print("Testing section references...")
+
+    cases = {
+        "[Section 3] Bridges need light clients": "Bridges need light clients",
+        "As Sections 2 and 4 argue, fees matter": "As argue, fees matter",
+        "[Sections 1-3] Rewards fall": "Rewards fall",
+        "No reference here, 5 sections at most": "No reference here, 5 sections at most",
+    }
+    for argument, expected in cases.items():
+        if strip_section_references(argument) != expected:
+            print(f"[FAIL] {argument!r} stripped to {strip_section_references(argument)!r}, expected {expected!r}")
+            return False
+
+    print("[PASS] Single, listed and ranged section citations removed")
+    return True
+
+
+def test_argument_sections():
+    """Test that each argument gets its supporting sections and the synopsis."""
+    print("Testing argument sections...")
+
+    article = build_article()
+    index = SectionIndex(article, max_tokens=300, synopsis_tokens=60)
+    if [section["title"] for section in index.sections] != ["Protocol Economics"] + list(SECTIONS):
+        print(f"[FAIL] Unexpected sections: {[section['title'] for section in index.sections]}")
+        return False
+
+    titles = [section["title"] for section in index.sections_for("Light client bridges are safer than multisig bridges")]
+    if titles != ["Bridge Security"]:
+        print(f"[FAIL] Bridge argument matched {titles}")
+        return False
+
+    # The extractor's section numbers do not follow the index, so only the argument's words count
+    titles = [section["title"] for section in index.sections_for("[Section 2] Builders capture priority tips")]
+    if titles != ["Fee Markets"]:
+        print(f"[FAIL] Cited argument matched {titles}")
+        return False
+
+    context = index.context_for("Vesting cliffs and token unlocks create selling pressure")
+    excerpts = context.partition("ARTICLE SECTIONS RELEVANT TO THIS ARGUMENT:")[2]
+    if not context.startswith("ARTICLE SYNOPSIS:") or not excerpts.startswith("\n## Token Unlocks") \
+            or "## Staking Rewards" in excerpts:
+        print("[FAIL] Context is not the synopsis plus the matching section")
+        return False
+    if len(context) >= len(article) // 2:
+        print(f"[FAIL] Context ({len(context)} chars) is not much shorter than the article ({len(article)} chars)")
+        return False
+    if index.context_for("Completely unrelated weather chat") != article:
+        print("[FAIL] Unmatched argument did not fall back to the whole article")
+        return False
+
+    print(f"[PASS] Arguments matched to their sections ({len(context)} of {len(article)} chars sent)")
+    return True
+
+
+def test_short_article_and_cache():
+    """Test that short articles are sent whole and indexes are built once."""
+    print("Testing short articles and cache...")
+
+    short = build_article(repeat=1)
+    if SectionIndex(short).context_for("Bridges hold collateral") != short:
+        print("[FAIL] Short article was not sent whole")
+        return False
+
+    article = build_article()
+    cache = SectionIndexCache(max_tokens=300)
+    with mock.patch.object(section_index, "SectionIndex", wraps=SectionIndex) as build:
+        first = cache.get(article)
+        second = cache.get(article)
+    if build.call_count != 1 or first is not second:
+        print(f"[FAIL] Index built {build.call_count} times")
+        return False
+
+    print("[PASS] Short articles passed through; index built once per article")
+    return True
+
+
+def main():
+    """Run all section index tests."""
+    print("=" * 70)
+    print("ContentAgent Section Index Tests")
+    print("=" * 70)
+
+    tests = [
+        test_section_references,
+        test_argument_sections,
+        test_short_article_and_cache
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} section index tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
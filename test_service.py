@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for the local HTTP service.
+Tests job submission and status over HTTP, and rejection of malformed
+requests with a 400 response.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.service import ContentService, create_server, JOB_COMPLETED, JOB_FAILED
+
+
+class FakeAgent:
+    """ContentAgent stand-in that records the options of each job."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, content, title, options, progress=None):
+        self.calls.append((content, title, options))
+        progress("Social media thread generated")
+        return {"twitter_thread": f"/tmp/{title}.md"}
+
+
+def start_server(agent):
+    """Start a service on a free local port and return (server, base URL)."""
+    server = create_server(ContentService(agent, max_concurrent_jobs=2), host="127.0.0.1", port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def request(method, url, body=None):
+    """Send a request and return (status, decoded JSON body)."""
+    data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method=method), timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_submit_and_poll():
+    """Test that a submitted job runs and its status can be polled."""
+    print("Testing job submission...")
+
+    agent = FakeAgent()
+    server, base = start_server(agent)
+    try:
+        status, job = request("POST", f"{base}/jobs",
+                              {"content": "Article text", "title": "Staking", "options": {"article_summary": True}})
+        if status != 202 or not job.get("id"):
+            print(f"[FAIL] Unexpected submit response: {status} {job}")
+            return False
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            status, job = request("GET", f"{base}/jobs/{job['id']}")
+            if job["status"] in (JOB_COMPLETED, JOB_FAILED):
+                break
+            time.sleep(0.02)
+        if job["status"] != JOB_COMPLETED or job["outputs"] != {"twitter_thread": "/tmp/Staking.md"}:
+            print(f"[FAIL] Job did not complete: {job}")
+            return False
+        if not agent.calls[0][2]["article_summary"] or not agent.calls[0][2]["twitter_thread"]:
+            print(f"[FAIL] Options not merged with the defaults: {agent.calls[0][2]}")
+            return False
+
+        status, body = request("GET", f"{base}/jobs/unknown")
+        if status != 404:
+            print(f"[FAIL] Unknown job returned {status}")
+            return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("[PASS] Job ran with merged options and its status was reported")
+    return True
+
+
+def test_malformed_requests():
+    """Test that malformed submissions get a 400 and the server keeps serving."""
+    print("\nTesting malformed requests...")
+
+    agent = FakeAgent()
+    server, base = start_server(agent)
+    try:
+        malformed = [
+            {"title": "No article"},
+            {"content": "x", "options": [1]},
+            {"content": "x", "options": "twitter_thread"},
+            {"content": "x", "options": {"podcast": True}},
+            [1, 2],
+            b"{not json",
+        ]
+        for body in malformed:
+            status, response = request("POST", f"{base}/jobs", body)
+            if status != 400 or "error" not in response:
+                print(f"[FAIL] {body!r} returned {status} {response}")
+                return False
+
+        status, response = request("GET", f"{base}/health")
+        if status != 200 or agent.calls:
+            print("[FAIL] Server stopped serving or ran a rejected job")
+            return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("[PASS] Malformed requests rejected with 400")
+    return True
+
+
+def main():
+    """Run all service tests."""
+    print("=" * 70)
+    print("ContentAgent Service Tests")
+    print("=" * 70)
+
+    tests = [
+        test_submit_and_poll,
+        test_malformed_requests
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} service tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
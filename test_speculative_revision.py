@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script for speculative revision drafts.
+Tests classification of revision feedback, matching feedback to drafts,
+taking finished and failed drafts, discarding pending ones and the agent's
+confirmation before a draft is used.
+"""
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.main import ContentAgent
+from src.memory_manager import classify_revision_reason
+from src.speculative_revision import SPECULATIVE_FEEDBACK, SpeculativeReviser, SpeculativeRevisionSet
+
+
+class FakeMemoryManager:
+    """Memory manager stand-in returning fixed rejection directions."""
+
+    def __init__(self, directions):
+        self.directions = directions
+
+    def get_rejection_directions(self, content_type):
+        return self.directions
+
+
+class FakeCLI:
+    """CLI stand-in that answers confirmations with a fixed choice."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.questions = []
+
+    def confirm(self, prompt, default=True):
+        self.questions.append(prompt)
+        return self.answer
+
+
+def finished_drafts(revisions):
+    """Build a draft set whose revisions have already run."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    return SpeculativeRevisionSet(executor, {
+        direction: executor.submit(lambda text=text: text) for direction, text in revisions.items()
+    })
+
+
+def test_classify_revision_reason():
+    """Test mapping revision feedback to rejection directions."""
+    print("Testing revision feedback classification...")
+
+    cases = {
+        "This is way TOO LONG": ['avoid_long_content'],
+        "Needs more detail on fees": ['avoid_short_content'],
+        "Too technical and verbose": ['avoid_long_content', 'avoid_technical'],
+        "Mention the validator count": [],
+        "": [],
+    }
+    for reason, expected in cases.items():
+        if classify_revision_reason(reason) != expected:
+            print(f"[FAIL] {reason!r} classified as {classify_revision_reason(reason)}, expected {expected}")
+            return False
+
+    print("[PASS] Feedback mapped to its directions")
+    return True
+
+
+def test_match_and_take():
+    """Test that only feedback with one speculated direction matches, and taking its draft."""
+    print("\nTesting draft matching...")
+
+    def failing():
+        raise RuntimeError("rate limited")
+
+    speculation = finished_drafts({'avoid_long_content': "Shorter post"})
+    speculation.drafts['avoid_technical'] = speculation.executor.submit(failing)
+    try:
+        if speculation.match("Too long, please") != 'avoid_long_content':
+            print("[FAIL] Feedback in a speculated direction did not match")
+            return False
+        if speculation.match("Too long and too technical") is not None:
+            print("[FAIL] Feedback in two directions matched a single draft")
+            return False
+        if speculation.match("More depth please") is not None:
+            print("[FAIL] Feedback in a direction without a draft matched")
+            return False
+
+        if speculation.take('avoid_long_content') != "Shorter post":
+            print("[FAIL] Finished draft not returned")
+            return False
+        if speculation.take('avoid_technical') is not None or speculation.take('avoid_simple') is not None:
+            print("[FAIL] Failed or missing draft returned content")
+            return False
+    finally:
+        speculation.discard()
+
+    print("[PASS] Single-direction feedback matched; failed drafts return None")
+    return True
+
+
+def test_discard():
+    """Test that discarding cancels drafts that have not started."""
+    print("\nTesting draft discarding...")
+
+    release = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    running = executor.submit(release.wait, 5)
+    queued = executor.submit(lambda: "Never generated")
+    speculation = SpeculativeRevisionSet(executor, {'avoid_long_content': running, 'avoid_simple': queued})
+
+    speculation.discard()
+    release.set()
+    if not queued.cancelled() or running.cancelled():
+        print("[FAIL] Discard did not cancel only the queued draft")
+        return False
+
+    print("[PASS] Queued drafts cancelled, running draft left to finish")
+    return True
+
+
+def test_reviser_directions():
+    """Test that drafts start for the most frequent known directions only."""
+    print("\nTesting speculative reviser...")
+
+    memory = FakeMemoryManager([('avoid_technical', 5), ('unknown_direction', 4),
+                                ('avoid_long_content', 3), ('avoid_simple', 1)])
+    reviser = SpeculativeReviser(memory, max_directions=2)
+    speculation = reviser.start("twitter_thread", lambda feedback: f"Revised: {feedback}")
+    try:
+        if list(speculation.drafts) != ['avoid_technical', 'avoid_long_content']:
+            print(f"[FAIL] Unexpected directions: {list(speculation.drafts)}")
+            return False
+        if speculation.take('avoid_technical') != f"Revised: {SPECULATIVE_FEEDBACK['avoid_technical']}":
+            print("[FAIL] Draft not revised with the direction's feedback")
+            return False
+    finally:
+        speculation.discard()
+
+    if SpeculativeReviser(FakeMemoryManager([])).start("twitter_thread", str) is not None:
+        print("[FAIL] Drafts started without feedback history")
+        return False
+
+    print("[PASS] Drafts started for the most frequent known directions")
+    return True
+
+
+def test_finish_speculation():
+    """Test that the agent uses a matching draft only after the user confirms."""
+    print("\nTesting use of a matching draft...")
+
+    agent = ContentAgent.__new__(ContentAgent)
+    for answer, expected in ((True, "Shorter post"), (False, None)):
+        agent.cli = FakeCLI(answer)
+        speculation = finished_drafts({'avoid_long_content': "Shorter post"})
+        if agent._finish_speculation(speculation, "revise", "Too long") != expected or not agent.cli.questions:
+            print(f"[FAIL] Confirmation answered {answer} did not give {expected!r}")
+            return False
+
+    agent.cli = FakeCLI(True)
+    if agent._finish_speculation(finished_drafts({'avoid_long_content': "Shorter post"}), "accept", "") \
+            or agent.cli.questions:
+        print("[FAIL] Draft offered for accepted content")
+        return False
+
+    print("[PASS] Draft used only when it matches and the user confirms")
+    return True
+
+
+def main():
+    """Run all speculative revision tests."""
+    print("=" * 70)
+    print("ContentAgent Speculative Revision Tests")
+    print("=" * 70)
+
+    tests = [
+        test_classify_revision_reason,
+        test_match_and_take,
+        test_discard,
+        test_reviser_directions,
+        test_finish_speculation
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} speculative revision tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test script for style profiles.
+Tests that a profile is distilled once and reused across runs, rebuilt when
+the samples change, kept within the word limit, used by the generators in
+place of the raw samples, and that generators fall back to the raw samples
+when it cannot be built.
+"""
+import os
+import sys
+import tempfile
+
+from langchain_core.runnables import RunnableLambda
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.style_profile import StyleProfiler, PROFILE_INSTRUCTIONS, read_samples
+from src.twitter_generator import TwitterThreadGenerator
+
+PROFILE = "- Voice: dry, numbers first\n- Formatting: tweets separated by ------"
+
+
+class FakeModel:
+    """Chat model stand-in that counts prompts and returns a fixed profile, or one answer per prompt."""
+
+    def __init__(self, answer=PROFILE, error: Exception = None):
+        self.answer = answer
+        self.error = error
+        self.prompts = []
+        self.runnable = RunnableLambda(self._respond)
+
+    def _respond(self, prompt):
+        self.prompts.append(prompt.to_string())
+        if self.error:
+            raise self.error
+        if isinstance(self.answer, list):
+            return self.answer[len(self.prompts) - 1]
+        return self.answer
+
+
+def write_samples(samples_dir: str):
+    """Write two sample threads and an instruction file."""
+    threads_dir = os.path.join(samples_dir, "sample_threads")
+    os.makedirs(threads_dir, exist_ok=True)
+    for name, text in (("a.txt", "First sample thread.\n\n------\n\nSecond tweet."), ("b.md", "Another thread.")):
+        with open(os.path.join(threads_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+    with open(os.path.join(samples_dir, "writing_instructions_thread.txt"), "w", encoding="utf-8") as f:
+        f.write("Never use hashtags.")
+    return threads_dir
+
+
+def test_profile_cache():
+    """Test that a profile is built once, stored for later runs and rebuilt when samples change."""
+    print("Testing style profile cache...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        threads_dir = write_samples(os.path.join(temp_dir, "samples"))
+        profile_dir = os.path.join(temp_dir, "profiles")
+
+        model = FakeModel()
+        profiler = StyleProfiler(profile_dir=profile_dir, llm=model.runnable)
+        first = profiler.get_profile("thread", "Never use hashtags.", threads_dir)
+        second = profiler.get_profile("thread", "Never use hashtags.", threads_dir)
+        if len(model.prompts) != 1 or first != second or PROFILE not in first:
+            print(f"[FAIL] Profile built {len(model.prompts)} times in one run")
+            return False
+        if "Another thread." not in model.prompts[0] or "Never use hashtags." not in model.prompts[0]:
+            print("[FAIL] Distillation prompt is missing the samples or the instructions")
+            return False
+
+        # A new run reads the stored profile instead of calling the model
+        later_model = FakeModel()
+        later = StyleProfiler(profile_dir=profile_dir, llm=later_model.runnable)
+        if later.get_profile("thread", "Never use hashtags.", threads_dir) != first or later_model.prompts:
+            print("[FAIL] Stored profile was not reused by a new profiler")
+            return False
+        if later.get_profile("post", "Never use hashtags.", threads_dir, build=False) is not None:
+            print("[FAIL] Uncached profile returned without building")
+            return False
+
+        with open(os.path.join(threads_dir, "b.md"), "a", encoding="utf-8") as f:
+            f.write(" Edited.")
+        later.get_profile("thread", "Never use hashtags.", threads_dir)
+        if len(later_model.prompts) != 1:
+            print("[FAIL] Profile was not rebuilt after a sample changed")
+            return False
+
+    print("[PASS] Profile built once, reused across runs and rebuilt when samples change")
+    return True
+
+
+def test_generator_guidance():
+    """Test that generators send the profile in place of raw samples and fall back when it fails."""
+    print("Testing generator style guidance...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        samples_dir = os.path.join(temp_dir, "samples")
+        write_samples(samples_dir)
+        profile_dir = os.path.join(temp_dir, "profiles")
+
+        profiler = StyleProfiler(profile_dir=profile_dir, llm=FakeModel().runnable)
+        generator = TwitterThreadGenerator(samples_dir=samples_dir, style_profiler=profiler)
+        instructions, samples = generator.load_style_guidance()
+        if instructions != PROFILE_INSTRUCTIONS or PROFILE not in samples or "First sample thread" in samples:
+            print("[FAIL] Generator did not use the profile in place of the raw samples")
+            return False
+
+        broken = StyleProfiler(profile_dir=os.path.join(temp_dir, "other"),
+                               llm=FakeModel(error=ValueError("model unavailable")).runnable)
+        generator = TwitterThreadGenerator(samples_dir=samples_dir, style_profiler=broken)
+        instructions, samples = generator.load_style_guidance()
+        if instructions != "Never use hashtags." or "First sample thread" not in samples:
+            print("[FAIL] Generator did not fall back to the raw samples")
+            return False
+
+        if [name for name, _ in read_samples(os.path.join(samples_dir, "sample_threads"))] != ["a.txt", "b.md"]:
+            print("[FAIL] Samples not read in a stable order")
+            return False
+
+    print("[PASS] Generators use the profile and fall back to raw samples on failure")
+    return True
+
+
+def test_word_limit():
+    """Test that profiles over the word limit are asked for again and never cut."""
+    print("\nTesting style profile word limit...")
+
+    long_profile = "\n".join(f"- Rule {number}: keep tweets short" for number in range(1, 41))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        threads_dir = write_samples(os.path.join(temp_dir, "samples"))
+
+        model = FakeModel(answer=[long_profile, PROFILE])
+        profiler = StyleProfiler(profile_dir=os.path.join(temp_dir, "retried"), max_words=30, llm=model.runnable)
+        profile = profiler.get_profile("thread", "Never use hashtags.", threads_dir)
+        if len(model.prompts) != 2 or "at most 21 words" not in model.prompts[1] or not profile.endswith(PROFILE):
+            print(f"[FAIL] Long profile not replaced by one built with a stricter limit: {profile!r}")
+            return False
+
+        model = FakeModel(answer=long_profile)
+        profiler = StyleProfiler(profile_dir=os.path.join(temp_dir, "rejected"), max_words=30, llm=model.runnable)
+        if profiler.get_profile("thread", "Never use hashtags.", threads_dir) is not None:
+            print("[FAIL] Profile over the limit used instead of the raw instructions")
+            return False
+
+    print("[PASS] Long profiles rebuilt with a stricter limit, or replaced by the raw instructions")
+    return True
+
+
+def main():
+    """Run all style profile tests."""
+    print("=" * 70)
+    print("ContentAgent Style Profile Tests")
+    print("=" * 70)
+
+    tests = [
+        test_profile_cache,
+        test_generator_guidance,
+        test_word_limit
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} style profile tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for targeted revisions.
+Tests segment splitting and merging for threads and posts, parsing of the
+changed segments, and the fallback to a full revision.
+"""
+import os
+import sys
+
+from langchain_core.runnables import RunnableLambda
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.targeted_revision import (
+    TargetedReviser, THREAD_SEPARATOR, PARAGRAPH_SEPARATOR,
+    split_segments, parse_replacements, merge_segments
+)
+
+THREAD = (
+    "Opening hook about the protocol.\n\n"
+    "------\n\n"
+    "Second tweet with the numbers.\n\n"
+    "------\n\n"
+    "Third tweet that is far too long and rambles.\n\n"
+    "------\n\n"
+    "Closing thoughts."
+)
+
+
+class FakeModel:
+    """Chat model stand-in that records prompts and returns a fixed answer."""
+
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.prompts = []
+        self.runnable = RunnableLambda(self._respond)
+
+    def _respond(self, prompt):
+        self.prompts.append(prompt.to_string())
+        return self.answer
+
+
+def test_segment_round_trip():
+    """Test that splitting and merging without changes reproduces the content."""
+    print("Testing segment round trip...")
+
+    segments, separators = split_segments(THREAD, THREAD_SEPARATOR)
+    if len(segments) != 4 or segments[2] != "Third tweet that is far too long and rambles.":
+        print(f"[FAIL] Unexpected thread segments: {segments}")
+        return False
+    if merge_segments(segments, separators, {}) != THREAD:
+        print("[FAIL] Unchanged thread does not merge back to the original")
+        return False
+
+    post = "First paragraph.\n\nSecond paragraph\nwith two lines.\n\n\nThird paragraph."
+    segments, separators = split_segments(post, PARAGRAPH_SEPARATOR)
+    if segments != ["First paragraph.", "Second paragraph\nwith two lines.", "Third paragraph."]:
+        print(f"[FAIL] Unexpected post paragraphs: {segments}")
+        return False
+    if merge_segments(segments, separators, {}) != post:
+        print("[FAIL] Unchanged post does not merge back to the original")
+        return False
+
+    print("[PASS] Threads split on dash lines, posts on blank lines, and merge back unchanged")
+    return True
+
+
+def test_replacements():
+    """Test parsing of changed segments, removal and rejection of malformed output."""
+    print("Testing replacement parsing...")
+
+    replacements = parse_replacements("[3]\nThird tweet, tightened.\n\n[4]\nDELETE\n", 4)
+    if replacements != {2: "Third tweet, tightened.", 3: ""}:
+        print(f"[FAIL] Unexpected replacements: {replacements}")
+        return False
+
+    segments, separators = split_segments(THREAD, THREAD_SEPARATOR)
+    merged = merge_segments(segments, separators, replacements)
+    expected = ("Opening hook about the protocol.\n\n------\n\nSecond tweet with the numbers.\n\n"
+                "------\n\nThird tweet, tightened.")
+    if merged != expected:
+        print(f"[FAIL] Unexpected merge: {merged!r}")
+        return False
+
+    merged = merge_segments(segments, separators, {0: ""})
+    if not merged.startswith("Second tweet") or merged.count("------") != 2:
+        print(f"[FAIL] Removing the first tweet left a stray separator: {merged!r}")
+        return False
+
+    for malformed in ("Here is the revised thread:\n[1]\nText", "[9]\nOut of range", "[2]\n", "No markers at all"):
+        if parse_replacements(malformed, 4) is not None:
+            print(f"[FAIL] Malformed output accepted: {malformed!r}")
+            return False
+
+    print("[PASS] Changed segments parsed, merged and malformed output rejected")
+    return True
+
+
+def test_targeted_reviser():
+    """Test a targeted revision end to end with a fake model."""
+    print("Testing targeted reviser...")
+
+    model = FakeModel("[3]\nThird tweet, now short.")
+    reviser = TargetedReviser(model.runnable, "social media thread", "tweet", THREAD_SEPARATOR)
+    revised = reviser.revise(THREAD, "The third tweet rambles", "Article text", "Be concise.",
+                             stage="twitter_thread_revision")
+    if revised != THREAD.replace("Third tweet that is far too long and rambles.", "Third tweet, now short."):
+        print(f"[FAIL] Unexpected revision: {revised!r}")
+        return False
+    if "[4]\nClosing thoughts." not in model.prompts[0] or "The third tweet rambles" not in model.prompts[0]:
+        print("[FAIL] Prompt is missing the numbered tweets or the feedback")
+        return False
+
+    # Output in the wrong format means the caller should rewrite the whole thread
+    model = FakeModel("Sure! Here is the whole thread again...")
+    reviser = TargetedReviser(model.runnable, "social media thread", "tweet", THREAD_SEPARATOR)
+    if reviser.revise(THREAD, "feedback", "Article text", "", stage="twitter_thread_revision") is not None:
+        print("[FAIL] Malformed output did not fall back to a full revision")
+        return False
+
+    print("[PASS] Only the targeted tweet was replaced; malformed output falls back")
+    return True
+
+
+def main():
+    """Run all targeted revision tests."""
+    print("=" * 70)
+    print("ContentAgent Targeted Revision Tests")
+    print("=" * 70)
+
+    tests = [
+        test_segment_round_trip,
+        test_replacements,
+        test_targeted_reviser
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"[ERROR] Test failed with exception: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 70)
+    print(f"{sum(results)}/{len(results)} targeted revision tests passed")
+    print("=" * 70)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    main()